@@ -0,0 +1,196 @@
+# agents/answer_cache.py - Cache des réponses déjà analysées, par champ, avec recherche par similarité (n-grammes)
+#
+# Les réponses des recruteurs se répètent d'une session à l'autre ("Python, Java", "remote",
+# "Pas de préférence"...). Une réponse proche d'une réponse déjà traitée pour le même champ
+# réutilise l'intention détectée, sans appel LLM. La valeur normalisée n'est reprise que pour la
+# même réponse normalisée ("C#, Python" est proche de "C++, Python" mais ne vaut pas la même
+# chose), et toujours revalidée contre l'offre en cours (voir UpdateAgent.update).
+import os
+import re
+import math
+import zlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "5000"))
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.8"))
+ANSWER_CACHE_MAX_CHARS = 120  # au-delà, la réponse est trop singulière pour être réutilisée
+
+# Intentions qui ne dépendent que du champ courant (MODIFY_FIELD / REVERT_FIELD dépendent de l'offre)
+CACHEABLE_INTENTIONS = frozenset({"DIRECT_ANSWER", "NO_PREFERENCE", "REFUSE", "SHOW_STATUS", "CLARIFICATION"})
+MIN_CONFIDENCE = 0.8
+
+_NGRAM = 3
+_BUCKETS = 1 << 20
+# "c++", "c#", "f#" : les suffixes symboliques distinguent des termes différents
+_TOKEN = re.compile(r"[a-z0-9]+[+#]*")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)?")
+# Mots vides (fr/en/es) ignorés pour la comparaison : "Python et Java" ~ "Python, Java"
+_STOPWORDS = frozenset("""
+    a au aux c ce cest d de des du en est et je j la le les l mon ma mes nous on par pour
+    sur un une y il elle ca voila bien alors donc svp merci
+    an and are for is it of the to we with our please thanks
+    el los las un una y para con es por favor gracias
+""".split())
+# Une négation change le sens sans changer les n-grammes : elle fait partie de la signature
+_NEGATIONS = frozenset({"pas", "non", "ni", "sans", "jamais", "not", "no", "never", "without", "nunca", "sin"})
+
+def normalize_answer(text: str) -> str:
+    """Minuscules, sans accents ni ponctuation, sans mots vides : "C'est du Télétravail !" -> "teletravail"."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(token for token in _TOKEN.findall(text) if token not in _STOPWORDS)
+
+def _signature(text: str, normalized: str) -> Tuple:
+    """Ce qui doit être identique pour réutiliser une réponse : nombres, négation, nombre de termes."""
+    tokens = normalized.split()
+    numbers = tuple(number.replace(",", ".") for number in _NUMBER.findall(text))
+    negated = any(token in _NEGATIONS for token in _TOKEN.findall(text.lower()))
+    return numbers, negated, len(tokens)
+
+def embed(normalized: str) -> Dict[int, float]:
+    """Vecteur creux normalisé (L2) des trigrammes de caractères de chaque terme, hachés sur 2^20 cases."""
+    counts: Dict[int, float] = {}
+    for token in normalized.split():
+        padded = f" {token} "
+        for i in range(max(1, len(padded) - _NGRAM + 1)):
+            bucket = zlib.crc32(padded[i:i + _NGRAM].encode("utf-8")) & (_BUCKETS - 1)
+            counts[bucket] = counts.get(bucket, 0.0) + 1.0
+    norm = math.sqrt(sum(weight * weight for weight in counts.values()))
+    return {bucket: weight / norm for bucket, weight in counts.items()} if norm else {}
+
+class CachedAnswer:
+    """Intention et valeur normalisée retenues pour une réponse à un champ."""
+    __slots__ = ("field", "normalized", "signature", "vector", "intention", "value")
+
+    def __init__(self, field: str, normalized: str, signature: Tuple, vector: Dict[int, float]):
+        self.field = field
+        self.normalized = normalized
+        self.signature = signature
+        self.vector = vector
+        self.intention: Optional[Dict[str, Any]] = None
+        self.value: Any = None
+
+class AnswerCache:
+    """
+    Index par champ : correspondance exacte sur le texte normalisé, sinon plus proche voisin
+    (cosinus) parmi les réponses qui partagent au moins un trigramme, via un index inversé.
+    LRU borné, partagé par toutes les sessions.
+    """
+
+    def __init__(self, max_size: int, threshold: float):
+        self.max_size = max_size
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], CachedAnswer]" = OrderedDict()
+        # (champ, signature, trigramme) -> clés des réponses : seules les réponses comparables sont parcourues
+        self._postings: Dict[Tuple[str, Tuple, int], set] = {}
+        self._counts = {"lookups": 0, "exact_hits": 0, "similar_hits": 0, "value_hits": 0, "revalidation_failures": 0}
+
+    def _prepare(self, text: str) -> Optional[Tuple[str, Tuple]]:
+        if not text or len(text) > ANSWER_CACHE_MAX_CHARS:
+            return None
+        normalized = normalize_answer(text)
+        if not normalized:
+            return None
+        return normalized, _signature(text, normalized)
+
+    def lookup(self, field: Optional[str], text: str) -> Optional[CachedAnswer]:
+        """Réponse retenue la plus proche pour ce champ (similarité >= seuil, même signature), sinon None."""
+        if not field:
+            return None
+        prepared = self._prepare(text)
+        if prepared is None:
+            return None
+        normalized, signature = prepared
+        with self._lock:
+            self._counts["lookups"] += 1
+            entry = self._entries.get((field, normalized))
+            if entry is not None:
+                self._entries.move_to_end((field, normalized))
+                self._counts["exact_hits"] += 1
+                return entry
+            best, best_score = None, self.threshold
+            scores: Dict[Tuple[str, str], float] = {}
+            for bucket, weight in embed(normalized).items():
+                for key in self._postings.get((field, signature, bucket), ()):
+                    scores[key] = scores.get(key, 0.0) + weight * self._entries[key].vector[bucket]
+            for key, score in scores.items():
+                if score >= best_score:
+                    best, best_score = self._entries[key], score
+            if best is not None:
+                self._entries.move_to_end((field, best.normalized))
+                self._counts["similar_hits"] += 1
+            return best
+
+    def _entry(self, field: str, text: str) -> Optional[CachedAnswer]:
+        """Entrée de cette réponse exacte, créée si besoin (appelé sous verrou)."""
+        prepared = self._prepare(text)
+        if prepared is None:
+            return None
+        normalized, signature = prepared
+        key = (field, normalized)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = CachedAnswer(field, normalized, signature, embed(normalized))
+            for bucket in entry.vector:
+                self._postings.setdefault((field, signature, bucket), set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._evict()
+        self._entries.move_to_end(key)
+        return entry
+
+    def _evict(self):
+        key, entry = self._entries.popitem(last=False)
+        for bucket in entry.vector:
+            posting = (entry.field, entry.signature, bucket)
+            keys = self._postings.get(posting)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[posting]
+
+    def remember(self, field: Optional[str], text: str, analysis: Dict[str, Any], value: Any = None):
+        """
+        Retient une intention sûre et indépendante de l'offre en cours, et la valeur validée
+        qu'elle a produite (déjà écrite dans une offre) si elle est fournie.
+        """
+        if (not field or analysis.get("intention") not in CACHEABLE_INTENTIONS
+                or analysis.get("confidence", 0) < MIN_CONFIDENCE):
+            return
+        with self._lock:
+            entry = self._entry(field, text)
+            if entry is not None:
+                entry.intention = {"intention": analysis["intention"], "confidence": analysis["confidence"]}
+                if value is not None:
+                    entry.value = value
+
+    def value_for(self, entry: CachedAnswer, text: str) -> Any:
+        """
+        Valeur retenue de `entry`, seulement si `text` est la même réponse normalisée : une réponse
+        seulement proche ("CDD temps plein" / "CDI temps plein") peut valoir autre chose.
+        """
+        if entry.value is None:
+            return None
+        prepared = self._prepare(text)
+        return entry.value if prepared is not None and prepared[0] == entry.normalized else None
+
+    def record_value_hit(self, applied: bool):
+        with self._lock:
+            self._counts["value_hits" if applied else "revalidation_failures"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self._counts["exact_hits"] + self._counts["similar_hits"]
+            lookups = self._counts["lookups"]
+            return dict(self._counts, size=len(self._entries), max_size=self.max_size, threshold=self.threshold,
+                        hit_rate=round(hits / lookups, 3) if lookups else 0.0)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+
+answer_cache = AnswerCache(ANSWER_CACHE_SIZE, ANSWER_CACHE_THRESHOLD)
@@ -0,0 +1,113 @@
+# agents/context_encoder.py - Contexte compact et déterministe des prompts (offre, derniers échanges, contradictions)
+#
+# Remplace le "Résumé conversationnel" (un appel LLM par prompt, ancien LangMem.get_summary) et les
+# json.dumps de l'offre : le bloc est rendu localement, identique pour un même état (les prompts
+# identiques restent dédupliqués par single_flight), et tronqué au budget de tokens du gabarit.
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from models.field_schema import is_filled
+
+CHARS_PER_TOKEN = 4          # même estimation que config.managed_llm.estimate_tokens
+VALUE_MAX_CHARS = 120        # une description longue n'apporte rien au-delà
+TURN_MAX_CHARS = 160
+MAX_CONTRADICTIONS = 3
+
+class ContextTemplate(NamedTuple):
+    """Budget d'un gabarit de prompt : tokens du bloc de contexte et nombre d'échanges récents."""
+    budget: int
+    turns: int
+
+TEMPLATES: Dict[str, ContextTemplate] = {
+    "intention": ContextTemplate(budget=300, turns=4),      # MODIFY_FIELD / REVERT_FIELD ont besoin des échanges
+    "extraction": ContextTemplate(budget=250, turns=2),
+    "reformulation": ContextTemplate(budget=150, turns=2),
+    "question": ContextTemplate(budget=200, turns=2),
+    "contradiction": ContextTemplate(budget=250, turns=0),
+}
+
+_ROLES = {"user": "recruteur", "system": "assistant"}
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+def render_value(value: Any) -> str:
+    """Valeur lisible et stable : "Anglais C1, Espagnol B2", "Europe/Paris (overlap 4)"."""
+    if isinstance(value, dict):
+        extras = [f"{key} {item}" if not isinstance(item, bool) else (key if item else f"non {key}")
+                  for key, item in value.items() if key != "name" and item not in (None, "", [], {})]
+        return f"{value.get('name')} ({', '.join(extras)})" if extras else str(value.get("name"))
+    if isinstance(value, list):
+        return ", ".join(render_value(item) for item in value)
+    return str(value)
+
+def _field_lines(details: Dict[str, Any]) -> List[str]:
+    return [f"- {field}: {_clip(render_value(value), VALUE_MAX_CHARS)}"
+            for field, value in details.items() if is_filled(field, value)]
+
+def _contradiction_lines(details: Dict[str, Any], memory) -> List[str]:
+    """Contradictions encore d'actualité : la valeur mise en cause est toujours celle de l'offre."""
+    outstanding = [item for item in list(getattr(memory, "contradictions", None) or [])
+                   if details.get(item.get("field")) == item.get("value")]
+    return [f"- {item['field']}: {_clip(item.get('message') or '', TURN_MAX_CHARS)}"
+            for item in outstanding[-MAX_CONTRADICTIONS:]]
+
+def _turn_lines(memory, turns: int, current_input: Optional[str]) -> List[str]:
+    history = list(getattr(memory, "short_term_memory", None) or []) if turns else []
+    # La réponse en cours d'analyse est déjà citée par le prompt
+    if history and current_input is not None and history[-1].get("role") == "user" and history[-1].get("content") == current_input:
+        history.pop()
+    return [f"- {_ROLES.get(turn.get('role'), turn.get('role'))}: {_clip(turn.get('content', ''), TURN_MAX_CHARS)}"
+            for turn in history[-turns:]]
+
+def encode(details: Dict[str, Any], memory=None, template: str = "extraction", current_input: Optional[str] = None) -> str:
+    """
+    Bloc de contexte pour un prompt : champs remplis de l'offre (dans l'ordre du schéma), contradictions
+    en cours et derniers échanges de `memory` (LangMem), dans le budget de tokens du gabarit.
+    Par ordre de priorité quand le budget est atteint : l'offre, les contradictions, puis les
+    échanges les plus récents.
+    """
+    spec = TEMPLATES.get(template, TEMPLATES["extraction"])
+    budget = spec.budget * CHARS_PER_TOKEN
+    sections = [
+        ("Offre (champs remplis):", _field_lines(details), "- aucun champ rempli"),
+        ("Contradictions en cours:", _contradiction_lines(details, memory), None),
+        ("Derniers échanges:", _turn_lines(memory, spec.turns, current_input), None),
+    ]
+
+    blocks: List[str] = []
+    used = 0
+    for title, lines, empty in sections:
+        if not lines and empty is None:
+            continue
+        cost = len(title) + 1
+        if used + cost + len("- … (+999)") + 1 > budget:
+            break
+        kept: List[str] = []
+        truncated = 0
+        # Les échanges se gardent du plus récent au plus ancien, les autres sections dans l'ordre
+        ordered = list(reversed(lines)) if title.startswith("Derniers") else lines
+        for position, line in enumerate(ordered):
+            remaining = len(ordered) - position - 1
+            marker = len(f"- … (+{remaining})") + 1 if remaining else 0
+            if used + cost + len(line) + 1 + marker > budget:
+                truncated = len(ordered) - position
+                break
+            kept.append(line)
+            cost += len(line) + 1
+        if not kept and empty is None:
+            break
+        if title.startswith("Derniers"):
+            kept.reverse()
+        if truncated:
+            marker_line = f"- … (+{truncated})"
+            kept.insert(0, marker_line) if title.startswith("Derniers") else kept.append(marker_line)
+            cost += len(marker_line) + 1
+        blocks.append("\n".join([title] + (kept or [empty])))
+        used += cost
+        if truncated:
+            break
+    return "\n".join(blocks)
@@ -1,32 +1,65 @@
 # agents/lang_mem.py - Version optimisée pour gestion du contexte et multilinguisme sans memory
 
-from config.llm_config import llm, get_response, ChatMessageHistory
+from config.llm_config import llm, new_chat_history, llm_priority, PRIORITY_BACKGROUND, WORKER_THREADS
 from typing import List, Dict, Any, Optional, Tuple
+import os
 import json
 import re
+import threading
 import traceback
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from agents.structured_output import invoke_json, StructuredOutputError
+from config.messages import t
+from models import gazetteer, greetings
+from agents import context_encoder
+
+# Extraction des faits des messages de l'application web : hors du chemin de la requête
+_facts_pool: Dict[str, Any] = {"pid": None, "executor": None}
+_facts_lock = threading.Lock()
+
+def _facts_executor() -> ThreadPoolExecutor:
+    """Pool propre au processus (recréé après le fork des workers), un thread par thread de requête."""
+    if _facts_pool["pid"] != os.getpid():
+        with _facts_lock:
+            if _facts_pool["pid"] != os.getpid():
+                _facts_pool["executor"] = ThreadPoolExecutor(WORKER_THREADS, thread_name_prefix="facts")
+                _facts_pool["pid"] = os.getpid()
+    return _facts_pool["executor"]
 
 class LangMem:
     """Classe pour la gestion de la mémoire des conversations avec capacités multilinguisme avancées."""
+    __slots__ = ("llm", "short_term_memory", "long_term_memory", "contradictions", "chat_history", "user_language",
+                 "_facts_lock", "_facts_seq", "_facts_stamps")
     
     def __init__(self, llm):
         self.llm = llm
         self.short_term_memory = []  # Derniers échanges
         self.long_term_memory = {}   # Faits importants stockés par catégorie
         self.contradictions = []     # Liste des contradictions détectées
-        self.chat_history = ChatMessageHistory()  # Remplace langchain_memory
+        self.chat_history = new_chat_history()  # Remplace langchain_memory
         self.user_language = "fr"    # Langue par défaut, sera mise à jour
+        # Les extractions de messages successifs tournent en parallèle : chaque catégorie retient
+        # le numéro du message qui l'a écrite, un message plus ancien ne l'écrase pas
+        self._facts_lock = threading.Lock()
+        self._facts_seq = 0
+        self._facts_stamps: Dict[str, int] = {}
         
-    def add_interaction(self, role: str, content: str):
-        """Ajoute une interaction à la mémoire à court terme avec traitement amélioré."""
+    def add_interaction(self, role: str, content: str, extract_facts: bool = True):
+        """
+        Ajoute une interaction à la mémoire à court terme avec traitement amélioré.
+        extract_facts=False laisse l'extraction des faits à l'appelant (branche parallèle de FormWorkflow).
+        """
         self.short_term_memory.append({"role": role, "content": content})
         
         # Ajouter à l'historique de chat
         try:
             if role == "user":
                 self.chat_history.add_user_message(content)
-                # Met à jour la mémoire à long terme pour les réponses utilisateur
-                self._extract_facts(content)
+                # Met à jour la mémoire à long terme pour les réponses utilisateur (un simple salut n'en contient pas)
+                greeting = greetings.classify_greeting(content)
+                if extract_facts and not (greeting and greeting.only_greeting):
+                    self.extract_facts_in_background(content)
                 # Détecte la langue si ce n'est pas déjà fait
                 if len(self.short_term_memory) <= 3:  # Seulement pour les premières interactions
                     detected_language = self._detect_language(content)
@@ -43,10 +76,15 @@ class LangMem:
             self.short_term_memory.pop(0)
 
     def _detect_language(self, text: str) -> str:
-        """Détecte n'importe quelle langue utilisée dans le texte en utilisant directement le LLM."""
+        """Détecte la langue du texte : indices locaux (models.greetings), sinon le LLM pour n'importe quelle langue."""
         if not text.strip():
             return "fr"  # Retourne français par défaut si le texte est vide
         
+        # Salut ou mots outils sans ambiguïté : pas d'appel LLM
+        local = greetings.detect_language(text)
+        if local:
+            return local
+        
         try:
             prompt = f"""
             Détectez la langue de ce texte:
@@ -72,10 +110,32 @@ class LangMem:
             print(f"⚠️ Erreur lors de la détection de langue par LLM: {e}")
             return "fr"  # Retourne français par défaut en cas d'erreur
 
-    def _extract_facts(self, content: str):
-        """Extrait les faits importants du contenu pour la mémoire à long terme."""
+    def extract_facts_in_background(self, content: str) -> Future:
+        """
+        Extraction des faits sans faire attendre le recruteur : la mémoire à long terme n'est pas lue
+        pendant le tour, l'appel passe donc en priorité basse sur un thread du pool.
+        """
+        seq = self._next_facts_seq()
+
+        def _run():
+            with llm_priority(PRIORITY_BACKGROUND):
+                return self._extract_facts(content, seq)
+        return _facts_executor().submit(contextvars.copy_context().run, _run)
+
+    def _next_facts_seq(self) -> int:
+        with self._facts_lock:
+            self._facts_seq += 1
+            return self._facts_seq
+
+    def _extract_facts(self, content: str, seq: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Extrait les faits importants du contenu pour la mémoire à long terme et retourne ceux retenus.
+        `seq` : rang du message, attribué à la réception (par défaut, à l'appel).
+        """
         if not content.strip():
-            return
+            return {}
+        if seq is None:
+            seq = self._next_facts_seq()
             
         # Prompt optimisé pour l'extraction d'informations clés
         prompt = f"""
@@ -100,28 +160,27 @@ class LangMem:
         """
         
         try:
-            response = self.llm.invoke(prompt)
-            # Extraire le JSON de la réponse
-            result_text = response.content.strip()
-            
-            # Nettoyage du résultat pour extraire uniquement le JSON
-            if not result_text.startswith("{"):
-                result_text = result_text[result_text.find("{"):]
-            if not result_text.endswith("}"):
-                result_text = result_text[:result_text.rfind("}")+1]
-                
-            # Parser le JSON
-            try:
-                facts = json.loads(result_text)
+            # Priorité de l'appelant : interactive quand un nœud du workflow attend ce résultat
+            facts = invoke_json(self.llm, prompt, "lang_mem._extract_facts")
                 
-                # Mettre à jour la mémoire à long terme avec les nouvelles informations
-                for category, value in facts.items():
-                    if value and value != "None" and not (isinstance(value, dict) and len(value) == 0):
-                        self.long_term_memory[category] = value
-            except json.JSONDecodeError:
-                print(f"⚠️ Réponse non-JSON pour l'extraction de faits: {result_text[:100]}...")
+            # Mettre à jour la mémoire à long terme avec les nouvelles informations
+            kept = {}
+            for category, value in facts.items():
+                if value and value != "None" and not (isinstance(value, dict) and len(value) == 0):
+                    kept[category] = value
+            with self._facts_lock:
+                # "finalement 60k" ne doit pas être écrasé par l'extraction plus lente de "50k"
+                newer = {category for category in kept if self._facts_stamps.get(category, 0) > seq}
+                written = {category: value for category, value in kept.items() if category not in newer}
+                self._facts_stamps.update(dict.fromkeys(written, seq))
+                # Nouveau dict plutôt qu'update : la session peut être sérialisée pendant l'extraction
+                self.long_term_memory = {**self.long_term_memory, **written}
+            return kept
+        except StructuredOutputError:
+            pass  # Déjà journalisé et compté par invoke_json
         except Exception as e:
             print(f"⚠️ Erreur lors de l'extraction des faits: {e}")
+        return {}
 
     def check_contradiction(self, key: str, value: Any, job_details: Dict) -> Tuple[bool, Optional[str]]:
         """Vérifie les contradictions entre la nouvelle valeur et les données existantes."""
@@ -133,30 +192,28 @@ class LangMem:
         # Vérifications numériques directes sans LLM
         if key == "minHourlyRate" and details.get("maxHourlyRate") is not None:
             if float(value) > float(details["maxHourlyRate"]):
-                if self.user_language == "fr":
-                    return True, f"Le taux horaire minimum ({value}) est supérieur au maximum ({details['maxHourlyRate']})"
-                elif self.user_language == "es":
-                    return True, f"La tarifa horaria mínima ({value}) es superior a la máxima ({details['maxHourlyRate']})"
-                else:
-                    return True, f"The minimum hourly rate ({value}) is higher than the maximum ({details['maxHourlyRate']})"
+                return True, t("contradiction.min_rate_above_max", self.user_language, value=value, max=details["maxHourlyRate"])
                 
         if key == "maxHourlyRate" and details.get("minHourlyRate") is not None:
             if float(value) < float(details["minHourlyRate"]):
-                if self.user_language == "fr":
-                    return True, f"Le taux horaire maximum ({value}) est inférieur au minimum ({details['minHourlyRate']})"
-                elif self.user_language == "es":
-                    return True, f"La tarifa horaria máxima ({value}) es inferior a la mínima ({details['minHourlyRate']})"
-                else:
-                    return True, f"The maximum hourly rate ({value}) is lower than the minimum ({details['minHourlyRate']})"
+                return True, t("contradiction.max_rate_below_min", self.user_language, value=value, min=details["minHourlyRate"])
         
         if key == "weeklyHours" and float(value) > 168:
-            if self.user_language == "fr":
-                return True, f"Les heures hebdomadaires ({value}) dépassent le maximum possible (168)"
-            elif self.user_language == "es":
-                return True, f"Las horas semanales ({value}) superan el máximo posible (168)"
-            else:
-                return True, f"Weekly hours ({value}) exceed the maximum possible (168)"
+            return True, t("contradiction.weekly_hours_over", self.user_language, value=value)
         
+        # Ville et pays tous deux connus du gazetteer : tranché localement, sans LLM
+        if key in ("city", "country"):
+            city = value if key == "city" else details.get("city")
+            country = details.get("country") if key == "city" else value
+            inside = gazetteer.city_in_country(city, country) if isinstance(city, str) else None
+            if inside is False:
+                country_name = country.get("name") if isinstance(country, dict) else country
+                message = t("contradiction.city_country", self.user_language, city=city, country=country_name)
+                self.contradictions.append({"field": key, "value": value, "message": message})
+                return True, message
+            if inside and key == "city":
+                return False, None
+
         # Vérification de cohérence géographique pour les cas complexes
         if key in ["countries", "continents", "regions", "country", "city"]:
             prompt = f"""
@@ -166,7 +223,7 @@ class LangMem:
             Nouvelle valeur: {json.dumps(value, ensure_ascii=False) if isinstance(value, (list, dict)) else str(value)}
             
             Informations existantes:
-            {json.dumps(details, ensure_ascii=False, indent=2)}
+{context_encoder.encode(details, self, "contradiction")}
             
             TÂCHE: Vérifiez UNIQUEMENT les contradictions géographiques évidentes.
             Exemples de contradictions:
@@ -182,19 +239,10 @@ class LangMem:
             """
             
             try:
-                response = self.llm.invoke(prompt)
-                result_text = response.content.strip()
-                
-                # Nettoyage du résultat
-                if not result_text.startswith("{"):
-                    result_text = result_text[result_text.find("{"):]
-                if not result_text.endswith("}"):
-                    result_text = result_text[:result_text.rfind("}")+1]
-                    
-                result = json.loads(result_text)
+                result = invoke_json(self.llm, prompt, "lang_mem.check_contradiction")
                 
                 if result.get("contradiction", False):
-                    message = result.get("message", f"Contradiction géographique détectée avec {key}")
+                    message = result.get("message") or t("contradiction.geography", self.user_language, field=key)
                     # Mémoriser la contradiction
                     self.contradictions.append({
                         "field": key,
@@ -206,40 +254,3 @@ class LangMem:
                 print(f"⚠️ Erreur lors de la vérification de contradiction: {e}")
         
         return False, None
-
-    def get_summary(self) -> str:
-        """Génère un résumé contextuel des interactions passées dans la langue de l'utilisateur."""
-        if not self.short_term_memory:
-            # Message minimal selon la langue
-            if self.user_language == "fr":
-                return "Début de la conversation."
-            elif self.user_language == "es":
-                return "Inicio de la conversación."
-            else:
-                return "Start of conversation."
-            
-        # Utiliser get_response pour générer un résumé basé sur l'historique
-        try:
-            # Construire un prompt pour obtenir un résumé
-            history_text = "\n".join([f"{turn['role']}: {turn['content']}" for turn in self.short_term_memory[-5:]])
-            prompt = f"""
-            Résumez brièvement cette conversation sur une offre d'emploi:
-            
-            {history_text}
-            
-            Créez un résumé CONCIS qui identifie les informations principales déjà fournies.
-            Maximum 3 phrases. Langue: {self.user_language}.
-            """
-            response, _ = get_response(prompt, self.chat_history)
-            return response.strip()
-            
-        except Exception as e:
-            print(f"⚠️ Erreur lors de la génération du résumé: {e}")
-            
-            # Message minimal selon la langue
-            if self.user_language == "fr":
-                return "Conversation en cours sur une offre d'emploi."
-            elif self.user_language == "es":
-                return "Conversación en curso sobre una oferta de trabajo."
-            else:
-                return "Ongoing conversation about a job posting."
\ No newline at end of file
@@ -1,188 +1,66 @@
 # agents/question_agent.py - Version améliorée avec contexte recruteur et gestion dynamique
 
 from config.llm_config import llm
-import json
+from config.messages import t
+from agents import context_encoder
+from models import field_schema, timezones
 from typing import List, Tuple, Optional, Dict, Any
 import re
 
 class QuestionAgent:
+    """
+    Sans état propre à une session : l'application partage une seule instance (question_agent)
+    et passe le JobDetails de la session à chaque appel.
+    """
+
+    # Questions pré-définies par défaut (partagées, issues du schéma des champs)
+    example_questions = field_schema.EXAMPLE_QUESTIONS
+
     def __init__(self):
         self.llm = llm
-        self.job_details = None
-        
-        # Questions pré-définies par défaut avec support multilingue
-        self.example_questions = {
-            "title": {
-                "fr": "Quel est le titre du poste pour cette offre d'emploi ?",
-            },
-            "description": {
-                "fr": "Pouvez-vous décrire les responsabilités du poste ?",
-            },
-            "discipline": {
-                "fr": "Dans quelle discipline ce poste s'inscrit-il (ex. Informatique, Marketing) ?",
-            },
-            "availability": {
-                "fr": "Quand le candidat doit-il être disponible (ex. immédiatement, 2 semaines) ?",
-            },
-            "seniority": {
-                "fr": "Quel niveau d'expérience recherchez-vous (Junior, Mid, Senior) ?",
-            },
-            "languages": {
-                "fr": "Quelles langues sont requises (ex. Français avancé, Anglais intermédiaire) ?",
-            },
-            "skills": {
-                "fr": "Quelles compétences sont nécessaires (ex. Python, Gestion de projet) ?",
-            },
-            "jobType": {
-                "fr": "S'agit-il d'un poste Freelance, Temps plein ou Temps partiel ?",
-            },
-            "type": {
-                "fr": "Le travail est-il à distance, sur site ou hybride ?",
-            },
-            "minHourlyRate": {
-                "fr": "Quel est le taux horaire minimum pour ce poste freelance ?",
-            },
-            "maxHourlyRate": {
-                "fr": "Quel est le taux horaire maximum pour ce poste freelance ?",
-            },
-            "weeklyHours": {
-                "fr": "Combien d'heures par semaine sont prévues ?",
-            },
-            "estimatedWeeks": {
-                "fr": "Combien de semaines durera ce projet freelance ?",
-            },
-            "minFullTimeSalary": {
-                "fr": "Quel est le salaire annuel minimum pour ce poste à temps plein ?",
-            },
-            "maxFullTimeSalary": {
-                "fr": "Quel est le salaire annuel maximum pour ce poste à temps plein ?",
-            },
-            "minPartTimeSalary": {
-                "fr": "Quel est le salaire minimum pour ce poste à temps partiel ?",
-            },
-            "maxPartTimeSalary": {
-                "fr": "Quel est le salaire maximum pour ce poste à temps partiel ?",
-            },
-            "continents": {
-                "fr": "Sur quels continents recherchez-vous des candidats (ex. Europe, Asie) ?",
-            },
-            "countries": {
-                "fr": "Dans quels pays le poste est-il ouvert (ex. France, Maroc) ?",
-            },
-            "regions": {
-                "fr": "Dans quelles régions spécifiques (ex. Île-de-France, Casablanca) ?",
-            },
-            "timeZone": {
-                "fr": "Quel fuseau horaire est requis (ex. CET, EST) ?",
-            },
-            "country": {
-                "fr": "Dans quel pays le poste est-il basé (ex. France) ?",
-            },
-            "city": {
-                "fr": "Dans quelle ville le poste est-il situé (ex. Paris) ?",
-            }
-        }
+        self.job_details = None  # JobDetails par défaut (workflow console, une seule offre)
 
     def get_field_type_description(self, field: str) -> str:
         """Retourne une description du type attendu pour un champ donné."""
-        list_fields = {"countries", "continents", "regions", "skills", "languages"}
-        numeric_fields = {
-            "minHourlyRate", "maxHourlyRate", "weeklyHours", "estimatedWeeks",
-            "minFullTimeSalary", "maxFullTimeSalary", "minPartTimeSalary", "maxPartTimeSalary",
-            "availability"
-        }
-        dict_fields = {"timeZone", "country"}
-        enum_fields = {
-            "jobType": {"FREELANCE", "FULLTIME", "PARTTIME"},
-            "type": {"REMOTE", "ONSITE", "HYBRID"},
-            "seniority": {"JUNIOR", "MID", "SENIOR"}
-        }
-
-        if field in list_fields:
-            if field == "languages":
-                return "Liste d'objets: [{name: string, level: string, required: boolean}]"
-            elif field == "skills":
-                return "Liste d'objets: [{name: string, mandatory: boolean}]"
-            else:
-                return "Liste d'objets: [{name: string}]"
-        elif field in dict_fields:
-            if field == "timeZone":
-                return "Objet: {name: string, overlap: number}"
-            else:
-                return "Objet: {name: string}"
-        elif field in enum_fields:
-            return f"Énumération: {', '.join(enum_fields[field])}"
-        elif field in numeric_fields:
-            return "Nombre: valeur numérique"
-        else:
-            return "Texte: chaîne de caractères"
-
-    def get_next_question(self, job_details, memory_summary: str) -> Tuple[Optional[str], Optional[str]]:
-        """Détermine la prochaine question à poser en fonction des champs manquants."""
-        if not self.job_details:
-            self.job_details = job_details
-
-        missing_fields = self.job_details.get_missing_fields()
-        if not missing_fields:
-            return None, None
+        return field_schema.QUESTION_TYPE_DESCRIPTIONS.get(field, "Texte: chaîne de caractères")
 
-        # Ordre de priorité pour les champs essentiels
-        priority_order = ["title", "description", "discipline", "availability", "seniority", "languages", "skills", "jobType", "type"]
-        for field in priority_order:
-            if field in missing_fields:
-                question = self.generate_question_with_llm(field, memory_summary)
-                return field, question
-
-        # Champs spécifiques selon jobType et type
-        job_type = self.job_details.data["jobDetails"].get("jobType")
-        work_type = self.job_details.data["jobDetails"].get("type")
-        
-        if job_type:
-            specific_fields = []
-            if job_type == "FREELANCE":
-                specific_fields = ["minHourlyRate", "maxHourlyRate", "weeklyHours", "estimatedWeeks"]
-            elif job_type == "FULLTIME":
-                specific_fields = ["minFullTimeSalary", "maxFullTimeSalary"]
-            elif job_type == "PARTTIME":
-                specific_fields = ["minPartTimeSalary", "maxPartTimeSalary"]
-            for field in specific_fields:
-                if field in missing_fields:
-                    question = self.generate_question_with_llm(field, memory_summary)
-                    return field, question
-
-        if work_type:
-            if work_type == "REMOTE":
-                geo_fields = ["continents", "countries", "regions", "timeZone"]
-                for field in geo_fields:
-                    if field in missing_fields:
-                        question = self.generate_question_with_llm(field, memory_summary)
-                        return field, question
-            elif work_type in ["ONSITE", "HYBRID"]:
-                location_fields = ["country", "city"]
-                for field in location_fields:
-                    if field in missing_fields:
-                        question = self.generate_question_with_llm(field, memory_summary)
-                        return field, question
-
-        # Si aucun champ prioritaire, prendre le premier manquant
-        field = missing_fields[0]
-        question = self.generate_question_with_llm(field, memory_summary)
+    def get_next_question(self, job_details, memory=None) -> Tuple[Optional[str], Optional[str]]:
+        """Détermine la prochaine question à poser en fonction des champs manquants (memory : LangMem de la session)."""
+        job_details = job_details or self.job_details
+
+        # L'index de JobDetails est déjà ordonné par priorité : base, jobType, puis type
+        field = job_details.next_missing_field()
+        if field is None:
+            return None, None
+        question = self.suggested_question(field, job_details) or self.generate_question_with_llm(field, memory, job_details)
         return field, question
 
-    def generate_question_with_llm(self, field: str, memory_summary: str = "Aucun historique") -> str:
+    def suggested_question(self, field: str, job_details, lang: Optional[str] = "fr") -> Optional[str]:
+        """
+        Question de confirmation d'une valeur déduite des champs remplis (fuseau du pays pour timeZone),
+        déjà rédigée dans la langue demandée : ni génération ni traduction par le LLM. None sinon.
+        """
+        if field != "timeZone" or job_details is None:
+            return None
+        suggestion = timezones.suggest_timezone(job_details.data["jobDetails"])
+        if suggestion is None:
+            return None
+        return t("form.timezone_suggestion", lang, zone=suggestion["name"],
+                 offset=timezones.utc_offset(suggestion["name"]), overlap=suggestion["overlap"])
+
+    def generate_question_with_llm(self, field: str, memory=None, job_details=None) -> str:
         """Génère une question dynamique avec le LLM en tenant compte du contexte."""
-        if not self.job_details:
+        job_details = job_details or self.job_details
+        if not job_details:
             return self.example_questions.get(field, {}).get("fr", f"Précisez {field} pour cette offre.")
 
-        current_state = self.job_details.get_state().get("jobDetails", {})
-        filled_fields = {k: v for k, v in current_state.items() if v not in [None, [], {}] and not (isinstance(v, dict) and not v.get("name"))}
+        context = context_encoder.encode(job_details.data["jobDetails"], memory, "question")
 
         prompt = f"""
         Générez une question concise pour un recruteur sur le champ '{field}' d'une offre d'emploi.
 
         **Contexte global**:
-        - Champs déjà remplis: {json.dumps(filled_fields, ensure_ascii=False)}
-        - Résumé conversationnel: {memory_summary}
+{context}
         - Type attendu pour '{field}': {self.get_field_type_description(field)}
 
         **Description des champs**:
@@ -228,4 +106,7 @@ class QuestionAgent:
             return question
         except Exception as e:
             print(f"⚠️ Erreur génération question LLM pour '{field}': {e}")
-            return self.example_questions.get(field, {}).get("fr", f"Précisez {field} pour cette offre.")
\ No newline at end of file
+            return self.example_questions.get(field, {}).get("fr", f"Précisez {field} pour cette offre.")
+
+# Instance partagée par toutes les sessions de l'application web
+question_agent = QuestionAgent()
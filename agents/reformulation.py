@@ -0,0 +1,203 @@
+# agents/reformulation.py - Reformulation des questions après une erreur : catégorie d'erreur et cache (champ, catégorie, langue)
+#
+# reformulate_question appelait le LLM à chaque réponse invalide et à chaque demande de précision,
+# alors que les cas se répètent d'une session à l'autre (salaire non numérique, continent inconnu...).
+# L'erreur est rangée dans une catégorie fixe ; la reformulation de (champ, catégorie, langue) est
+# rendue depuis le catalogue (config.messages), préchauffée au démarrage (preload), et le LLM ne sert
+# qu'aux langues absentes du catalogue, une seule fois par clé. REFORMULATION_CACHE=0 rétablit la
+# reformulation contextuelle par le LLM (UpdateAgent._reformulate_with_llm).
+import os
+import re
+import threading
+from string import Formatter
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from config.messages import CATALOG, normalize_language, t
+from models import field_schema
+from models.greetings import normalize
+
+REFORMULATION_CACHE = os.getenv("REFORMULATION_CACHE", "1") == "1"
+
+CATEGORIES: Tuple[str, ...] = (
+    "clarification", "confusion", "not_a_number", "out_of_range", "invalid_choice",
+    "unknown_place", "invalid_format", "no_value", "unclear",
+)
+
+# Code des messages d'erreur du catalogue (update.*, validation.*) -> catégorie
+_CODE_CATEGORIES: Dict[str, str] = {
+    "number_expected": "not_a_number",
+    "below_min": "out_of_range", "above_max": "out_of_range", "min_gt_max": "out_of_range",
+    "invalid_utc_offset": "out_of_range",
+    "invalid_choice": "invalid_choice", "unknown_choice": "invalid_choice",
+    "invalid_continent": "unknown_place", "country_not_continent": "unknown_place",
+    "invalid_country": "unknown_place", "country_outside_continents": "unknown_place",
+    "invalid_region": "unknown_place", "city_outside_country": "unknown_place",
+    "invalid_format": "invalid_format", "missing_keys": "invalid_format", "type_error": "invalid_format",
+    "no_value_extracted": "no_value", "empty_response": "no_value",
+    "failed": "unclear", "processing_error": "unclear", "unknown_field": "unclear",
+}
+# Messages qui expliquent l'erreur au recruteur (bornes, options, lieu) : repris devant la question
+_EXPLAINING_CODES = frozenset({
+    "number_expected", "below_min", "above_max", "min_gt_max", "invalid_utc_offset", "invalid_choice", "unknown_choice",
+    "invalid_continent", "country_not_continent", "invalid_country", "country_outside_continents",
+    "invalid_region", "city_outside_country",
+})
+
+# Messages libres (erreurs rédigées par le LLM, textes internes) : premier motif trouvé, dans l'ordre
+_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("unclear", ("json", "erreur de traitement", "processing error")),
+    ("confusion", ("confusion", "hors sujet", "off topic", "off-topic")),
+    ("no_value", ("vide", "empty", "vacia", "aucune valeur", "no value", "ningun valor")),
+    ("unknown_place", ("continent", "pays", "country", "pais", "region", "ville", "city", "ciudad")),
+    ("invalid_choice", ("option", "choix", "choice", "opcion")),
+    ("out_of_range", ("superieur", "inferieur", "depasse", "exceed", "negati", "au moins", "at least",
+                      "trop eleve", "too high", "too low", "rango", "range")),
+    ("not_a_number", ("numeri", "nombre", "number", "numero", "chiffre", "montant", "amount")),
+    ("invalid_format", ("format",)),
+)
+
+class ErrorCategory(NamedTuple):
+    category: str
+    explains: bool     # error_msg est un message du catalogue à montrer tel quel devant la question
+
+def _template_pattern(template: str) -> "re.Pattern":
+    """Gabarit du catalogue -> expression régulière : texte littéral, paramètres quelconques."""
+    parts: List[str] = []
+    for literal, name, _, _ in Formatter().parse(template):
+        parts.append(re.escape(literal))
+        if name is not None:
+            parts.append(".+?")
+    return re.compile("".join(parts), re.DOTALL)
+
+def _compile_patterns() -> List[Tuple["re.Pattern", str]]:
+    patterns = []
+    for msgid, translations in CATALOG.items():
+        if not msgid.startswith(("update.", "validation.")):
+            continue
+        code = msgid.rsplit(".", 1)[1]
+        if code not in _CODE_CATEGORIES:
+            continue
+        for template in translations.values():
+            patterns.append((_template_pattern(template), code, len(template)))
+    # Les gabarits les plus longs (les plus spécifiques) d'abord
+    return [(pattern, code) for pattern, code, _ in sorted(patterns, key=lambda item: -item[2])]
+
+_PATTERNS = _compile_patterns()
+
+def classify_error(field: Optional[str], error_msg: Optional[str] = None, analysis: Optional[Dict] = None) -> ErrorCategory:
+    """
+    Catégorie de l'erreur : intention de l'analyse (CLARIFICATION, CONFUSION), message du catalogue
+    reconnu à son gabarit, sinon mots-clés du message libre. Pour un champ numérique, une erreur
+    de format ou une valeur introuvable revient à demander un nombre.
+    """
+    intention = (analysis or {}).get("intention")
+    if intention == "CLARIFICATION" and not error_msg:
+        return ErrorCategory("clarification", False)
+    if intention == "CONFUSION":
+        return ErrorCategory("confusion", False)
+    category, explains = "unclear", False
+    text = (error_msg or "").strip()
+    for pattern, code in _PATTERNS:
+        if pattern.fullmatch(text):
+            category, explains = _CODE_CATEGORIES[code], code in _EXPLAINING_CODES
+            break
+    else:
+        normalized = normalize(text)
+        for candidate, keywords in _KEYWORDS:
+            if any(keyword in normalized for keyword in keywords):
+                category = candidate
+                break
+    if category in ("invalid_format", "no_value") and field in field_schema.FIELDS_BY_KIND[field_schema.NUMERIC]:
+        category = "not_a_number"
+    return ErrorCategory(category, explains)
+
+# Langues où toutes les entrées reformulate.* et question.* sont rédigées
+CATALOG_LANGUAGES = frozenset.intersection(*(
+    frozenset(translations) for msgid, translations in CATALOG.items()
+    if msgid.startswith(("reformulate.", "question."))
+))
+
+def _render(field: str, category: str, lang: str) -> str:
+    return t(f"reformulate.{category}", lang, question=t(f"question.{field}", lang))
+
+class ReformulationCache:
+    """
+    (champ, catégorie, langue) -> question reformulée, partagé par toutes les sessions. Borné par
+    le schéma : champs x catégories x langues rencontrées. Les langues du catalogue sont rendues
+    localement ; les autres sont traduites une fois par le LLM depuis l'anglais.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str, str], str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.llm_calls = 0
+
+    def prewarm(self, languages=None) -> int:
+        """Rend toutes les combinaisons des langues du catalogue ; retourne le nombre d'entrées."""
+        entries = {(field, category, lang): _render(field, category, lang)
+                   for lang in (languages or CATALOG_LANGUAGES)
+                   for field in field_schema.FIELD_ORDER
+                   for category in CATEGORIES}
+        with self._lock:
+            self._entries.update(entries)
+            return len(self._entries)
+
+    def get(self, field: str, category: str, lang: Optional[str], llm=None) -> str:
+        lang = normalize_language(lang)
+        key = (field, category, lang)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        if lang in CATALOG_LANGUAGES:
+            text = _render(field, category, lang)
+        else:
+            text = self._translate(_render(field, category, "en"), lang, llm)
+            if text is None:
+                return _render(field, category, "en")   # nouvel essai au prochain échec
+        with self._lock:
+            self._entries[key] = text
+        return text
+
+    def _translate(self, source: str, lang: str, llm) -> Optional[str]:
+        if llm is None:
+            return None
+        prompt = f"""
+        Traduisez en {lang} cette question d'un assistant qui aide un recruteur à rédiger une offre d'emploi :
+        "{source}"
+        Gardez le ton, la ponctuation et les exemples entre parenthèses.
+        Retournez UNIQUEMENT la traduction, sans commentaire ni guillemets.
+        """
+        self.llm_calls += 1
+        try:
+            return llm.invoke(prompt).content.strip().strip('"') or None
+        except Exception as e:
+            print(f"⚠️ Erreur lors de la traduction de la reformulation en {lang}: {e}")
+            return None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.llm_calls = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "llm_calls": self.llm_calls}
+
+reformulation_cache = ReformulationCache()
+
+def reformulate(field: Optional[str], previous_question: Optional[str], error_msg: Optional[str] = None,
+                analysis: Optional[Dict] = None, lang: Optional[str] = None, llm=None) -> str:
+    """
+    Question reformulée après une erreur : entrée en matière de la catégorie et question du champ,
+    précédées du message d'erreur quand il explique déjà le problème (borne, options, lieu).
+    Un champ hors schéma reprend la question précédente.
+    """
+    category, explains = classify_error(field, error_msg, analysis)
+    if field in field_schema.SPECS:
+        question = reformulation_cache.get(field, category, lang, llm)
+    else:
+        question = t(f"reformulate.{category}", lang, question=previous_question or "")
+    return f"{error_msg.strip()}\n{question}" if explains else question
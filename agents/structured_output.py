@@ -0,0 +1,269 @@
+# agents/structured_output.py - Sorties JSON des agents : mode JSON du backend, extraction tolérante, validation par schéma
+import os
+import re
+import json
+import threading
+from typing import Any, Dict, Optional
+
+from pydantic import ValidationError
+from models.job_details import JobDetail, FIELD_ADAPTERS
+
+# Le mode JSON (response_format) est désactivé automatiquement si le backend le refuse
+_json_mode = {"enabled": os.getenv("LLM_JSON_MODE", "1") == "1"}
+_JSON_MODE_REFUSED = re.compile(r"response_format|json_object|json[ _]mode", re.IGNORECASE)
+
+_NUMBER = re.compile(r"-?\d+(\.\d+)?([eE][+-]?\d+)?$")
+_LITERALS = {"true": "true", "false": "false", "null": "null", "True": "true", "False": "false", "None": "null"}
+
+class StructuredOutputError(ValueError):
+    """Aucun JSON exploitable dans la réponse du LLM."""
+
+class IncrementalJSONParser:
+    """
+    Extracteur JSON tolérant en une seule passe, alimentable token par token.
+    Ignore la prose et les blocs ``` autour du premier objet/tableau, accepte les
+    guillemets simples, les littéraux Python, les clés et valeurs non quotées et
+    les virgules finales, et sait refermer un JSON tronqué.
+    """
+
+    def __init__(self):
+        self._out = []
+        self._stack = []
+        self._quote = None
+        self._escape = False
+        self._word = []
+        self.started = False
+        self.done = False
+        self.repaired = False
+
+    def feed(self, chunk: str) -> bool:
+        """Consomme un morceau de texte. Retourne True quand l'objet de premier niveau est complet."""
+        for char in chunk:
+            if self.done:
+                break
+            if not self.started:
+                if char in "{[":
+                    self.started = True
+                    self._open(char)
+                continue
+            if self._quote:
+                self._feed_string(char)
+            else:
+                self._feed_structure(char)
+        return self.done
+
+    def _open(self, char: str):
+        self._stack.append("}" if char == "{" else "]")
+        self._out.append(char)
+
+    def _feed_string(self, char: str):
+        if self._escape:
+            self._out.append(char)
+            self._escape = False
+        elif char == "\\":
+            self._out.append(char)
+            self._escape = True
+        elif char == self._quote:
+            self._out.append('"')
+            self._quote = None
+        elif char == '"':
+            self._out.append('\\"')
+            self.repaired = True
+        elif char == "\n":
+            self._out.append("\\n")
+        elif char in "\r\t":
+            self._out.append(" ")
+        else:
+            self._out.append(char)
+
+    def _feed_structure(self, char: str):
+        if char in "\"'":
+            self._flush_word()
+            if char == "'":
+                self.repaired = True
+            self._quote = char
+            self._out.append('"')
+        elif char in "{[":
+            self._flush_word()
+            self._open(char)
+        elif char in "}]":
+            self._flush_word()
+            self._drop_trailing_comma()
+            self._out.append(self._stack.pop())
+            if not self._stack:
+                self.done = True
+        elif char == ":":
+            self._flush_word(is_key=True)
+            self._out.append(char)
+        elif char == ",":
+            self._flush_word()
+            self._out.append(char)
+        elif char.isspace():
+            self._flush_word()
+        else:
+            self._word.append(char)
+
+    def _flush_word(self, is_key: bool = False):
+        if not self._word:
+            return
+        word = "".join(self._word)
+        self._word = []
+        if not is_key and (word in _LITERALS or _NUMBER.match(word)):
+            self._out.append(_LITERALS.get(word, word))
+            if word in ("True", "False", "None"):
+                self.repaired = True
+        else:
+            self._out.append(json.dumps(word))
+            self.repaired = True
+
+    def _drop_trailing_comma(self):
+        if self._out and self._out[-1] == ",":
+            self._out.pop()
+            self.repaired = True
+
+    def result(self) -> Any:
+        """Objet complet, ou meilleure reconstruction possible si le flux est tronqué."""
+        if not self.started:
+            raise StructuredOutputError("Aucun JSON trouvé")
+        if self.done:
+            try:
+                return json.loads("".join(self._out))
+            except json.JSONDecodeError as e:
+                raise StructuredOutputError(f"JSON invalide: {e}") from e
+        return self.partial()
+
+    def partial(self) -> Any:
+        """Ferme les chaînes et structures ouvertes pour parser un préfixe (flux en cours ou tronqué)."""
+        if not self.started:
+            return None
+        self.repaired = True
+        text = "".join(self._out)
+        if self._word:
+            word = "".join(self._word)
+            if word in _LITERALS or _NUMBER.match(word):
+                text += _LITERALS.get(word, word)
+            elif any(literal.startswith(word) for literal in _LITERALS):
+                text += "null"  # littéral coupé en plein milieu (ex. "fa")
+            else:
+                text += json.dumps(word)
+        if self._quote:
+            text += '"'
+        for _ in range(8):
+            try:
+                return json.loads(_close_json(text))
+            except json.JSONDecodeError:
+                # Retirer le dernier élément incomplet (clé ou valeur coupée) et réessayer
+                cut = max(text.rfind(","), text.rfind("{"), text.rfind("["))
+                if cut < 0:
+                    break
+                shorter = text[:cut + 1] if text[cut] in "{[" else text[:cut]
+                if shorter == text:
+                    break
+                text = shorter
+        raise StructuredOutputError("JSON tronqué irrécupérable")
+
+def _close_json(text: str) -> str:
+    """Ajoute les fermetures manquantes à un préfixe de JSON déjà normalisé."""
+    stack = []
+    in_string = escape = False
+    for char in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+    text = text.rstrip().rstrip(",")
+    if text.endswith(":"):
+        text += "null"
+    return text + "".join(reversed(stack))
+
+def extract_json(text: str) -> Any:
+    """Extrait le premier objet ou tableau JSON d'une réponse LLM (voie rapide json.loads, sinon analyse tolérante)."""
+    stripped = text.strip()
+    if stripped[:1] in ("{", "["):
+        try:
+            return json.loads(stripped)
+        except json.JSONDecodeError:
+            pass
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.result()
+
+class ParseMetrics:
+    """Taux d'échec d'analyse par site d'appel (exposé par /api/metrics)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sites: Dict[str, Dict[str, int]] = {}
+
+    def record(self, call_site: str, outcome: str):
+        with self._lock:
+            site = self._sites.setdefault(call_site, {"calls": 0, "failures": 0, "schema_failures": 0})
+            site["calls"] += 1
+            if outcome != "ok":
+                site[outcome] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                site: dict(counts, failure_rate=round(counts["failures"] / counts["calls"], 3))
+                for site, counts in self._sites.items()
+            }
+
+parse_metrics = ParseMetrics()
+
+def validate_field_value(field: str, value: Any) -> Any:
+    """Valide et convertit une valeur selon le type déclaré dans JobDetail. Lève ValidationError."""
+    return FIELD_ADAPTERS[field].validate_python(value)
+
+def _invoke_text(llm, prompt: str) -> str:
+    import openai  # déjà chargé par le client LLM à ce stade
+    if _json_mode["enabled"]:
+        try:
+            return llm.invoke(prompt, response_format={"type": "json_object"}).content
+        except openai.BadRequestError as e:
+            # Seul un refus de response_format désactive le mode JSON ; les autres erreurs
+            # (contexte trop long, prompt invalide...) se reproduiraient sans lui
+            if not _JSON_MODE_REFUSED.search(str(e)):
+                raise
+            _json_mode["enabled"] = False
+            print(f"⚠️ Mode JSON refusé par le backend, désactivé: {e}")
+    return llm.invoke(prompt).content
+
+def invoke_json(llm, prompt: str, call_site: str, field: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Appelle le LLM et retourne la réponse JSON sous forme de dict.
+    Avec `field`, la réponse est traitée comme une enveloppe {"value", "error"} dont la valeur
+    est validée par le schéma JobDetail (conversion de type si possible).
+    Lève StructuredOutputError si aucune structure exploitable n'est trouvée.
+    """
+    text = _invoke_text(llm, prompt)
+    try:
+        result = extract_json(text)
+    except StructuredOutputError:
+        parse_metrics.record(call_site, "failures")
+        print(f"⚠️ Réponse non-JSON ({call_site}): {text[:100]}...")
+        raise
+
+    if field is not None and isinstance(result, list):
+        result = {"value": result}
+    if not isinstance(result, dict):
+        parse_metrics.record(call_site, "failures")
+        raise StructuredOutputError(f"Objet JSON attendu, reçu: {type(result).__name__}")
+
+    if field in JobDetail.model_fields and result.get("value") not in (None, "INVALID") and not result.get("error"):
+        try:
+            result["value"] = validate_field_value(field, result["value"])
+        except ValidationError:
+            parse_metrics.record(call_site, "schema_failures")
+            return result
+    parse_metrics.record(call_site, "ok")
+    return result
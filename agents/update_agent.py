@@ -1,12 +1,37 @@
 # agents/update_agent.py - Version améliorée avec fonctions spécifiques par champ et mémoire optimisée
 
-from config.llm_config import llm
+from config.llm_config import llm, WORKER_THREADS
+import os
 import json
 import re
+import copy
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional, List, Tuple, Dict, Any, Union
 import traceback
 import time
-import pycountry  # Ajout de l'importation de pycountry
+from agents.structured_output import invoke_json, StructuredOutputError
+from config.messages import t
+from agents.answer_cache import answer_cache
+from agents import context_encoder, reformulation
+from models import durations, field_schema, gazetteer, language_levels, skills_taxonomy, timezones
+
+# Extraction du champ lancée pendant la détection d'intention (voir UpdateAgent._speculate) :
+# un tour coûte max(intention, extraction) au lieu de leur somme, au prix d'une extraction
+# perdue quand la réponse n'est pas une DIRECT_ANSWER.
+SPECULATIVE_EXTRACTION = os.getenv("UPDATE_SPECULATION", "1") == "1"
+_speculation_pool: Dict[str, Any] = {"pid": None, "executor": None}
+_speculation_lock = threading.Lock()
+
+def _speculation_executor() -> ThreadPoolExecutor:
+    """Pool propre au processus (recréé après le fork des workers), un thread par thread de requête."""
+    if _speculation_pool["pid"] != os.getpid():
+        with _speculation_lock:
+            if _speculation_pool["pid"] != os.getpid():
+                _speculation_pool["executor"] = ThreadPoolExecutor(WORKER_THREADS, thread_name_prefix="speculation")
+                _speculation_pool["pid"] = os.getpid()
+    return _speculation_pool["executor"]
 
 class UpdateAgent:
     """
@@ -14,51 +39,30 @@ class UpdateAgent:
     Détection automatique de la langue par le LLM sans sélection manuelle initiale.
     Version améliorée avec gestion par type de champ et exemples dans les prompts.
     """
+
+    # Tables compilées une fois depuis models/field_schema.py, partagées par toutes les sessions
+    list_fields = field_schema.FIELDS_BY_KIND[field_schema.LIST]
+    numeric_fields = field_schema.FIELDS_BY_KIND[field_schema.NUMERIC]
+    dict_fields = field_schema.FIELDS_BY_KIND[field_schema.DICT]
+    text_fields = field_schema.FIELDS_BY_KIND[field_schema.TEXT]
+    enum_fields = field_schema.ENUM_VALUES
+
+    # Seul l'état de la conversation est propre à l'instance
+    __slots__ = ("job_details", "lang_mem", "llm", "user_language")
     
     def __init__(self, job_details, lang_mem):
         self.job_details = job_details
         self.lang_mem = lang_mem
         self.llm = llm
-        
-        self.list_fields = {"countries", "continents", "regions", "skills", "languages"}
-        self.numeric_fields = {
-            "minHourlyRate", "maxHourlyRate", "weeklyHours", "estimatedWeeks",
-            "minFullTimeSalary", "maxFullTimeSalary", "minPartTimeSalary", "maxPartTimeSalary",
-            "availability"
-        }
-        self.dict_fields = {"timeZone", "country"}
-        self.enum_fields = {
-            "jobType": {"FREELANCE", "FULLTIME", "PARTTIME"},
-            "type": {"REMOTE", "ONSITE", "HYBRID"},
-            "seniority": {"JUNIOR", "MID", "SENIOR"}
-        }
-        self.text_fields = {"title", "description", "discipline", "city"}
         self.user_language = None
-        self.field_update_handlers = {
-            "title": self._update_title,
-            "description": self._update_description,
-            "discipline": self._update_discipline,
-            "availability": self._update_availability,
-            "languages": self._update_languages,
-            "skills": self._update_skills,
-            "jobType": self._update_enum_field,
-            "type": self._update_enum_field,
-            "seniority": self._update_enum_field,
-            "country": self._update_dict_field,
-            "timeZone": self._update_dict_field,
-            "countries": self._update_list_field,
-            "continents": self._update_list_field,
-            "regions": self._update_list_field,
-            "city": self._update_text_field,
-            "minHourlyRate": self._update_numeric_field,
-            "maxHourlyRate": self._update_numeric_field,
-            "weeklyHours": self._update_numeric_field,
-            "estimatedWeeks": self._update_numeric_field,
-            "minFullTimeSalary": self._update_numeric_field,
-            "maxFullTimeSalary": self._update_numeric_field,
-            "minPartTimeSalary": self._update_numeric_field,
-            "maxPartTimeSalary": self._update_numeric_field
-        }
+
+    def _t(self, msgid: str, **params) -> str:
+        """Message système dans la langue de l'utilisateur (catalogue config/messages.py)."""
+        return t(msgid, self.user_language, **params)
+
+    def _context(self, template: str, user_input: Optional[str] = None) -> str:
+        """Bloc de contexte du prompt (offre, contradictions, derniers échanges), sans appel LLM."""
+        return context_encoder.encode(self.job_details.data["jobDetails"], self.lang_mem, template, user_input)
 
     def detect_language(self, user_input: str) -> str:
         # Code existant inchangé
@@ -94,15 +98,47 @@ class UpdateAgent:
             self.user_language = "fr"
             return "fr"
 
+    def _local_answer(self, key: str, user_input: str) -> Optional[Dict[str, Any]]:
+        """
+        Valeur analysée sans LLM quand l'analyseur local du champ est assez sûr de lui
+        ({"value", "confidence"}), sinon None : la réponse suit alors le chemin LLM habituel.
+        """
+        if key in durations.DURATION_FIELDS:
+            parsed = durations.parse_duration(user_input, durations.DURATION_FIELDS[key])
+            if parsed is not None and parsed.confidence >= durations.MIN_CONFIDENCE:
+                return {"value": parsed.weeks, "confidence": parsed.confidence}
+        elif key == "timeZone":
+            parsed = timezones.resolve_timezone(user_input)
+            if parsed is None or parsed.confidence < timezones.MIN_CONFIDENCE:
+                return None
+            # "oui" ou "6h" seul : complète la valeur en cours, sinon celle proposée d'après le pays
+            current = self.job_details.data["jobDetails"].get(key)
+            base = current if isinstance(current, dict) and current.get("name") else self._suggest_auto_value(key)
+            name = parsed.name or (base or {}).get("name")
+            if not name:
+                return None
+            overlap = parsed.overlap or (not parsed.name and (base or {}).get("overlap")) or timezones.DEFAULT_OVERLAP
+            overlap = int(overlap) if float(overlap).is_integer() else overlap
+            return {"value": {"name": name, "overlap": overlap}, "confidence": parsed.confidence}
+        elif key == "city":
+            country = (self.job_details.data["jobDetails"].get("country") or {}).get("name")
+            match = gazetteer.extract_city(user_input, country)
+            if match is not None and match.confidence >= gazetteer.MIN_CONFIDENCE:
+                return {"value": match.name, "confidence": match.confidence}
+        return None
+
+    def _suggest_auto_value(self, key: str) -> Optional[Any]:
+        """Valeur par défaut déduite des champs déjà remplis (fuseau du pays pour timeZone), sinon None."""
+        if key == "timeZone":
+            return timezones.suggest_timezone(self.job_details.data["jobDetails"])
+        return None
+
     def detect_intention(self, user_input: str, current_field: str, form_state: Dict) -> Dict[str, Any]:
         # Code existant inchangé
         if not user_input or user_input.strip() == "":
             return {"intention": "EMPTY", "field": current_field, "confidence": 1.0}
             
-        filled_fields = {field: value for field, value in form_state.get("jobDetails", {}).items() if value not in [None, [], {}] and not (isinstance(value, dict) and not value.get("name"))}
-        all_fields_info = [f"{field} ({'énumération (' + ', '.join(self.enum_fields[field]) + ')' if field in self.enum_fields else 'nombre' if field in self.numeric_fields else 'liste' if field in self.list_fields else 'objet' if field in self.dict_fields else 'texte'})" for field in self.job_details.data["jobDetails"].keys()]
-        
-        conversation_summary = self.lang_mem.get_summary() if self.lang_mem else "Aucun historique"
+        context = context_encoder.encode(form_state.get("jobDetails", {}), self.lang_mem, "intention", user_input)
         
         prompt = f"""
         Analysez cette réponse d'un **recruteur** remplissant un formulaire d'offre d'emploi:
@@ -110,9 +146,8 @@ class UpdateAgent:
 
         Contexte:
         - Champ actuel: '{current_field}'
-        - Champs remplis: {json.dumps(filled_fields, ensure_ascii=False)}
-        - Champs disponibles: {", ".join(all_fields_info)}
-        - Résumé conversationnel: {conversation_summary}
+        - Champs disponibles: {field_schema.FIELDS_SUMMARY}
+{context}
 
         TÂCHE: Déterminez l'intention principale du recruteur. Intentions possibles:
         1. "DIRECT_ANSWER" - Répond directement à la question posée
@@ -123,6 +158,7 @@ class UpdateAgent:
         6. "REFUSE" - Refuse de répondre à cette question
         7. "EMPTY" - Réponse vide ou non informative
         8. "CONFUSION" - Réponse confuse ou hors sujet
+        9. "REVERT_FIELD" - Souhaite annuler une modification et revenir à la valeur précédente
 
         EXEMPLES:
         - "Je souhaite un développeur Java senior" → {{"intention": "DIRECT_ANSWER", "confidence": 0.9}}
@@ -130,6 +166,8 @@ class UpdateAgent:
         - "Modifier le poste par Développeur Frontend" → {{"intention": "MODIFY_FIELD", "field_to_modify": "title", "confidence": 0.85}}
         - "Je veux changer la valeur du champ Titre" → {{"intention": "MODIFY_FIELD", "field_to_modify": "title", "confidence": 0.9}}
         - "Où en sommes-nous?" → {{"intention": "SHOW_STATUS", "confidence": 0.9}}
+        - "En fait, remettez l'ancien salaire" → {{"intention": "REVERT_FIELD", "field_to_modify": "salaire", "confidence": 0.9}}
+        - "Annule ma dernière modification" → {{"intention": "REVERT_FIELD", "confidence": 0.85}}
         - "Qu'est-ce que vous entendez par taux horaire?" → {{"intention": "CLARIFICATION", "confidence": 0.85}}
         - "Peu importe, comme vous voulez" → {{"intention": "NO_PREFERENCE", "confidence": 0.8}}
         - "Je préfère ne pas préciser" → {{"intention": "REFUSE", "confidence": 0.9}}
@@ -140,6 +178,7 @@ class UpdateAgent:
 
         RÈGLES:
         - Si "MODIFY_FIELD", identifiez le champ à modifier (normalisez en minuscules, ex: "Titre" → "title").
+        - Si "REVERT_FIELD", indiquez le champ concerné s'il est mentionné, sinon omettez "field_to_modify".
         - Si le champ mentionné est ambigu, essayez de le mapper au plus proche dans les champs disponibles.
         - Si la réponse contient une liste de valeurs (ex. pays, compétences) pour le champ actuel '{current_field}', privilégiez "DIRECT_ANSWER".
         - Si l’utilisateur spécifie une valeur pour un pays/région et indique "pas de problème" ou "peu importe" pour les autres, traitez comme "DIRECT_ANSWER".
@@ -150,13 +189,7 @@ class UpdateAgent:
         """
         
         try:
-            response = self.llm.invoke(prompt)
-            result_text = response.content.strip()
-            json_start = result_text.find('{')
-            json_end = result_text.rfind('}') + 1
-            if json_start == -1 or json_end == 0:
-                raise ValueError("Aucun JSON valide trouvé")
-            result = json.loads(result_text[json_start:json_end])
+            result = invoke_json(self.llm, prompt, "update_agent.detect_intention")
             
             if "intention" not in result:
                 result["intention"] = "DIRECT_ANSWER"
@@ -172,6 +205,8 @@ class UpdateAgent:
                     result["field_to_modify"] = result["field_to_modify"].lower()
                     if result["field_to_modify"] not in self.job_details.data["jobDetails"]:
                         result = self._map_to_existing_field(result, user_input)
+            elif result["intention"] == "REVERT_FIELD" and result.get("field_to_modify"):
+                result = self._resolve_revert_field(result, user_input)
             print(f"DEBUG Intention détectée: {result['intention']}, Champ: {result.get('field_to_modify', 'N/A')}")
             return result
             
@@ -180,6 +215,22 @@ class UpdateAgent:
             traceback.print_exc()
             return {"intention": "DIRECT_ANSWER", "field": current_field, "confidence": 0.5}
 
+    def _resolve_revert_field(self, result: Dict, user_input: str) -> Dict:
+        """Associe le champ à rétablir à un champ existant, en privilégiant le dernier modifié parmi les candidats."""
+        field = result["field_to_modify"]
+        by_lower = {name.lower(): name for name in self.job_details.data["jobDetails"]}
+        if field.lower() in by_lower:
+            result["field_to_modify"] = by_lower[field.lower()]
+            return result
+        # "salaire" → le champ de rémunération modifié le plus récemment
+        is_pay = any(word in field.lower() for word in ("salaire", "salary", "rémunération", "taux", "rate"))
+        for change in reversed(self.job_details.changes_since(0)):
+            name = change["field"]
+            if field.lower() in name.lower() or (is_pay and ("Salary" in name or "Rate" in name)):
+                result["field_to_modify"] = name
+                return result
+        return self._map_to_existing_field(result, user_input)
+
     def _map_to_existing_field(self, result: Dict, user_input: str) -> Dict:
         # Code existant inchangé
         field_to_map = result.get("field_to_modify", "")
@@ -223,14 +274,32 @@ class UpdateAgent:
     def update(self, key: str, user_input: str, original_question: str, question_agent=None) -> Tuple[bool, Optional[str], Optional[Dict]]:
         # Code existant inchangé
         if not user_input or user_input.strip() == "":
-            error_messages = {"fr": "Réponse vide", "en": "Empty response", "es": "Respuesta vacía"}
-            return False, error_messages.get(self.user_language or "fr", error_messages["fr"]), None
+            return False, self._t("update.empty_response"), None
         
         if not self.user_language:
             self.detect_language(user_input)
         
-        intention_analysis = self.detect_intention(user_input, key, self.job_details.get_state())
+        # Réponse analysée localement avec assurance (durée, date...) : ni détection d'intention ni cache ;
+        # le gestionnaire du champ reprend la valeur depuis intention_analysis["local"]
+        local = self._local_answer(key, user_input)
+        # Réponse déjà analysée pour ce champ (texte identique ou très proche) : pas d'appel LLM
+        hit = answer_cache.lookup(key, user_input) if local is None else None
+        speculation = None
+        if local is not None:
+            intention_analysis = {"intention": "DIRECT_ANSWER", "confidence": local["confidence"], "local": local}
+            print(f"DEBUG Intention (analyse locale): DIRECT_ANSWER, valeur {local['value']}")
+        elif hit is not None:
+            intention_analysis = dict(hit.intention, cached=True)
+            print(f"DEBUG Intention (cache): {intention_analysis['intention']}, réponse proche de '{hit.normalized}'")
+        else:
+            speculation = self._speculate(key, user_input, original_question) if SPECULATIVE_EXTRACTION else None
+            intention_analysis = self.detect_intention(user_input, key, self.job_details.get_state())
+            answer_cache.remember(key, user_input, intention_analysis)
         intention = intention_analysis.get("intention")
+        if speculation is not None and intention != "DIRECT_ANSWER":
+            # Extraction spéculative annulée si elle n'a pas démarré, sinon oubliée avec sa copie
+            speculation.cancel()
+            speculation = None
         
         if intention == "SHOW_STATUS":
             return False, f"SHOW_STATUS:{key}", intention_analysis
@@ -238,7 +307,7 @@ class UpdateAgent:
         elif intention == "MODIFY_FIELD":
             field_to_modify = intention_analysis.get("field_to_modify")
             if field_to_modify and field_to_modify in self.job_details.data["jobDetails"]:
-                current_value = self.job_details.data["jobDetails"].get(field_to_modify, "Non spécifié")
+                current_value = self.job_details.data["jobDetails"].get(field_to_modify) or self._t("form.not_specified")
                 if "par" in user_input.lower() or "to" in user_input.lower() or "por" in user_input.lower():
                     new_value = user_input.split("par")[-1].strip() if "par" in user_input.lower() else \
                                 user_input.split("to")[-1].strip() if "to" in user_input.lower() else \
@@ -247,23 +316,27 @@ class UpdateAgent:
                     if success:
                         print(f"✅ Champ '{field_to_modify}' modifié avec succès: {new_value}")
                         return True, None, intention_analysis
-                    return False, update_error or f"Erreur lors de la modification de '{field_to_modify}'", intention_analysis
-                question_templates = {
-                    "fr": f"Remplacer '{current_value}' par quoi pour '{field_to_modify}' ?",
-                    "en": f"Replace '{current_value}' with what for '{field_to_modify}'?",
-                    "es": f"¿Reemplazar '{current_value}' por qué para '{field_to_modify}'?"
-                }
-                print(f"DEBUG Demande de modification: {field_to_modify}, Question générée: {question_templates.get(self.user_language or 'fr')}")
+                    return False, update_error or self._t("update.failed", field=field_to_modify), intention_analysis
+                print(f"DEBUG Demande de modification: {field_to_modify}, Question générée: {self._t('form.replace_value', value=current_value, field=field_to_modify)}")
                 return False, f"CHANGE_FIELD:{field_to_modify}", intention_analysis
             else:
-                error_messages = {
-                    "fr": "Je n'ai pas compris quel champ vous souhaitez modifier.",
-                    "en": "I didn't understand which field you want to modify.",
-                    "es": "No entendí qué campo desea modificar."
-                }
                 print(f"DEBUG Champ non reconnu: {field_to_modify}")
-                return False, error_messages.get(self.user_language or "fr"), intention_analysis
+                return False, self._t("form.field_unclear"), intention_analysis
         
+        elif intention == "REVERT_FIELD":
+            field_to_revert = intention_analysis.get("field_to_modify")
+            try:
+                if field_to_revert in self.job_details.data["jobDetails"]:
+                    record = self.job_details.revert_field(field_to_revert)
+                else:
+                    record = self.job_details.undo()
+            except field_schema.FieldValidationError as e:
+                return False, e.localized(self.user_language), intention_analysis
+            if record is None:
+                return False, self._t("update.nothing_to_undo"), intention_analysis
+            print(f"✅ Champ '{record.field}' rétabli: {record.old} → {record.new}")
+            return False, f"REVERTED:{record.field}", intention_analysis
+
         elif intention == "CLARIFICATION":
             explanation = self.reformulate_question(key, original_question, None, intention_analysis)
             return False, explanation, intention_analysis
@@ -282,20 +355,131 @@ class UpdateAgent:
                 if success:
                     print(f"✅ Valeur par défaut appliquée pour '{key}': {default_value}")
                     return True, None, intention_analysis
-                return False, update_error or "Erreur lors de l'application de la valeur par défaut", intention_analysis
+                return False, update_error or self._t("update.default_failed"), intention_analysis
             return False, "AUTO_VALUE_IMPOSSIBLE", intention_analysis
         
         elif intention == "CONFUSION":
             return False, self.reformulate_question(key, original_question, "Confusion détectée", intention_analysis), intention_analysis
         
-        if key in self.field_update_handlers:
-            return self.field_update_handlers[key](key, user_input, original_question, intention_analysis)
+        cached_value = answer_cache.value_for(hit, user_input) if hit is not None else None
+        if cached_value is not None:
+            # Valeur normalisée de la même réponse, revalidée contre l'offre en cours
+            success, _ = self.job_details.update(key, copy.deepcopy(cached_value))
+            answer_cache.record_value_hit(success)
+            if success:
+                print(f"✅ {key} mis à jour (cache): {cached_value}")
+                return True, None, intention_analysis
         
+        version = self.job_details.version
+        result = self._commit_speculation(speculation, intention_analysis) if speculation is not None else None
+        if result is None:
+            result = self._extract(key, user_input, original_question, intention_analysis)
+        
+        # Seules les réponses qui n'ont écrit que le champ demandé sont réutilisables telles quelles
+        # (une valeur analysée localement peut dépendre de la date du jour : elle n'est pas retenue)
+        changes = self.job_details.changes_since(version) if result[0] and not intention_analysis.get("local") else []
+        if len(changes) == 1 and changes[0]["field"] == key:
+            answer_cache.remember(key, user_input, intention_analysis, copy.deepcopy(changes[0]["new"]))
+        return result
+
+    def _extract(self, key: str, user_input: str, original_question: str, intention_analysis: Dict) -> Tuple[bool, Optional[str], Dict]:
+        """Extraction et écriture de la valeur par le gestionnaire du champ."""
+        handler = _FIELD_HANDLERS.get(key)
+        if handler is not None:
+            return handler(self, key, user_input, original_question, intention_analysis)
         return self.update_field_value(key, user_input, original_question, intention_analysis)
 
+    def _speculate(self, key: str, user_input: str, original_question: str) -> Future:
+        """
+        Lance l'extraction du champ sur une copie de l'offre (JobDetails.fork) pendant que la
+        détection d'intention s'exécute. La future rend (résultat, modifications de la copie,
+        version de l'offre copiée).
+        """
+        base_version = self.job_details.version
+        agent = UpdateAgent(self.job_details.fork(), self.lang_mem)
+        agent.llm = self.llm
+        agent.user_language = self.user_language
+
+        def extract():
+            result = agent._extract(key, user_input, original_question, {})
+            return result, agent.job_details.changes_since(0), base_version
+
+        # La priorité LLM de la requête (contextvars) suit l'extraction dans le pool
+        return _speculation_executor().submit(contextvars.copy_context().run, extract)
+
+    def _commit_speculation(self, speculation: Future, intention_analysis: Dict) -> Optional[Tuple[bool, Optional[str], Dict]]:
+        """
+        Rejoue sur l'offre les écritures de l'extraction spéculative (DIRECT_ANSWER confirmée).
+        None si elle a échoué ou si l'offre a changé entre-temps : l'extraction est alors refaite.
+        """
+        try:
+            (success, message, _), changes, base_version = speculation.result()
+        except Exception as e:
+            print(f"⚠️ Extraction spéculative en échec, reprise sans spéculation: {e}")
+            return None
+        if base_version != self.job_details.version:
+            print("⚠️ Offre modifiée pendant l'extraction spéculative, reprise sans spéculation")
+            return None
+        patch = {change["field"]: change["new"] for change in changes}
+        errors = self.job_details.update_many(patch) if patch else []
+        if errors:
+            print(f"⚠️ Extraction spéculative non applicable ({errors[0].message}), reprise sans spéculation")
+            return None
+        return success, message, intention_analysis
+
+    def extract_from_brief(self, brief: str) -> List[field_schema.FieldValidationError]:
+        """
+        Remplit l'offre à partir d'une description libre, en un seul appel LLM et sans question au recruteur.
+        Les champs valides sont appliqués ; retourne les erreurs des champs rejetés.
+        """
+        fields_description = "\n".join(
+            f"        - {name}: {description}" for name, description in field_schema.QUESTION_TYPE_DESCRIPTIONS.items()
+        )
+        prompt = f"""
+        Voici la description libre d'une offre d'emploi rédigée par un **recruteur**:
+        "{brief}"
+
+        TÂCHE: Extrayez tous les champs explicitement mentionnés ou déductibles sans ambiguïté.
+        Champs et formats attendus:
+{fields_description}
+
+        RÈGLES:
+        - N'inventez aucune valeur : omettez les champs absents de la description.
+        - Montants et durées en nombres (availability et estimatedWeeks en semaines, weeklyHours en heures).
+        - Utilisez exactement les valeurs d'énumération indiquées.
+
+        EXEMPLE:
+        "CDI de Data Scientist senior à Lyon, sur site, 55-65k€, Python et SQL indispensables, anglais courant"
+        → {{"title": "Data Scientist", "seniority": "SENIOR", "jobType": "FULLTIME", "type": "ONSITE",
+            "minFullTimeSalary": 55000, "maxFullTimeSalary": 65000, "country": {{"name": "France"}}, "city": "Lyon",
+            "skills": [{{"name": "Python", "mandatory": true}}, {{"name": "SQL", "mandatory": true}}],
+            "languages": [{{"name": "Anglais", "level": "C1", "required": true}}]}}
+
+        Retournez UNIQUEMENT un objet JSON valide avec ces champs.
+        """
+        result = invoke_json(self.llm, prompt, "update_agent.extract_from_brief")
+        result = result.get("jobDetails", result) if isinstance(result.get("jobDetails"), dict) else result
+        patch = {key: value for key, value in result.items()
+                 if key in field_schema.SPECS and value not in (None, "", [], {})}
+
+        # update_many est atomique : on écarte les champs rejetés et on réapplique le reste
+        rejected = []
+        while patch:
+            errors = self.job_details.update_many(patch)
+            if not errors:
+                break
+            rejected.extend(errors)
+            remaining = len(patch)
+            for error in errors:
+                for field in (error.field, error.params.get("min_field"), error.params.get("max_field")):
+                    patch.pop(field, None)
+            if len(patch) == remaining:
+                break
+        return rejected
+
     def update_field_value(self, key: str, user_input: str, original_question: str, intention_analysis: Dict) -> Tuple[bool, Optional[str], Dict]:
         # Code existant inchangé
-        conversation_summary = self.lang_mem.get_summary() if self.lang_mem else "Aucun historique"
+        context = self._context("extraction", user_input)
         
         prompt_validation = f"""
         Analysez cette réponse d'un **recruteur** pour le champ '{key}' d'une offre d'emploi:
@@ -304,8 +488,7 @@ class UpdateAgent:
         Contexte:
         - Question posée: "{original_question}"
         - Type attendu: {self._get_field_type_description(key)}
-        - Champs déjà remplis: {json.dumps(self.job_details.get_state().get("jobDetails", {}), ensure_ascii=False)}
-        - Résumé conversationnel: {conversation_summary}
+{context}
         
         TÂCHE: Validez et normalisez la réponse pour '{key}' selon le format attendu.
         - **Extraire UNIQUEMENT la partie pertinente** liée à '{key}'.
@@ -330,21 +513,13 @@ class UpdateAgent:
         6. Retournez TOUJOURS un JSON valide: {{"value": "VALEUR ou INVALID", "error": "EXPLICATION" (si invalide)}}
         """
         try:
-            response = self.llm.invoke(prompt_validation)
-            result_text = response.content.strip()
-            json_start = result_text.find('{"value":')
-            if json_start == -1:
-                json_start = result_text.find('{ "value":')
-            if json_start != -1:
-                json_end = result_text.rfind('}') + 1
-                result_text = result_text[json_start:json_end]
-            result = json.loads(result_text)
-            if result["value"] == "INVALID":
-                reformulated = self.reformulate_question(key, original_question, result["error"], intention_analysis)
+            result = invoke_json(self.llm, prompt_validation, "update_agent.update_field_value", field=key)
+            if result.get("value") == "INVALID":
+                reformulated = self.reformulate_question(key, original_question, result.get("error"), intention_analysis)
                 return False, reformulated, intention_analysis
             cleaned_value = result["value"]
-        except json.JSONDecodeError as e:
-            print(f"⚠️ Erreur JSON dans la validation de '{key}': {e} - Réponse brute: {response.content}")
+        except StructuredOutputError as e:
+            print(f"⚠️ Erreur JSON dans la validation de '{key}': {e}")
             reformulated = self.reformulate_question(key, original_question, f"Erreur de format JSON: {str(e)}. Veuillez préciser {key}.", intention_analysis)
             return False, reformulated, intention_analysis
         except Exception as e:
@@ -359,7 +534,7 @@ class UpdateAgent:
             if success:
                 print(f"✅ Mise à jour réussie: {key} = {cleaned_value}")
                 return True, None, intention_analysis
-            return False, update_error or f"Erreur lors de la mise à jour de '{key}'", intention_analysis
+            return False, update_error or self._t("update.failed", field=key), intention_analysis
             
         elif key in self.enum_fields:
             enum_value = str(cleaned_value).upper()
@@ -370,8 +545,8 @@ class UpdateAgent:
                 if success:
                     print(f"✅ Mise à jour réussie: {key} = {enum_value}")
                     return True, None, intention_analysis
-                return False, update_error or f"Erreur lors de la mise à jour de '{key}'", intention_analysis
-            return False, f"Valeur non reconnue pour {key}. Options: {', '.join(self.enum_fields[key])}", intention_analysis
+                return False, update_error or self._t("update.failed", field=key), intention_analysis
+            return False, self._t("update.unknown_choice", field=key, allowed=", ".join(self.enum_fields[key])), intention_analysis
         
         elif key in self.numeric_fields:
             try:
@@ -382,9 +557,9 @@ class UpdateAgent:
                 if success:
                     print(f"✅ Mise à jour réussie: {key} = {value}")
                     return True, None, intention_analysis
-                return False, update_error or f"Erreur lors de la mise à jour de '{key}'", intention_analysis
+                return False, update_error or self._t("update.failed", field=key), intention_analysis
             except (ValueError, TypeError):
-                return False, f"Valeur numérique attendue pour {key}.", intention_analysis
+                return False, self._t("update.number_expected", field=key), intention_analysis
         
         elif key in self.dict_fields:
             if isinstance(cleaned_value, dict) and "name" in cleaned_value:
@@ -394,8 +569,8 @@ class UpdateAgent:
                 if success:
                     print(f"✅ Mise à jour réussie: {key} = {json.dumps(cleaned_value)}")
                     return True, None, intention_analysis
-                return False, update_error or f"Erreur lors de la mise à jour de '{key}'", intention_analysis
-            return False, f"Format invalide pour {key}. Exemple: {{'name': 'France'}}", intention_analysis
+                return False, update_error or self._t("update.failed", field=key), intention_analysis
+            return False, self._t("update.invalid_format", field=key, example="{'name': 'France'}"), intention_analysis
         
         elif key in self.list_fields:
             if isinstance(cleaned_value, list) and all(isinstance(item, dict) and "name" in item for item in cleaned_value):
@@ -405,8 +580,8 @@ class UpdateAgent:
                 if success:
                     print(f"✅ Mise à jour réussie: {key} = {json.dumps(cleaned_value)}")
                     return True, None, intention_analysis
-                return False, update_error or f"Erreur lors de la mise à jour de '{key}'", intention_analysis
-            return False, f"Format invalide pour {key}. Exemple: [{{'name': 'Europe'}}]", intention_analysis
+                return False, update_error or self._t("update.failed", field=key), intention_analysis
+            return False, self._t("update.invalid_format", field=key, example="[{'name': 'Europe'}]"), intention_analysis
         
         else:
             result = self.job_details.update(key, cleaned_value)
@@ -415,21 +590,26 @@ class UpdateAgent:
             if success:
                 print(f"✅ Mise à jour réussie: {key} = {cleaned_value}")
                 return True, None, intention_analysis
-            return False, update_error or f"Erreur lors de la mise à jour de '{key}'", intention_analysis
+            return False, update_error or self._t("update.failed", field=key), intention_analysis
 
     def reformulate_question(self, key: str, previous_question: str, error_msg: Optional[str] = None, analysis: Optional[Dict] = None) -> str:
-        # Code existant inchangé
         if error_msg and error_msg.startswith("NEED_CLARIFICATION:"):
             return error_msg.replace("NEED_CLARIFICATION:", "")
-        
-        conversation_summary = self.lang_mem.get_summary() if self.lang_mem else "Aucun historique"
+        if reformulation.REFORMULATION_CACHE:
+            # (champ, catégorie d'erreur, langue) : rendu du catalogue, LLM seulement pour une langue hors catalogue
+            return reformulation.reformulate(key, previous_question, error_msg, analysis, self.user_language, self.llm)
+        return self._reformulate_with_llm(key, previous_question, error_msg, analysis)
+
+    def _reformulate_with_llm(self, key: str, previous_question: str, error_msg: Optional[str] = None, analysis: Optional[Dict] = None) -> str:
+        """Reformulation contextuelle par le LLM (REFORMULATION_CACHE=0) : un appel par erreur."""
+        context = self._context("reformulation")
         
         if analysis and analysis.get("intention") == "CLARIFICATION":
             prompt = f"""
             Reformulez cette question pour '{key}' en une version concise et claire:
             Question précédente: "{previous_question}"
             Type: {self._get_field_type_description(key)}
-            Résumé conversationnel: {conversation_summary}
+{context}
             RÈGLES:
             1. Une phrase directe
             2. Incluez 2-3 exemples brefs
@@ -449,7 +629,7 @@ class UpdateAgent:
         Question précédente: "{previous_question}"
         {error_context}
         Type: {self._get_field_type_description(key)}
-        Résumé conversationnel: {conversation_summary}
+{context}
         RÈGLES:
         1. Une phrase concise expliquant l'erreur
         2. Proposez 2-3 choix clairs
@@ -497,13 +677,7 @@ class UpdateAgent:
         """
         
         try:
-            response = self.llm.invoke(prompt)
-            result_text = response.content.strip()
-            json_start = result_text.find('{')
-            json_end = result_text.rfind('}') + 1
-            if json_start == -1 or json_end == 0:
-                raise ValueError("Aucun JSON valide trouvé")
-            result = json.loads(result_text[json_start:json_end])
+            result = intention_analysis.get("local") or invoke_json(self.llm, prompt, "update_agent._update_text_field", field=key)
             
             if "error" in result and result["error"]:
                 return False, result["error"], intention_analysis
@@ -518,13 +692,13 @@ class UpdateAgent:
                 if success:
                     print(f"✅ {key} mis à jour: {text_value}")
                     return True, None, intention_analysis
-                return False, update_error or f"Erreur lors de la mise à jour de '{key}'", intention_analysis
+                return False, update_error or self._t("update.failed", field=key), intention_analysis
             
-            return False, f"Impossible d'extraire une valeur textuelle pour {key}", intention_analysis
+            return False, self._t("update.no_value_extracted", field=key), intention_analysis
             
         except Exception as e:
             print(f"⚠️ Erreur lors de la mise à jour de '{key}': {e}")
-            return False, f"Erreur de traitement: {str(e)}", intention_analysis
+            return False, self._t("update.processing_error", error=e), intention_analysis
 
     def _update_title(self, key: str, user_input: str, original_question: str, intention_analysis: Dict) -> Tuple[bool, Optional[str], Dict]:
         # Code existant inchangé
@@ -534,8 +708,7 @@ class UpdateAgent:
         
         Contexte:
         - Question: "{original_question}"
-        - Autres champs: {json.dumps(self.job_details.get_state().get("jobDetails", {}), ensure_ascii=False)}
-        - Résumé conversationnel: {self.lang_mem.get_summary() if self.lang_mem else "Aucun historique"}
+{self._context("extraction", user_input)}
         
         TÂCHE: Extraire uniquement le titre du poste, de manière concise et professionnelle.
         
@@ -548,13 +721,7 @@ class UpdateAgent:
         """
         
         try:
-            response = self.llm.invoke(prompt)
-            result_text = response.content.strip()
-            json_start = result_text.find('{')
-            json_end = result_text.rfind('}') + 1
-            if json_start == -1 or json_end == 0:
-                raise ValueError("Aucun JSON valide trouvé")
-            result = json.loads(result_text[json_start:json_end])
+            result = invoke_json(self.llm, prompt, "update_agent._update_title", field=key)
             
             if "error" in result and result["error"]:
                 return False, result["error"], intention_analysis
@@ -568,13 +735,13 @@ class UpdateAgent:
                 if success:
                     print(f"✅ Titre mis à jour: {title_value}")
                     return True, None, intention_analysis
-                return False, update_error or f"Erreur lors de la mise à jour du titre", intention_analysis
+                return False, update_error or self._t("update.failed", field="title"), intention_analysis
             
-            return False, "Impossible d'extraire un titre valide", intention_analysis
+            return False, self._t("update.no_value_extracted", field="title"), intention_analysis
             
         except Exception as e:
             print(f"⚠️ Erreur lors de la mise à jour du titre: {e}")
-            return False, f"Erreur de traitement: {str(e)}", intention_analysis
+            return False, self._t("update.processing_error", error=e), intention_analysis
 
     def _update_description(self, key: str, user_input: str, original_question: str, intention_analysis: Dict) -> Tuple[bool, Optional[str], Dict]:
         # Code existant inchangé
@@ -585,7 +752,7 @@ class UpdateAgent:
         Contexte:
         - Question: "{original_question}"
         - Titre du poste: {self.job_details.data["jobDetails"].get("title", "Non spécifié")}
-        - Résumé conversationnel: {self.lang_mem.get_summary() if self.lang_mem else "Aucun historique"}
+{self._context("extraction", user_input)}
         
         TÂCHE: Extraire ou reformuler la description du poste de manière professionnelle.
         - Conservez un style concis mais informatif
@@ -600,13 +767,7 @@ class UpdateAgent:
         """
         
         try:
-            response = self.llm.invoke(prompt)
-            result_text = response.content.strip()
-            json_start = result_text.find('{')
-            json_end = result_text.rfind('}') + 1
-            if json_start == -1 or json_end == 0:
-                raise ValueError("Aucun JSON valide trouvé")
-            result = json.loads(result_text[json_start:json_end])
+            result = invoke_json(self.llm, prompt, "update_agent._update_description", field=key)
             
             if "error" in result and result["error"]:
                 return False, result["error"], intention_analysis
@@ -620,13 +781,13 @@ class UpdateAgent:
                 if success:
                     print(f"✅ Description mise à jour: {description_value[:30]}...")
                     return True, None, intention_analysis
-                return False, update_error or f"Erreur lors de la mise à jour de la description", intention_analysis
+                return False, update_error or self._t("update.failed", field="description"), intention_analysis
             
-            return False, "Impossible d'extraire une description valide", intention_analysis
+            return False, self._t("update.no_value_extracted", field="description"), intention_analysis
             
         except Exception as e:
             print(f"⚠️ Erreur lors de la mise à jour de la description: {e}")
-            return False, f"Erreur de traitement: {str(e)}", intention_analysis
+            return False, self._t("update.processing_error", error=e), intention_analysis
 
     def _update_discipline(self, key: str, user_input: str, original_question: str, intention_analysis: Dict) -> Tuple[bool, Optional[str], Dict]:
         # Code existant inchangé
@@ -650,13 +811,7 @@ class UpdateAgent:
         """
         
         try:
-            response = self.llm.invoke(prompt)
-            result_text = response.content.strip()
-            json_start = result_text.find('{')
-            json_end = result_text.rfind('}') + 1
-            if json_start == -1 or json_end == 0:
-                raise ValueError("Aucun JSON valide trouvé")
-            result = json.loads(result_text[json_start:json_end])
+            result = invoke_json(self.llm, prompt, "update_agent._update_discipline", field=key)
             
             if "error" in result and result["error"]:
                 return False, result["error"], intention_analysis
@@ -670,13 +825,13 @@ class UpdateAgent:
                 if success:
                     print(f"✅ Discipline mise à jour: {discipline_value}")
                     return True, None, intention_analysis
-                return False, update_error or f"Erreur lors de la mise à jour de la discipline", intention_analysis
+                return False, update_error or self._t("update.failed", field="discipline"), intention_analysis
             
-            return False, "Impossible d'identifier une discipline valide", intention_analysis
+            return False, self._t("update.no_value_extracted", field="discipline"), intention_analysis
             
         except Exception as e:
             print(f"⚠️ Erreur lors de la mise à jour de la discipline: {e}")
-            return False, f"Erreur de traitement: {str(e)}", intention_analysis
+            return False, self._t("update.processing_error", error=e), intention_analysis
 
     def _update_availability(self, key: str, user_input: str, original_question: str, intention_analysis: Dict) -> Tuple[bool, Optional[str], Dict]:
         # Code existant inchangé
@@ -710,13 +865,7 @@ class UpdateAgent:
         """
         
         try:
-            response = self.llm.invoke(prompt)
-            result_text = response.content.strip()
-            json_start = result_text.find('{')
-            json_end = result_text.rfind('}') + 1
-            if json_start == -1 or json_end == 0:
-                raise ValueError("Aucun JSON valide trouvé")
-            result = json.loads(result_text[json_start:json_end])
+            result = intention_analysis.get("local") or invoke_json(self.llm, prompt, "update_agent._update_availability", field=key)
             
             if "error" in result and result["error"]:
                 return False, result["error"], intention_analysis
@@ -733,16 +882,70 @@ class UpdateAgent:
                 if success:
                     print(f"✅ Disponibilité mise à jour: {availability_value} semaines")
                     return True, None, intention_analysis
-                return False, update_error or f"Erreur lors de la mise à jour de la disponibilité", intention_analysis
+                return False, update_error or self._t("update.failed", field="availability"), intention_analysis
             
-            return False, "Impossible d'extraire une valeur numérique de disponibilité", intention_analysis
+            return False, self._t("update.no_value_extracted", field="availability"), intention_analysis
             
         except Exception as e:
             print(f"⚠️ Erreur lors de la mise à jour de la disponibilité: {e}")
-            return False, f"Erreur de traitement: {str(e)}", intention_analysis
+            return False, self._t("update.processing_error", error=e), intention_analysis
 
     def _update_languages(self, key: str, user_input: str, original_question: str, intention_analysis: Dict) -> Tuple[bool, Optional[str], Dict]:
-        # Code existant inchangé
+        # Analyse locale d'abord (noms ISO 639, niveaux CECRL) : le LLM ne voit que les fragments non reconnus
+        extraction = language_levels.extract_languages(user_input)
+        languages_value = list(extraction.languages)
+        
+        if extraction.residue or not languages_value:
+            try:
+                result = self._extract_languages_with_llm(user_input, original_question, languages_value, extraction.residue)
+            except Exception as e:
+                print(f"⚠️ Erreur lors de la mise à jour des langues: {e}")
+                if not languages_value:
+                    return False, self._t("update.processing_error", error=e), intention_analysis
+                result = {"value": []}
+            
+            if "error" in result and result["error"] and not languages_value:
+                return False, result["error"], intention_analysis
+            if not isinstance(result.get("value"), list):
+                if not languages_value:
+                    return False, self._t("update.invalid_format", field="languages", example='[{"name": "Anglais", "level": "B2", "required": true}]'), intention_analysis
+                result["value"] = []
+            
+            known = {lang["name"].lower() for lang in languages_value}
+            for lang in result["value"]:
+                if not isinstance(lang, dict) or not lang.get("name"):
+                    continue
+                lang["name"] = language_levels.canonical_language(str(lang["name"])) or lang["name"]
+                if str(lang["name"]).lower() in known:
+                    continue
+                lang["level"] = language_levels.normalize_level(lang.get("level")) or lang.get("level") or language_levels.DEFAULT_LEVEL
+                lang.setdefault("required", True)
+                known.add(str(lang["name"]).lower())
+                languages_value.append(lang)
+        else:
+            print(f"DEBUG Langues résolues localement: {len(languages_value)}")
+        
+        update_result = self.job_details.update(key, languages_value)
+        success = update_result[0] if isinstance(update_result, tuple) else update_result
+        update_error = update_result[1] if isinstance(update_result, tuple) and not success else None
+        
+        if success:
+            print(f"✅ Langues mises à jour: {', '.join([l.get('name', 'Unknown') for l in languages_value])}")
+            return True, None, intention_analysis
+        return False, update_error or self._t("update.failed", field="languages"), intention_analysis
+    
+    def _extract_languages_with_llm(self, user_input: str, original_question: str, recognized: List[Dict], residue: List[str]) -> Dict[str, Any]:
+        """Extraction LLM : de toute la réponse si rien n'a été reconnu, sinon des seuls fragments restants."""
+        if recognized:
+            scope = f"""
+        Langues déjà reconnues (à NE PAS répéter): {json.dumps(recognized, ensure_ascii=False)}
+        Fragments restant à analyser: {json.dumps(residue, ensure_ascii=False)}
+        
+        TÂCHE: Extraire uniquement les langues présentes dans les fragments restants, avec leur niveau et leur caractère
+        obligatoire d'après la réponse complète. Retournez une liste vide si les fragments ne contiennent aucune langue."""
+        else:
+            scope = """
+        TÂCHE: Extraire les langues mentionnées avec leur niveau et leur caractère obligatoire."""
         prompt = f"""
         Analysez cette réponse concernant les langues requises pour le poste:
         "{user_input}"
@@ -750,57 +953,21 @@ class UpdateAgent:
         Contexte:
         - Question: "{original_question}"
         - Format attendu: Liste d'objets: [{{"name": "string", "level": "string", "required": boolean}}]
-        
-        TÂCHE: Extraire les langues mentionnées avec leur niveau et leur caractère obligatoire.
+        {scope}
         
         EXEMPLES:
-        - "Anglais obligatoire, français apprécié" → 
-          [{{"name": "Anglais", "level": "intermediate", "required": true}}, 
-           {{"name": "Français", "level": "basic", "required": false}}]
-        - "Espagnol courant et allemand basique" → 
-          [{{"name": "Espagnol", "level": "fluent", "required": true}}, 
-           {{"name": "Allemand", "level": "basic", "required": false}}]
+        - "Anglais obligatoire, notions d'allemand appréciées" → 
+          [{{"name": "Anglais", "level": "B1", "required": true}}, 
+           {{"name": "Allemand", "level": "A2", "required": false}}]
+        - "Anglais TOEIC 900 minimum" → 
+          [{{"name": "Anglais", "level": "C1", "required": true}}]
         
-        Niveaux possibles: "native", "fluent", "advanced", "intermediate", "basic" ou bien si autre niveaux a vous de choisir le niveux a travers contexte.
+        Niveaux possibles (CECRL): "A1", "A2", "B1", "B2", "C1", "C2" (langue maternelle ou bilingue: "C2", courant: "C1").
+        Noms de langues en français ("Anglais", "Espagnol"...).
         
         Retournez uniquement: {{"value": [LANGUES_FORMATÉES], "error": "EXPLICATION" (si invalide)}}
         """
-        
-        try:
-            response = self.llm.invoke(prompt)
-            result_text = response.content.strip()
-            json_start = result_text.find('{')
-            json_end = result_text.rfind('}') + 1
-            if json_start == -1 or json_end == 0:
-                raise ValueError("Aucun JSON valide trouvé")
-            result = json.loads(result_text[json_start:json_end])
-            
-            if "error" in result and result["error"]:
-                return False, result["error"], intention_analysis
-                
-            if "value" in result and isinstance(result["value"], list):
-                languages_value = result["value"]
-                
-                for lang in languages_value:
-                    if not isinstance(lang, dict):
-                        continue
-                    lang.setdefault("level", "intermediate")
-                    lang.setdefault("required", True)
-                
-                update_result = self.job_details.update(key, languages_value)
-                success = update_result[0] if isinstance(update_result, tuple) else update_result
-                update_error = update_result[1] if isinstance(update_result, tuple) and not success else None
-                
-                if success:
-                    print(f"✅ Langues mises à jour: {', '.join([l.get('name', 'Unknown') for l in languages_value])}")
-                    return True, None, intention_analysis
-                return False, update_error or f"Erreur lors de la mise à jour des langues", intention_analysis
-            
-            return False, "Format de langues invalide. Exemple attendu: [{\"name\": \"Anglais\", \"level\": \"intermediate\", \"required\": true}]", intention_analysis
-            
-        except Exception as e:
-            print(f"⚠️ Erreur lors de la mise à jour des langues: {e}")
-            return False, f"Erreur de traitement: {str(e)}", intention_analysis
+        return invoke_json(self.llm, prompt, "update_agent._update_languages", field="languages")
 
     def _update_enum_field(self, key: str, user_input: str, original_question: str, intention_analysis: Dict) -> Tuple[bool, Optional[str], Dict]:
         # Code existant inchangé
@@ -844,13 +1011,7 @@ class UpdateAgent:
         """
         
         try:
-            response = self.llm.invoke(prompt)
-            result_text = response.content.strip()
-            json_start = result_text.find('{')
-            json_end = result_text.rfind('}') + 1
-            if json_start == -1 or json_end == 0:
-                raise ValueError("Aucun JSON valide trouvé")
-            result = json.loads(result_text[json_start:json_end])
+            result = invoke_json(self.llm, prompt, "update_agent._update_enum_field", field=key)
             
             if "error" in result and result["error"]:
                 return False, result["error"], intention_analysis
@@ -859,7 +1020,7 @@ class UpdateAgent:
                 enum_value = str(result["value"]).upper()
                 
                 if enum_value not in valid_values:
-                    return False, f"Valeur non reconnue pour {key}. Options: {', '.join(valid_values)}", intention_analysis
+                    return False, self._t("update.unknown_choice", field=key, allowed=", ".join(valid_values)), intention_analysis
                 
                 update_result = self.job_details.update(key, enum_value)
                 success = update_result[0] if isinstance(update_result, tuple) else update_result
@@ -868,13 +1029,13 @@ class UpdateAgent:
                 if success:
                     print(f"✅ {key} mis à jour: {enum_value}")
                     return True, None, intention_analysis
-                return False, update_error or f"Erreur lors de la mise à jour de '{key}'", intention_analysis
+                return False, update_error or self._t("update.failed", field=key), intention_analysis
             
-            return False, f"Impossible d'identifier une valeur valide pour {key}", intention_analysis
+            return False, self._t("update.no_value_extracted", field=key), intention_analysis
             
         except Exception as e:
             print(f"⚠️ Erreur lors de la mise à jour de '{key}': {e}")
-            return False, f"Erreur de traitement: {str(e)}", intention_analysis
+            return False, self._t("update.processing_error", error=e), intention_analysis
 
     def _update_numeric_field(self, key: str, user_input: str, original_question: str, intention_analysis: Dict) -> Tuple[bool, Optional[str], Dict]:
         # Code existant inchangé
@@ -922,13 +1083,7 @@ class UpdateAgent:
         """
         
         try:
-            response = self.llm.invoke(prompt)
-            result_text = response.content.strip()
-            json_start = result_text.find('{')
-            json_end = result_text.rfind('}') + 1
-            if json_start == -1 or json_end == 0:
-                raise ValueError("Aucun JSON valide trouvé")
-            result = json.loads(result_text[json_start:json_end])
+            result = intention_analysis.get("local") or invoke_json(self.llm, prompt, "update_agent._update_numeric_field", field=key)
             
             if "error" in result and result["error"]:
                 return False, result["error"], intention_analysis
@@ -944,15 +1099,15 @@ class UpdateAgent:
                     if success:
                         print(f"✅ {key} mis à jour: {numeric_value}")
                         return True, None, intention_analysis
-                    return False, update_error or f"Erreur lors de la mise à jour de '{key}'", intention_analysis
+                    return False, update_error or self._t("update.failed", field=key), intention_analysis
                 except (ValueError, TypeError):
-                    return False, f"La valeur fournie n'est pas un nombre valide", intention_analysis
+                    return False, self._t("update.number_expected", field=key), intention_analysis
             
-            return False, f"Impossible d'extraire une valeur numérique pour {key}", intention_analysis
+            return False, self._t("update.no_value_extracted", field=key), intention_analysis
             
         except Exception as e:
             print(f"⚠️ Erreur lors de la mise à jour de '{key}': {e}")
-            return False, f"Erreur de traitement: {str(e)}", intention_analysis
+            return False, self._t("update.processing_error", error=e), intention_analysis
 
     def _update_dict_field(self, key: str, user_input: str, original_question: str, intention_analysis: Dict) -> Tuple[bool, Optional[str], Dict]:
         # Code existant inchangé
@@ -989,13 +1144,7 @@ class UpdateAgent:
         """
         
         try:
-            response = self.llm.invoke(prompt)
-            result_text = response.content.strip()
-            json_start = result_text.find('{')
-            json_end = result_text.rfind('}') + 1
-            if json_start == -1 or json_end == 0:
-                raise ValueError("Aucun JSON valide trouvé")
-            result = json.loads(result_text[json_start:json_end])
+            result = intention_analysis.get("local") or invoke_json(self.llm, prompt, "update_agent._update_dict_field", field=key)
             
             if "error" in result and result["error"]:
                 return False, result["error"], intention_analysis
@@ -1004,7 +1153,7 @@ class UpdateAgent:
                 dict_value = result["value"]
                 
                 if key == "timeZone" and "overlap" not in dict_value:
-                    dict_value["overlap"] = 4
+                    dict_value["overlap"] = timezones.DEFAULT_OVERLAP
                 
                 update_result = self.job_details.update(key, dict_value)
                 success = update_result[0] if isinstance(update_result, tuple) else update_result
@@ -1013,21 +1162,22 @@ class UpdateAgent:
                 if success:
                     print(f"✅ {key} mis à jour: {dict_value['name']}")
                     return True, None, intention_analysis
-                return False, update_error or f"Erreur lors de la mise à jour de '{key}'", intention_analysis
+                return False, update_error or self._t("update.failed", field=key), intention_analysis
             
             example = {"name": "France"}
             if key == "timeZone":
                 example["overlap"] = 4
-            return False, f"Format invalide pour {key}. Exemple: {example}", intention_analysis
+            return False, self._t("update.invalid_format", field=key, example=example), intention_analysis
         except Exception as e:
             print(f"⚠️ Erreur lors de la mise à jour de '{key}': {e}")
-            return False, f"Erreur de traitement: {str(e)}", intention_analysis
+            return False, self._t("update.processing_error", error=e), intention_analysis
 
     def _update_list_field(self, key: str, user_input: str, original_question: str, intention_analysis: Dict) -> Tuple[bool, Optional[str], Dict]:
         """
         Mise à jour spécifique pour les champs de type liste (continents, countries, regions).
         Utilise le LLM pour identifier les entités géographiques et pycountry pour valider.
         """
+        import pycountry  # importé à la demande (démarrage plus rapide)
         prompt = f"""
         Analysez cette réponse pour le champ '{key}' de type liste:
         "{user_input}"
@@ -1035,7 +1185,7 @@ class UpdateAgent:
         Contexte:
         - Question: "{original_question}"
         - Type: Liste d'objets avec propriété 'name'
-        - État actuel du formulaire: {json.dumps(self.job_details.get_state().get("jobDetails", {}), ensure_ascii=False)}
+{self._context("extraction", user_input)}
         
         TÂCHE: Identifiez les entités géographiques mentionnées (continents, pays, régions) et retournez-les sous forme de liste formatée.
         - Pour '{key}', extrayez uniquement les valeurs pertinentes au type demandé (continents, pays ou régions).
@@ -1074,13 +1224,7 @@ class UpdateAgent:
         """
         
         try:
-            response = self.llm.invoke(prompt)
-            result_text = response.content.strip()
-            json_start = result_text.find('{')
-            json_end = result_text.rfind('}') + 1
-            if json_start == -1 or json_end == 0:
-                raise ValueError("Aucun JSON valide trouvé")
-            result = json.loads(result_text[json_start:json_end])
+            result = invoke_json(self.llm, prompt, "update_agent._update_list_field", field=key)
             
             if "error" in result and result["error"]:
                 return False, result["error"], intention_analysis
@@ -1090,7 +1234,7 @@ class UpdateAgent:
                 
                 # Vérifier que chaque élément a un format valide
                 if not all(isinstance(item, dict) and "name" in item for item in list_value):
-                    return False, f"Format invalide pour {key}. Exemple: [{{'name': 'Europe'}}, {{'name': 'Asie'}}]", intention_analysis
+                    return False, self._t("update.invalid_format", field=key, example="[{'name': 'Europe'}, {'name': 'Asie'}]"), intention_analysis
                 
                 # Validation avec pycountry
                 validated_list = []
@@ -1178,16 +1322,66 @@ class UpdateAgent:
                 if success:
                     print(f"✅ {key} mis à jour: {', '.join([item['name'] for item in validated_list])}")
                     return True, None, intention_analysis
-                return False, update_error or f"Erreur lors de la mise à jour de '{key}'", intention_analysis
+                return False, update_error or self._t("update.failed", field=key), intention_analysis
             
-            return False, f"Format invalide pour {key}. Exemple: [{{'name': 'Europe'}}, {{'name': 'Asie'}}]", intention_analysis
+            return False, self._t("update.invalid_format", field=key, example="[{'name': 'Europe'}, {'name': 'Asie'}]"), intention_analysis
         
         except Exception as e:
             print(f"⚠️ Erreur lors de la mise à jour de '{key}': {e}")
-            return False, f"Erreur de traitement: {str(e)}", intention_analysis
+            return False, self._t("update.processing_error", error=e), intention_analysis
 
     def _update_skills(self, key: str, user_input: str, original_question: str, intention_analysis: Dict) -> Tuple[bool, Optional[str], Dict]:
-        # Code existant inchangé
+        # Référentiel local d'abord : le LLM ne voit que les fragments non reconnus
+        extraction = skills_taxonomy.extract_skills(user_input)
+        skills_value = list(extraction.skills)
+        
+        if extraction.residue or not skills_value:
+            try:
+                result = self._extract_skills_with_llm(user_input, original_question, skills_value, extraction.residue)
+            except Exception as e:
+                print(f"⚠️ Erreur lors de la mise à jour des compétences: {e}")
+                if not skills_value:
+                    return False, self._t("update.processing_error", error=e), intention_analysis
+                result = {"value": []}
+            
+            if "error" in result and result["error"] and not skills_value:
+                return False, result["error"], intention_analysis
+            if not isinstance(result.get("value"), list):
+                if not skills_value:
+                    return False, self._t("update.invalid_format", field="skills", example='[{"name": "Java", "mandatory": true}]'), intention_analysis
+                result["value"] = []
+            
+            known = {skill["name"].lower() for skill in skills_value}
+            for skill in result["value"]:
+                if not isinstance(skill, dict) or not skill.get("name") or str(skill["name"]).lower() in known:
+                    continue
+                skill.setdefault("mandatory", True)
+                known.add(str(skill["name"]).lower())
+                skills_value.append(skill)
+        else:
+            print(f"DEBUG Compétences résolues localement: {len(skills_value)}")
+        
+        update_result = self.job_details.update(key, skills_value)
+        success = update_result[0] if isinstance(update_result, tuple) else update_result
+        update_error = update_result[1] if isinstance(update_result, tuple) and not success else None
+        
+        if success:
+            print(f"✅ Compétences mises à jour: {', '.join([s.get('name', 'Unknown') for s in skills_value])}")
+            return True, None, intention_analysis
+        return False, update_error or self._t("update.failed", field="skills"), intention_analysis
+    
+    def _extract_skills_with_llm(self, user_input: str, original_question: str, recognized: List[Dict], residue: List[str]) -> Dict[str, Any]:
+        """Extraction LLM : de toute la réponse si rien n'a été reconnu, sinon des seuls fragments restants."""
+        if recognized:
+            scope = f"""
+        Compétences déjà reconnues (à NE PAS répéter): {json.dumps(recognized, ensure_ascii=False)}
+        Fragments restant à analyser: {json.dumps(residue, ensure_ascii=False)}
+        
+        TÂCHE: Extraire uniquement les compétences présentes dans les fragments restants, avec leur caractère obligatoire
+        d'après la réponse complète. Retournez une liste vide si les fragments ne contiennent aucune compétence."""
+        else:
+            scope = """
+        TÂCHE: Extraire les compétences mentionnées avec leur caractère obligatoire."""
         prompt = f"""
         Analysez cette réponse concernant les compétences requises pour le poste:
         "{user_input}"
@@ -1197,8 +1391,7 @@ class UpdateAgent:
         - Titre: {self.job_details.data["jobDetails"].get("title", "Non spécifié")}
         - Discipline: {self.job_details.data["jobDetails"].get("discipline", "Non spécifiée")}
         - Format attendu: Liste d'objets: [{{"name": "string", "mandatory": boolean}}]
-        
-        TÂCHE: Extraire les compétences mentionnées avec leur caractère obligatoire.
+        {scope}
         
         EXEMPLES:
         - "Java, Python et idéalement React" → 
@@ -1210,52 +1403,10 @@ class UpdateAgent:
         
         Retournez uniquement: {{"value": [COMPÉTENCES_FORMATÉES], "error": "EXPLICATION" (si invalide)}}
         """
-        
-        try:
-            response = self.llm.invoke(prompt)
-            result_text = response.content.strip()
-            json_start = result_text.find('{')
-            json_end = result_text.rfind('}') + 1
-            if json_start == -1 or json_end == 0:
-                raise ValueError("Aucun JSON valide trouvé")
-            result = json.loads(result_text[json_start:json_end])
-            
-            if "error" in result and result["error"]:
-                return False, result["error"], intention_analysis
-                
-            if "value" in result and isinstance(result["value"], list):
-                skills_value = result["value"]
-                
-                for skill in skills_value:
-                    if not isinstance(skill, dict):
-                        continue
-                    skill.setdefault("mandatory", True)
-                
-                update_result = self.job_details.update(key, skills_value)
-                success = update_result[0] if isinstance(update_result, tuple) else update_result
-                update_error = update_result[1] if isinstance(update_result, tuple) and not success else None
-                
-                if success:
-                    print(f"✅ Compétences mises à jour: {', '.join([s.get('name', 'Unknown') for s in skills_value])}")
-                    return True, None, intention_analysis
-                return False, update_error or f"Erreur lors de la mise à jour des compétences", intention_analysis
-            
-            return False, "Format de compétences invalide. Exemple attendu: [{\"name\": \"Java\", \"mandatory\": true}]", intention_analysis
-            
-        except Exception as e:
-            print(f"⚠️ Erreur lors de la mise à jour des compétences: {e}")
-            return False, f"Erreur de traitement: {str(e)}", intention_analysis
+        return invoke_json(self.llm, prompt, "update_agent._update_skills", field="skills")
     
     def _get_field_type_description(self, key: str) -> str:
-        # Code existant inchangé
-        if key in self.text_fields:
-            return "Texte simple (chaîne de caractères)"
-        elif key in self.numeric_fields:
-            return "Nombre (valeur numérique)"
-        elif key in self.enum_fields:
-            return f"Énumération (options: {', '.join(self.enum_fields[key])})"
-        elif key in self.list_fields:
-            return "Liste d'éléments (ex: [{'name': 'valeur'}])"
-        elif key in self.dict_fields:
-            return "Objet dictionnaire (ex: {'name': 'valeur'})"
-        return "Type inconnu"
\ No newline at end of file
+        return field_schema.UPDATE_TYPE_DESCRIPTIONS.get(key, "Type inconnu")
+
+# Dispatch compilé depuis le schéma : champ -> méthode de mise à jour spécifique
+_FIELD_HANDLERS = {field: getattr(UpdateAgent, name) for field, name in field_schema.HANDLER_NAMES.items()}
@@ -0,0 +1,85 @@
+# agents/welcome.py - Réponse de bienvenue au premier message : salut repris et présentation tirés du catalogue
+#
+# Le premier tour ne dépend plus que de la première question : la langue et la formule de salut
+# viennent de models.greetings, le texte de config.messages. La personnalisation par le LLM
+# (WELCOME_PERSONALIZATION=1) tourne en parallèle de la génération de la question et n'est
+# retenue que si elle est prête avant elle.
+import os
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from config.llm_config import WORKER_THREADS
+from config.messages import t
+from models import greetings
+
+WELCOME_PERSONALIZATION = os.getenv("WELCOME_PERSONALIZATION", "0") == "1"
+_personalization_pool: Dict[str, Any] = {"pid": None, "executor": None}
+_personalization_lock = threading.Lock()
+
+def _personalization_executor() -> ThreadPoolExecutor:
+    """Pool propre au processus (recréé après le fork des workers), un thread par thread de requête."""
+    if _personalization_pool["pid"] != os.getpid():
+        with _personalization_lock:
+            if _personalization_pool["pid"] != os.getpid():
+                _personalization_pool["executor"] = ThreadPoolExecutor(WORKER_THREADS, thread_name_prefix="welcome")
+                _personalization_pool["pid"] = os.getpid()
+    return _personalization_pool["executor"]
+
+def welcome_language(user_input: str, lang_mem=None) -> str:
+    """Langue du premier message : indices locaux, sinon celle déjà retenue par LangMem (détection LLM)."""
+    return greetings.detect_language(user_input) or (lang_mem.user_language if lang_mem else None) or "fr"
+
+def catalog_welcome(user_input: str, lang: str) -> str:
+    """Bienvenue du catalogue, reprenant le salut du recruteur s'il y en a un."""
+    match = greetings.classify_greeting(user_input)
+    if match:
+        return t("app.welcome", lang, greeting=match.greeting)
+    return t("app.welcome_fallback", lang)
+
+def _personalize(user_input: str, lang: str, llm) -> Optional[str]:
+    prompt = f"""
+    L'utilisateur a envoyé ce premier message: "{user_input}"
+    Langue détectée: {lang}
+
+    TÂCHE: Générez une réponse de bienvenue adaptée à la langue:
+    1. Répondez dans la langue détectée ({lang}).
+    2. Répétez le salut initial (ex. "Bonjour" → "Bonjour").
+    3. Présentez-vous comme un assistant intelligent aidant les recruteurs à créer des offres d'emploi.
+    4. Ton amical et professionnel, maximum 2-3 phrases.
+
+    EXEMPLES:
+    - Input: "Bonjour", Langue: fr → "Bonjour ! Je suis un assistant intelligent qui aide les recruteurs à créer des offres d'emploi."
+    - Input: "Hello", Langue: en → "Hello! I’m an intelligent assistant helping recruiters craft job postings."
+    - Input: "Hola", Langue: es → "¡Hola! Soy un asistente inteligente que ayuda a los reclutadores a crear ofertas de empleo."
+
+    Retournez UNIQUEMENT la réponse, sans JSON ni commentaire.
+    """
+    try:
+        return llm.invoke(prompt).content.strip() or None
+    except Exception as e:
+        print(f"⚠️ Erreur lors de la génération de la réponse: {e}")
+        return None
+
+def start_welcome(user_input: str, lang_mem, llm) -> Tuple[str, Optional[Future]]:
+    """
+    (bienvenue du catalogue, personnalisation LLM en cours ou None). La langue est enregistrée
+    dans lang_mem ; l'appelant génère la première question puis appelle settle().
+    """
+    lang = welcome_language(user_input, lang_mem)
+    if lang_mem is not None:
+        lang_mem.user_language = lang
+    future = None
+    if WELCOME_PERSONALIZATION and llm is not None:
+        future = _personalization_executor().submit(contextvars.copy_context().run, _personalize, user_input, lang, llm)
+    return catalog_welcome(user_input, lang), future
+
+def settle(welcome: str, personalization: Optional[Future]) -> str:
+    """Bienvenue personnalisée si elle est déjà prête, sinon celle du catalogue (sans attendre le LLM)."""
+    if personalization is None:
+        return welcome
+    if not personalization.done():
+        personalization.cancel()
+        return welcome
+    return personalization.result() or welcome
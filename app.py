@@ -1,56 +1,88 @@
 # app.py - Version corrigée pour gérer la langue des questions
 
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, render_template, request, jsonify, session, stream_with_context, make_response
+from flask.json.provider import DefaultJSONProvider
 import uuid
+import threading
+from collections import OrderedDict
 import json
 import sys
 import traceback
 import os
-from workflow.form_workflow import FormWorkflow
 from agents.lang_mem import LangMem
-from agents.question_agent import QuestionAgent
+from agents.question_agent import question_agent
 from agents.update_agent import UpdateAgent
-from config.llm_config import llm
+from config.llm_config import llm, warm_up_connections, admission, single_flight
+from config.messages import t
 from models.job_details import JobDetails
+from models.field_schema import FieldValidationError
+from models import serialization
+from agents.structured_output import parse_metrics
+from agents.answer_cache import answer_cache
+from agents import welcome
+from workflow.bulk_ingest import bulk_ingestor
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify via models.serialization : orjson si disponible, clés dans l'ordre du schéma (pas de tri)."""
+
+    def dumps(self, obj, **kwargs):
+        return serialization.dumps_text(obj)
+
+    def loads(self, s, **kwargs):
+        return serialization.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Octets encodés directement dans la réponse, sans passer par une chaîne intermédiaire
+        return self._app.response_class(serialization.dumps(self._prepare_response_obj(args, kwargs)),
+                                        mimetype=self.mimetype)
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 app.secret_key = os.urandom(24)
 
-# Dictionnaire pour stocker les sessions actives
+INITIAL_MESSAGE = t("app.initial_prompt")  # langue encore inconnue : français par défaut
+# Réponses conservées par session pour rejouer un message_id reçu deux fois
+MAX_REPLAYED_MESSAGES = 32
+
+class ChatSession:
+    """
+    État propre à une conversation. Les agents sans état (QuestionAgent, tables de champs,
+    client LLM) sont des singletons partagés ; seul ce qui dépend de la conversation vit ici.
+    """
+    __slots__ = ("job_details", "lang_mem", "update_agent", "conversation", "current_field",
+                 "current_question", "is_first_interaction", "lock", "replies")
+
+    def __init__(self):
+        self.job_details = JobDetails()
+        self.lang_mem = LangMem(llm)
+        self.update_agent = UpdateAgent(self.job_details, self.lang_mem)
+        self.conversation = [{"role": "system", "content": INITIAL_MESSAGE}]
+        self.lang_mem.add_interaction("system", INITIAL_MESSAGE)
+        self.current_field = None
+        self.current_question = None
+        self.is_first_interaction = True
+        self.lock = threading.Lock()
+        self.replies = OrderedDict()
+
+# Dictionnaire pour stocker les sessions actives (créées au premier vrai message)
 active_sessions = {}
+_sessions_lock = threading.Lock()
+
+def _session_for(session_id: str) -> ChatSession:
+    sess = active_sessions.get(session_id)
+    if sess is None:
+        with _sessions_lock:
+            sess = active_sessions.get(session_id)
+            if sess is None:
+                sess = active_sessions[session_id] = ChatSession()
+    return sess
 
 @app.route('/')
 def index():
-    """Affiche la page d'accueil"""
+    """Affiche la page d'accueil (aucun état serveur tant que le visiteur n'a rien envoyé)"""
     if 'session_id' not in session:
         session['session_id'] = str(uuid.uuid4())
-    
-    session_id = session['session_id']
-    if session_id not in active_sessions:
-        job_details = JobDetails()
-        lang_mem = LangMem(llm)
-        question_agent = QuestionAgent()
-        question_agent.job_details = job_details
-        update_agent = UpdateAgent(job_details, lang_mem)
-        
-        active_sessions[session_id] = {
-            "job_details": job_details,
-            "lang_mem": lang_mem,
-            "question_agent": question_agent,
-            "update_agent": update_agent,
-            "conversation": [],
-            "current_field": None,
-            "current_question": None,
-            "is_first_interaction": True
-        }
-    
-    sess = active_sessions[session_id]
-    if sess["is_first_interaction"] and not sess["conversation"]:
-        initial_message = "Envoyez un premier message (ex. Bonjour) pour commencer."
-        sess["conversation"].append({"role": "system", "content": initial_message})
-        sess["lang_mem"].add_interaction("system", initial_message)
-    
-    return render_template('index.html', initial_conversation=sess["conversation"])
+    return render_template('index.html', initial_conversation=[{"role": "system", "content": INITIAL_MESSAGE}])
 
 def translate_question(question, target_lang, llm):
     """Traduit une question dans la langue cible à l'aide de l'LLM."""
@@ -76,187 +108,158 @@ def translate_question(question, target_lang, llm):
         print(f"⚠️ Erreur lors de la traduction: {e}")
         return question  # En cas d'erreur, retourner la question originale
 
-def generate_welcome_response(user_input, lang_mem, llm):
-    """Génère une réponse de bienvenue en fonction de la langue détectée."""
-    lang = lang_mem._detect_language(user_input)
-    lang_mem.user_language = lang
-    
-    prompt = f"""
-    L'utilisateur a envoyé ce premier message: "{user_input}"
-    Langue détectée: {lang}
-    
-    TÂCHE: Générez une réponse de bienvenue adaptée à la langue:
-    1. Répondez dans la langue détectée ({lang}).
-    2. Répétez le salut initial (ex. "Bonjour" → "Bonjour").
-    3. Présentez-vous comme un assistant intelligent aidant les recruteurs à créer des offres d'emploi.
-    4. Ton amical et professionnel, maximum 2-3 phrases.
-    
-    EXEMPLES:
-    - Input: "Bonjour", Langue: fr → "Bonjour ! Je suis un assistant intelligent qui aide les recruteurs à créer des offres d'emploi."
-    - Input: "Hello", Langue: en → "Hello! I’m an intelligent assistant helping recruiters craft job postings."
-    - Input: "Hola", Langue: es → "¡Hola! Soy un asistente inteligente que ayuda a los reclutadores a crear ofertas de empleo."
-    
-    Retournez UNIQUEMENT la réponse, sans JSON ni commentaire.
-    """
+def _next_question(sess):
+    """Prochaine question dans la langue de la session : proposition locale (fuseau du pays) ou question LLM traduite."""
+    field, question = question_agent.get_next_question(sess.job_details, sess.lang_mem)
+    if field and question:
+        lang = sess.lang_mem.user_language
+        question = question_agent.suggested_question(field, sess.job_details, lang) or translate_question(question, lang, llm)
+    return field, question
+
+def _completion_message(sess: ChatSession) -> str:
+    lang = sess.lang_mem.user_language
+    offer = serialization.format_offer(sess.job_details.get_state())
+    return f"{t('app.all_collected', lang)}\n\n{t('app.offer_result', lang, offer=offer)}"
+
+def _client_version(data) -> int:
     try:
-        response = llm.invoke(prompt)
-        return response.content.strip()
-    except Exception as e:
-        print(f"⚠️ Erreur lors de la génération de la réponse: {e}")
-        return "Bonjour ! Je suis un assistant intelligent qui aide les recruteurs à créer des offres d'emploi."
+        return max(0, int(data.get("version") or 0))
+    except (TypeError, ValueError):
+        return 0
+
+def _reply(sess, delta_since, **payload):
+    """
+    Réponse de /api/message. Format complet : conversation et état entiers.
+    Format compact (delta_since renseigné) : seulement les champs modifiés depuis la version du client.
+    Un client en avance sur le serveur (redémarrage, session recréée) reçoit l'état entier et la
+    version du serveur, qu'il reprend pour les deltas suivants.
+    """
+    job_details = sess.job_details
+    payload["progress"] = job_details.completion()
+    payload["version"] = job_details.version
+    if delta_since is None:
+        payload["conversation"] = sess.conversation
+        payload["current_state"] = job_details.get_state()
+    elif delta_since > job_details.version:
+        payload["current_state"] = job_details.get_state()
+    else:
+        payload["state_delta"] = job_details.delta_since(delta_since)
+    return jsonify(payload)
 
 @app.route('/api/message', methods=['POST'])
 def process_message():
-    """Traite les messages du chatbot"""
+    """Traite les messages du chatbot, un à la fois par session ; un message_id déjà traité est rejoué."""
     data = request.json
     user_message = data.get('message', '').strip()
-    session_id = session.get('session_id')
-    
-    if not session_id or session_id not in active_sessions:
-        return jsonify({"error": "Session invalide"}), 400
+    if 'session_id' not in session:
+        session['session_id'] = str(uuid.uuid4())
+    session_id = session['session_id']
     
-    sess = active_sessions[session_id]
+    if session_id not in active_sessions and (not user_message or user_message == 'START'):
+        # Invite initiale : inutile de créer la session avant un vrai message
+        return jsonify({"response": INITIAL_MESSAGE, "field": None,
+                        "conversation": [{"role": "system", "content": INITIAL_MESSAGE}]})
     
-    # Gestion spéciale pour le message 'START'
-    if user_message == 'START' and sess["is_first_interaction"]:
-        initial_message = "Envoyez un premier message (ex. Bonjour) pour commencer."
-        if not sess["conversation"]:
-            sess["conversation"].append({"role": "system", "content": initial_message})
-            sess["lang_mem"].add_interaction("system", initial_message)
-        return jsonify({
-            "response": initial_message,
-            "field": None,
-            "conversation": sess["conversation"]
-        })
+    sess = _session_for(session_id)
+    message_id = data.get("message_id")
+    # Verrou propre à la session : les autres sessions ne sont jamais bloquées. Un doublon
+    # (double clic, nouvel essai du client) attend ici la fin de l'original puis reçoit sa réponse.
+    with sess.lock:
+        replies = sess.replies
+        if message_id and message_id in replies:
+            body, status = replies[message_id]
+            return app.response_class(body, status=status, mimetype="application/json")
+        response = make_response(_handle_message(sess, data))
+        # Après une erreur serveur, un nouvel essai doit être retraité, pas rejoué
+        if message_id and response.status_code < 500:
+            replies[message_id] = (response.get_data(), response.status_code)
+            while len(replies) > MAX_REPLAYED_MESSAGES:
+                replies.popitem(last=False)
+        return response
+
+def _handle_message(sess, data):
+    user_message = data.get('message', '').strip()
+    # Format compact : le client envoie la dernière version reçue et ne reçoit que les champs modifiés depuis
+    delta_since = _client_version(data) if data.get("wire") == "compact" else None
     
-    # Si aucun message n'est envoyé et c'est la première interaction, renvoyer l'invite initiale
-    if not user_message and sess["is_first_interaction"]:
-        initial_message = "Envoyez un premier message (ex. Bonjour) pour commencer."
-        if not sess["conversation"]:
-            sess["conversation"].append({"role": "system", "content": initial_message})
-            sess["lang_mem"].add_interaction("system", initial_message)
-        return jsonify({
-            "response": initial_message,
-            "field": None,
-            "conversation": sess["conversation"]
-        })
+    # Message 'START' ou vide avant la première interaction : renvoyer l'invite initiale
+    if (user_message == 'START' or not user_message) and sess.is_first_interaction:
+        return _reply(sess, delta_since, response=INITIAL_MESSAGE, field=None)
     
     # Ajouter le message de l'utilisateur à la conversation (si non vide)
     if user_message:
-        sess["conversation"].append({"role": "user", "content": user_message})
-        sess["lang_mem"].add_interaction("user", user_message)
+        sess.conversation.append({"role": "user", "content": user_message})
+        sess.lang_mem.add_interaction("user", user_message)
+        # Les modifications de ce tour sont rattachées au message dans le journal
+        sess.job_details.current_turn = len(sess.conversation) - 1
     
     try:
         # Gestion de la première interaction
-        if sess["is_first_interaction"] and user_message:
-            welcome_response = generate_welcome_response(user_message, sess["lang_mem"], llm)
-            sess["conversation"].append({"role": "system", "content": welcome_response})
-            sess["lang_mem"].add_interaction("system", welcome_response)
+        if sess.is_first_interaction and user_message:
+            # Bienvenue du catalogue : seule la première question attend le LLM (personnalisation en parallèle)
+            welcome_response, personalization = welcome.start_welcome(user_message, sess.lang_mem, llm)
+            field, question = _next_question(sess)
+            welcome_response = welcome.settle(welcome_response, personalization)
+            sess.conversation.append({"role": "system", "content": welcome_response})
+            sess.lang_mem.add_interaction("system", welcome_response)
             
             # Poser la première question
-            field, question = sess["question_agent"].get_next_question(
-                sess["job_details"], 
-                sess["lang_mem"].get_summary()
-            )
             if field and question:
-                # Traduire la question selon la langue détectée
-                translated_question = translate_question(question, sess["lang_mem"].user_language, llm)
-                sess["current_field"] = field
-                sess["current_question"] = translated_question
-                sess["conversation"].append({"role": "system", "content": translated_question})
-                sess["lang_mem"].add_interaction("system", translated_question)
-                sess["is_first_interaction"] = False
-                return jsonify({
-                    "response": f"{welcome_response}\n\n{translated_question}",
-                    "field": field,
-                    "conversation": sess["conversation"],
-                    "success": True,
-                    "current_state": sess["job_details"].get_state()
-                })
+                sess.current_field = field
+                sess.current_question = question
+                sess.conversation.append({"role": "system", "content": question})
+                sess.lang_mem.add_interaction("system", question)
+                sess.is_first_interaction = False
+                return _reply(sess, delta_since, response=f"{welcome_response}\n\n{question}", field=field, success=True)
             else:
-                sess["is_first_interaction"] = False
-                return jsonify({
-                    "response": welcome_response,
-                    "field": None,
-                    "conversation": sess["conversation"],
-                    "success": True,
-                    "current_state": sess["job_details"].get_state()
-                })
+                sess.is_first_interaction = False
+                return _reply(sess, delta_since, response=welcome_response, field=None, success=True)
         
         # Si ce n'est pas la première interaction, traiter la réponse de l'utilisateur
         # Vérifier si une question est en attente avant de traiter la réponse
-        if sess["current_field"] is None or sess["current_question"] is None:
+        if sess.current_field is None or sess.current_question is None:
             # Si aucune question n'est en attente, poser la prochaine question
-            field, question = sess["question_agent"].get_next_question(
-                sess["job_details"], 
-                sess["lang_mem"].get_summary()
-            )
+            field, question = _next_question(sess)
             if field and question:
-                # Traduire la question selon la langue détectée
-                translated_question = translate_question(question, sess["lang_mem"].user_language, llm)
-                sess["current_field"] = field
-                sess["current_question"] = translated_question
-                sess["conversation"].append({"role": "system", "content": translated_question})
-                sess["lang_mem"].add_interaction("system", translated_question)
-                return jsonify({
-                    "response": translated_question,
-                    "field": field,
-                    "conversation": sess["conversation"],
-                    "success": True,
-                    "current_state": sess["job_details"].get_state()
-                })
+                sess.current_field = field
+                sess.current_question = question
+                sess.conversation.append({"role": "system", "content": question})
+                sess.lang_mem.add_interaction("system", question)
+                return _reply(sess, delta_since, response=question, field=field, success=True)
             else:
-                response = "Merci! Toutes les informations nécessaires ont été recueillies."
-                json_result = sess["job_details"].get_state()
-                response += f"\n\nVoici le résultat de l'offre d'emploi:\n{json.dumps(json_result, indent=2, ensure_ascii=False)}"
-                sess["current_field"] = None
-                sess["current_question"] = None
-                sess["conversation"].append({"role": "system", "content": response})
-                sess["lang_mem"].add_interaction("system", response)
-                return jsonify({
-                    "response": response,
-                    "field": None,
-                    "conversation": sess["conversation"],
-                    "success": True,
-                    "current_state": sess["job_details"].get_state()
-                })
+                response = _completion_message(sess)
+                sess.current_field = None
+                sess.current_question = None
+                sess.conversation.append({"role": "system", "content": response})
+                sess.lang_mem.add_interaction("system", response)
+                return _reply(sess, delta_since, response=response, field=None, success=True)
 
         # Traiter la réponse de l'utilisateur
-        success, message, intention_analysis = sess["update_agent"].update(
-            sess["current_field"], 
+        success, message, intention_analysis = sess.update_agent.update(
+            sess.current_field, 
             user_message, 
-            sess["current_question"],
-            sess["question_agent"]
+            sess.current_question,
+            question_agent
         )
         
         # Analyser le résultat
         if success:
             # Si mise à jour réussie, passer à la question suivante
-            field, question = sess["question_agent"].get_next_question(
-                sess["job_details"],
-                sess["lang_mem"].get_summary()
-            )
+            field, question = _next_question(sess)
             if field and question:
-                # Traduire la question selon la langue détectée
-                translated_question = translate_question(question, sess["lang_mem"].user_language, llm)
-                sess["current_field"] = field
-                sess["current_question"] = translated_question
-                response = translated_question
+                sess.current_field = field
+                sess.current_question = question
+                response = question
             else:
                 # Formulaire complet!
-                response = "Merci! Toutes les informations nécessaires ont été recueillies."
-                json_result = sess["job_details"].get_state()
-                response += f"\n\nVoici le résultat de l'offre d'emploi:\n{json.dumps(json_result, indent=2, ensure_ascii=False)}"
-                sess["current_field"] = None
-                sess["current_question"] = None
+                response = _completion_message(sess)
+                sess.current_field = None
+                sess.current_question = None
         elif message and message.startswith("SHOW_STATUS:"):
             # Afficher le statut actuel
-            filled_fields = {}
-            for field, value in sess["job_details"].data["jobDetails"].items():
-                if value not in [None, [], {}] and not (isinstance(value, dict) and not value.get("name")):
-                    filled_fields[field] = value
+            filled_fields = serialization.clean_details(sess.job_details.data["jobDetails"])
             
-            response = "Voici l'état actuel de l'offre d'emploi:\n"
+            response = t("app.status_header", sess.lang_mem.user_language) + "\n"
             for k, v in filled_fields.items():
                 if isinstance(v, (list, dict)):
                     response += f"• {k}: {json.dumps(v, ensure_ascii=False)}\n"
@@ -264,48 +267,49 @@ def process_message():
                     response += f"• {k}: {v}\n"
             
             # Continuer avec la question actuelle
-            response += f"\n{sess['current_question']}"
+            response += f"\n{sess.current_question}"
+        elif message and message.startswith("REVERTED:"):
+            # Modification annulée : afficher la valeur rétablie puis reprendre la question en cours
+            reverted_field = message.split("REVERTED:")[1]
+            restored_value = sess.job_details.data["jobDetails"].get(reverted_field)
+            if isinstance(restored_value, (list, dict)):
+                formatted_value = json.dumps(restored_value, ensure_ascii=False)
+            else:
+                formatted_value = str(restored_value) if restored_value is not None else t("form.not_specified", sess.lang_mem.user_language)
+            restored = t("app.value_restored", sess.lang_mem.user_language, field=reverted_field, value=formatted_value)
+            response = f"{restored}\n\n{sess.current_question}"
         elif message and message.startswith("CHANGE_FIELD:"):
             # Changer de champ
             field_to_modify = message.split("CHANGE_FIELD:")[1]
-            if field_to_modify in sess["job_details"].data["jobDetails"]:
-                sess["current_field"] = field_to_modify
-                current_value = sess["job_details"].data["jobDetails"].get(field_to_modify, "Non spécifié")
+            if field_to_modify in sess.job_details.data["jobDetails"]:
+                sess.current_field = field_to_modify
+                current_value = sess.job_details.data["jobDetails"].get(field_to_modify)
                 if isinstance(current_value, (list, dict)):
                     formatted_value = json.dumps(current_value, ensure_ascii=False)
                 else:
-                    formatted_value = str(current_value)
-                response = f"Valeur actuelle pour '{field_to_modify}': {formatted_value}. Nouvelle valeur?"
-                sess["current_question"] = response
+                    formatted_value = str(current_value) if current_value is not None else t("form.not_specified", sess.lang_mem.user_language)
+                response = t("app.current_value", sess.lang_mem.user_language, field=field_to_modify, value=formatted_value)
+                sess.current_question = response
             else:
-                response = f"Champ '{field_to_modify}' non reconnu. {sess['current_question']}"
+                response = f"{t('form.field_not_recognized', sess.lang_mem.user_language, field=field_to_modify)} {sess.current_question}"
         else:
             # Erreur, reformuler la question
             if message:
                 response = message
             else:
-                response = sess["update_agent"].reformulate_question(
-                    sess["current_field"],
-                    sess["current_question"],
+                response = sess.update_agent.reformulate_question(
+                    sess.current_field,
+                    sess.current_question,
                     "Réponse non valide",
                     intention_analysis
                 )
-                sess["current_question"] = response
+                sess.current_question = response
         
         # Ajouter la réponse à la conversation
-        sess["conversation"].append({"role": "system", "content": response})
-        sess["lang_mem"].add_interaction("system", response)
-        
-        # Obtenir l'état actuel
-        current_state = sess["job_details"].get_state()
+        sess.conversation.append({"role": "system", "content": response})
+        sess.lang_mem.add_interaction("system", response)
         
-        return jsonify({
-            "response": response,
-            "field": sess["current_field"],
-            "success": success,
-            "conversation": sess["conversation"],
-            "current_state": current_state
-        })
+        return _reply(sess, delta_since, response=response, field=sess.current_field, success=success)
         
     except Exception as e:
         error_msg = f"Erreur: {str(e)}"
@@ -321,5 +325,83 @@ def reset_session():
     session['session_id'] = str(uuid.uuid4())
     return jsonify({"success": True, "message": "Session réinitialisée"})
 
+def _current_session():
+    session_id = session.get('session_id')
+    return active_sessions.get(session_id) if session_id else None
+
+@app.route('/api/history', methods=['GET'])
+def history():
+    """Journal des modifications de l'offre depuis une version donnée (?since=N) pour l'affichage de l'historique."""
+    sess = _current_session()
+    if sess is None:
+        return jsonify({"error": "Session invalide"}), 400
+    since = request.args.get('since', default=0, type=int)
+    job_details = sess.job_details
+    return jsonify({
+        "version": job_details.version,
+        "changes": job_details.changes_since(since),
+        "can_undo": job_details.can_undo(),
+        "can_redo": job_details.can_redo()
+    })
+
+def _history_step(step: str):
+    sess = _current_session()
+    if sess is None:
+        return jsonify({"error": "Session invalide"}), 400
+    job_details = sess.job_details
+    error = None
+    with sess.lock:
+        version = job_details.version
+        try:
+            record = job_details.undo() if step == "undo" else job_details.redo()
+        except FieldValidationError as e:
+            # L'offre a changé depuis : la valeur rétablie la rendrait incohérente
+            record, error = None, e.localized(sess.lang_mem.user_language)
+    return jsonify({
+        "success": record is not None,
+        "error": error,
+        "change": record._asdict() if record else None,
+        "changes": job_details.changes_since(version),   # tous les champs d'un patch annulé d'un bloc
+        "current_state": job_details.get_state(),
+        "progress": job_details.completion(),
+        "version": job_details.version,
+        "can_undo": job_details.can_undo(),
+        "can_redo": job_details.can_redo()
+    })
+
+@app.route('/api/undo', methods=['POST'])
+def undo():
+    """Annule la dernière modification de l'offre."""
+    return _history_step("undo")
+
+@app.route('/api/redo', methods=['POST'])
+def redo():
+    """Rétablit la dernière modification annulée."""
+    return _history_step("redo")
+
+@app.route('/api/jobs/bulk', methods=['POST'])
+def bulk_jobs():
+    """
+    Ingestion en masse : corps JSONL, une description libre par ligne ({"brief": ..., "idempotency_key": ...}).
+    Réponse NDJSON en flux : une offre finalisée (ou ses champs manquants) par ligne, puis un résumé.
+    Renvoyer le même lot après une coupure ne retraite pas les lignes déjà terminées.
+    """
+    def generate():
+        for result in bulk_ingestor.run(request.stream):
+            yield serialization.dumps(result) + b"\n"
+    return app.response_class(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Expose l'état des appels LLM : admission, regroupement des prompts identiques, échecs d'analyse JSON, cache des réponses."""
+    return jsonify({
+        "llm_admission": admission.stats(),
+        "llm_single_flight": single_flight.stats(),
+        "json_parse": parse_metrics.stats(),
+        "answer_cache": answer_cache.stats(),
+        "bulk_ingest": bulk_ingestor.stats()
+    })
+
 if __name__ == '__main__':
+    warm_up_connections()
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
\ No newline at end of file
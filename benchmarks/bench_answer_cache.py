@@ -0,0 +1,75 @@
+# benchmarks/bench_answer_cache.py - Appels LLM évités par le cache des réponses (agents/answer_cache.py)
+#
+# Usage: python benchmarks/bench_answer_cache.py [sessions] [latence_llm_s]
+import os
+import sys
+import json
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.stub_server import start_stub_server
+
+# Une seule réponse du stub sert à la fois à l'analyse d'intention et à l'extraction de la valeur
+REPLY = json.dumps({"intention": "DIRECT_ANSWER", "confidence": 0.95, "value": "FREELANCE"})
+
+# Variantes réalistes d'une même réponse : casse, accents, ponctuation, mots vides
+VARIANTS = ["Freelance", "freelance", "Freelance !", "C'est du freelance", "en freelance", "FREELANCE.",
+            "un freelance svp", "Freelancer", "freelances", "Un freelancer, merci", "Je cherche un freelance"]
+
+def main(sessions: int = 200, latency: float = 0.3):
+    _, url = start_stub_server(latency=latency, reply=REPLY)
+    os.environ["TOGETHER_BASE_URL"] = url
+    os.environ.setdefault("TOGETHER_API_KEY", "stub")
+    os.environ.setdefault("LLM_MAX_RPS", "100000")
+    from config.llm_config import admission
+    from agents.answer_cache import answer_cache, embed, normalize_answer
+    from agents.update_agent import UpdateAgent
+    from models.job_details import JobDetails
+
+    rng = random.Random(7)
+    answers = [rng.choice(VARIANTS) for _ in range(sessions)]
+
+    def run(label: str, use_cache: bool):
+        answer_cache.clear()
+        admitted = admission.stats()["admitted"]
+        start = time.perf_counter()
+        for answer in answers:
+            if not use_cache:
+                answer_cache.clear()
+            agent = UpdateAgent(JobDetails(), None)
+            agent.user_language = "fr"
+            success, message, _ = agent.update("jobType", answer, "Freelance, temps plein ou temps partiel ?")
+            assert success and agent.job_details.data["jobDetails"]["jobType"] == "FREELANCE", message
+        elapsed = time.perf_counter() - start
+        calls = admission.stats()["admitted"] - admitted
+        print(f"  {label:<12} {calls:5d} appels LLM, {elapsed:6.2f} s ({elapsed / sessions * 1000:6.1f} ms par réponse)")
+
+    print(f"{sessions} réponses 'jobType' ({len(set(map(normalize_answer, VARIANTS)))} formes normalisées distinctes "
+          f"parmi {len(VARIANTS)} variantes), latence LLM simulée {latency * 1000:.0f} ms")
+    run("sans cache", use_cache=False)
+    run("avec cache", use_cache=True)
+    stats = answer_cache.stats()
+    print(f"  hits exacts {stats['exact_hits']}, hits par similarité {stats['similar_hits']}, "
+          f"valeurs réutilisées {stats['value_hits']}, revalidations refusées {stats['revalidation_failures']}")
+
+    # Coût de la recherche seule, index rempli de réponses variées sur un même champ
+    answer_cache.clear()
+    analysis = {"intention": "DIRECT_ANSWER", "confidence": 0.95}
+    words = ("python java sql docker react angular vue node typescript javascript go rust kotlin swift scala spark "
+             "excel powerbi tableau figma photoshop sap salesforce jira confluence git linux aws azure gcp terraform "
+             "ansible kubernetes django flask spring laravel symfony php ruby rails csharp dotnet unity pandas numpy "
+             "pytorch tensorflow airflow kafka hadoop mongodb postgresql mysql oracle redis elasticsearch graphql").split()
+    while len(answer_cache._entries) < 5000:
+        picked = rng.sample(words, rng.randint(1, 3))
+        answer_cache.remember("skills", ", ".join(picked), analysis, [{"name": name} for name in picked])
+    queries = ["Python, Java", "pyhton et sql", "Kubernetes, Terraform et AWS", "réponse inédite"]
+    n = 2000
+    start = time.perf_counter()
+    for i in range(n):
+        answer_cache.lookup("skills", queries[i % len(queries)])
+    print(f"  recherche dans 5000 réponses: {(time.perf_counter() - start) / n * 1e6:.0f} µs "
+          f"(vecteur d'une réponse: {len(embed(normalize_answer(queries[0])))} trigrammes)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200, float(sys.argv[2]) if len(sys.argv) > 2 else 0.3)
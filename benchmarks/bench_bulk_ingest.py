@@ -0,0 +1,45 @@
+# benchmarks/bench_bulk_ingest.py - Débit de /api/jobs/bulk (offres par minute) face à un LLM simulé
+#
+# Usage: python benchmarks/bench_bulk_ingest.py [nombre_offres] [latence_llm_s]
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.stub_server import start_stub_server
+
+REPLY = json.dumps({
+    "title": "Data Scientist", "description": "Modélisation et analyse de données", "discipline": "Data Science",
+    "availability": 4, "seniority": "SENIOR", "jobType": "FULLTIME", "type": "ONSITE",
+    "minFullTimeSalary": 55000, "maxFullTimeSalary": 65000, "country": {"name": "France"}, "city": "Lyon",
+    "skills": [{"name": "Python", "mandatory": True}], "languages": [{"name": "Anglais", "level": "C1", "required": True}]
+})
+
+def main(postings: int = 64, latency: float = 0.5):
+    _, url = start_stub_server(latency=latency, reply=REPLY)
+    os.environ["TOGETHER_BASE_URL"] = url
+    os.environ.setdefault("TOGETHER_API_KEY", "stub")
+    # Le stub répond sans limite : ne pas mesurer le contrôle d'admission
+    os.environ.setdefault("LLM_MAX_RPS", "100000")
+    from app import app
+    client = app.test_client()
+
+    def run(prefix: str, count: int):
+        body = "\n".join(json.dumps({"brief": f"CDI Data Scientist senior à Lyon, 55-65k€ ({prefix} {i})"}) for i in range(count))
+        lines = client.post("/api/jobs/bulk", data=body).data.decode("utf-8").splitlines()
+        return json.loads(lines[-1])["summary"]
+
+    run("chauffe", 2)  # imports et bases pycountry hors mesure
+    summary = run("mesure", postings)
+    print(f"{postings} offres, latence LLM simulée {latency * 1000:.0f} ms, "
+          f"{app.json.loads(client.get('/api/metrics').data)['bulk_ingest']['max_workers']} workers")
+    print(f"  {summary['elapsed_s']:.2f} s, {summary['postings_per_minute']:,.0f} offres/min, "
+          f"latence p50 {summary['latency_ms_p50']:.0f} ms, p95 {summary['latency_ms_p95']:.0f} ms")
+    print(f"  séquentiel théorique: {60 / latency:,.0f} offres/min")
+    resumed = run("mesure", postings)
+    print(f"  reprise du même lot: {resumed['cached']}/{resumed['items']} lignes servies par clé d'idempotence "
+          f"en {resumed['elapsed_s']:.3f} s")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 64, float(sys.argv[2]) if len(sys.argv) > 2 else 0.5)
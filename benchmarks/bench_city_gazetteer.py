@@ -0,0 +1,84 @@
+# benchmarks/bench_city_gazetteer.py - Villes validées hors ligne : gazetteer projeté en mémoire vs appels LLM
+#
+# Usage: python benchmarks/bench_city_gazetteer.py [latence_llm_s]
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.stub_server import start_stub_server
+
+# Une seule réponse du stub sert à l'intention, à l'extraction de la ville et au contrôle de cohérence
+REPLY = json.dumps({"intention": "DIRECT_ANSWER", "confidence": 0.95, "value": "Lyon", "contradiction": False})
+
+ANSWERS = [
+    ("France", "Lyon"), ("France", "Le poste est basé à Lyon"), ("France", "Marseille et sa région"),
+    ("France", "Bureaux à Paris, près de la Défense"), ("France", "Toulouze"), ("France", "St-Étienne"),
+    ("France", "Aix-en-Provence"), ("France", "nice"), ("Maroc", "Casablanca"), ("Maroc", "Casa"),
+    ("Maroc", "Rabat ou Salé"), ("Espagne", "Barcelona"), ("Espagne", "Valencia"), ("Belgique", "Louvain-la-Neuve"),
+    ("Suisse", "Genève"), ("Canada", "Montreal"), ("Allemagne", "Frankfurt am Main"), ("Allemagne", "Lyon"),
+    ("France", "Trifouilly-les-Oies"), ("France", "Paris ou Lyon"), ("France", "Là où se trouve le client"),
+]
+
+def main(latency: float = 0.3):
+    _, url = start_stub_server(latency=latency, reply=REPLY)
+    os.environ["TOGETHER_BASE_URL"] = url
+    os.environ.setdefault("TOGETHER_API_KEY", "stub")
+    os.environ.setdefault("LLM_MAX_RPS", "100000")
+    from config.llm_config import admission, llm
+    from agents.answer_cache import answer_cache
+    from agents.lang_mem import LangMem
+    from agents.update_agent import UpdateAgent
+    from models import gazetteer
+    from models.job_details import JobDetails
+
+    start = time.perf_counter()
+    gazetteer.city_in_country("Paris", "France")
+    opened = (time.perf_counter() - start) * 1000
+
+    local = checked = 0
+    for country, answer in ANSWERS:
+        match = gazetteer.extract_city(answer, country)
+        resolved = match is not None and match.confidence >= gazetteer.MIN_CONFIDENCE
+        inside = gazetteer.city_in_country(match.name, country) if resolved else None
+        local += resolved
+        checked += inside is not None
+        detail = f"{match.name} ({match.country}, confiance {match.confidence})" if match else "-"
+        verdict = {True: "", False: f"  ⚠️ hors de {country}", None: ""}[inside]
+        print(f"{'local' if resolved else 'LLM  '}  {country:<9} {answer:<36} -> {detail}{verdict}")
+
+    n = 20000
+    start = time.perf_counter()
+    for i in range(n):
+        country, answer = ANSWERS[i % len(ANSWERS)]
+        gazetteer.extract_city(answer, country)
+    per_answer = (time.perf_counter() - start) / n * 1e6
+    start = time.perf_counter()
+    for i in range(n):
+        country, answer = ANSWERS[i % len(ANSWERS)]
+        gazetteer.city_in_country(answer, country)
+    per_check = (time.perf_counter() - start) / n * 1e6
+
+    answer_cache.clear()
+    UpdateAgent(JobDetails(), None).detect_intention("ok", "city", {})   # import du client hors mesure
+    admitted = admission.stats()["admitted"]
+    start = time.perf_counter()
+    for country, answer in ANSWERS:
+        details = JobDetails()
+        details.update("country", {"name": country})
+        agent = UpdateAgent(details, None)
+        agent.user_language = "fr"
+        agent.update("city", answer, "Dans quelle ville le poste est-il situé ?")
+        LangMem(llm).check_contradiction("city", details.data["jobDetails"]["city"] or answer, details.get_state())
+    elapsed = time.perf_counter() - start
+    calls = admission.stats()["admitted"] - admitted
+
+    print(f"\n{local}/{len(ANSWERS)} villes reconnues sans appel LLM, cohérence ville/pays tranchée localement "
+          f"pour {checked}/{len(ANSWERS)}")
+    print(f"  premier appel (index projeté, noms de pays) en {opened:.1f} ms, {per_answer:.1f} µs par réponse, {per_check:.1f} µs par contrôle ville/pays")
+    print(f"  update + check_contradiction : {calls} appels LLM pour {len(ANSWERS)} réponses "
+          f"(contre {3 * len(ANSWERS)} : intention, valeur, cohérence), {elapsed:.2f} s avec {latency * 1000:.0f} ms de latence")
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.3)
@@ -0,0 +1,96 @@
+# benchmarks/bench_context_encoder.py - Appels LLM et taille des prompts d'un tour, contexte encodé localement
+#
+# Usage: python benchmarks/bench_context_encoder.py [tours] [latence_llm_s]
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.stub_server import start_stub_server
+
+REPLY = json.dumps({"intention": "DIRECT_ANSWER", "confidence": 0.95, "value": "Data Scientist"})
+
+OFFER = {
+    "title": "Data Scientist confirmé",
+    "description": "Concevoir et industrialiser des modèles de prévision de la demande, en lien avec les équipes "
+                   "produit et data engineering. Encadrement de deux profils juniors.",
+    "discipline": "Data Science",
+    "seniority": "SENIOR",
+    "skills": [{"name": "Python", "mandatory": True}, {"name": "SQL", "mandatory": True}, {"name": "Spark", "mandatory": False}],
+    "languages": [{"name": "Français", "level": "C2", "required": True}, {"name": "Anglais", "level": "B2", "required": True}],
+    "jobType": "FULLTIME",
+}
+
+HISTORY = [
+    ("system", "Bonjour ! Quel est le titre du poste ?"),
+    ("user", "Nous recrutons un Data Scientist confirmé pour notre équipe Supply Chain"),
+    ("system", "Pouvez-vous décrire les missions principales ?"),
+    ("user", "Prévision de la demande, industrialisation des modèles, encadrement de deux juniors"),
+    ("system", "Quelles compétences sont requises ?"),
+    ("user", "Python et SQL obligatoires, Spark apprécié"),
+    ("system", "Quel est le type de contrat ?"),
+    ("user", "CDI temps plein"),
+]
+
+ANSWERS = [
+    ("title", "En fait plutôt Lead Data Scientist", "Quel est le titre du poste ?"),
+    ("description", "Ajoutez la mise en production sur GCP", "Pouvez-vous décrire les missions principales ?"),
+    ("discipline", "C'est de la data, côté supply chain", "Dans quel domaine se situe le poste ?"),
+]
+
+def main(turns: int = 6, latency: float = 0.1):
+    server, url = start_stub_server(latency=latency, reply=REPLY)
+    os.environ["TOGETHER_BASE_URL"] = url
+    os.environ.setdefault("TOGETHER_API_KEY", "stub")
+    os.environ.setdefault("LLM_MAX_RPS", "100000")
+    from config.llm_config import llm
+    from agents import context_encoder
+    from agents.answer_cache import answer_cache
+    from agents.lang_mem import LangMem
+    from agents.update_agent import UpdateAgent
+    from models.job_details import JobDetails
+
+    def session():
+        job_details = JobDetails()
+        job_details.update_many(OFFER)
+        lang_mem = LangMem(llm)
+        for role, content in HISTORY:
+            lang_mem.short_term_memory.append({"role": role, "content": content})
+            (lang_mem.chat_history.add_user_message if role == "user" else lang_mem.chat_history.add_ai_message)(content)
+        return job_details, lang_mem
+
+    job_details, lang_mem = session()
+    UpdateAgent(job_details, None).detect_intention("ok", "title", {})   # import du client hors mesure
+    counter = server.RequestHandlerClass.prompt_chars
+
+    requests_before, chars_before = counter
+    start = time.perf_counter()
+    for i in range(turns):
+        answer_cache.clear()
+        job_details, lang_mem = session()
+        agent = UpdateAgent(job_details, lang_mem)
+        agent.user_language = "fr"
+        field, answer, question = ANSWERS[i % len(ANSWERS)]
+        lang_mem.short_term_memory.append({"role": "user", "content": answer})
+        agent.update(field, answer, question)
+    elapsed = (time.perf_counter() - start) / turns * 1000
+    time.sleep(latency * 2)   # extractions spéculatives éventuellement encore en vol
+    requests, chars = counter[0] - requests_before, counter[1] - chars_before
+
+    block = context_encoder.encode(job_details.data["jobDetails"], lang_mem, "intention")
+    n = 5000
+    start = time.perf_counter()
+    for _ in range(n):
+        context_encoder.encode(job_details.data["jobDetails"], lang_mem, "intention")
+    encode_us = (time.perf_counter() - start) / n * 1e6
+
+    print(f"{turns} tours UpdateAgent.update (offre de {len(OFFER)} champs, {len(HISTORY)} échanges), latence {latency * 1000:.0f} ms")
+    print(f"  {requests / turns:.1f} appels LLM par tour, {chars / turns:.0f} caractères de prompt par tour "
+          f"({chars / max(requests, 1):.0f} par appel), {elapsed:.0f} ms par tour")
+    print(f"  bloc de contexte 'intention' : {context_encoder.estimate_tokens(block)} tokens "
+          f"(budget {context_encoder.TEMPLATES['intention'].budget}), encodé en {encode_us:.1f} µs\n")
+    print(block)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 6, float(sys.argv[2]) if len(sys.argv) > 2 else 0.1)
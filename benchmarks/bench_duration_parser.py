@@ -0,0 +1,68 @@
+# benchmarks/bench_duration_parser.py - Appels LLM évités par l'analyse locale des délais (availability, estimatedWeeks)
+#
+# Usage: python benchmarks/bench_duration_parser.py [latence_llm_s]
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.stub_server import start_stub_server
+
+# Une seule réponse du stub sert à la fois à l'analyse d'intention et à l'extraction de la valeur
+REPLY = json.dumps({"intention": "DIRECT_ANSWER", "confidence": 0.95, "value": 4})
+
+ANSWERS = [
+    ("availability", "Immédiatement"), ("availability", "ASAP"), ("availability", "Dès que possible"),
+    ("availability", "dans un mois"), ("availability", "2-3 semaines"), ("availability", "début janvier"),
+    ("availability", "sous 15 jours"), ("availability", "la semaine prochaine"), ("availability", "mi-février"),
+    ("availability", "as soon as possible"), ("availability", "en 2 semanas"), ("availability", "Pas avant l'été"),
+    ("availability", "quand il aura fini son préavis"), ("availability", "2"),
+    ("estimatedWeeks", "3 mois"), ("estimatedWeeks", "6 mois environ"), ("estimatedWeeks", "entre 4 et 6 semaines"),
+    ("estimatedWeeks", "jusqu'à la fin de l'année"), ("estimatedWeeks", "un an"), ("estimatedWeeks", "un mois et demi"),
+    ("estimatedWeeks", "le temps de la migration"),
+]
+
+def main(latency: float = 0.3):
+    _, url = start_stub_server(latency=latency, reply=REPLY)
+    os.environ["TOGETHER_BASE_URL"] = url
+    os.environ.setdefault("TOGETHER_API_KEY", "stub")
+    os.environ.setdefault("LLM_MAX_RPS", "100000")
+    from config.llm_config import admission
+    from agents.answer_cache import answer_cache
+    from agents.update_agent import UpdateAgent
+    from models.durations import DURATION_FIELDS, MIN_CONFIDENCE, parse_duration
+    from models.job_details import JobDetails
+
+    local = 0
+    for field, answer in ANSWERS:
+        parsed = parse_duration(answer, DURATION_FIELDS[field])
+        resolved = parsed is not None and parsed.confidence >= MIN_CONFIDENCE
+        local += resolved
+        detail = f"{parsed.weeks:g} sem. ({parsed.kind}, confiance {parsed.confidence})" if parsed else "-"
+        print(f"{'local' if resolved else 'LLM  '}  {field:<15} {answer:<34} -> {detail}")
+
+    n = 20000
+    start = time.perf_counter()
+    for i in range(n):
+        field, answer = ANSWERS[i % len(ANSWERS)]
+        parse_duration(answer, DURATION_FIELDS[field])
+    per_answer = (time.perf_counter() - start) / n * 1e6
+
+    answer_cache.clear()
+    UpdateAgent(JobDetails(), None).detect_intention("ok", "availability", {})   # import du client hors mesure
+    admitted = admission.stats()["admitted"]
+    start = time.perf_counter()
+    for field, answer in ANSWERS:
+        agent = UpdateAgent(JobDetails(), None)
+        agent.user_language = "fr"
+        agent.update(field, answer, "Quand le candidat doit-il être disponible ?")
+    elapsed = time.perf_counter() - start
+    calls = admission.stats()["admitted"] - admitted
+
+    print(f"\n{local}/{len(ANSWERS)} réponses résolues sans appel LLM, {per_answer:.1f} µs par réponse")
+    print(f"  UpdateAgent.update : {calls} appels LLM pour {len(ANSWERS)} réponses "
+          f"(contre {2 * len(ANSWERS)} : intention puis valeur), {elapsed:.2f} s avec {latency * 1000:.0f} ms de latence")
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.3)
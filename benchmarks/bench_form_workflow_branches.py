@@ -0,0 +1,58 @@
+# benchmarks/bench_form_workflow_branches.py - Tours FormWorkflow : étapes post-réponse en série ou en branches parallèles
+#
+# Usage: python benchmarks/bench_form_workflow_branches.py [tours] [latence_llm_s]
+import io
+import os
+import sys
+import json
+import time
+import builtins
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.stub_server import start_stub_server
+
+# Une seule réponse du stub sert à l'intention, à l'extraction, aux faits et aux questions
+REPLY = json.dumps({"intention": "DIRECT_ANSWER", "confidence": 0.95, "value": "Data Scientist"})
+
+def main(turns: int = 6, latency: float = 0.2):
+    _, url = start_stub_server(latency=latency, reply=REPLY)
+    os.environ["TOGETHER_BASE_URL"] = url
+    os.environ.setdefault("TOGETHER_API_KEY", "stub")
+    os.environ.setdefault("LLM_MAX_RPS", "100000")
+    from config.llm_config import admission
+    from agents.answer_cache import answer_cache
+    from agents.update_agent import UpdateAgent
+    from models.job_details import JobDetails
+    from workflow import form_workflow
+
+    def run(parallel: bool):
+        form_workflow.WORKFLOW_PARALLEL = parallel
+        answer_cache.clear()
+        workflow = form_workflow.FormWorkflow()
+        # Le recruteur : un salut puis des réponses, et la fin de l'entrée arrête le graphe
+        answers = iter(["Bonjour"] + [f"Nous recrutons un Data Scientist ({i})" for i in range(turns)])
+        def scripted_input(prompt=""):
+            answer = next(answers, None)
+            if answer is None:
+                raise EOFError
+            return answer
+        builtins.input = scripted_input
+        admitted = admission.stats()["admitted"]
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            workflow.start()
+        elapsed = time.perf_counter() - start
+        return workflow.timings, elapsed, admission.stats()["admitted"] - admitted
+
+    UpdateAgent(JobDetails(), None).detect_intention("ok", "title", {})   # import du client hors mesure
+    print(f"{turns} réponses, latence LLM simulée {latency * 1000:.0f} ms\n")
+    for parallel in (False, True):
+        timings, elapsed, calls = run(parallel)
+        critical, total = timings.critical_path()
+        print(f"--- {'branches parallèles' if parallel else 'en série'} : {elapsed:.2f} s, {calls} appels LLM, "
+              f"chemin critique {critical:.2f} s pour {total:.2f} s de nœuds")
+        print(timings.report() + "\n")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 6, float(sys.argv[2]) if len(sys.argv) > 2 else 0.2)
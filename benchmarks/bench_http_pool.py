@@ -0,0 +1,63 @@
+# benchmarks/bench_http_pool.py - Surcoût par appel LLM : connexion froide vs pool keep-alive partagé
+#
+# Usage: python benchmarks/bench_http_pool.py [nombre_appels]
+import os
+import sys
+import time
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TOGETHER_API_KEY", "stub")
+# Le stub répond sans limite : ne pas mesurer le contrôle d'admission
+os.environ.setdefault("LLM_MAX_RPS", "100000")
+
+import httpx
+from benchmarks.stub_server import start_stub_server
+from config import llm_config
+from langchain_openai import ChatOpenAI
+
+def _measure(label: str, calls: int, fn) -> float:
+    fn()  # premier appel hors mesure (imports, sérialiseurs)
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    median = statistics.median(timings)
+    p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+    print(f"{label:<32} médiane {median:7.3f} ms   p95 {p95:7.3f} ms")
+    return median
+
+def main(calls: int = 200):
+    server, base_url = start_stub_server()
+    print(f"Stub: {base_url} - {calls} appels par scénario (HTTP/2 activé: {llm_config.HTTP2_ENABLED})\n")
+
+    def cold_llm_call():
+        # Ce que faisait tests/+++.py : un client (et donc un pool) par instance
+        with httpx.Client(timeout=llm_config.make_http_timeout()) as client:
+            cold = ChatOpenAI(base_url=base_url, api_key="stub", model="stub", http_client=client)
+            cold.invoke("ping")
+
+    pooled = llm_config.create_llm(model="stub", base_url=base_url)
+
+    def pooled_llm_call():
+        pooled.invoke("ping")
+
+    def cold_http_call():
+        with httpx.Client() as client:
+            client.post(f"{base_url}/chat/completions", json={"model": "stub", "messages": []})
+
+    def pooled_http_call():
+        llm_config.get_http_client().post(f"{base_url}/chat/completions", json={"model": "stub", "messages": []})
+
+    cold_http = _measure("httpx, connexion froide", calls, cold_http_call)
+    pooled_http = _measure("httpx, pool partagé", calls, pooled_http_call)
+    cold_llm = _measure("ChatOpenAI, connexion froide", calls, cold_llm_call)
+    pooled_llm = _measure("ChatOpenAI, pool partagé", calls, pooled_llm_call)
+
+    print(f"\nGain httpx: {cold_http - pooled_http:.3f} ms/appel, ChatOpenAI: {cold_llm - pooled_llm:.3f} ms/appel")
+    print("(en local, sans TLS : le gain réel vers api.together.xyz inclut en plus le handshake TLS)")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
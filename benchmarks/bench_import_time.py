@@ -0,0 +1,88 @@
+# benchmarks/bench_import_time.py - Temps d'import à froid de l'application (rapport `python -X importtime`)
+#
+# Usage: python benchmarks/bench_import_time.py [module] [nombre_runs]
+# Chaque mesure est ajoutée à benchmarks/results/import_time.jsonl pour suivre l'évolution.
+import os
+import sys
+import json
+import time
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS = os.path.join(ROOT, "benchmarks", "results", "import_time.jsonl")
+
+def _import_report(module: str) -> list:
+    """Lance un interpréteur neuf et retourne [(module, self_us, cumulé_us)] dans l'ordre du rapport."""
+    env = dict(os.environ)
+    # L'import doit marcher hors ligne et sans clé API
+    env.pop("TOGETHER_API_KEY", None)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Import de {module} impossible:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+def main(module: str = "app", runs: int = 5):
+    # Modules chargés par l'interpréteur lui-même, exclus du classement
+    startup = {name.strip() for name, _, _ in _import_report("sys")}
+    totals = []
+    for _ in range(runs):
+        rows = _import_report(module)
+        totals.append(next(cumulative for name, _, cumulative in rows if name.strip() == module) / 1000)
+
+    # Dépendances directes de premier niveau (indentation d'un niveau) les plus coûteuses
+    top_level = [(name.strip(), cumulative / 1000) for name, _, cumulative in rows
+                 if name.startswith("  ") and not name.startswith("    ") and name.strip() not in startup]
+    top_level.sort(key=lambda item: item[1], reverse=True)
+    heavy = {"openai", "langchain_openai", "langgraph", "langchain_community", "httpx", "pycountry"}
+    loaded_heavy = sorted({name.strip().split(".")[0] for name, _, _ in rows} & heavy)
+
+    entry = {
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "module": module,
+        "runs": runs,
+        "median_ms": round(statistics.median(totals), 1),
+        "min_ms": round(min(totals), 1),
+        "heavy_modules_loaded": loaded_heavy,
+        "top": [[name, round(ms, 1)] for name, ms in top_level[:10]]
+    }
+
+    print(f"import {module}: médiane {entry['median_ms']:.1f} ms, min {entry['min_ms']:.1f} ms sur {runs} runs")
+    print(f"Dépendances lourdes chargées à l'import: {', '.join(loaded_heavy) or 'aucune'}")
+    print("\nImports directs les plus coûteux (cumulé):")
+    for name, ms in entry["top"]:
+        print(f"  {name:<40} {ms:8.1f} ms")
+
+    previous = None
+    if os.path.exists(RESULTS):
+        with open(RESULTS, encoding="utf-8") as f:
+            history = [json.loads(line) for line in f if line.strip()]
+        previous = next((item for item in reversed(history) if item["module"] == module), None)
+    if previous:
+        delta = entry["median_ms"] - previous["median_ms"]
+        print(f"\nPrécédent ({previous['commit'] or '?'} du {previous['date']}): {previous['median_ms']:.1f} ms ({delta:+.1f} ms)")
+
+    os.makedirs(os.path.dirname(RESULTS), exist_ok=True)
+    with open(RESULTS, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "app", int(sys.argv[2]) if len(sys.argv) > 2 else 5)
@@ -0,0 +1,80 @@
+# benchmarks/bench_job_details_update.py - Débit de JobDetails.update sur tous les champs du formulaire
+#
+# Usage: python benchmarks/bench_job_details_update.py [itérations]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.job_details import JobDetail, JobDetails
+
+# Une valeur valide par champ, dans l'ordre où une conversation les remplit
+SAMPLE = {
+    "title": "Développeur Python",
+    "description": "Conception et maintenance d'API",
+    "discipline": "Informatique",
+    "availability": "2",
+    "seniority": "SENIOR",
+    "languages": [{"name": "Français", "level": "C1", "required": True}],
+    "skills": [{"name": "Python", "mandatory": True}],
+    "jobType": "FREELANCE",
+    "minHourlyRate": 40,
+    "maxHourlyRate": "60",
+    "weeklyHours": 35,
+    "estimatedWeeks": 12,
+    "minFullTimeSalary": 45000,
+    "maxFullTimeSalary": 60000,
+    "minPartTimeSalary": 20000,
+    "maxPartTimeSalary": 30000,
+    "type": "REMOTE",
+    "continents": [{"name": "Europe"}],
+    "countries": [{"name": "France"}],
+    "regions": [{"name": "Bretagne"}],
+    "timeZone": {"name": "Europe/Paris", "overlap": 4},
+    "country": {"name": "France"},
+    "city": "Paris",
+}
+
+def _per_call_us(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def main(iterations: int = 2000):
+    assert set(SAMPLE) == set(JobDetail.model_fields), "SAMPLE doit couvrir tous les champs"
+    job = JobDetails()
+    for field, value in SAMPLE.items():
+        ok, error = job.update(field, value)
+        assert ok, f"{field}: {error}"
+
+    print(f"{'champ':<20} {'update (µs)':>12} {'modèle complet (µs)':>20}")
+    total_update = total_model = geo_update = 0.0
+    for field, value in SAMPLE.items():
+        # pycountry domine pour les champs géographiques : moins d'itérations
+        n = iterations if field not in ("countries", "regions") else max(20, iterations // 50)
+        update_us = _per_call_us(lambda: job.update(field, value), n)
+        # Référence : revalider tout le modèle à chaque modification
+        state = dict(job.data["jobDetails"])
+        model_us = _per_call_us(lambda: JobDetail.model_validate({**state, field: value}), n)
+        total_update += update_us
+        total_model += model_us
+        if field in ("countries", "regions"):
+            geo_update += update_us
+        print(f"{field:<20} {update_us:12.1f} {model_us:20.1f}")
+
+    print(f"\n{len(SAMPLE)} champs: {total_update:.0f} µs par passe complète avec update "
+          f"({len(SAMPLE) / total_update * 1e6:,.0f} mises à jour/s), dont {geo_update:.0f} µs de recherche pycountry")
+    fast = total_update - geo_update
+    print(f"Hors countries/regions: {fast:.1f} µs pour {len(SAMPLE) - 2} champs ({(len(SAMPLE) - 2) / fast * 1e6:,.0f} mises à jour/s), "
+          f"contre {total_model:.1f} µs en revalidant le modèle complet")
+
+    plain = {field: value for field, value in SAMPLE.items() if field not in ("continents", "countries", "regions")}
+    sequential_us = _per_call_us(lambda: [job.update(field, value) for field, value in plain.items()], iterations // 10)
+    patch_us = _per_call_us(lambda: job.update_many(plain), iterations // 10)
+    print(f"Patch de {len(plain)} champs non géographiques: update x{len(plain)} {sequential_us:.1f} µs, "
+          f"update_many {patch_us:.1f} µs")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
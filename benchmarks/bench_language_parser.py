@@ -0,0 +1,83 @@
+# benchmarks/bench_language_parser.py - Réponses "langues" analysées par seconde : parseur local vs appel LLM
+#
+# Usage: python benchmarks/bench_language_parser.py [itérations] [latence_llm_s]
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.stub_server import start_stub_server
+
+REPLY = json.dumps({"value": [{"name": "Anglais", "level": "C1", "required": True}]})
+
+# Réponses typiques de recruteurs (fr/en/es) : niveaux CECRL ou en toutes lettres, marqueurs obligatoire/optionnel
+ANSWERS = [
+    "Français courant, anglais B2, espagnol un plus",
+    "Anglais obligatoire, français apprécié",
+    "Espagnol courant et allemand basique",
+    "Français et anglais courants",
+    "Niveau C1 en anglais et B2 en espagnol",
+    "Anglais",
+    "Bilingue anglais/français",
+    "Une bonne maîtrise de l'anglais est indispensable, l'allemand serait un atout",
+    "English fluent, Spanish nice to have",
+    "Inglés avanzado y francés deseable",
+    "Arabe langue maternelle, anglais courant requis",
+    "Mandarin idéalement",
+    "Anglais niveau C1 minimum (obligatoire)",
+    "Anglais lu, écrit, parlé",
+    "Portugais natif, notions d'italien",
+    "Anglais TOEIC 850 minimum",
+    "Anglais technique",
+    "Pas besoin d'anglais",
+    "Néerlandais ou allemand, niveau intermédiaire",
+    "Français C2; anglais B1",
+]
+
+def main(iterations: int = 2000, latency: float = 0.3):
+    _, url = start_stub_server(latency=latency, reply=REPLY)
+    os.environ["TOGETHER_BASE_URL"] = url
+    os.environ.setdefault("TOGETHER_API_KEY", "stub")
+    os.environ.setdefault("LLM_MAX_RPS", "100000")
+    from config.llm_config import admission
+    from agents.update_agent import UpdateAgent
+    from models.job_details import JobDetails
+    from models.language_levels import extract_languages
+
+    local = 0
+    for answer in ANSWERS:
+        extraction = extract_languages(answer)
+        resolved = bool(extraction.languages) and not extraction.residue
+        local += resolved
+        languages = ", ".join(f"{l['name']} {l['level']}{'' if l['required'] else '?'}" for l in extraction.languages)
+        residue = f"  | LLM: {extraction.residue}" if extraction.residue else ""
+        print(f"{'local' if resolved else 'LLM  '}  {answer:<62} -> {languages}{residue}")
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for answer in ANSWERS:
+            extract_languages(answer)
+    local_rate = iterations * len(ANSWERS) / (time.perf_counter() - start)
+
+    agent = UpdateAgent(JobDetails(), None)
+    agent.user_language = "fr"
+    question = "Quelles langues sont requises ?"
+    agent._extract_languages_with_llm(ANSWERS[0], question, [], [])   # import du client et connexion hors mesure
+    start = time.perf_counter()
+    for answer in ANSWERS:
+        agent._extract_languages_with_llm(answer, question, [], [])
+    api_rate = len(ANSWERS) / (time.perf_counter() - start)
+
+    admitted = admission.stats()["admitted"]
+    for answer in ANSWERS:
+        UpdateAgent(JobDetails(), None)._update_languages("languages", answer, question, {})
+    calls = admission.stats()["admitted"] - admitted
+
+    print(f"\n{local}/{len(ANSWERS)} réponses résolues sans appel LLM ({local / len(ANSWERS):.0%})")
+    print(f"  parseur local : {local_rate:10.0f} réponses/s")
+    print(f"  via l'API     : {api_rate:10.1f} réponses/s (latence simulée {latency * 1000:.0f} ms)")
+    print(f"  _update_languages : {calls} appels LLM pour {len(ANSWERS)} réponses (un par réponse auparavant)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000, float(sys.argv[2]) if len(sys.argv) > 2 else 0.3)
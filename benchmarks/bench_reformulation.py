@@ -0,0 +1,67 @@
+# benchmarks/bench_reformulation.py - Reformulation après une erreur : appels LLM et latence, cache (champ, catégorie, langue)
+#
+# Usage: python benchmarks/bench_reformulation.py [latence_llm_s]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.stub_server import start_stub_server
+
+def main(latency: float = 0.2):
+    _, url = start_stub_server(latency=latency, reply="Pouvez-vous préciser votre réponse (ex. 35, 40) ?")
+    os.environ["TOGETHER_BASE_URL"] = url
+    os.environ.setdefault("TOGETHER_API_KEY", "stub")
+    os.environ.setdefault("LLM_MAX_RPS", "100000")
+    from config.llm_config import admission
+    from config.messages import t
+    from agents import reformulation
+    from agents.update_agent import UpdateAgent
+    from models.job_details import JobDetails
+
+    # Erreurs typiques d'une session : (champ, message d'erreur, analyse)
+    errors = [
+        ("minFullTimeSalary", t("update.number_expected", "fr", field="minFullTimeSalary"), None),
+        ("weeklyHours", t("validation.above_max", "fr", field="weeklyHours", max=168), None),
+        ("continents", t("validation.invalid_continent", "fr", name="Atlantide", allowed="Europe, Asie"), None),
+        ("seniority", t("update.unknown_choice", "fr", field="seniority", allowed="JUNIOR, MID, SENIOR"), None),
+        ("minHourlyRate", "La réponse ne contient pas de nombre exploitable", None),
+        ("skills", None, {"intention": "CLARIFICATION"}),
+        ("title", "Confusion détectée", {"intention": "CONFUSION"}),
+        ("city", "Réponse non valide", None),
+    ]
+    agent = UpdateAgent(JobDetails(), None)
+    agent.llm.invoke("ping")   # import du client hors mesure
+
+    def run(lang: str, rounds: int = 3):
+        agent.user_language = lang
+        admitted = admission.stats()["admitted"]
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for field, error, analysis in errors:
+                text = agent.reformulate_question(field, "Question précédente ?", error, analysis)
+        count = rounds * len(errors)
+        return (time.perf_counter() - start) / count * 1000, (admission.stats()["admitted"] - admitted) / count, text
+
+    print(f"{len(errors)} erreurs typiques, latence LLM {latency * 1000:.0f} ms")
+    reformulation.REFORMULATION_CACHE = False
+    elapsed, calls, _ = run("fr", rounds=1)
+    print(f"  LLM à chaque erreur        : {elapsed:8.2f} ms, {calls:.2f} appels LLM par reformulation")
+
+    reformulation.REFORMULATION_CACHE = True
+    reformulation.reformulation_cache.clear()
+    start = time.perf_counter()
+    entries = reformulation.reformulation_cache.prewarm()
+    print(f"  préchauffage               : {entries} entrées en {(time.perf_counter() - start) * 1000:.1f} ms")
+    for lang in ("fr", "en", "es"):
+        elapsed, calls, text = run(lang)
+        print(f"  cache ({lang})                 : {elapsed:8.3f} ms, {calls:.2f} appels LLM par reformulation")
+    elapsed, calls, _ = run("de", rounds=1)
+    print(f"  langue hors catalogue (de) : {elapsed:8.2f} ms, {calls:.2f} appels LLM par reformulation (premier passage)")
+    elapsed, calls, _ = run("de")
+    print(f"  langue hors catalogue (de) : {elapsed:8.3f} ms, {calls:.2f} appels LLM par reformulation (ensuite)")
+    print(f"  {reformulation.reformulation_cache.stats()}")
+    print(f"\n  exemple : {text}")
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.2)
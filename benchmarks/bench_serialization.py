@@ -0,0 +1,65 @@
+# benchmarks/bench_serialization.py - Coût de sérialisation des réponses /api/message selon la longueur de la conversation
+#
+# Usage: python benchmarks/bench_serialization.py [itérations]
+# Compare jsonify par défaut de Flask (json + tri des clés), FastJSONProvider (format complet)
+# et le format compact (delta d'état, sans conversation).
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TOGETHER_API_KEY", "stub")
+
+from flask import Flask
+from app import FastJSONProvider
+from models import serialization
+from models.job_details import JobDetails
+from benchmarks.bench_job_details_update import SAMPLE
+
+MESSAGE = ("Nous recherchons un développeur Python senior pour renforcer notre équipe data, "
+           "en télétravail avec quelques déplacements à Paris. ")
+
+def _per_call_us(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def main(iterations: int = 500):
+    job = JobDetails()
+    for field, value in SAMPLE.items():
+        if field not in ("countries", "regions"):  # pycountry hors sujet ici
+            job.update(field, value)
+    version = job.version
+    job.update("title", "Développeur Python senior")
+
+    default_app = Flask("default")
+    fast_app = Flask("fast")
+    fast_app.json = FastJSONProvider(fast_app)
+
+    print(f"orjson: {'oui' if serialization.orjson else 'non (repli json)'}")
+    print(f"{'messages':>8} {'Flask défaut (µs)':>18} {'complet (µs)':>13} {'compact (µs)':>13} {'octets complet':>15} {'octets compact':>15}")
+    for length in (10, 50, 200, 1000):
+        conversation = [{"role": "user" if i % 2 else "system", "content": MESSAGE * (1 + i % 3)} for i in range(length)]
+        full = {"response": MESSAGE, "field": "city", "success": True, "conversation": conversation,
+                "current_state": job.get_state(), "progress": job.completion(), "version": job.version}
+        compact = {"response": MESSAGE, "field": "city", "success": True, "progress": job.completion(),
+                   "version": job.version, "state_delta": job.delta_since(version)}
+        n = max(20, iterations * 10 // length)
+        with default_app.app_context():
+            default_us = _per_call_us(lambda: default_app.json.response(full).get_data(), n)
+        with fast_app.app_context():
+            full_us = _per_call_us(lambda: fast_app.json.response(full).get_data(), n)
+            compact_us = _per_call_us(lambda: fast_app.json.response(compact).get_data(), n)
+            full_bytes = len(fast_app.json.response(full).get_data())
+            compact_bytes = len(fast_app.json.response(compact).get_data())
+        print(f"{length:8d} {default_us:18.1f} {full_us:13.1f} {compact_us:13.1f} {full_bytes:15,d} {compact_bytes:15,d}")
+
+    state = job.get_state()
+    before_us = _per_call_us(lambda: json.dumps(state, indent=2, ensure_ascii=False), iterations * 10)
+    after_us = _per_call_us(lambda: serialization.format_offer(state), iterations * 10)
+    print(f"\nOffre finale indentée: json.dumps {before_us:.1f} µs, format_offer {after_us:.1f} µs")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
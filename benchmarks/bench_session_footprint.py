@@ -0,0 +1,55 @@
+# benchmarks/bench_session_footprint.py - Coût mémoire et temps de création d'une session de chat
+#
+# Usage: python benchmarks/bench_session_footprint.py [nombre_sessions]
+# Mesure (tracemalloc) la mémoire retenue par visiteur sur GET / et par session créée au premier message.
+import os
+import gc
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TOGETHER_API_KEY", "stub")
+
+import app
+from agents.lang_mem import LangMem
+from agents.update_agent import UpdateAgent
+from models.job_details import JobDetails
+
+def _measure(factory, count: int):
+    """Retourne (µs par objet, octets retenus par objet) en gardant les objets vivants."""
+    factory()  # imports paresseux et caches hors mesure
+    # Temps et mémoire en deux passes : tracemalloc ralentit fortement les allocations
+    start = time.perf_counter()
+    timed = [factory() for _ in range(count)]
+    elapsed = time.perf_counter() - start
+    del timed
+    kept = []
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(count):
+        kept.append(factory())
+    retained = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+    tracemalloc.stop()
+    return elapsed / count * 1e6, retained / count
+
+def main(count: int = 2000):
+    client = app.app.test_client()
+    sessions_before = len(app.active_sessions)
+    visit_us, visit_bytes = _measure(lambda: app.app.test_client().get("/").close(), count // 4)
+    print(f"GET / (visiteur sans message): {visit_us:7.1f} µs, {visit_bytes:7.0f} o retenus, "
+          f"{len(app.active_sessions) - sessions_before} sessions créées")
+
+    print(f"\n{'objet':<14} {'création (µs)':>14} {'mémoire (o)':>12}")
+    job_details = JobDetails()
+    lang_mem = LangMem(app.llm)
+    for label, factory in (("ChatSession", app.ChatSession),
+                           ("JobDetails", JobDetails),
+                           ("LangMem", lambda: LangMem(app.llm)),
+                           ("UpdateAgent", lambda: UpdateAgent(job_details, lang_mem))):
+        us, size = _measure(factory, count)
+        print(f"{label:<14} {us:14.1f} {size:12.0f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,60 @@
+# benchmarks/bench_skills_taxonomy.py - Part des réponses "compétences" résolues sans LLM et coût de l'extraction locale
+#
+# Usage: python benchmarks/bench_skills_taxonomy.py [itérations]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.skills_taxonomy import extract_skills
+
+# Réponses typiques de recruteurs (fr/en/es), avec fautes et marqueurs obligatoire/optionnel
+ANSWERS = [
+    "java, python, react.js, gestion de projet",
+    "Java, Python et idéalement React",
+    "Python obligatoire, Docker nice to have",
+    "Nice to have: Docker, Kubernetes. Obligatoire : Java",
+    "Java et Python sont obligatoires, Vue.js serait un plus",
+    "Expérience en gestion de projet requise",
+    "Bonne maîtrise de Pyhton, Node JS et k8s",
+    "SQL, Power BI, Excel",
+    "Spring Boot, Hibernate, PostgreSQL, Docker",
+    "Angular, TypeScript, RxJS",
+    "Machine learning, PyTorch, pandas, numpy",
+    "AWS ou Azure, Terraform souhaité",
+    "Figma, UX design, idéalement Adobe Illustrator",
+    "conocimientos de Python y Docker, idealmente AWS",
+    "C#, .NET Core, SQL Server",
+    "Scrum, Jira, Confluence",
+    "Kotlin, Swift, Flutter serait un atout",
+    "Laravel, Symfony, PHP 8, MySQL",
+    "Blockchain, Solidity",
+    "Python mais pas de Java",
+    "Communication, travail en équipe, leadership",
+    "Linux, Bash, Ansible, Jenkins, Git",
+    "SAP FI/CO et comptabilité",
+    "React Native ou Flutter",
+    "Spark, Kafka, Airflow, dbt, Snowflake",
+]
+
+def main(iterations: int = 2000):
+    local = 0
+    for answer in ANSWERS:
+        extraction = extract_skills(answer)
+        resolved = bool(extraction.skills) and not extraction.residue
+        local += resolved
+        skills = ", ".join(f"{s['name']}{'' if s['mandatory'] else '?'}" for s in extraction.skills)
+        residue = f"  | LLM: {extraction.residue}" if extraction.residue else ""
+        print(f"{'local' if resolved else 'LLM  '}  {answer:<58} -> {skills}{residue}")
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for answer in ANSWERS:
+            extract_skills(answer)
+    per_answer = (time.perf_counter() - start) / (iterations * len(ANSWERS)) * 1e6
+    print(f"\n{local}/{len(ANSWERS)} réponses résolues sans appel LLM ({local / len(ANSWERS):.0%}), "
+          f"{per_answer:.1f} µs par réponse (contre un appel LLM de plusieurs centaines de ms)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
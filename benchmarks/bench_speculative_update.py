@@ -0,0 +1,56 @@
+# benchmarks/bench_speculative_update.py - Latence d'un tour : intention puis extraction, ou les deux en parallèle
+#
+# Usage: python benchmarks/bench_speculative_update.py [tours] [latence_llm_s]
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.stub_server import start_stub_server
+
+# Une seule réponse du stub sert à la fois à l'analyse d'intention et à l'extraction de la valeur
+DIRECT = json.dumps({"intention": "DIRECT_ANSWER", "confidence": 0.95, "value": "Data Scientist"})
+REFUSE = json.dumps({"intention": "REFUSE", "confidence": 0.9, "value": None})
+
+def main(turns: int = 10, latency: float = 0.3):
+    server, url = start_stub_server(latency=latency, reply=DIRECT)
+    os.environ["TOGETHER_BASE_URL"] = url
+    os.environ.setdefault("TOGETHER_API_KEY", "stub")
+    os.environ.setdefault("LLM_MAX_RPS", "100000")
+    from config.llm_config import admission
+    from agents import update_agent
+    from agents.answer_cache import answer_cache
+    from agents.update_agent import UpdateAgent
+    from models.job_details import JobDetails
+
+    def run(speculative: bool, reply: str):
+        update_agent.SPECULATIVE_EXTRACTION = speculative
+        server.RequestHandlerClass.reply = reply
+        admitted = admission.stats()["admitted"]
+        start = time.perf_counter()
+        committed = 0
+        for i in range(turns):
+            answer_cache.clear()
+            agent = UpdateAgent(JobDetails(), None)
+            agent.user_language = "fr"
+            success, _, _ = agent.update("title", f"Nous recrutons un Data Scientist (offre {i})", "Quel est le titre du poste ?")
+            committed += success and agent.job_details.data["jobDetails"]["title"] == "Data Scientist"
+        elapsed = (time.perf_counter() - start) / turns * 1000
+        time.sleep(latency * 1.5)   # extractions spéculatives abandonnées : hors de la mesure suivante
+        return elapsed, admission.stats()["admitted"] - admitted, committed
+
+    UpdateAgent(JobDetails(), None).detect_intention("ok", "title", {})   # import du client hors mesure
+    serial, serial_calls, serial_ok = run(False, DIRECT)
+    speculative, speculative_calls, speculative_ok = run(True, DIRECT)
+    refused, refused_calls, _ = run(True, REFUSE)
+    refused_serial, refused_serial_calls, _ = run(False, REFUSE)
+
+    print(f"{turns} tours 'title', latence LLM simulée {latency * 1000:.0f} ms")
+    print(f"  DIRECT_ANSWER, en série      : {serial:7.1f} ms/tour, {serial_calls} appels LLM, {serial_ok} valeurs écrites")
+    print(f"  DIRECT_ANSWER, spéculatif    : {speculative:7.1f} ms/tour, {speculative_calls} appels LLM, {speculative_ok} valeurs écrites")
+    print(f"  REFUSE, en série             : {refused_serial:7.1f} ms/tour, {refused_serial_calls} appels LLM")
+    print(f"  REFUSE, spéculatif           : {refused:7.1f} ms/tour, {refused_calls} appels LLM (extractions oubliées)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10, float(sys.argv[2]) if len(sys.argv) > 2 else 0.3)
@@ -0,0 +1,76 @@
+# benchmarks/bench_timezone_resolver.py - Appels LLM évités par la résolution locale du fuseau horaire (timeZone)
+#
+# Usage: python benchmarks/bench_timezone_resolver.py [latence_llm_s]
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.stub_server import start_stub_server
+
+# Une seule réponse du stub sert à la fois à l'analyse d'intention et à l'extraction de la valeur
+REPLY = json.dumps({"intention": "DIRECT_ANSWER", "confidence": 0.95, "value": {"name": "CET", "overlap": 4}})
+
+ANSWERS = [
+    "CET", "CET, GMT+1", "Europe/Paris", "EST", "UTC+1", "GMT+5:30", "heure de Paris", "fuseau de Montréal",
+    "4h overlap with EST", "Heure du Maroc, 3 heures de chevauchement", "Pacific time", "hora central europea",
+    "Le fuseau est CET", "oui", "ok pour moi", "6h de chevauchement", "Tokyo", "Inde",
+    "CET ou EST", "de 9h à 17h heure française", "comme l'équipe produit",
+]
+
+def main(latency: float = 0.3):
+    _, url = start_stub_server(latency=latency, reply=REPLY)
+    os.environ["TOGETHER_BASE_URL"] = url
+    os.environ.setdefault("TOGETHER_API_KEY", "stub")
+    os.environ.setdefault("LLM_MAX_RPS", "100000")
+    from config.llm_config import admission
+    from agents.answer_cache import answer_cache
+    from agents.question_agent import question_agent
+    from agents.update_agent import UpdateAgent
+    from models.job_details import JobDetails
+    from models.timezones import MIN_CONFIDENCE, resolve_timezone
+
+    def job_details() -> JobDetails:
+        details = JobDetails()
+        details.update("countries", [{"name": "France"}])   # "oui" confirme le fuseau proposé
+        return details
+
+    local = 0
+    for answer in ANSWERS:
+        agent = UpdateAgent(job_details(), None)
+        value = agent._local_answer("timeZone", answer)
+        local += value is not None
+        parsed = resolve_timezone(answer)
+        detail = f"{value['value']} (confiance {parsed.confidence})" if value else (f"confiance {parsed.confidence}" if parsed else "-")
+        print(f"{'local' if value else 'LLM  '}  {answer:<44} -> {detail}")
+
+    n = 20000
+    start = time.perf_counter()
+    for i in range(n):
+        resolve_timezone(ANSWERS[i % len(ANSWERS)])
+    per_answer = (time.perf_counter() - start) / n * 1e6
+
+    answer_cache.clear()
+    UpdateAgent(JobDetails(), None).detect_intention("ok", "timeZone", {})   # import du client hors mesure
+    admitted = admission.stats()["admitted"]
+    question = question_agent.suggested_question("timeZone", job_details(), "fr")
+    questions = admission.stats()["admitted"] - admitted
+    admitted = admission.stats()["admitted"]
+    start = time.perf_counter()
+    for answer in ANSWERS:
+        agent = UpdateAgent(job_details(), None)
+        agent.user_language = "fr"
+        agent.update("timeZone", answer, "Quel fuseau horaire pour l'équipe ?")
+    elapsed = time.perf_counter() - start
+    calls = admission.stats()["admitted"] - admitted
+
+    print(f"\n{local}/{len(ANSWERS)} réponses résolues sans appel LLM (minimum de confiance {MIN_CONFIDENCE}), "
+          f"{per_answer:.1f} µs par réponse")
+    print(f"  question timeZone avec un pays renseigné : {questions} appel LLM (un pour la générer et un pour la traduire "
+          f"auparavant)\n    {question}")
+    print(f"  UpdateAgent.update : {calls} appels LLM pour {len(ANSWERS)} réponses "
+          f"(contre {2 * len(ANSWERS)} : intention puis valeur), {elapsed:.2f} s avec {latency * 1000:.0f} ms de latence")
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.3)
@@ -0,0 +1,46 @@
+# benchmarks/bench_welcome.py - Premier tour d'une session web : appels LLM et latence avant la première question
+#
+# Usage: python benchmarks/bench_welcome.py [latence_llm_s]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.stub_server import start_stub_server
+
+FIRST_MESSAGES = ["Bonjour", "Hello", "Hola", "Bonjour à tous !", "Good morning team",
+                  "Bonjour, je recrute un Data Scientist", "Hallo", "Data Scientist"]
+
+def main(latency: float = 0.2):
+    _, url = start_stub_server(latency=latency, reply="Quel est l'intitulé du poste ?")
+    os.environ["TOGETHER_BASE_URL"] = url
+    os.environ.setdefault("TOGETHER_API_KEY", "stub")
+    os.environ.setdefault("LLM_MAX_RPS", "100000")
+    from config.llm_config import admission
+    from agents import welcome
+    from models import greetings
+    import app
+
+    def first_turn(message: str):
+        client = app.app.test_client()
+        admitted = admission.stats()["admitted"]
+        start = time.perf_counter()
+        reply = client.post("/api/message", json={"message": message}).get_json()
+        elapsed = (time.perf_counter() - start) * 1000
+        time.sleep(latency * 1.5)   # personnalisation abandonnée : hors de la mesure suivante
+        return elapsed, admission.stats()["admitted"] - admitted, reply["response"].split("\n")[0]
+
+    first_turn("Bonjour")   # import du client hors mesure
+    for personalized in (False, True):
+        welcome.WELCOME_PERSONALIZATION = personalized
+        print(f"--- personnalisation LLM {'activée' if personalized else 'désactivée'}, latence {latency * 1000:.0f} ms")
+        total_ms = total_calls = 0
+        for message in FIRST_MESSAGES:
+            elapsed, calls, text = first_turn(message)
+            total_ms += elapsed
+            total_calls += calls
+            print(f"  {message:<40} {greetings.detect_language(message) or 'LLM':>4} {elapsed:7.0f} ms {calls} appels  {text[:60]}")
+        print(f"  moyenne : {total_ms / len(FIRST_MESSAGES):.0f} ms, {total_calls / len(FIRST_MESSAGES):.1f} appels LLM par premier tour\n")
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.2)
@@ -0,0 +1,74 @@
+# benchmarks/stub_server.py - Serveur local compatible OpenAI pour les benchmarks (sans réseau ni clé API)
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_count_lock = threading.Lock()
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Répond à /chat/completions avec une réponse fixe, en HTTP/1.1 keep-alive."""
+    protocol_version = "HTTP/1.1"
+    reply = "{\"value\": \"stub\"}"
+    latency = 0.0
+    prompt_chars = None   # liste partagée [requêtes, caractères de prompt], créée par start_stub_server
+
+    def setup(self):
+        super().setup()
+        # En-têtes et corps partent en deux écritures : sans TCP_NODELAY, Nagle ajoute ~40 ms
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        with _count_lock:
+            self.prompt_chars[0] += 1
+            self.prompt_chars[1] += sum(len(str(message.get("content", ""))) for message in body.get("messages", []))
+        if self.latency:
+            time.sleep(self.latency)
+        payload = json.dumps({
+            "id": "stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": self.reply},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server(latency: float = 0.0, reply: str = None):
+    """Démarre le serveur sur un port libre dans un thread. Retourne (server, base_url)."""
+    handler = type("ConfiguredStubHandler", (StubHandler,), {
+        "latency": latency,
+        "reply": reply if reply is not None else StubHandler.reply,
+        "prompt_chars": [0, 0]
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+if __name__ == "__main__":
+    server, url = start_stub_server()
+    print(f"Serveur stub à l'écoute sur {url} (TOGETHER_BASE_URL={url})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,27 +1,137 @@
 # config/llm_config.py - Mise à jour pour utiliser Together API avec LangGraph et ChatMessageHistory corrigé
+# Les dépendances lourdes (langchain_openai, openai, langgraph, httpx) ne sont importées qu'au
+# premier usage : importer ce module ne coûte que quelques millisecondes et fonctionne hors ligne.
 import os
+import threading
+import importlib.util
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langgraph.graph import StateGraph, END
 from typing import Annotated, TypedDict
-from langchain_community.chat_message_histories import ChatMessageHistory  # Import corrigé
+from config.rate_limiter import AdmissionController, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND, llm_priority
+from config.single_flight import SingleFlight
 
 # Charger la clé API depuis le fichier .env
 load_dotenv()
 TOGETHER_API_KEY = os.getenv("TOGETHER_API_KEY")
 
-if not TOGETHER_API_KEY:
-    raise ValueError("⚠️ TOGETHER_API_KEY est manquant. Vérifie ton fichier .env !")
+TOGETHER_BASE_URL = os.getenv("TOGETHER_BASE_URL", "https://api.together.xyz")
+DEFAULT_MODEL = "meta-llama/Llama-3.3-70B-Instruct-Turbo-Free"
 
-# Configuration du modèle LLM
-llm = ChatOpenAI(
-    base_url="https://api.together.xyz",
-    api_key=TOGETHER_API_KEY,
-    model="meta-llama/Llama-3.3-70B-Instruct-Turbo-Free",
-    temperature=0.0
+# Pool de connexions HTTP partagé par tous les appels LLM du processus.
+# Chaque worker gunicorn a son propre pool : on le dimensionne d'après le nombre
+# de threads par worker (voir gunicorn.conf.py) pour que chaque requête en vol
+# trouve une connexion keep-alive déjà ouverte au lieu de refaire un handshake TLS.
+WORKER_THREADS = int(os.getenv("GUNICORN_THREADS", "4"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", str(max(4, WORKER_THREADS * 2))))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "90"))
+HTTP2_ENABLED = os.getenv("LLM_HTTP2", "1") == "1" and importlib.util.find_spec("h2") is not None
+
+def make_http_limits():
+    """Limites du pool de connexions vers l'API LLM."""
+    import httpx
+    return httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+    )
+
+def make_http_timeout():
+    """Délais réseau : connexion courte, lecture longue (génération LLM)."""
+    import httpx
+    return httpx.Timeout(60.0, connect=5.0, pool=10.0)
+
+# Clients partagés (sync et async), créés au premier appel et propres à chaque processus :
+# avec preload_app, le maître gunicorn ne doit pas léguer ses sockets aux workers.
+_http_clients = {"pid": None, "sync": None, "async": None}
+_lazy_lock = threading.RLock()
+
+def _process_http_clients() -> dict:
+    if _http_clients["pid"] != os.getpid():
+        with _lazy_lock:
+            if _http_clients["pid"] != os.getpid():
+                import httpx
+                _http_clients["sync"] = httpx.Client(http2=HTTP2_ENABLED, limits=make_http_limits(), timeout=make_http_timeout())
+                _http_clients["async"] = httpx.AsyncClient(http2=HTTP2_ENABLED, limits=make_http_limits(), timeout=make_http_timeout())
+                _http_clients["pid"] = os.getpid()
+    return _http_clients
+
+def get_http_client():
+    """Client httpx synchrone partagé du processus : ne jamais le fermer, ne pas en créer d'autres."""
+    return _process_http_clients()["sync"]
+
+def get_http_async_client():
+    """Client httpx asynchrone partagé du processus."""
+    return _process_http_clients()["async"]
+
+# Contrôle d'admission commun à tout le processus : évite les rafales de 429 quand
+# plusieurs sessions appellent le LLM en même temps. LLM_RATE_LIMIT_DIR active le
+# partage des budgets entre workers gunicorn (fichiers verrouillés).
+admission = AdmissionController(
+    requests_per_second=float(os.getenv("LLM_MAX_RPS", "2")),
+    tokens_per_minute=float(os.getenv("LLM_MAX_TPM", "60000")),
+    max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", str(HTTP_MAX_CONNECTIONS))),
+    timeout=float(os.getenv("LLM_ADMISSION_TIMEOUT", "60")),
+    shared_dir=os.getenv("LLM_RATE_LIMIT_DIR")
 )
+# Au démarrage de nombreuses sessions, des dizaines de prompts identiques partent en même
+# temps (première question, traductions) : un seul appel amont est fait par prompt.
+single_flight = SingleFlight()
+
+def create_llm(model: str = DEFAULT_MODEL, temperature: float = 0.0, base_url: str = None):
+    """Crée un client ChatOpenAI branché sur le pool HTTP partagé et le contrôle d'admission."""
+    if not TOGETHER_API_KEY:
+        raise ValueError("⚠️ TOGETHER_API_KEY est manquant. Vérifie ton fichier .env !")
+    from config.managed_llm import ManagedChatOpenAI
+    return ManagedChatOpenAI(
+        base_url=base_url or TOGETHER_BASE_URL,
+        api_key=TOGETHER_API_KEY,
+        model=model,
+        temperature=temperature,
+        http_client=get_http_client(),
+        http_async_client=get_http_async_client()
+    )
+
+def warm_up_connections(background: bool = True):
+    """Ouvre à l'avance la connexion (TCP + TLS) vers l'API pour éviter le coût au premier appel."""
+    def _warm_up():
+        try:
+            get_http_client().head(TOGETHER_BASE_URL, timeout=5.0)
+        except Exception as e:
+            print(f"⚠️ Préchauffage de la connexion LLM impossible: {e}")
+
+    if background:
+        threading.Thread(target=_warm_up, name="llm-warmup", daemon=True).start()
+    else:
+        _warm_up()
+
+_default_llm = {"pid": None, "instance": None}
+
+def get_llm():
+    """Modèle LLM par défaut du processus, construit au premier appel."""
+    if _default_llm["pid"] != os.getpid():
+        with _lazy_lock:
+            if _default_llm["pid"] != os.getpid():
+                _default_llm["instance"] = create_llm()
+                _default_llm["pid"] = os.getpid()
+    return _default_llm["instance"]
+
+class _LazyLLM:
+    """Se comporte comme le modèle par défaut, sans le construire tant qu'il n'est pas utilisé."""
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        return getattr(get_llm(), name)
+
+    def __or__(self, other):
+        return get_llm() | other
+
+    def __ror__(self, other):
+        return other | get_llm()
+
+    def __repr__(self):
+        return f"<LLM paresseux {DEFAULT_MODEL}>"
+
+# Configuration du modèle LLM
+llm = _LazyLLM()
 
 # Définir l'état du graphe
 class State(TypedDict):
@@ -32,6 +142,7 @@ def summarize_conversation(state: State) -> State:
     messages = state["messages"]
     total_tokens = sum(len(str(msg.content).split()) for msg in messages)  # Estimation simple des tokens
     if total_tokens > 500:  # Respecter votre max_token_limit
+        from langchain_core.messages import SystemMessage
         # Garder les messages récents et résumer le reste
         to_summarize = []
         recent_messages = []
@@ -62,24 +173,71 @@ def call_model(state: State) -> State:
     state["messages"].append(response)
     return state
 
-# Construire le graphe
-workflow = StateGraph(State)
-workflow.add_node("summarize", summarize_conversation)
-workflow.add_node("chat", call_model)
-workflow.set_entry_point("summarize")
-workflow.add_edge("summarize", "chat")
-workflow.add_edge("chat", END)
+_graph = {}
 
-# Compiler le graphe
-graph = workflow.compile()
+def get_graph():
+    """Graphe résumé → modèle, compilé au premier appel (langgraph est long à importer)."""
+    if "compiled" not in _graph:
+        with _lazy_lock:
+            if "compiled" not in _graph:
+                from langgraph.graph import StateGraph, END
+                # Construire le graphe
+                workflow = StateGraph(State)
+                workflow.add_node("summarize", summarize_conversation)
+                workflow.add_node("chat", call_model)
+                workflow.set_entry_point("summarize")
+                workflow.add_edge("summarize", "chat")
+                workflow.add_edge("chat", END)
+                # Compiler le graphe
+                _graph["compiled"] = workflow.compile()
+    return _graph["compiled"]
+
+def new_chat_history():
+    """Historique de conversation en mémoire (langchain_community importé à la demande)."""
+    from langchain_community.chat_message_histories import ChatMessageHistory  # Import corrigé
+    return ChatMessageHistory()
 
 # Fonction utilitaire pour interagir avec le graphe
-def get_response(user_input: str, history: ChatMessageHistory = None):
+def get_response(user_input: str, history=None):
+    from langchain_core.messages import HumanMessage
     if history is None:
-        history = ChatMessageHistory()
+        history = new_chat_history()
     state = {"messages": history.messages}
     state["messages"].append(HumanMessage(content=user_input))
-    output = graph.invoke(state)
+    output = get_graph().invoke(state)
     history.messages = output["messages"]
     return output["messages"][-1].content, history
 
+def preload():
+    """
+    Importe les dépendances lourdes et compile le graphe sans rien ouvrir sur le réseau.
+    Appelé par le maître gunicorn (preload_app) avant le fork : les workers héritent
+    de ces pages en copie sur écriture au lieu de refaire chacun les imports.
+    """
+    import config.managed_llm  # noqa: F401 (langchain_openai, openai)
+    import langchain_community.chat_message_histories  # noqa: F401
+    import pycountry
+    get_graph()
+    # Charger les bases pycountry (chargées paresseusement au premier accès)
+    len(pycountry.countries), len(pycountry.subdivisions), len(pycountry.languages)
+    from models.language_levels import canonical_language
+    canonical_language("Français")  # compile l'index des langues avant le fork
+    from models.timezones import country_timezone
+    country_timezone("France")      # et celui des fuseaux horaires (base tz, pays)
+    from models.gazetteer import city_in_country
+    city_in_country("Paris", "France")   # projette l'index des villes : pages partagées par les workers
+    from agents.reformulation import reformulation_cache
+    reformulation_cache.prewarm()        # reformulations (champ, catégorie, langue) du catalogue
+
+def __getattr__(name):
+    # Compatibilité avec les anciens imports de ce module
+    if name == "graph":
+        return get_graph()
+    if name == "http_client":
+        return get_http_client()
+    if name == "http_async_client":
+        return get_http_async_client()
+    if name == "ChatMessageHistory":
+        from langchain_community.chat_message_histories import ChatMessageHistory
+        return ChatMessageHistory
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,65 @@
+# config/managed_llm.py - Client ChatOpenAI géré (regroupement des prompts + contrôle d'admission)
+# Importé à la demande par config.llm_config.create_llm : langchain_openai et openai coûtent
+# à eux seuls plus d'une seconde au démarrage.
+import openai
+from langchain_openai import ChatOpenAI
+from config.llm_config import admission, single_flight
+from config.single_flight import prompt_key
+
+COMPLETION_TOKENS_ESTIMATE = 512
+
+def estimate_tokens(messages) -> int:
+    """Estimation grossière (≈ 4 caractères par token) du coût d'un appel, réponse comprise."""
+    return sum(len(str(message.content)) for message in messages) // 4 + COMPLETION_TOKENS_ESTIMATE
+
+def _retry_after(error: openai.RateLimitError) -> float:
+    try:
+        return float(error.response.headers.get("retry-after", 5))
+    except (AttributeError, TypeError, ValueError):
+        return 5.0
+
+class ManagedChatOpenAI(ChatOpenAI):
+    """ChatOpenAI dont chaque appel passe par le regroupement des prompts identiques puis le contrôleur d'admission."""
+
+    def _flight_key(self, messages, stop, kwargs):
+        # Seuls les appels déterministes peuvent partager leur réponse
+        if self.temperature not in (None, 0, 0.0):
+            return None
+        return prompt_key(self.model_name, self.openai_api_base, stop, kwargs,
+                          [(message.type, message.content) for message in messages])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        key = self._flight_key(messages, stop, kwargs)
+        if key is None:
+            return self._admitted_generate(messages, stop, run_manager, **kwargs)
+        result, shared = single_flight.do(key, lambda: self._admitted_generate(messages, stop, run_manager, **kwargs))
+        return result.model_copy(deep=True) if shared else result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        key = self._flight_key(messages, stop, kwargs)
+        if key is None:
+            return await self._admitted_agenerate(messages, stop, run_manager, **kwargs)
+        result, shared = await single_flight.do_async(key, lambda: self._admitted_agenerate(messages, stop, run_manager, **kwargs))
+        return result.model_copy(deep=True) if shared else result
+
+    def _admitted_generate(self, messages, stop=None, run_manager=None, **kwargs):
+        with admission.admit(estimate_tokens(messages)) as ticket:
+            try:
+                result = super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except openai.RateLimitError as e:
+                admission.penalize(_retry_after(e))
+                raise
+            ticket.actual_tokens = (result.llm_output or {}).get("token_usage", {}).get("total_tokens")
+            return result
+
+    async def _admitted_agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        ticket = await admission.acquire_async(estimate_tokens(messages))
+        try:
+            result = await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            ticket.actual_tokens = (result.llm_output or {}).get("token_usage", {}).get("total_tokens")
+            return result
+        except openai.RateLimitError as e:
+            admission.penalize(_retry_after(e))
+            raise
+        finally:
+            admission.release(ticket)
@@ -0,0 +1,606 @@
+# config/messages.py - Catalogue des messages système (fr, en, es) avec interpolation de paramètres
+#
+# Les textes fixes de l'interface ne passent plus par le LLM : t("msgid", langue, **paramètres).
+# Une langue absente du catalogue est traduite une seule fois par message (depuis l'anglais)
+# via le LLM, puis mise en cache pour la durée du processus.
+from string import Formatter
+from typing import Any, Dict, Optional, Tuple
+
+from config.single_flight import SingleFlight
+
+DEFAULT_LANGUAGE = "fr"
+SOURCE_LANGUAGE = "en"  # langue de référence des traductions automatiques
+
+CATALOG: Dict[str, Dict[str, str]] = {
+    # --- Application web -------------------------------------------------------------
+    "app.initial_prompt": {
+        "fr": "Envoyez un premier message (ex. Bonjour) pour commencer.",
+        "en": "Send a first message (e.g. Hello) to get started.",
+        "es": "Envíe un primer mensaje (p. ej. Hola) para comenzar.",
+    },
+    # Bienvenue du premier message (agents/welcome.py) : aussi en de/it/pt, langues des saluts reconnus
+    "app.welcome": {
+        "fr": "{greeting} ! Je suis un assistant intelligent qui aide les recruteurs à créer des offres d'emploi.",
+        "en": "{greeting}! I'm an intelligent assistant helping recruiters create job postings.",
+        "es": "¡{greeting}! Soy un asistente inteligente que ayuda a los reclutadores a crear ofertas de empleo.",
+        "de": "{greeting}! Ich bin ein intelligenter Assistent, der Recruitern beim Erstellen von Stellenanzeigen hilft.",
+        "it": "{greeting}! Sono un assistente intelligente che aiuta i recruiter a creare offerte di lavoro.",
+        "pt": "{greeting}! Sou um assistente inteligente que ajuda recrutadores a criar ofertas de emprego.",
+    },
+    "app.welcome_fallback": {
+        "fr": "Bonjour ! Je suis un assistant intelligent qui aide les recruteurs à créer des offres d'emploi.",
+        "en": "Hello! I'm an intelligent assistant helping recruiters create job postings.",
+        "es": "¡Hola! Soy un asistente inteligente que ayuda a los reclutadores a crear ofertas de empleo.",
+        "de": "Hallo! Ich bin ein intelligenter Assistent, der Recruitern beim Erstellen von Stellenanzeigen hilft.",
+        "it": "Ciao! Sono un assistente intelligente che aiuta i recruiter a creare offerte di lavoro.",
+        "pt": "Olá! Sou um assistente inteligente que ajuda recrutadores a criar ofertas de emprego.",
+    },
+    "app.all_collected": {
+        "fr": "Merci! Toutes les informations nécessaires ont été recueillies.",
+        "en": "Thank you! All the required information has been collected.",
+        "es": "¡Gracias! Se ha recopilado toda la información necesaria.",
+    },
+    "app.offer_result": {
+        "fr": "Voici le résultat de l'offre d'emploi:\n{offer}",
+        "en": "Here is the resulting job posting:\n{offer}",
+        "es": "Este es el resultado de la oferta de empleo:\n{offer}",
+    },
+    "app.status_header": {
+        "fr": "Voici l'état actuel de l'offre d'emploi:",
+        "en": "Here is the current state of the job posting:",
+        "es": "Este es el estado actual de la oferta de empleo:",
+    },
+    "app.value_restored": {
+        "fr": "Valeur précédente rétablie pour '{field}': {value}",
+        "en": "Previous value restored for '{field}': {value}",
+        "es": "Valor anterior restablecido para '{field}': {value}",
+    },
+    "app.current_value": {
+        "fr": "Valeur actuelle pour '{field}': {value}. Nouvelle valeur?",
+        "en": "Current value for '{field}': {value}. New value?",
+        "es": "Valor actual para '{field}': {value}. ¿Nuevo valor?",
+    },
+    # --- Formulaire (partagé web / console) ----------------------------------------------
+    "form.not_specified": {"fr": "Non spécifié", "en": "Not specified", "es": "No especificado"},
+    "form.replace_value": {
+        "fr": "Remplacer '{value}' par quoi pour '{field}' ?",
+        "en": "Replace '{value}' with what for '{field}'?",
+        "es": "¿Reemplazar '{value}' por qué para '{field}'?",
+    },
+    "form.new_value_for": {
+        "fr": "Quelle nouvelle valeur souhaitez-vous pour '{field}' (actuellement: {value}) ?",
+        "en": "What new value would you like for '{field}' (currently: {value})?",
+        "es": "¿Qué nuevo valor desea para '{field}' (actualmente: {value})?",
+    },
+    "form.field_not_recognized": {
+        "fr": "Champ '{field}' non reconnu.",
+        "en": "Field '{field}' not recognized.",
+        "es": "Campo '{field}' no reconocido.",
+    },
+    "form.field_unclear": {
+        "fr": "Je n'ai pas compris quel champ vous souhaitez modifier.",
+        "en": "I didn't understand which field you want to modify.",
+        "es": "No entendí qué campo desea modificar.",
+    },
+    "form.specify_field": {
+        "fr": "Précisez {field} pour cette offre d'emploi.",
+        "en": "Specify {field} for this job posting.",
+        "es": "Especifique {field} para esta oferta de trabajo.",
+    },
+    "form.what_to_add": {
+        "fr": "Quelle information souhaitez-vous ajouter?",
+        "en": "What information would you like to add?",
+        "es": "¿Qué información desea añadir?",
+    },
+    "form.continue": {
+        "fr": "Souhaitez-vous continuer à remplir le formulaire ?",
+        "en": "Would you like to continue filling out the form?",
+        "es": "¿Desea continuar completando el formulario?",
+    },
+    "form.timezone_suggestion": {
+        "fr": "Fuseau horaire proposé : {zone} ({offset}), avec {overlap} h de chevauchement. Cela vous convient-il (oui, ou précisez ex. CET, UTC+2, 3h) ?",
+        "en": "Suggested time zone: {zone} ({offset}), with {overlap} h of overlap. Does that work (yes, or specify e.g. CET, UTC+2, 3h)?",
+        "es": "Huso horario propuesto: {zone} ({offset}), con {overlap} h de solapamiento. ¿Le conviene (sí, o precise p. ej. CET, UTC+2, 3h)?",
+    },
+    "form.status_fallback": {
+        "fr": "Voici les informations fournies :\n• {items}",
+        "en": "Here is the information provided:\n• {items}",
+        "es": "Aquí está la información proporcionada:\n• {items}",
+    },
+    # --- Mises à jour (UpdateAgent) --------------------------------------------------
+    "update.empty_response": {"fr": "Réponse vide", "en": "Empty response", "es": "Respuesta vacía"},
+    "update.nothing_to_undo": {
+        "fr": "Aucune modification à annuler.",
+        "en": "There is no change to undo.",
+        "es": "No hay ningún cambio que deshacer.",
+    },
+    "update.failed": {
+        "fr": "Erreur lors de la mise à jour de '{field}'",
+        "en": "Error while updating '{field}'",
+        "es": "Error al actualizar '{field}'",
+    },
+    "update.default_failed": {
+        "fr": "Erreur lors de l'application de la valeur par défaut",
+        "en": "Error while applying the default value",
+        "es": "Error al aplicar el valor predeterminado",
+    },
+    "update.unknown_choice": {
+        "fr": "Valeur non reconnue pour {field}. Options: {allowed}",
+        "en": "Unrecognized value for {field}. Options: {allowed}",
+        "es": "Valor no reconocido para {field}. Opciones: {allowed}",
+    },
+    "update.number_expected": {
+        "fr": "Valeur numérique attendue pour {field}.",
+        "en": "Numeric value expected for {field}.",
+        "es": "Se espera un valor numérico para {field}.",
+    },
+    "update.invalid_format": {
+        "fr": "Format invalide pour {field}. Exemple: {example}",
+        "en": "Invalid format for {field}. Example: {example}",
+        "es": "Formato no válido para {field}. Ejemplo: {example}",
+    },
+    "update.no_value_extracted": {
+        "fr": "Impossible d'extraire une valeur valide pour {field}",
+        "en": "Could not extract a valid value for {field}",
+        "es": "No se pudo extraer un valor válido para {field}",
+    },
+    "update.processing_error": {
+        "fr": "Erreur de traitement: {error}",
+        "en": "Processing error: {error}",
+        "es": "Error de procesamiento: {error}",
+    },
+    # --- Reformulation après une erreur (agents/reformulation.py) -----------------------
+    # Entrée en matière par catégorie d'erreur, suivie de la question du champ ({question})
+    "reformulate.clarification": {
+        "fr": "Je précise : {question}",
+        "en": "Let me clarify: {question}",
+        "es": "Le aclaro: {question}",
+    },
+    "reformulate.confusion": {
+        "fr": "Revenons à l'offre : {question}",
+        "en": "Let's get back to the job posting: {question}",
+        "es": "Volvamos a la oferta: {question}",
+    },
+    "reformulate.not_a_number": {
+        "fr": "J'ai besoin d'un nombre. {question}",
+        "en": "I need a number. {question}",
+        "es": "Necesito un número. {question}",
+    },
+    "reformulate.out_of_range": {
+        "fr": "Cette valeur est hors des limites acceptées. {question}",
+        "en": "That value is outside the accepted range. {question}",
+        "es": "Ese valor está fuera del rango aceptado. {question}",
+    },
+    "reformulate.invalid_choice": {
+        "fr": "Cette option n'est pas proposée. {question}",
+        "en": "That option is not available. {question}",
+        "es": "Esa opción no está disponible. {question}",
+    },
+    "reformulate.unknown_place": {
+        "fr": "Je n'ai pas reconnu ce lieu. {question}",
+        "en": "I did not recognize that place. {question}",
+        "es": "No reconocí ese lugar. {question}",
+    },
+    "reformulate.invalid_format": {
+        "fr": "Je n'ai pas pu lire ce format. {question}",
+        "en": "I could not read that format. {question}",
+        "es": "No pude leer ese formato. {question}",
+    },
+    "reformulate.no_value": {
+        "fr": "Je n'ai pas trouvé de valeur dans votre réponse. {question}",
+        "en": "I could not find a value in your answer. {question}",
+        "es": "No encontré ningún valor en su respuesta. {question}",
+    },
+    "reformulate.unclear": {
+        "fr": "Votre réponse n'était pas claire. {question}",
+        "en": "Your answer was not clear. {question}",
+        "es": "Su respuesta no fue clara. {question}",
+    },
+    # Question reformulée de chaque champ, avec 2-3 exemples ou les options
+    "question.title": {
+        "fr": "Quel est le titre du poste (ex. Développeur Full Stack, Data Scientist) ?",
+        "en": "What is the job title (e.g. Full Stack Developer, Data Scientist)?",
+        "es": "¿Cuál es el título del puesto (p. ej. Desarrollador Full Stack, Data Scientist)?",
+    },
+    "question.description": {
+        "fr": "Quelles sont les missions principales du poste (ex. développer l'API, encadrer l'équipe) ?",
+        "en": "What are the main responsibilities (e.g. build the API, lead the team)?",
+        "es": "¿Cuáles son las funciones principales del puesto (p. ej. desarrollar la API, dirigir el equipo)?",
+    },
+    "question.discipline": {
+        "fr": "Dans quelle discipline s'inscrit le poste (ex. Informatique, Marketing, Finance) ?",
+        "en": "Which discipline is the role in (e.g. IT, Marketing, Finance)?",
+        "es": "¿En qué disciplina se enmarca el puesto (p. ej. Informática, Marketing, Finanzas)?",
+    },
+    "question.availability": {
+        "fr": "Quand le candidat doit-il être disponible (ex. immédiatement, 2 semaines, 1 mois) ?",
+        "en": "When should the candidate be available (e.g. immediately, 2 weeks, 1 month)?",
+        "es": "¿Cuándo debe estar disponible el candidato (p. ej. inmediatamente, 2 semanas, 1 mes)?",
+    },
+    "question.seniority": {
+        "fr": "Quel niveau d'expérience recherchez-vous : Junior, Mid ou Senior ?",
+        "en": "What experience level are you looking for: Junior, Mid or Senior?",
+        "es": "¿Qué nivel de experiencia busca: Junior, Mid o Senior?",
+    },
+    "question.languages": {
+        "fr": "Quelles langues sont requises, avec le niveau (ex. Français C1, Anglais B2) ?",
+        "en": "Which languages are required, with their level (e.g. French C1, English B2)?",
+        "es": "¿Qué idiomas se requieren, con su nivel (p. ej. Francés C1, Inglés B2)?",
+    },
+    "question.skills": {
+        "fr": "Quelles compétences sont nécessaires (ex. Python, SQL, Gestion de projet) ?",
+        "en": "Which skills are needed (e.g. Python, SQL, Project management)?",
+        "es": "¿Qué competencias se necesitan (p. ej. Python, SQL, Gestión de proyectos)?",
+    },
+    "question.jobType": {
+        "fr": "S'agit-il d'un poste Freelance, Temps plein ou Temps partiel ?",
+        "en": "Is it a Freelance, Full-time or Part-time position?",
+        "es": "¿Se trata de un puesto Freelance, a Tiempo completo o a Tiempo parcial?",
+    },
+    "question.type": {
+        "fr": "Le travail est-il à distance, sur site ou hybride ?",
+        "en": "Is the work remote, on-site or hybrid?",
+        "es": "¿El trabajo es remoto, presencial o híbrido?",
+    },
+    "question.minHourlyRate": {
+        "fr": "Quel est le taux horaire minimum, en nombre (ex. 40, 55) ?",
+        "en": "What is the minimum hourly rate, as a number (e.g. 40, 55)?",
+        "es": "¿Cuál es la tarifa horaria mínima, en número (p. ej. 40, 55)?",
+    },
+    "question.maxHourlyRate": {
+        "fr": "Quel est le taux horaire maximum, en nombre (ex. 60, 80) ?",
+        "en": "What is the maximum hourly rate, as a number (e.g. 60, 80)?",
+        "es": "¿Cuál es la tarifa horaria máxima, en número (p. ej. 60, 80)?",
+    },
+    "question.weeklyHours": {
+        "fr": "Combien d'heures par semaine sont prévues (ex. 20, 35, 40) ?",
+        "en": "How many hours per week are planned (e.g. 20, 35, 40)?",
+        "es": "¿Cuántas horas por semana están previstas (p. ej. 20, 35, 40)?",
+    },
+    "question.estimatedWeeks": {
+        "fr": "Combien de semaines durera la mission (ex. 4, 12, 26) ?",
+        "en": "How many weeks will the assignment last (e.g. 4, 12, 26)?",
+        "es": "¿Cuántas semanas durará el proyecto (p. ej. 4, 12, 26)?",
+    },
+    "question.minFullTimeSalary": {
+        "fr": "Quel est le salaire annuel minimum, en nombre (ex. 40000, 55000) ?",
+        "en": "What is the minimum annual salary, as a number (e.g. 40000, 55000)?",
+        "es": "¿Cuál es el salario anual mínimo, en número (p. ej. 40000, 55000)?",
+    },
+    "question.maxFullTimeSalary": {
+        "fr": "Quel est le salaire annuel maximum, en nombre (ex. 50000, 70000) ?",
+        "en": "What is the maximum annual salary, as a number (e.g. 50000, 70000)?",
+        "es": "¿Cuál es el salario anual máximo, en número (p. ej. 50000, 70000)?",
+    },
+    "question.minPartTimeSalary": {
+        "fr": "Quel est le salaire minimum pour ce temps partiel, en nombre (ex. 1200, 1800) ?",
+        "en": "What is the minimum salary for this part-time role, as a number (e.g. 1200, 1800)?",
+        "es": "¿Cuál es el salario mínimo para este puesto a tiempo parcial, en número (p. ej. 1200, 1800)?",
+    },
+    "question.maxPartTimeSalary": {
+        "fr": "Quel est le salaire maximum pour ce temps partiel, en nombre (ex. 1500, 2500) ?",
+        "en": "What is the maximum salary for this part-time role, as a number (e.g. 1500, 2500)?",
+        "es": "¿Cuál es el salario máximo para este puesto a tiempo parcial, en número (p. ej. 1500, 2500)?",
+    },
+    "question.continents": {
+        "fr": "Sur quels continents recherchez-vous des candidats (Europe, Asie, Afrique, Amérique du Nord, Amérique du Sud, Océanie) ?",
+        "en": "On which continents are you looking for candidates (Europe, Asia, Africa, North America, South America, Oceania)?",
+        "es": "¿En qué continentes busca candidatos (Europa, Asia, África, América del Norte, América del Sur, Oceanía)?",
+    },
+    "question.countries": {
+        "fr": "Dans quels pays le poste est-il ouvert (ex. France, Maroc, Canada) ?",
+        "en": "Which countries is the position open to (e.g. France, Morocco, Canada)?",
+        "es": "¿En qué países está abierto el puesto (p. ej. Francia, Marruecos, Canadá)?",
+    },
+    "question.regions": {
+        "fr": "Dans quelles régions de ces pays (ex. Île-de-France, Casablanca-Settat) ?",
+        "en": "Which regions of those countries (e.g. Île-de-France, Casablanca-Settat)?",
+        "es": "¿En qué regiones de esos países (p. ej. Île-de-France, Casablanca-Settat)?",
+    },
+    "question.timeZone": {
+        "fr": "Quel fuseau horaire est requis, et combien d'heures de chevauchement (ex. CET 4h, UTC+1, EST) ?",
+        "en": "Which time zone is required, and how many hours of overlap (e.g. CET 4h, UTC+1, EST)?",
+        "es": "¿Qué huso horario se requiere, y cuántas horas de solapamiento (p. ej. CET 4h, UTC+1, EST)?",
+    },
+    "question.country": {
+        "fr": "Dans quel pays le poste est-il basé (ex. France, Belgique, Maroc) ?",
+        "en": "Which country is the position based in (e.g. France, Belgium, Morocco)?",
+        "es": "¿En qué país tiene su sede el puesto (p. ej. Francia, Bélgica, Marruecos)?",
+    },
+    "question.city": {
+        "fr": "Dans quelle ville de ce pays le poste est-il situé (ex. Paris, Lyon) ?",
+        "en": "Which city in that country is the position located in (e.g. Paris, Lyon)?",
+        "es": "¿En qué ciudad de ese país se encuentra el puesto (p. ej. París, Lyon)?",
+    },
+    # --- Contradictions (LangMem) ------------------------------------------------------
+    "contradiction.min_rate_above_max": {
+        "fr": "Le taux horaire minimum ({value}) est supérieur au maximum ({max})",
+        "en": "The minimum hourly rate ({value}) is higher than the maximum ({max})",
+        "es": "La tarifa horaria mínima ({value}) es superior a la máxima ({max})",
+    },
+    "contradiction.max_rate_below_min": {
+        "fr": "Le taux horaire maximum ({value}) est inférieur au minimum ({min})",
+        "en": "The maximum hourly rate ({value}) is lower than the minimum ({min})",
+        "es": "La tarifa horaria máxima ({value}) es inferior a la mínima ({min})",
+    },
+    "contradiction.weekly_hours_over": {
+        "fr": "Les heures hebdomadaires ({value}) dépassent le maximum possible (168)",
+        "en": "Weekly hours ({value}) exceed the maximum possible (168)",
+        "es": "Las horas semanales ({value}) superan el máximo posible (168)",
+    },
+    "contradiction.city_country": {
+        "fr": "La ville '{city}' n'est pas située dans le pays indiqué ({country})",
+        "en": "The city '{city}' is not located in the specified country ({country})",
+        "es": "La ciudad '{city}' no está situada en el país indicado ({country})",
+    },
+    "contradiction.geography": {
+        "fr": "Contradiction géographique détectée avec {field}",
+        "en": "Geographic contradiction detected with {field}",
+        "es": "Contradicción geográfica detectada con {field}",
+    },
+    # --- Workflow console (FormWorkflow) -----------------------------------------------
+    "workflow.recruiter_prompt": {"fr": "👨‍💼 Recruteur: ", "en": "👨‍💼 Recruiter: ", "es": "👨‍💼 Reclutador: "},
+    "workflow.starting": {
+        "fr": "\n🚀 Démarrage de la création de l'offre d'emploi...\n",
+        "en": "\n🚀 Starting the job posting creation process...\n",
+        "es": "\n🚀 Iniciando la creación de la oferta de empleo...\n",
+    },
+    "workflow.finalized": {
+        "fr": "\n✅ Offre d'emploi finalisée. Détails :",
+        "en": "\n✅ Job posting finalized. Details:",
+        "es": "\n✅ Oferta de empleo finalizada. Detalles:",
+    },
+    "workflow.error": {
+        "fr": "\n❌ Une erreur s'est produite : {error}",
+        "en": "\n❌ An error occurred: {error}",
+        "es": "\n❌ Se produjo un error: {error}",
+    },
+    "workflow.finalize_anyway": {
+        "fr": "\n🔄 Tentative de finalisation malgré l'erreur...",
+        "en": "\n🔄 Attempting to finalize despite the error...",
+        "es": "\n🔄 Intentando finalizar a pesar del error...",
+    },
+    "workflow.not_enough_info": {
+        "fr": "⚠️ Pas assez d'informations pour finaliser l'offre d'emploi.",
+        "en": "⚠️ Not enough information to finalize the job posting.",
+        "es": "⚠️ No hay suficiente información para finalizar la oferta de empleo.",
+    },
+    "workflow.finalize_failed": {
+        "fr": "⚠️ Échec de la finalisation : {error}",
+        "en": "⚠️ Finalization failed: {error}",
+        "es": "⚠️ Falló la finalización: {error}",
+    },
+    "workflow.iteration_limit": {
+        "fr": "⚠️ Limite d'itérations ({count}) atteinte. Finalisation forcée.",
+        "en": "⚠️ Iteration limit ({count}) reached. Forcing finalization.",
+        "es": "⚠️ Límite de iteraciones ({count}) alcanzado. Finalización forzada.",
+    },
+    "workflow.next_question_error": {
+        "fr": "⚠️ Erreur lors du choix de la prochaine question : {error}",
+        "en": "⚠️ Error determining next question: {error}",
+        "es": "⚠️ Error al determinar la siguiente pregunta: {error}",
+    },
+    "workflow.intention_unknown": {
+        "fr": "Impossible de déterminer l'intention de l'utilisateur.",
+        "en": "Unable to determine the user's intention.",
+        "es": "No se puede determinar la intención del usuario.",
+    },
+    "workflow.no_active_field": {
+        "fr": "Aucun champ actif à mettre à jour.",
+        "en": "No active field to update.",
+        "es": "No hay ningún campo activo que actualizar.",
+    },
+    "workflow.reset_loop": {
+        "fr": "🔄 Réinitialisation de l'état pour éviter une boucle",
+        "en": "🔄 Resetting state to avoid loop",
+        "es": "🔄 Reiniciando el estado para evitar un bucle",
+    },
+    "workflow.show_status": {
+        "fr": "ℹ️ Affichage de l'état demandé",
+        "en": "ℹ️ Displaying requested status",
+        "es": "ℹ️ Mostrando el estado solicitado",
+    },
+    "workflow.too_many_errors": {
+        "fr": "🔄 Trop d'erreurs pour '{field}', passage au champ suivant",
+        "en": "🔄 Too many errors for '{field}', moving to next field",
+        "es": "🔄 Demasiados errores para '{field}', pasando al siguiente campo",
+    },
+    "workflow.explanation": {
+        "fr": "ℹ️ Voici une explication",
+        "en": "ℹ️ Here's an explanation",
+        "es": "ℹ️ Aquí tiene una explicación",
+    },
+    "workflow.reformulating": {
+        "fr": "🔄 Reformulation suite à : {error}",
+        "en": "🔄 Reformulating due to: {error}",
+        "es": "🔄 Reformulando debido a: {error}",
+    },
+    "workflow.status_error": {
+        "fr": "⚠️ Erreur lors de la génération de l'état : {error}",
+        "en": "⚠️ Error generating status: {error}",
+        "es": "⚠️ Error al generar el estado: {error}",
+    },
+    # --- Affichage des valeurs -----------------------------------------------------------
+    "display.immediate": {"fr": "Immédiat", "en": "Immediate", "es": "Inmediato"},
+    "display.one_week": {"fr": "1 semaine", "en": "1 week", "es": "1 semana"},
+    "display.weeks": {"fr": "{value} semaines", "en": "{value} weeks", "es": "{value} semanas"},
+    "display.salary": {"fr": "{value}€", "en": "${value}", "es": "{value}€"},
+    "display.hourly_rate": {"fr": "{value}€/h", "en": "${value}/h", "es": "{value}€/h"},
+    "display.required": {"fr": "requis", "en": "required", "es": "obligatorio"},
+    "display.optional": {"fr": "optionnel", "en": "optional", "es": "opcional"},
+    "display.overlap": {"fr": "{name} (chevauchement: {overlap}h)", "en": "{name} (overlap: {overlap}h)", "es": "{name} (solapamiento: {overlap}h)"},
+    # --- Validation des champs (codes de FieldValidationError) ---------------------------
+    "validation.unknown_field": {
+        "fr": "⚠️ Champ '{field}' non valide.",
+        "en": "⚠️ Invalid field '{field}'.",
+        "es": "⚠️ Campo '{field}' no válido.",
+    },
+    "validation.invalid_choice": {
+        "fr": "⚠️ Valeur '{value}' non valide pour '{field}'. Options: {allowed}",
+        "en": "⚠️ Invalid value '{value}' for '{field}'. Options: {allowed}",
+        "es": "⚠️ Valor '{value}' no válido para '{field}'. Opciones: {allowed}",
+    },
+    "validation.below_min": {
+        "fr": "⚠️ '{field}' doit être au moins {min:g}.",
+        "en": "⚠️ '{field}' must be at least {min:g}.",
+        "es": "⚠️ '{field}' debe ser al menos {min:g}.",
+    },
+    "validation.above_max": {
+        "fr": "⚠️ '{field}' ne peut pas dépasser {max:g}.",
+        "en": "⚠️ '{field}' cannot exceed {max:g}.",
+        "es": "⚠️ '{field}' no puede superar {max:g}.",
+    },
+    "validation.min_gt_max": {
+        "fr": "⚠️ '{min_field}' ne peut pas dépasser '{max_field}'.",
+        "en": "⚠️ '{min_field}' cannot exceed '{max_field}'.",
+        "es": "⚠️ '{min_field}' no puede superar '{max_field}'.",
+    },
+    "validation.invalid_utc_offset": {
+        "fr": "⚠️ '{value}' n'est pas un décalage horaire valide (de UTC-12 à UTC+14).",
+        "en": "⚠️ '{value}' is not a valid UTC offset (UTC-12 to UTC+14).",
+        "es": "⚠️ '{value}' no es un desfase horario válido (de UTC-12 a UTC+14).",
+    },
+    "validation.missing_keys": {
+        "fr": "⚠️ L'objet pour '{field}' doit inclure {keys}.",
+        "en": "⚠️ The object for '{field}' must include {keys}.",
+        "es": "⚠️ El objeto para '{field}' debe incluir {keys}.",
+    },
+    "validation.invalid_continent": {
+        "fr": "⚠️ Le continent '{name}' n'est pas valide. Options: {allowed}",
+        "en": "⚠️ The continent '{name}' is not valid. Options: {allowed}",
+        "es": "⚠️ El continente '{name}' no es válido. Opciones: {allowed}",
+    },
+    "validation.country_not_continent": {
+        "fr": "⚠️ '{name}' semble être un pays, pas un continent.",
+        "en": "⚠️ '{name}' looks like a country, not a continent.",
+        "es": "⚠️ '{name}' parece ser un país, no un continente.",
+    },
+    "validation.invalid_country": {
+        "fr": "⚠️ Le pays '{name}' n'est pas valide.",
+        "en": "⚠️ The country '{name}' is not valid.",
+        "es": "⚠️ El país '{name}' no es válido.",
+    },
+    "validation.country_outside_continents": {
+        "fr": "⚠️ Le pays '{name}' n'est pas dans les continents: {continents}",
+        "en": "⚠️ The country '{name}' is not in the continents: {continents}",
+        "es": "⚠️ El país '{name}' no está en los continentes: {continents}",
+    },
+    "validation.invalid_region": {
+        "fr": "⚠️ La région '{name}' n'est pas valide pour les pays: {countries}",
+        "en": "⚠️ The region '{name}' is not valid for the countries: {countries}",
+        "es": "⚠️ La región '{name}' no es válida para los países: {countries}",
+    },
+    "validation.city_outside_country": {
+        "fr": "⚠️ La ville '{name}' n'est pas située dans le pays indiqué ({country})",
+        "en": "⚠️ The city '{name}' is not located in the specified country ({country})",
+        "es": "⚠️ La ciudad '{name}' no está situada en el país indicado ({country})",
+    },
+    "validation.type_error": {
+        "fr": "⚠️ Valeur invalide pour '{field}': {detail}",
+        "en": "⚠️ Invalid value for '{field}': {detail}",
+        "es": "⚠️ Valor no válido para '{field}': {detail}",
+    },
+    "validation.availability.below_min": {
+        "fr": "⚠️ La disponibilité ne peut pas être négative.",
+        "en": "⚠️ Availability cannot be negative.",
+        "es": "⚠️ La disponibilidad no puede ser negativa.",
+    },
+    "validation.weeklyHours.above_max": {
+        "fr": "⚠️ Les heures par semaine ne peuvent pas dépasser {max:g}.",
+        "en": "⚠️ Weekly hours cannot exceed {max:g}.",
+        "es": "⚠️ Las horas semanales no pueden superar {max:g}.",
+    },
+    "validation.minHourlyRate.min_gt_max": {
+        "fr": "⚠️ Le taux horaire minimum ne peut pas dépasser le maximum.",
+        "en": "⚠️ The minimum hourly rate cannot exceed the maximum.",
+        "es": "⚠️ La tarifa horaria mínima no puede superar la máxima.",
+    },
+    "validation.minFullTimeSalary.min_gt_max": {
+        "fr": "⚠️ Le salaire minimum ne peut pas dépasser le maximum.",
+        "en": "⚠️ The minimum salary cannot exceed the maximum.",
+        "es": "⚠️ El salario mínimo no puede superar el máximo.",
+    },
+    "validation.minPartTimeSalary.min_gt_max": {
+        "fr": "⚠️ Le salaire minimum ne peut pas dépasser le maximum.",
+        "en": "⚠️ The minimum salary cannot exceed the maximum.",
+        "es": "⚠️ El salario mínimo no puede superar el máximo.",
+    },
+}
+
+# Compilation à l'import : une table {msgid: gabarit} par langue
+_TABLES: Dict[str, Dict[str, str]] = {}
+for _msgid, _translations in CATALOG.items():
+    for _lang, _template in _translations.items():
+        _TABLES.setdefault(_lang, {})[_msgid] = _template
+LANGUAGES = frozenset(_TABLES)
+
+# Traductions LLM des langues non couvertes : (langue, msgid) -> gabarit. Seules les traductions
+# réussies sont retenues ; une même clé n'est traduite qu'une fois à la fois (single-flight par clé)
+_fallback_cache: Dict[Tuple[str, str], str] = {}
+_fallback_flights = SingleFlight()
+_formatter = Formatter()
+
+def normalize_language(lang: Optional[str]) -> str:
+    """'fr-FR', 'FR', 'pt_BR' -> 'fr', 'fr', 'pt'. Langue par défaut si absente."""
+    if not lang:
+        return DEFAULT_LANGUAGE
+    return lang.replace("_", "-").split("-")[0].strip().lower() or DEFAULT_LANGUAGE
+
+def _placeholders(template: str) -> frozenset:
+    return frozenset(name for _, name, _, _ in _formatter.parse(template) if name)
+
+def _translate_with_llm(msgid: str, lang: str) -> str:
+    """
+    Traduit le gabarit anglais une seule fois ; repli sur l'anglais si le LLM échoue ou casse un
+    paramètre, sans le retenir : la traduction est retentée au prochain message.
+    """
+    key = (lang, msgid)
+    cached = _fallback_cache.get(key)
+    if cached is not None:
+        return cached
+    template, _ = _fallback_flights.do(f"{lang}:{msgid}", lambda: _llm_translation(key))
+    return template
+
+def _llm_translation(key: Tuple[str, str]) -> str:
+    lang, msgid = key
+    source = _TABLES[SOURCE_LANGUAGE][msgid]
+    try:
+        from config.llm_config import llm  # import tardif : le catalogue ne dépend pas du LLM
+        prompt = f"""
+        Traduisez ce message d'interface en {lang} :
+        "{source}"
+        Conservez à l'identique les paramètres entre accolades (ex. {{field}}), les emojis et les retours à la ligne.
+        Retournez UNIQUEMENT la traduction, sans commentaire ni guillemets.
+        """
+        translated = llm.invoke(prompt).content.strip().strip('"')
+    except Exception as e:
+        print(f"⚠️ Traduction de '{msgid}' en {lang} impossible: {e}")
+        return source
+    if not translated or _placeholders(translated) != _placeholders(source):
+        print(f"⚠️ Traduction de '{msgid}' en {lang} rejetée (paramètres modifiés)")
+        return source
+    _fallback_cache[key] = translated
+    return translated
+
+def template(msgid: str, lang: Optional[str] = None) -> str:
+    """Gabarit brut de `msgid` ; repli : traduction LLM mise en cache, puis français, puis msgid."""
+    lang = normalize_language(lang)
+    table = _TABLES.get(lang)
+    if table is not None and msgid in table:
+        return table[msgid]
+    if msgid in _TABLES[SOURCE_LANGUAGE]:
+        return _translate_with_llm(msgid, lang)
+    return _TABLES[DEFAULT_LANGUAGE].get(msgid, msgid)
+
+def t(msgid: str, lang: Optional[str] = None, **params: Any) -> str:
+    """Message `msgid` dans la langue demandée, paramètres interpolés (str.format)."""
+    text = template(msgid, lang)
+    if not params:
+        return text
+    try:
+        return text.format(**params)
+    except (KeyError, IndexError, ValueError):
+        return text
+
+def has_message(msgid: str) -> bool:
+    return msgid in _TABLES[DEFAULT_LANGUAGE]
@@ -0,0 +1,243 @@
+# config/rate_limiter.py - Contrôle d'admission des appels LLM (débit, tokens/minute, priorités)
+import os
+import time
+import heapq
+import struct
+import asyncio
+import threading
+import itertools
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional, Dict, Any
+
+try:
+    import fcntl  # Verrou inter-processus (absent sous Windows)
+except ImportError:
+    fcntl = None
+
+# Les questions posées au recruteur passent avant le travail de fond (extraction de faits)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+_current_priority = contextvars.ContextVar("llm_priority", default=PRIORITY_INTERACTIVE)
+
+@contextmanager
+def llm_priority(priority: int):
+    """Fixe la priorité des appels LLM faits dans ce bloc (thread ou tâche courante)."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+def current_priority() -> int:
+    return _current_priority.get()
+
+class AdmissionTimeout(Exception):
+    """Levée quand un appel attend plus longtemps que le délai d'admission autorisé."""
+
+class TokenBucket:
+    """Seau à jetons classique, local au processus. Non thread-safe : protégé par l'appelant."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Secondes à attendre avant de pouvoir consommer `amount` jetons (0 si disponible)."""
+        self._refill(time.monotonic())
+        amount = min(amount, self.capacity)
+        if self._tokens >= amount:
+            return 0.0
+        return (amount - self._tokens) / self.rate
+
+    def consume(self, amount: float):
+        self._refill(time.monotonic())
+        self._tokens -= min(amount, self.capacity)
+
+    def adjust(self, amount: float):
+        """Rend (amount > 0) ou reprend (amount < 0) des jetons après coup."""
+        self._refill(time.monotonic())
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+class SharedTokenBucket(TokenBucket):
+    """Seau à jetons partagé entre les workers via un petit fichier verrouillé (fcntl.flock)."""
+    _FORMAT = "dd"  # (jetons, horodatage time.time())
+
+    def __init__(self, rate: float, capacity: float, path: str):
+        super().__init__(rate, capacity)
+        self.path = path
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        with os.fdopen(fd, "r+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            if len(f.read()) != struct.calcsize(self._FORMAT):
+                f.seek(0)
+                f.truncate()
+                f.write(struct.pack(self._FORMAT, capacity, time.time()))
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _locked(self, operation):
+        with open(self.path, "r+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                tokens, updated = struct.unpack(self._FORMAT, f.read())
+                now = time.time()
+                tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+                tokens, result = operation(tokens)
+                f.seek(0)
+                f.write(struct.pack(self._FORMAT, tokens, now))
+                return result
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def delay(self, amount: float) -> float:
+        amount = min(amount, self.capacity)
+        return self._locked(lambda tokens: (tokens, 0.0 if tokens >= amount else (amount - tokens) / self.rate))
+
+    def consume(self, amount: float):
+        amount = min(amount, self.capacity)
+        self._locked(lambda tokens: (tokens - amount, None))
+
+    def adjust(self, amount: float):
+        self._locked(lambda tokens: (min(self.capacity, tokens + amount), None))
+
+class AdmissionTicket:
+    """Autorisation d'émettre un appel ; `actual_tokens` permet de corriger l'estimation."""
+    __slots__ = ("estimated_tokens", "actual_tokens", "priority", "wait")
+
+    def __init__(self, estimated_tokens: int, priority: int, wait: float):
+        self.estimated_tokens = estimated_tokens
+        self.actual_tokens = None
+        self.priority = priority
+        self.wait = wait
+
+class AdmissionController:
+    """
+    File d'attente à priorités devant l'API LLM.
+    Un appel n'est admis que s'il est en tête de file, qu'un créneau de concurrence est libre
+    et que les budgets requêtes/seconde et tokens/minute le permettent.
+    """
+
+    def __init__(self, requests_per_second: float, tokens_per_minute: float, max_concurrency: int,
+                 timeout: Optional[float] = None, shared_dir: Optional[str] = None):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        if shared_dir and fcntl is not None:
+            os.makedirs(shared_dir, exist_ok=True)
+            self._request_bucket = SharedTokenBucket(requests_per_second, max(1.0, requests_per_second), os.path.join(shared_dir, "llm_requests.bucket"))
+            self._token_bucket = SharedTokenBucket(tokens_per_minute / 60.0, tokens_per_minute, os.path.join(shared_dir, "llm_tokens.bucket"))
+        else:
+            self._request_bucket = TokenBucket(requests_per_second, max(1.0, requests_per_second))
+            self._token_bucket = TokenBucket(tokens_per_minute / 60.0, tokens_per_minute)
+        self._cond = threading.Condition()
+        self._queue = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._waits = deque(maxlen=500)
+        self._admitted = 0
+        self._timeouts = 0
+        self._rate_limited = 0
+
+    def _delay(self, estimated_tokens: int) -> float:
+        pause = self._paused_until - time.monotonic()
+        return max(pause, self._request_bucket.delay(1), self._token_bucket.delay(estimated_tokens))
+
+    def acquire(self, estimated_tokens: int = 0, priority: Optional[int] = None, timeout: Optional[float] = None) -> AdmissionTicket:
+        """Bloque jusqu'à l'admission de l'appel. Lève AdmissionTimeout si le délai est dépassé."""
+        priority = current_priority() if priority is None else priority
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout if timeout else None
+        entry = (priority, next(self._seq))
+
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+            try:
+                while True:
+                    delay = None
+                    if self._queue[0] == entry and self._in_flight < self.max_concurrency:
+                        delay = self._delay(estimated_tokens)
+                        if delay <= 0:
+                            break
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._timeouts += 1
+                            raise AdmissionTimeout(f"Appel LLM non admis après {timeout:.1f}s (file: {len(self._queue)})")
+                        delay = remaining if delay is None else min(delay, remaining)
+                    self._cond.wait(delay)
+            except BaseException:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+                raise
+
+            heapq.heappop(self._queue)
+            self._request_bucket.consume(1)
+            self._token_bucket.consume(estimated_tokens)
+            self._in_flight += 1
+            wait = time.monotonic() - start
+            self._waits.append(wait)
+            self._admitted += 1
+            self._cond.notify_all()
+        return AdmissionTicket(estimated_tokens, priority, wait)
+
+    def release(self, ticket: AdmissionTicket):
+        with self._cond:
+            self._in_flight -= 1
+            if ticket.actual_tokens is not None:
+                self._token_bucket.adjust(ticket.estimated_tokens - ticket.actual_tokens)
+            self._cond.notify_all()
+
+    def penalize(self, retry_after: float):
+        """Suspend les admissions après un 429 du fournisseur."""
+        with self._cond:
+            self._rate_limited += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            self._cond.notify_all()
+
+    @contextmanager
+    def admit(self, estimated_tokens: int = 0, priority: Optional[int] = None):
+        ticket = self.acquire(estimated_tokens, priority)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    async def acquire_async(self, estimated_tokens: int = 0, priority: Optional[int] = None) -> AdmissionTicket:
+        """Version asynchrone : l'attente se fait dans un thread pour ne pas bloquer la boucle."""
+        priority = current_priority() if priority is None else priority
+        future = asyncio.get_running_loop().run_in_executor(None, self.acquire, estimated_tokens, priority)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Le thread finira par obtenir le créneau : le rendre dès qu'il l'a
+            future.add_done_callback(lambda f: f.exception() is None and self.release(f.result()))
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            waits = sorted(self._waits)
+            queued = {}
+            for priority, _ in self._queue:
+                queued[priority] = queued.get(priority, 0) + 1
+            return {
+                "queue_depth": len(self._queue),
+                "queued_by_priority": queued,
+                "in_flight": self._in_flight,
+                "max_concurrency": self.max_concurrency,
+                "admitted": self._admitted,
+                "timeouts": self._timeouts,
+                "rate_limited": self._rate_limited,
+                "wait_ms_avg": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+                "wait_ms_p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1) if waits else 0.0,
+                "wait_ms_max": round(waits[-1] * 1000, 1) if waits else 0.0,
+            }
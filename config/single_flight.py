@@ -0,0 +1,97 @@
+# config/single_flight.py - Regroupement des appels identiques en vol (un seul appel amont par clé)
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Les appels concurrents portant la même clé attendent le premier (le « leader ») et
+    partagent son résultat ou son exception. Rien n'est mis en cache une fois l'appel terminé.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[Tuple[int, str], list] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Exécute fn() une seule fois pour tous les threads concurrents. Retourne (résultat, partagé)."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self._leaders += 1
+                leader = True
+            else:
+                self._coalesced += 1
+                leader = False
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result, False
+
+    async def do_async(self, key: str, coro_fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Équivalent asynchrone : l'appel amont tourne dans une tâche partagée.
+        Une attente annulée n'annule la tâche que si plus personne ne l'attend.
+        """
+        loop_key = (id(asyncio.get_running_loop()), key)
+        entry = self._tasks.get(loop_key)
+        if entry is None:
+            task = asyncio.ensure_future(coro_fn())
+            entry = self._tasks[loop_key] = [task, 0]
+            task.add_done_callback(lambda _: self._tasks.pop(loop_key, None))
+            self._leaders += 1
+            shared = False
+        else:
+            self._coalesced += 1
+            shared = True
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task), shared
+        except asyncio.CancelledError:
+            if not task.done() and entry[1] == 1:
+                task.cancel()
+            raise
+        finally:
+            entry[1] -= 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "leaders": self._leaders,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._calls) + len(self._tasks)
+            }
+
+def prompt_key(*parts: Any) -> str:
+    """Empreinte stable d'un prompt et de ses paramètres."""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
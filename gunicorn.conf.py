@@ -0,0 +1,27 @@
+# gunicorn.conf.py - Configuration gunicorn (chargée automatiquement par `gunicorn app:app`)
+import gc
+import os
+
+worker_class = "gthread"
+# Un seul worker : les sessions (app.active_sessions) vivent dans la mémoire du processus.
+# La montée en charge passe par les threads tant qu'elles ne sont pas dans un stockage partagé.
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+# Même variable que config/llm_config.py pour dimensionner le pool HTTP du worker
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+keepalive = 5
+# L'application est importée une seule fois par le maître, puis partagée par fork
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+def when_ready(server):
+    """Avant le fork des workers : charger les dépendances lourdes une fois pour toutes."""
+    if preload_app:
+        from config.llm_config import preload
+        preload()
+        # Sortir ces objets du ramasse-miettes pour que les workers ne touchent pas leurs pages
+        gc.freeze()
+
+def post_fork(server, worker):
+    """Ouvre la connexion vers l'API LLM dès le démarrage du worker."""
+    from config.llm_config import warm_up_connections
+    warm_up_connections()
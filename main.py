@@ -2,6 +2,7 @@
 import traceback
 import sys
 from workflow.form_workflow import FormWorkflow
+from config.llm_config import warm_up_connections
 
 def main():
     # Message d'accueil orienté recruteurs
@@ -26,6 +27,9 @@ def main():
     # Augmenter la limite de récursion de Python
     sys.setrecursionlimit(1500)  # Valeur par défaut: 1000
     
+    # Ouvrir la connexion LLM pendant la construction du workflow
+    warm_up_connections()
+    
     try:
         # Création et démarrage du workflow
         form = FormWorkflow()
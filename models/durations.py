@@ -0,0 +1,321 @@
+# models/durations.py - Analyse locale des délais et durées en semaines ("immédiatement", "2-3 semaines", "début janvier")
+#
+# Les réponses à availability / estimatedWeeks sont presque toujours une formule courte : un mot
+# ("ASAP"), une quantité ("un mois et demi"), un intervalle ("entre 2 et 3 semaines") ou une date
+# relative ("mi-février", "fin de l'année") rapportée à la date du jour. L'analyse renvoie une
+# confiance : en dessous de MIN_CONFIDENCE (mots non reconnus, négation, plusieurs expressions),
+# la réponse est confiée au LLM (voir UpdateAgent._local_answer).
+import re
+import calendar
+import unicodedata
+from datetime import date
+from typing import List, NamedTuple, Optional, Tuple
+
+MIN_CONFIDENCE = 0.8
+# Au-delà de deux ans, un délai ou une durée de mission est plus probablement une erreur de lecture
+# ("100 ans") : la confiance est plafonnée pour laisser trancher le LLM
+MAX_PLAUSIBLE_WEEKS = 104
+# Nombre sans unité : "40" est sans doute des semaines, mais "le 5" est un jour du mois. En dessous
+# de MIN_CONFIDENCE, la réponse passe par le LLM et la détection d'intention
+BARE_NUMBER_CONFIDENCE = 0.6
+
+# Champs exprimés en semaines, et nombre de semaines comptées par mois (règles des prompts existants :
+# "1 mois ≈ 4 semaines" pour la disponibilité, "3 mois → 13" pour la durée d'un projet)
+DURATION_FIELDS = {"availability": 4.0, "estimatedWeeks": 52 / 12}
+
+_NUMBER_WORDS = {
+    "un": 1, "une": 1, "deux": 2, "trois": 3, "quatre": 4, "cinq": 5, "six": 6, "sept": 7, "huit": 8, "neuf": 9,
+    "dix": 10, "onze": 11, "douze": 12, "quinze": 15, "vingt": 20, "trente": 30,
+    "one": 1, "a": 1, "an": 1, "two": 2, "three": 3, "four": 4, "five": 5, "seven": 7, "eight": 8, "nine": 9,
+    "ten": 10, "eleven": 11, "twelve": 12, "fifteen": 15, "twenty": 20, "thirty": 30,
+    "uno": 1, "una": 1, "dos": 2, "tres": 3, "cuatro": 4, "cinco": 5, "seis": 6, "siete": 7, "ocho": 8, "nueve": 9,
+    "diez": 10, "once": 11, "doce": 12, "quince": 15, "veinte": 20, "treinta": 30,
+}
+_UNITS = {
+    "jour": "day", "jours": "day", "j": "day", "day": "day", "days": "day", "dia": "day", "dias": "day",
+    "semaine": "week", "semaines": "week", "sem": "week", "week": "week", "weeks": "week", "wk": "week",
+    "semana": "week", "semanas": "week",
+    "mois": "month", "month": "month", "months": "month", "mes": "month", "meses": "month",
+    "an": "year", "ans": "year", "annee": "year", "annees": "year", "year": "year", "years": "year",
+    "ano": "year", "anos": "year",
+}
+_MONTHS = {
+    "janvier": 1, "fevrier": 2, "mars": 3, "avril": 4, "mai": 5, "juin": 6, "juillet": 7, "aout": 8,
+    "septembre": 9, "octobre": 10, "novembre": 11, "decembre": 12,
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6, "july": 7, "august": 8,
+    "september": 9, "october": 10, "november": 11, "december": 12,
+    "jan": 1, "feb": 2, "fev": 2, "apr": 4, "avr": 4, "jun": 6, "jul": 7, "aug": 8, "sep": 9,
+    "oct": 10, "nov": 11, "dec": 12,
+    "enero": 1, "febrero": 2, "marzo": 3, "abril": 4, "mayo": 5, "junio": 6, "julio": 7, "agosto": 8,
+    "septiembre": 9, "setiembre": 9, "octubre": 10, "noviembre": 11, "diciembre": 12,
+}
+# Position dans la période : début (1), milieu (15), fin (dernier jour)
+_POSITIONS = {
+    "debut": "start", "commencement": "start", "early": "start", "beginning": "start", "start": "start",
+    "principios": "start", "inicios": "start", "comienzos": "start",
+    "mi": "mid", "milieu": "mid", "mid": "mid", "middle": "mid", "mediados": "mid",
+    "fin": "end", "end": "end", "late": "end", "finales": "end", "final": "end",
+}
+_PERIODS = {"mois": "month", "month": "month", "mes": "month",
+            "annee": "year", "an": "year", "year": "year", "ano": "year",
+            "semaine": "week", "week": "week", "semana": "week"}
+_NEXT = frozenset({"prochain", "prochaine", "next", "proximo", "proxima", "suivant", "suivante", "siguiente"})
+# Pas de disjonction ("ou", "or", "o") : "2 semaines ou 3 mois" propose deux valeurs, pas un intervalle
+_RANGE_SEPARATORS = frozenset({"-", "a", "to", "au", "hasta"})
+_RANGE_OPENERS = frozenset({"entre", "between", "from", "de", "desde"})
+_RANGE_JOINERS = frozenset({"et", "and", "y"})
+_HALF = (("et", "demi"), ("et", "demie"), ("and", "a", "half"), ("y", "medio"), ("y", "media"))
+
+# Formules qui valent un nombre fixe de semaines
+_PHRASES: Tuple[Tuple[float, Tuple[str, ...]], ...] = (
+    (0, ("immediatement", "immediat", "immediate", "immediately", "tout de suite", "de suite", "des que possible",
+         "au plus vite", "au plus tot", "asap", "now", "right now", "right away", "straight away",
+         "as soon as possible", "maintenant", "des maintenant", "aujourd hui", "today", "demain", "tomorrow",
+         "apres demain", "sans delai", "sans preavis", "hoy", "manana", "inmediatamente", "inmediato", "inmediata",
+         "ya", "cuanto antes", "lo antes posible", "lo mas pronto posible", "de inmediato", "urgent", "urgente")),
+    (1, ("semaine prochaine", "next week", "semana que viene", "proxima semana", "semana proxima",
+         "huitaine", "une huitaine", "sous huitaine", "une huitaine de jours")),
+    (2, ("quinzaine", "une quinzaine", "une quinzaine de jours", "sous quinzaine", "fortnight", "a fortnight",
+         "quincena", "una quincena")),
+)
+# Mots sans contenu : ils n'abaissent pas la confiance
+_FILLER = frozenset("""
+    dans d ici l le la les de du des en sous environ approximativement vers au aux plus tard tot maximum max minimum
+    min pendant durant pour sur jusqu jusque a partir apres compter il elle faut doit doivent etre est sera
+    disponible disponibilite dispo disponibles candidat candidate poste projet mission contrat duree durera dure
+    prevu prevue prevus estime estimee je pense dirais disons c cest ok svp merci er eme
+    in within about around approximately roughly the at latest most for during over until till by starting start
+    from after available availability project contract mission duration should be will is it lasts last we say
+    of i think please thanks st nd rd th
+    en el la los las unos unas un dentro aproximadamente alrededor mas tardar por para durante hasta desde
+    disponible disponibilidad proyecto contrato duracion sera dura de del al gracias
+""".split())
+_ORDINALS = frozenset({"er", "eme", "st", "nd", "rd", "th", "de", "of"})   # "1er avril", "15 de marzo", "1st of may"
+_NEGATIONS = frozenset({"pas", "non", "ni", "jamais", "not", "no", "never", "nunca", "sin"})
+_TOKEN = re.compile(r"\d{4}-\d{1,2}-\d{1,2}|\d{1,2}/\d{1,2}(?:/\d{2,4})?|\d+(?:[.,]\d+)?|[a-z]+|-")
+
+class DurationParse(NamedTuple):
+    weeks: float
+    confidence: float
+    kind: str   # "immediate", "duration", "range", "date"
+
+def _tokens(text: str) -> List[str]:
+    text = unicodedata.normalize("NFKD", text.lower().replace("’", "'"))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _TOKEN.findall(text)
+
+def _round_weeks(weeks: float) -> float:
+    """Semaine entière la plus proche (45 jours -> 6, 48 jours -> 7)."""
+    return float(int(weeks + 0.5))
+
+def _weeks_until(target: date, today: date) -> float:
+    return max(0.0, _round_weeks((target - today).days / 7))
+
+def _month_date(year: int, month: int, day: Optional[int], position: str) -> date:
+    last = calendar.monthrange(year, month)[1]
+    if day is not None:
+        return date(year, month, min(day, last))
+    return date(year, month, {"start": 1, "mid": 15, "end": last}[position])
+
+def _number(token: str) -> Optional[float]:
+    if token[:1].isdigit():
+        try:
+            return float(token.replace(",", "."))
+        except ValueError:
+            return None
+    return _NUMBER_WORDS.get(token)
+
+class _Parser:
+    """Parcours des mots de la réponse ; chaque expression reconnue donne (début, fin, semaines, type)."""
+
+    def __init__(self, tokens: List[str], weeks_per_month: float, today: date):
+        self.tokens = tokens
+        self.weeks_per_month = weeks_per_month
+        self.today = today
+
+    def at(self, index: int) -> str:
+        return self.tokens[index] if index < len(self.tokens) else ""
+
+    def skip_filler(self, index: int, limit: int = 3) -> int:
+        while limit and (self.at(index) in _FILLER or self.at(index) == "-"):
+            index += 1
+            limit -= 1
+        return index
+
+    def phrase(self, index: int) -> Optional[Tuple[int, float]]:
+        best = None
+        for weeks, phrases in _PHRASES:
+            for phrase in phrases:
+                words = phrase.split()
+                if self.tokens[index:index + len(words)] == words and (best is None or len(words) > best[0] - index):
+                    best = (index + len(words), float(weeks))
+        return best
+
+    def quantity(self, index: int) -> Optional[Tuple[int, Optional[float], Optional[str]]]:
+        """Nombre suivi éventuellement d'une unité (et "et demi") : (fin, nombre, unité)."""
+        value = _number(self.at(index))
+        if value is None:
+            return None
+        end = index + 1
+        unit = _UNITS.get(self.at(end))
+        if self.at(index) in ("a", "an") and unit is None:
+            return None   # "a" / "an" ne sont des nombres que devant une unité ("a month", "un an")
+        if unit is not None:
+            end += 1
+            for half in _HALF:
+                if tuple(self.tokens[end:end + len(half)]) == half:
+                    value += 0.5
+                    end += len(half)
+                    break
+        return end, value, unit
+
+    def to_weeks(self, value: float, unit: str) -> float:
+        if unit == "day":
+            return _round_weeks(value / 7)
+        if unit == "month":
+            return _round_weeks(value * self.weeks_per_month)
+        if unit == "year":
+            return _round_weeks(value * 52)
+        return value
+
+    def duration(self, index: int) -> Optional[Tuple[int, float, str, float]]:
+        """Quantité ou intervalle ("2-3 semaines", "entre 2 et 3 mois", "2 semaines à 1 mois") : (fin, semaines, type, confiance)."""
+        opener = self.at(index) in _RANGE_OPENERS
+        first = self.quantity(index + 1 if opener else index)
+        if first is None:
+            return None
+        end, low, low_unit = first
+        separators = _RANGE_SEPARATORS | (_RANGE_JOINERS if opener else frozenset())
+        second = self.quantity(end + 1) if self.at(end) in separators else None
+        if second is not None and second[2] is not None or (second is not None and low_unit is None):
+            end, high, high_unit = second
+            unit = high_unit or "week"
+            low_weeks, high_weeks = self.to_weeks(low, low_unit or unit), self.to_weeks(high, unit)
+            if high_weeks >= low_weeks:
+                return end, (low_weeks + high_weeks) / 2, "range", 1.0 if high_unit else BARE_NUMBER_CONFIDENCE
+        if low_unit is None and (opener or low > MAX_PLAUSIBLE_WEEKS):
+            return None   # "entre 2", "2027" : pas une durée
+        # Nombre seul : le champ est exprimé en semaines, mais l'unité reste à confirmer
+        return end, self.to_weeks(low, low_unit or "week"), "duration", 1.0 if low_unit else BARE_NUMBER_CONFIDENCE
+
+    def calendar_date(self, index: int) -> Optional[Tuple[int, float]]:
+        """Date relative : "début janvier", "le 15 mars", "march 15", "fin du mois", "l'année prochaine", "15/03"."""
+        token = self.at(index)
+        if "/" in token or (len(token) == 10 and token[4] == "-"):
+            return self.numeric_date(index)
+        position = _POSITIONS.get(token)
+        start = self.skip_filler(index + 1) if position else index
+        day = None
+        value = _number(self.at(start)) if self.at(start)[:1].isdigit() else None
+        if value is not None and value.is_integer() and 1 <= value <= 31:
+            month_index = start + 1
+            while self.at(month_index) in _ORDINALS and month_index < start + 3:
+                month_index += 1
+            if self.at(month_index) in _MONTHS:
+                day, start = int(value), month_index
+        anchor = self.at(start)
+        if anchor in _MONTHS:
+            month, end, year = _MONTHS[anchor], start + 1, None
+            following = _number(self.at(end)) if self.at(end)[:1].isdigit() else None
+            if following is not None and following.is_integer():
+                if 2000 <= following <= 2100:
+                    year, end = int(following), end + 1
+                elif day is None and 1 <= following <= 31:
+                    day, end = int(following), end + 1
+            return end, self.resolve_month(month, year, day, position or "start")
+        if anchor == "rentree":
+            return start + 1, self.resolve_month(9, None, 1, "start")
+        # "le mois prochain", "next month", "fin du mois", "début d'année"
+        shift = 0
+        if anchor in _NEXT and self.at(start + 1) in _PERIODS:
+            shift, start = 1, start + 1
+        period = _PERIODS.get(self.at(start))
+        end = start + 1
+        if period is not None and not shift and self.at(end) in _NEXT:
+            shift, end = 1, end + 1
+        if period is None or (position is None and not shift):
+            return None
+        today = self.today
+        if period == "week":
+            return end, float(shift)
+        if period == "month":
+            month, year = today.month + shift, today.year
+            if month > 12:
+                month, year = 1, year + 1
+            resolved = _month_date(year, month, None, position or "start")
+            if resolved < today:   # "début du mois" passé : celui du mois suivant
+                month, year = (1, year + 1) if month == 12 else (month + 1, year)
+                resolved = _month_date(year, month, None, position or "start")
+            return end, _weeks_until(resolved, today)
+        month = {"start": 1, "mid": 7, "end": 12}[position or "start"]
+        resolved = _month_date(today.year + shift, month, 1 if position == "mid" else None, position or "start")
+        if resolved < today:
+            resolved = _month_date(today.year + 1, month, 1 if position == "mid" else None, position or "start")
+        return end, _weeks_until(resolved, today)
+
+    def resolve_month(self, month: int, year: Optional[int], day: Optional[int], position: str) -> float:
+        """Semaines jusqu'à cette date ; sans année, un mois déjà passé désigne celui de l'an prochain."""
+        resolved = _month_date(year or self.today.year, month, day, position)
+        if year is None and resolved < self.today:
+            resolved = _month_date(self.today.year + 1, month, day, position)
+        return _weeks_until(resolved, self.today)
+
+    def match(self, index: int) -> Optional[Tuple[int, float, str, float]]:
+        """Expression qui commence à cette position : (fin, semaines, type, confiance)."""
+        phrase = self.phrase(index)
+        if phrase is not None:
+            return phrase[0], phrase[1], "immediate" if phrase[1] == 0 else "duration", 1.0
+        when = self.calendar_date(index)
+        if when is not None:
+            return when[0], when[1], "date", 1.0
+        return self.duration(index)
+
+    def numeric_date(self, index: int) -> Optional[Tuple[int, float]]:
+        token = self.at(index)
+        try:
+            if "/" in token:
+                parts = [int(part) for part in token.split("/")]
+                year = parts[2] if len(parts) == 3 else None
+                if year is not None and year < 100:
+                    year += 2000
+                if _UNITS.get(self.at(index + 1)):
+                    return None   # "2/3 semaines" n'est pas une date
+                return index + 1, self.resolve_month(parts[1], year, parts[0], "start")
+            year, month, day = (int(part) for part in token.split("-"))
+            return index + 1, _weeks_until(date(year, month, day), self.today)
+        except ValueError:
+            return None
+
+def parse_duration(text: str, weeks_per_month: float = 52 / 12, today: Optional[date] = None) -> Optional[DurationParse]:
+    """
+    Nombre de semaines exprimé par la réponse, avec une confiance entre 0 et 1 ; None si aucune
+    expression de durée ou de date n'y figure. Les dates sont rapportées à `today` (par défaut aujourd'hui)
+    et un mois déjà passé désigne celui de l'an prochain ; un intervalle vaut son milieu.
+    """
+    tokens = _tokens(text)
+    parser = _Parser(tokens, weeks_per_month, today or date.today())
+    found: List[Tuple[float, str, float]] = []   # (semaines, type, confiance)
+    unknown = 0
+    negated = False
+    index = 0
+    while index < len(tokens):
+        match = parser.match(index)
+        if match is not None:
+            index = match[0]
+            found.append(match[1:])
+        else:
+            token = tokens[index]
+            if token in _NEGATIONS:
+                negated = True
+            elif token not in _FILLER and token != "-":
+                unknown += 1
+            index += 1
+    if not found:
+        return None
+    weeks, kind, confidence = found[0]
+    if len({round(item[0], 2) for item in found}) > 1:
+        confidence = min(confidence, 0.5)   # "2 semaines ou 1 mois" : plusieurs valeurs possibles
+    if weeks > MAX_PLAUSIBLE_WEEKS:
+        confidence = min(confidence, 0.5)
+    confidence = 0.0 if negated else max(0.0, confidence - 0.25 * unknown)
+    return DurationParse(float(weeks), round(confidence, 2), kind)
@@ -0,0 +1,245 @@
+# models/field_schema.py - Schéma déclaratif des champs de l'offre, compilé une fois en tables de recherche
+#
+# Source unique pour JobDetails (champs requis, validations), QuestionAgent (ordre et
+# formulation des questions) et UpdateAgent (type de champ, handler de mise à jour).
+# Ajouter un champ = ajouter une ligne à FIELDS (et au modèle JobDetail).
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from pydantic_core import PydanticCustomError
+from config.messages import has_message, t, template
+
+TEXT, NUMERIC, ENUM, LIST, DICT = "text", "numeric", "enum", "list", "dict"
+
+# Un contrôle retourne None, ou (code, paramètres) en cas d'échec
+Check = Callable[[Any], Optional[Tuple[str, Dict[str, Any]]]]
+
+def at_least(minimum: float) -> Check:
+    return lambda value: ("below_min", {"min": minimum}) if value is not None and value < minimum else None
+
+def at_most(maximum: float) -> Check:
+    return lambda value: ("above_max", {"max": maximum}) if value is not None and value > maximum else None
+
+def existing_utc_offset(value: Any) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Un fuseau nommé par son décalage doit exister ("UTC+25" est refusé)."""
+    from models import timezones   # base tz : chargée au premier fuseau validé
+    name = value.get("name") if isinstance(value, dict) else None
+    return ("invalid_utc_offset", {"value": name}) if isinstance(name, str) and not timezones.valid_offset(name) else None
+
+class FieldValidationError(ValueError):
+    """
+    Erreur de validation structurée : un code stable, le champ et des paramètres.
+    Les agents peuvent la traduire sans LLM ; `message` donne la version française.
+    Les gabarits sont dans config/messages.py ("validation.<champ>.<code>" a priorité sur
+    "validation.<code>") ; les codes absents sont ceux de pydantic-core (ex. float_parsing).
+    """
+
+    def __init__(self, code: str, field: str, **params: Any):
+        self.code = code
+        self.field = field
+        self.params = params
+        super().__init__(self.message)
+
+    @property
+    def message(self) -> str:
+        return self.localized("fr")
+
+    def localized(self, lang: Optional[str]) -> str:
+        for msgid in (f"validation.{self.field}.{self.code}",
+                      f"validation.{self.params.get('min_field')}.{self.code}",
+                      f"validation.{self.code}"):
+            if has_message(msgid):
+                break
+        else:
+            msgid = "validation.type_error"
+        try:
+            return template(msgid, lang).format(field=self.field, **self.params)
+        except (KeyError, ValueError):
+            return t("validation.type_error", lang, field=self.field, detail=self.params.get("detail", self.code))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"code": self.code, "field": self.field, "params": self.params}
+
+@dataclass(frozen=True)
+class FieldSpec:
+    name: str
+    kind: str
+    priority: int
+    handler: str                                  # méthode de UpdateAgent
+    question: str                                 # question par défaut (fr)
+    values: Tuple[str, ...] = ()                  # valeurs autorisées (énumérations, continents)
+    shape: Optional[str] = None                   # forme des objets pour les listes/dicts
+    required_when: Optional[Tuple[str, Tuple[str, ...]]] = None  # (champ sélecteur, valeurs) ; None = toujours requis
+    required: bool = True
+    checks: Tuple[Check, ...] = ()
+    range_max: Optional[str] = None               # champ borne haute (pour un champ min)
+
+FIELDS: Tuple[FieldSpec, ...] = (
+    # Champs de base requis pour tous les types de job
+    FieldSpec("title", TEXT, 10, "_update_title", "Quel est le titre du poste pour cette offre d'emploi ?"),
+    FieldSpec("description", TEXT, 20, "_update_description", "Pouvez-vous décrire les responsabilités du poste ?"),
+    FieldSpec("discipline", TEXT, 30, "_update_discipline", "Dans quelle discipline ce poste s'inscrit-il (ex. Informatique, Marketing) ?"),
+    FieldSpec("availability", NUMERIC, 40, "_update_availability", "Quand le candidat doit-il être disponible (ex. immédiatement, 2 semaines) ?",
+              checks=(at_least(0),)),
+    FieldSpec("seniority", ENUM, 50, "_update_enum_field", "Quel niveau d'expérience recherchez-vous (Junior, Mid, Senior) ?",
+              values=("JUNIOR", "MID", "SENIOR")),
+    FieldSpec("languages", LIST, 60, "_update_languages", "Quelles langues sont requises (ex. Français avancé, Anglais intermédiaire) ?",
+              shape="[{name: string, level: string, required: boolean}]"),
+    FieldSpec("skills", LIST, 70, "_update_skills", "Quelles compétences sont nécessaires (ex. Python, Gestion de projet) ?",
+              shape="[{name: string, mandatory: boolean}]"),
+    FieldSpec("jobType", ENUM, 80, "_update_enum_field", "S'agit-il d'un poste Freelance, Temps plein ou Temps partiel ?",
+              values=("FREELANCE", "FULLTIME", "PARTTIME")),
+    FieldSpec("type", ENUM, 90, "_update_enum_field", "Le travail est-il à distance, sur site ou hybride ?",
+              values=("REMOTE", "ONSITE", "HYBRID")),
+
+    # Champs requis selon le type d'emploi (jobType)
+    FieldSpec("minHourlyRate", NUMERIC, 100, "_update_numeric_field", "Quel est le taux horaire minimum pour ce poste freelance ?",
+              required_when=("jobType", ("FREELANCE",)), range_max="maxHourlyRate"),
+    FieldSpec("maxHourlyRate", NUMERIC, 110, "_update_numeric_field", "Quel est le taux horaire maximum pour ce poste freelance ?",
+              required_when=("jobType", ("FREELANCE",))),
+    FieldSpec("weeklyHours", NUMERIC, 120, "_update_numeric_field", "Combien d'heures par semaine sont prévues ?",
+              required_when=("jobType", ("FREELANCE",)),
+              checks=(at_most(168),)),
+    FieldSpec("estimatedWeeks", NUMERIC, 130, "_update_numeric_field", "Combien de semaines durera ce projet freelance ?",
+              required_when=("jobType", ("FREELANCE",))),
+    FieldSpec("minFullTimeSalary", NUMERIC, 140, "_update_numeric_field", "Quel est le salaire annuel minimum pour ce poste à temps plein ?",
+              required_when=("jobType", ("FULLTIME",)), range_max="maxFullTimeSalary"),
+    FieldSpec("maxFullTimeSalary", NUMERIC, 150, "_update_numeric_field", "Quel est le salaire annuel maximum pour ce poste à temps plein ?",
+              required_when=("jobType", ("FULLTIME",))),
+    FieldSpec("minPartTimeSalary", NUMERIC, 160, "_update_numeric_field", "Quel est le salaire minimum pour ce poste à temps partiel ?",
+              required_when=("jobType", ("PARTTIME",)), range_max="maxPartTimeSalary"),
+    FieldSpec("maxPartTimeSalary", NUMERIC, 170, "_update_numeric_field", "Quel est le salaire maximum pour ce poste à temps partiel ?",
+              required_when=("jobType", ("PARTTIME",))),
+
+    # Champs requis selon le type de travail (type)
+    FieldSpec("continents", LIST, 200, "_update_list_field", "Sur quels continents recherchez-vous des candidats (ex. Europe, Asie) ?",
+              shape="[{name: string}]", required_when=("type", ("REMOTE",)),
+              values=("Europe", "Asie", "Amérique du Nord", "Amérique du Sud", "Afrique", "Océanie")),
+    FieldSpec("countries", LIST, 210, "_update_list_field", "Dans quels pays le poste est-il ouvert (ex. France, Maroc) ?",
+              shape="[{name: string}]", required_when=("type", ("REMOTE",))),
+    FieldSpec("regions", LIST, 220, "_update_list_field", "Dans quelles régions spécifiques (ex. Île-de-France, Casablanca) ?",
+              shape="[{name: string}]", required_when=("type", ("REMOTE",))),
+    FieldSpec("timeZone", DICT, 230, "_update_dict_field", "Quel fuseau horaire est requis (ex. CET, EST) ?",
+              shape="{name: string, overlap: number}", required_when=("type", ("REMOTE",)),
+              checks=(existing_utc_offset,)),
+    FieldSpec("country", DICT, 240, "_update_dict_field", "Dans quel pays le poste est-il basé (ex. France) ?",
+              shape="{name: string}", required_when=("type", ("ONSITE", "HYBRID"))),
+    FieldSpec("city", TEXT, 250, "_update_text_field", "Dans quelle ville le poste est-il situé (ex. Paris) ?",
+              required_when=("type", ("ONSITE", "HYBRID"))),
+)
+
+# --- Compilation (une seule fois, à l'import) -------------------------------------------
+
+SPECS: Dict[str, FieldSpec] = {spec.name: spec for spec in FIELDS}
+# Ordre d'affichage et de sérialisation de jobDetails (ordre de déclaration ci-dessus)
+FIELD_ORDER: Tuple[str, ...] = tuple(SPECS)
+_ordered = sorted(FIELDS, key=lambda spec: spec.priority)
+
+FIELDS_BY_KIND: Dict[str, frozenset] = {
+    kind: frozenset(spec.name for spec in FIELDS if spec.kind == kind)
+    for kind in (TEXT, NUMERIC, ENUM, LIST, DICT)
+}
+ENUM_VALUES: Dict[str, Tuple[str, ...]] = {spec.name: spec.values for spec in FIELDS if spec.kind == ENUM}
+
+# Champs toujours requis, puis requis conditionnellement : {sélecteur: {valeur: [champs]}}
+BASE_REQUIRED: Tuple[str, ...] = tuple(spec.name for spec in _ordered if spec.required and spec.required_when is None)
+CONDITIONAL_REQUIRED: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+for _spec in _ordered:
+    if _spec.required and _spec.required_when:
+        _selector, _values = _spec.required_when
+        for _value in _values:
+            _fields = CONDITIONAL_REQUIRED.setdefault(_selector, {}).setdefault(_value, ())
+            CONDITIONAL_REQUIRED[_selector][_value] = _fields + (_spec.name,)
+SELECTOR_FIELDS = frozenset(CONDITIONAL_REQUIRED)
+
+PRIORITY: Dict[str, int] = {spec.name: spec.priority for spec in FIELDS}
+HANDLER_NAMES: Dict[str, str] = {spec.name: spec.handler for spec in FIELDS}
+EXAMPLE_QUESTIONS: Dict[str, Dict[str, str]] = {spec.name: {"fr": spec.question} for spec in FIELDS}
+# Paires (min, max) indexées par chacun des deux champs
+RANGE_PAIRS: Dict[str, Tuple[str, str]] = {}
+for _spec in FIELDS:
+    if _spec.range_max:
+        RANGE_PAIRS[_spec.name] = RANGE_PAIRS[_spec.range_max] = (_spec.name, _spec.range_max)
+
+def _question_type(spec: FieldSpec) -> str:
+    if spec.kind == LIST:
+        return f"Liste d'objets: {spec.shape}"
+    if spec.kind == DICT:
+        return f"Objet: {spec.shape}"
+    if spec.kind == ENUM:
+        return f"Énumération: {', '.join(spec.values)}"
+    if spec.kind == NUMERIC:
+        return "Nombre: valeur numérique"
+    return "Texte: chaîne de caractères"
+
+_UPDATE_TYPES = {
+    TEXT: "Texte simple (chaîne de caractères)",
+    NUMERIC: "Nombre (valeur numérique)",
+    LIST: "Liste d'éléments (ex: [{'name': 'valeur'}])",
+    DICT: "Objet dictionnaire (ex: {'name': 'valeur'})",
+}
+_SHORT_TYPES = {TEXT: "texte", NUMERIC: "nombre", LIST: "liste", DICT: "objet"}
+
+# Descriptions de type utilisées dans les prompts (QuestionAgent / UpdateAgent)
+QUESTION_TYPE_DESCRIPTIONS: Dict[str, str] = {spec.name: _question_type(spec) for spec in FIELDS}
+UPDATE_TYPE_DESCRIPTIONS: Dict[str, str] = {
+    spec.name: f"Énumération (options: {', '.join(spec.values)})" if spec.kind == ENUM else _UPDATE_TYPES[spec.kind]
+    for spec in FIELDS
+}
+SHORT_TYPE_DESCRIPTIONS: Dict[str, str] = {
+    spec.name: f"énumération ({', '.join(spec.values)})" if spec.kind == ENUM else _SHORT_TYPES[spec.kind]
+    for spec in FIELDS
+}
+# Liste des champs pour les prompts d'analyse d'intention
+FIELDS_SUMMARY = ", ".join(f"{spec.name} ({SHORT_TYPE_DESCRIPTIONS[spec.name]})" for spec in FIELDS)
+
+def is_filled(field: str, value: Any) -> bool:
+    """
+    Champ renseigné selon son type : un nombre dès qu'il n'est pas None (availability=0 =
+    immédiatement), un objet (timeZone, country) dès que son nom est donné, une liste ou un
+    texte non vide sinon.
+    """
+    spec = SPECS.get(field)
+    kind = spec.kind if spec else None
+    if kind == NUMERIC:
+        return value is not None
+    if kind == DICT or isinstance(value, dict):
+        return isinstance(value, dict) and bool(value.get("name"))
+    return value not in (None, "", [])
+
+def required_fields(details: Dict[str, Any]) -> List[str]:
+    """Champs requis pour l'état courant, par ordre de priorité."""
+    required = list(BASE_REQUIRED)
+    for selector, by_value in CONDITIONAL_REQUIRED.items():
+        required.extend(by_value.get(details.get(selector), ()))
+    return required
+
+def enforce(field: str, value: Any) -> Any:
+    """
+    Contrôles déclarés d'un champ (valeurs autorisées, bornes), utilisés comme validateurs
+    pydantic par JobDetail et par les TypeAdapters de JobDetails. Lève PydanticCustomError.
+    """
+    spec = SPECS[field]
+    if spec.kind == ENUM and value and value not in spec.values:
+        raise PydanticCustomError("invalid_choice", "'{value}' n'est pas parmi {allowed}",
+                                  {"value": str(value), "allowed": ", ".join(spec.values)})
+    for check in spec.checks:
+        failure = check(value)
+        if failure:
+            code, params = failure
+            raise PydanticCustomError(code, code, params)
+    return value
+
+def check_ranges(field: str, value: Any, details: Dict[str, Any]) -> Optional[FieldValidationError]:
+    """Cohérence des paires min/max avec l'état `details`. Retourne l'erreur ou None."""
+    pair = RANGE_PAIRS.get(field)
+    if pair is None or value is None:
+        return None
+    low_field, high_field = pair
+    low = value if field == low_field else details.get(low_field)
+    high = value if field == high_field else details.get(high_field)
+    try:
+        if low is not None and high is not None and low > high:
+            return FieldValidationError("min_gt_max", field, min_field=low_field, max_field=high_field)
+    except TypeError:
+        pass  # valeur non numérique : laissée aux validations de type
+    return None
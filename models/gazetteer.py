@@ -0,0 +1,365 @@
+# models/gazetteer.py - Villes connues hors ligne : nom canonique, code pays, recherche tolérante aux fautes
+#
+# La liste source (models/data/cities.tsv) est compilée en un fichier d'enregistrements de taille fixe
+# triés par clé normalisée (models/data/cities.bin). Ce fichier est projeté en mémoire (mmap) : les
+# workers gunicorn partagent les mêmes pages, la recherche est une dichotomie sans rien désérialiser,
+# et les clés d'un même préfixe sont contiguës (candidats de la recherche tolérante aux fautes).
+# Le fichier est recompilé automatiquement quand la source change (empreinte dans l'en-tête).
+# Recompiler à la main : python -m models.gazetteer
+import os
+import re
+import mmap
+import struct
+import gettext
+import hashlib
+import threading
+import unicodedata
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SOURCE = os.path.join(DATA_DIR, "cities.tsv")
+INDEX = os.path.join(DATA_DIR, "cities.bin")
+MIN_CONFIDENCE = 0.8
+
+# En-tête : signature, nombre d'enregistrements, empreinte de la source ; puis enregistrements
+# (clé normalisée, nom retenu, code pays, population en milliers), triés par clé puis population décroissante
+_MAGIC = b"GAZ1"
+_HEADER = struct.Struct("<4sI16s")
+_RECORD = struct.Struct("<48s48s2sI")
+_KEY_SIZE = 48
+_LONGEST = 5   # mots de la plus longue clé ("santa cruz de la sierra")
+
+# Noms de pays absents de pycountry (ou abrégés) -> code ISO 3166
+COUNTRY_ALIASES: Dict[str, str] = {
+    "usa": "US", "us": "US", "etats unis": "US", "etats unis d amerique": "US", "amerique": "US",
+    "estados unidos": "US", "eeuu": "US", "uk": "GB", "royaume uni": "GB", "angleterre": "GB", "england": "GB",
+    "ecosse": "GB", "scotland": "GB", "pays de galles": "GB", "wales": "GB", "grande bretagne": "GB",
+    "great britain": "GB", "britain": "GB", "reino unido": "GB", "inglaterra": "GB", "hollande": "NL",
+    "holland": "NL", "holanda": "NL", "coree du sud": "KR", "coree": "KR", "south korea": "KR", "korea": "KR",
+    "corea del sur": "KR", "russie": "RU", "russia": "RU", "rusia": "RU", "syrie": "SY", "vietnam": "VN",
+    "iran": "IR", "bolivie": "BO", "venezuela": "VE", "tanzanie": "TZ", "rdc": "CD", "congo kinshasa": "CD",
+    "congo brazzaville": "CG", "cote d ivoire": "CI", "ivory coast": "CI", "emirats": "AE",
+    "emirats arabes unis": "AE", "eau": "AE", "uae": "AE", "taiwan": "TW", "tchequie": "CZ",
+    "republique tcheque": "CZ", "czech republic": "CZ", "moldavie": "MD", "macedoine": "MK", "laos": "LA",
+    "birmanie": "MM", "burma": "MM", "palestine": "PS", "turquie": "TR", "turkey": "TR", "guadeloupe": "GP",
+}
+
+# Villes qui sont aussi des mots courants ou des prénoms : reconnues dans une phrase seulement
+# avec une majuscule ("Nice"), ou quand elles constituent toute la réponse
+_AMBIGUOUS = frozenset({
+    "nice", "tours", "sale", "mons", "pau", "cannes", "grenade", "laval", "valence", "vienne", "cork", "cali",
+    "leon", "rio", "casa", "faro", "lima", "essen", "santiago", "salvador", "victoria", "charlotte", "nancy",
+    "florence", "sofia", "orlando", "phoenix", "columbus", "hamilton", "regina", "kingston", "brighton",
+    "oxford", "cambridge", "sf", "kl", "aix", "canton", "reims",
+})
+# Mots sans contenu dans une réponse sur la ville (sans accents)
+_FILLER = frozenset("""
+    le la les l un une des de du d a au aux en dans et ou sur a cote pres proche de pres autour environs
+    alentours region sa son ses nos notre nous on poste est sera situe situee base basee bases basees
+    travail travaille bureau bureaux siege locaux agence site sur centre ville intra muros grand grande
+    metropole agglomeration banlieue peripherie zone quartier presentiel hybride c cest plutot uniquement
+    the in at of and or near based located city office offices downtown area greater metro metropolitan
+    el los las del en y o cerca ciudad oficina oficinas sede centro zona
+    svp merci please thanks gracias
+""".split())
+_SPELLED = str.maketrans({"ł": "l", "ø": "o", "đ": "d", "ß": "ss", "æ": "ae", "œ": "oe", "ı": "i"})
+_WORD = re.compile(r"[^\W_]+")
+_EXPANSIONS = {"st": "saint", "ste": "sainte"}
+
+class City(NamedTuple):
+    name: str          # nom retenu ("Bruxelles" pour "Brussels")
+    country: str       # code ISO 3166 ("BE")
+    population: int    # en milliers
+
+class CityMatch(NamedTuple):
+    name: str
+    country: str
+    confidence: float  # 1.0 pour un nom exact, moins pour une faute de frappe ou des mots inconnus
+
+def _words(text: str) -> List[str]:
+    """Mots de `text` sans accents, casse conservée ("Saint-Étienne" -> ["Saint", "Etienne"])."""
+    text = unicodedata.normalize("NFKD", text.translate(_SPELLED))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _WORD.findall(text)
+
+def normalize(name: str) -> str:
+    """Clé de recherche d'un nom de lieu : minuscules, sans accents ni ponctuation, "St" développé."""
+    return " ".join(_EXPANSIONS.get(word, word) for word in (word.lower() for word in _words(name)))
+
+# --- Compilation ------------------------------------------------------------------------
+
+def _digest(source: bytes) -> bytes:
+    return hashlib.blake2b(source, digest_size=16).digest()
+
+def _compile(source: bytes) -> bytes:
+    """Fichier d'index (en-tête + enregistrements triés) compilé depuis le contenu de cities.tsv."""
+    records: Dict[Tuple[bytes, bytes], Tuple[bytes, int]] = {}
+    for line in source.decode("utf-8").splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        columns = line.split("\t")
+        name, country, population = columns[0], columns[1], int(columns[2])
+        aliases = columns[3].split("|") if len(columns) > 3 and columns[3] else []
+        for alias in [name] + aliases:
+            key = normalize(alias).encode("utf-8")
+            if len(key) > _KEY_SIZE or len(name.encode("utf-8")) > _KEY_SIZE or len(key.split()) > _LONGEST:
+                raise ValueError(f"Nom trop long pour l'index : {alias!r}")
+            previous = records.get((key, country.encode()))
+            if key and (previous is None or previous[1] < population):
+                records[(key, country.encode())] = (name.encode("utf-8"), population)
+    ordered = sorted(records.items(), key=lambda item: (item[0][0], -item[1][1]))
+    body = b"".join(_RECORD.pack(key, name, country, population)
+                    for (key, country), (name, population) in ordered)
+    return _HEADER.pack(_MAGIC, len(ordered), _digest(source)) + body
+
+def build(source: str = SOURCE, target: str = INDEX) -> int:
+    """Compile `source` vers `target` (écriture atomique) ; renvoie le nombre d'enregistrements."""
+    with open(source, "rb") as handle:
+        data = _compile(handle.read())
+    temporary = f"{target}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(data)
+    os.replace(temporary, target)
+    return _HEADER.unpack_from(data)[1]
+
+# --- Lecture --------------------------------------------------------------------------
+
+class _Gazetteer:
+    """Enregistrements triés lus directement dans le tampon (mmap ou octets) par dichotomie."""
+
+    def __init__(self, buffer: Any):
+        self.buffer = buffer
+        self.count = _HEADER.unpack_from(buffer)[1]
+
+    def key(self, position: int) -> bytes:
+        offset = _HEADER.size + position * _RECORD.size
+        return self.buffer[offset:offset + _KEY_SIZE]
+
+    def city(self, position: int) -> City:
+        _, name, country, population = _RECORD.unpack_from(self.buffer, _HEADER.size + position * _RECORD.size)
+        return City(name.rstrip(b"\0").decode("utf-8"), country.decode(), population)
+
+    def lower_bound(self, key: bytes) -> int:
+        """Première position dont la clé est >= `key` (les clés sont complétées par des octets nuls)."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def exact(self, key: str) -> List[City]:
+        padded = key.encode("utf-8").ljust(_KEY_SIZE, b"\0")
+        position, cities = self.lower_bound(padded), []
+        while position < self.count and self.key(position) == padded:
+            cities.append(self.city(position))
+            position += 1
+        return cities
+
+    def starts_key(self, word: str) -> bool:
+        """Une clé commence-t-elle par le mot `word` ? (évite de chercher les expressions qui en partent)"""
+        encoded = word.encode("utf-8")
+        position = self.lower_bound(encoded)
+        return position < self.count and self.key(position)[:len(encoded) + 1] in (encoded + b"\0", encoded + b" ")
+
+    def prefixed(self, prefix: str) -> range:
+        """Positions des clés qui commencent par `prefix` (contiguës dans l'index trié)."""
+        encoded = prefix.encode("utf-8")
+        return range(self.lower_bound(encoded), self.lower_bound(encoded + b"\xff"))
+
+_index: Dict[str, Any] = {}
+_index_lock = threading.Lock()
+
+def _open() -> _Gazetteer:
+    with open(SOURCE, "rb") as handle:
+        digest = _digest(handle.read())
+    try:
+        with open(INDEX, "rb") as handle:
+            header = handle.read(_HEADER.size)
+        stale = len(header) < _HEADER.size or _HEADER.unpack(header)[::2] != (_MAGIC, digest)
+    except OSError:
+        stale = True
+    if stale:
+        try:
+            build()
+        except OSError as e:
+            print(f"⚠️ Index des villes non écrit ({e}) : compilé en mémoire pour ce processus")
+            with open(SOURCE, "rb") as handle:
+                return _Gazetteer(_compile(handle.read()))
+    with open(INDEX, "rb") as handle:
+        return _Gazetteer(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+
+def _get_gazetteer() -> _Gazetteer:
+    """Index des villes projeté en mémoire au premier appel (recompilé si la source a changé)."""
+    if "gazetteer" not in _index:
+        with _index_lock:
+            if "gazetteer" not in _index:
+                _index["gazetteer"] = _open()
+    return _index["gazetteer"]
+
+def country_names() -> List[Tuple[str, List[str]]]:
+    """(code ISO 3166, [nom anglais, français, espagnol, nom usuel]) depuis pycountry, vide s'il est absent."""
+    try:
+        import pycountry
+    except ImportError:
+        print("⚠️ pycountry indisponible : seuls les noms de pays courants seront reconnus localement")
+        return []
+    translations = [gettext.translation("iso3166-1", pycountry.LOCALES_DIR, languages=[lang], fallback=True)
+                    for lang in ("fr", "es")]
+    names = []
+    for country in pycountry.countries:
+        variants = [country.name] + [translation.gettext(country.name) for translation in translations]
+        common = getattr(country, "common_name", None)
+        if common:
+            variants.append(common)
+        names.append((country.alpha_2, variants))
+    return names
+
+def _get_countries() -> Dict[str, str]:
+    """Nom de pays normalisé -> code ISO 3166, compilé au premier appel (pycountry est long à charger)."""
+    if "countries" not in _index:
+        with _index_lock:
+            if "countries" not in _index:
+                countries: Dict[str, str] = {}
+                for code, variants in country_names():
+                    for variant in variants:
+                        countries.setdefault(normalize(variant.split(",")[0].split("(")[0]), code)
+                countries.update(COUNTRY_ALIASES)
+                _index["countries"] = countries
+    return _index["countries"]
+
+def country_code(name: Optional[str]) -> Optional[str]:
+    """Code ISO 3166 d'un pays nommé en français, anglais ou espagnol ("Allemagne" -> "DE")."""
+    if not name:
+        return None
+    if len(name) == 2 and name.isupper():
+        return name
+    return _get_countries().get(normalize(name))
+
+# --- Recherche ------------------------------------------------------------------------
+
+def _distance(a: str, b: str, limit: int) -> int:
+    """Distance d'édition avec transpositions (Damerau restreinte), arrêtée au-delà de `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if previous2 is not None and i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+def _tolerance(key: str) -> int:
+    """Fautes tolérées selon la longueur : aucune sous 4 lettres, une jusqu'à 7, deux au-delà."""
+    return 0 if len(key) < 4 else 1 if len(key) < 8 else 2
+
+def _best(cities: List[City], country: Optional[str]) -> City:
+    """Homonymes : la ville du pays indiqué, sinon la plus peuplée (l'index est déjà trié ainsi)."""
+    return next((city for city in cities if city.country == country), cities[0])
+
+def _fuzzy(key: str, country: Optional[str]) -> Optional[Tuple[City, int]]:
+    """
+    Ville la plus proche, avec le nombre de fautes : parmi les clés qui partagent les deux
+    premières lettres, puis la seule initiale si aucune ne convient.
+    """
+    limit = _tolerance(key)
+    if not limit:
+        return None
+    gazetteer = _get_gazetteer()
+    for prefix in (key[:2], key[:1]):
+        best: Optional[Tuple[int, bool, int]] = None   # (fautes, autre pays, -population)
+        found = None
+        for position in gazetteer.prefixed(prefix):
+            candidate = gazetteer.key(position).rstrip(b"\0").decode("utf-8")
+            if abs(len(candidate) - len(key)) > limit:
+                continue
+            distance = _distance(key, candidate, limit)
+            if distance <= limit:
+                city = gazetteer.city(position)
+                rank = (distance, city.country != country, -city.population)
+                if best is None or rank < best:
+                    best, found = rank, (city, distance)
+        if found:
+            return found
+    return None
+
+def lookup(name: str, country: Optional[str] = None) -> Optional[City]:
+    """
+    Ville nommée exactement (alias compris) ou à quelques fautes près ; à homonymie égale,
+    celle du pays `country` (nom ou code ISO) est préférée. None si rien n'est assez proche.
+    """
+    key = normalize(name)
+    if not key:
+        return None
+    code = country_code(country)
+    cities = _get_gazetteer().exact(key)
+    if cities:
+        return _best(cities, code)
+    found = _fuzzy(key, code)
+    return found[0] if found else None
+
+def city_in_country(city: str, country: Any) -> Optional[bool]:
+    """
+    La ville est-elle dans ce pays ? True / False quand ville et pays sont connus, None sinon
+    (la question reste alors au LLM). Seuls les noms exacts sont pris en compte.
+    """
+    if isinstance(country, dict):
+        country = country.get("name")
+    code = country_code(country)
+    cities = _get_gazetteer().exact(normalize(city)) if city and code else []
+    if not cities:
+        return None
+    return any(entry.country == code for entry in cities)
+
+def extract_city(text: str, country: Optional[str] = None) -> Optional[CityMatch]:
+    """
+    Ville citée dans la réponse ("Le poste est basé à Lyon"), avec une confiance entre 0 et 1 ;
+    None si aucune n'est reconnue. Plusieurs villes différentes ou des mots inconnus abaissent
+    la confiance ; sans nom exact, une réponse réduite à un nom mal orthographié ("Marseile")
+    est rapprochée de la ville la plus proche.
+    """
+    originals = _words(text)
+    words = [_EXPANSIONS.get(word.lower(), word.lower()) for word in originals]
+    meaningful = [word for word in words if word not in _FILLER]
+    code = country_code(country)
+    gazetteer = _get_gazetteer()
+
+    found: List[City] = []
+    unknown, position = 0, 0
+    while position < len(words):
+        lengths = range(min(_LONGEST, len(words) - position), 0, -1) if gazetteer.starts_key(words[position]) else ()
+        for length in lengths:
+            key = " ".join(words[position:position + length])
+            cities = gazetteer.exact(key)
+            if cities and length == 1 and key in _AMBIGUOUS and not originals[position][:1].isupper() \
+                    and meaningful != [key]:
+                cities = []
+            if cities:
+                found.append(_best(cities, code))
+                position += length
+                break
+        else:
+            unknown += words[position] not in _FILLER
+            position += 1
+
+    if found:
+        confidence = 1.0 - 0.25 * unknown
+        if len({city.name for city in found}) > 1:
+            confidence = min(confidence, 0.5)   # "Paris ou Lyon" : à confier au LLM
+        return CityMatch(found[0].name, found[0].country, round(max(0.0, confidence), 2))
+    if 0 < len(meaningful) <= 3:
+        match = _fuzzy(" ".join(meaningful), code)
+        if match:
+            city, distance = match
+            return CityMatch(city.name, city.country, 0.9 if distance == 1 else 0.8)
+    return None
+
+if __name__ == "__main__":
+    print(f"✅ {build()} entrées écrites dans {INDEX}")
@@ -0,0 +1,108 @@
+# models/greetings.py - Reconnaissance locale des salutations et de la langue d'un premier message
+#
+# Le premier message d'une session est presque toujours un salut ("Bonjour", "Hello", "Hola !"),
+# parfois suivi de la demande ("Bonjour, je recrute un Data Scientist"). Le salut donne la langue
+# et la formule à reprendre dans la réponse de bienvenue ; les mots outils de la suite confirment
+# ou corrigent la langue. Sans indice suffisant, detect_language retourne None et l'appelant
+# s'en remet au LLM.
+import re
+import unicodedata
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Formule normalisée (minuscules, sans accents) -> (langue, formule reprise dans la réponse)
+GREETINGS: Dict[str, Tuple[str, str]] = {
+    "bonjour": ("fr", "Bonjour"), "bonsoir": ("fr", "Bonsoir"), "salut": ("fr", "Salut"),
+    "coucou": ("fr", "Bonjour"), "bjr": ("fr", "Bonjour"), "slt": ("fr", "Salut"),
+    "hello": ("en", "Hello"), "hi": ("en", "Hi"), "hey": ("en", "Hello"), "greetings": ("en", "Hello"),
+    "good morning": ("en", "Good morning"), "good afternoon": ("en", "Good afternoon"),
+    "good evening": ("en", "Good evening"),
+    "hola": ("es", "Hola"), "buenos dias": ("es", "Buenos días"), "buenas tardes": ("es", "Buenas tardes"),
+    "buenas noches": ("es", "Buenas noches"), "buenas": ("es", "Hola"), "saludos": ("es", "Hola"),
+    "hallo": ("de", "Hallo"), "guten tag": ("de", "Guten Tag"), "guten morgen": ("de", "Guten Morgen"),
+    "guten abend": ("de", "Guten Abend"), "servus": ("de", "Hallo"), "moin": ("de", "Hallo"),
+    "ciao": ("it", "Ciao"), "buongiorno": ("it", "Buongiorno"), "buonasera": ("it", "Buonasera"), "salve": ("it", "Salve"),
+    "ola": ("pt", "Olá"), "oi": ("pt", "Olá"), "bom dia": ("pt", "Bom dia"), "boa tarde": ("pt", "Boa tarde"),
+    "boa noite": ("pt", "Boa noite"),
+}
+
+# Ce qui peut suivre un salut sans rien demander : "Bonjour à tous", "Hi there", "Hola equipo"
+_COURTESY = frozenset("""
+    a tous toutes tout le monde madame monsieur mesdames messieurs l equipe ca va comment allez vous
+    there everyone all team guys folks how are you
+    todos equipo que tal como estas
+""".split())
+
+# Mots outils propres à une langue (les mots partagés, comme "de", "la" ou "en", sont exclus)
+STOPWORDS: Dict[str, frozenset] = {
+    "fr": frozenset("""
+        le les une des du et est je nous vous pour avec dans sur qui pas ce cette il elle au aux mais
+        notre nos votre vos mon mes son ses tres bien oui merci cherche cherchons recrute recrutons poste offre
+        emploi besoin voudrais souhaite souhaitons creer publier un d l j c qu
+    """.split()),
+    "en": frozenset("""
+        the an and is are i we you for with in who that not this it of to our your my need looking hiring
+        job position role please yes thanks want would like create post posting hire
+    """.split()),
+    "es": frozenset("""
+        el los las una y soy somos para con este esta nosotros necesito necesitamos buscamos busco puesto oferta
+        trabajo empleo gracias quiero queremos favor crear publicar contratar del al
+    """.split()),
+}
+# Caractères propres à une langue
+_LETTERS: Dict[str, str] = {"es": "ñ¿¡", "fr": "çœèêùû", "de": "ßäöü", "pt": "ãõ"}
+
+MIN_SCORE = 2      # un salut ou deux mots outils
+MIN_MARGIN = 2     # la langue retenue doit avoir au moins deux fois le score de la suivante
+
+_WORD = re.compile(r"[a-z0-9]+")
+_MAX_GREETING_WORDS = max(len(phrase.split()) for phrase in GREETINGS)
+
+class GreetingMatch(NamedTuple):
+    greeting: str      # formule à reprendre ("Buenos días")
+    language: str      # langue de la formule
+    only_greeting: bool  # rien d'autre qu'un salut (et des politesses) : pas de faits à extraire
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(normalize(text))
+
+def classify_greeting(text: str) -> Optional[GreetingMatch]:
+    """Salut en tête du message ("Bonjour !", "Good morning team, ..."), sinon None."""
+    words = _words(text)
+    for size in range(min(_MAX_GREETING_WORDS, len(words)), 0, -1):
+        found = GREETINGS.get(" ".join(words[:size]))
+        if found:
+            language, greeting = found
+            rest = words[size:]
+            return GreetingMatch(greeting, language, all(word in _COURTESY for word in rest))
+    return None
+
+def detect_language(text: str) -> Optional[str]:
+    """
+    Langue (code ISO 639-1) déduite du salut, des mots outils et des caractères propres à une
+    langue ; None si les indices sont trop faibles ou partagés ("Data Scientist", "OK").
+    """
+    scores: Dict[str, float] = {}
+    match = classify_greeting(text)
+    if match:
+        # Un salut seul suffit ; suivi d'une phrase, il pèse comme un mot outil ("Hello, nous cherchons...")
+        scores[match.language] = MIN_SCORE if match.only_greeting else 1
+    for word in _words(text):
+        for language, stopwords in STOPWORDS.items():
+            if word in stopwords:
+                scores[language] = scores.get(language, 0) + 1
+    lowered = text.lower()
+    for language, letters in _LETTERS.items():
+        if any(letter in lowered for letter in letters):
+            scores[language] = scores.get(language, 0) + 1
+    if not scores:
+        return None
+    ranked = sorted(scores.items(), key=lambda item: -item[1])
+    best, score = ranked[0]
+    runner_up = ranked[1][1] if len(ranked) > 1 else 0
+    if score >= MIN_SCORE and score >= MIN_MARGIN * runner_up:
+        return best
+    return None
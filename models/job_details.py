@@ -1,7 +1,11 @@
 import json
-from typing import Dict, List, Optional, Any, Tuple
-from pydantic import BaseModel, Field, validator
-import pycountry  # Ajout de l'importation de pycountry
+from bisect import bisect_right
+from functools import partial
+from typing import Annotated, Callable, Dict, List, NamedTuple, Optional, Any, Tuple
+from typing_extensions import TypedDict
+from pydantic import AfterValidator, BaseModel, Field, TypeAdapter, ValidationError, field_validator
+from models import field_schema, gazetteer
+from models.field_schema import FieldValidationError
 
 class JobDetail(BaseModel):
     title: Optional[str] = None
@@ -28,60 +32,339 @@ class JobDetail(BaseModel):
     minPartTimeSalary: Optional[float] = None
     maxPartTimeSalary: Optional[float] = None
 
-    @validator('seniority')
-    def validate_seniority(cls, v):
-        if v and v not in ["JUNIOR", "MID", "SENIOR"]:
-            raise ValueError(f"Seniority doit être JUNIOR, MID ou SENIOR, pas {v}")
-        return v
-
-    @validator('type')
-    def validate_type(cls, v):
-        if v and v not in ["REMOTE", "ONSITE", "HYBRID"]:
-            raise ValueError(f"Type doit être REMOTE, ONSITE ou HYBRID, pas {v}")
-        return v
-
-    @validator('jobType')
-    def validate_job_type(cls, v):
-        if v and v not in ["FREELANCE", "FULLTIME", "PARTTIME"]:
-            raise ValueError(f"JobType doit être FREELANCE, FULLTIME ou PARTTIME, pas {v}")
-        return v
-
-    @validator('availability')
-    def validate_availability(cls, v):
-        if v is not None and v < 0:
-            raise ValueError("Availability ne peut pas être négative")
-        return v
+    @field_validator("seniority", "type", "jobType", "availability", "weeklyHours")
+    @classmethod
+    def validate_declared_checks(cls, v, info):
+        # Valeurs autorisées et bornes déclarées dans models/field_schema.py
+        return field_schema.enforce(info.field_name, v)
+
+def _field_type(field: str):
+    """Type annoté d'un champ, avec les contrôles du schéma en validateur."""
+    return Annotated[JobDetail.model_fields[field].annotation, AfterValidator(partial(field_schema.enforce, field))]
+
+# Validateurs pydantic-core compilés une fois : un par champ, et un pour un patch multi-champs
+FIELD_ADAPTERS: Dict[str, TypeAdapter] = {field: TypeAdapter(_field_type(field)) for field in JobDetail.model_fields}
+JobDetailPatch = TypedDict("JobDetailPatch", {field: _field_type(field) for field in JobDetail.model_fields}, total=False)
+PATCH_ADAPTER = TypeAdapter(JobDetailPatch)
+
+# Clés obligatoires quand une langue ou une compétence est fournie seule (objet au lieu d'une liste)
+ITEM_KEYS = {"languages": ("name", "level", "required"), "skills": ("name", "mandatory")}
+
+def structured_errors(error: ValidationError, field: Optional[str] = None) -> List[FieldValidationError]:
+    """Convertit une ValidationError pydantic en erreurs structurées (code pydantic-core + contexte)."""
+    errors = []
+    for item in error.errors(include_url=False):
+        loc = item.get("loc") or ()
+        params = {key: value if isinstance(value, (str, int, float, bool)) or value is None else str(value)
+                  for key, value in (item.get("ctx") or {}).items()}
+        params.setdefault("detail", item.get("msg", ""))
+        errors.append(FieldValidationError(item["type"], field or (str(loc[0]) if loc else ""), **params))
+    return errors
+
+def field_default(field: str) -> Any:
+    """Nouvelle valeur par défaut d'un champ (liste/dict neufs)."""
+    return JobDetail.model_fields[field].get_default(call_default_factory=True)
+
+# Formulaire vierge calculé une fois : clés dans l'ordre du schéma, champs requis de départ
+_model_defaults = JobDetail().model_dump()
+_DEFAULTS: Dict[str, Any] = {field: _model_defaults[field] for field in field_schema.FIELD_ORDER}
+_BLANK_REQUIRED = field_schema.required_fields(_DEFAULTS)
+_BLANK_MISSING = {field: None for field in _BLANK_REQUIRED if not field_schema.is_filled(field, _DEFAULTS.get(field))}
+
+class ChangeRecord(NamedTuple):
+    """Entrée du journal des modifications (append-only)."""
+    version: int
+    field: str
+    old: Any
+    new: Any
+    turn: Optional[int]   # tour de conversation à l'origine du changement
+    op: str               # set, undo, redo, revert
 
 class JobDetails:
-    JOB_TYPES = {"FREELANCE", "FULLTIME", "PARTTIME"}
-    WORK_TYPES = {"REMOTE", "ONSITE", "HYBRID"}
-    SENIORITY_LEVELS = {"JUNIOR", "MID", "SENIOR"}
+    JOB_TYPES = set(field_schema.ENUM_VALUES["jobType"])
+    WORK_TYPES = set(field_schema.ENUM_VALUES["type"])
+    SENIORITY_LEVELS = set(field_schema.ENUM_VALUES["seniority"])
     
-    # Champs de base requis pour tous les types de job
+    # Champs requis : de base, puis selon le type d'emploi (jobType) et le type de travail (type)
     REQUIRED_FIELDS = {
-        "BASE": ["title", "description", "discipline", "availability", "seniority", "languages", "skills", "jobType", "type"],
-        # Champs requis selon le type d'emploi (jobType)
-        "FREELANCE": ["minHourlyRate", "maxHourlyRate", "weeklyHours", "estimatedWeeks"],
-        "FULLTIME": ["minFullTimeSalary", "maxFullTimeSalary"],
-        "PARTTIME": ["minPartTimeSalary", "maxPartTimeSalary"],
-        # Champs requis selon le type de travail (type)
-        "REMOTE": ["continents", "countries", "regions", "timeZone"],
-        "ONSITE": ["country", "city"],
-        "HYBRID": ["country", "city"]
+        "BASE": list(field_schema.BASE_REQUIRED),
+        **{value: list(fields) for by_value in field_schema.CONDITIONAL_REQUIRED.values() for value, fields in by_value.items()}
     }
 
-    VALID_CONTINENTS = ["Europe", "Asie", "Amérique du Nord", "Amérique du Sud", "Afrique", "Océanie"]
+    VALID_CONTINENTS = list(field_schema.SPECS["continents"].values)
+
+    # Champs dont la valeur change la liste des champs requis
+    SELECTOR_FIELDS = field_schema.SELECTOR_FIELDS
+
+    # Une instance par session : pas de __dict__, les tables ci-dessus restent partagées
+    __slots__ = ("data", "_subscribers", "_required", "_missing", "_log", "_undo", "_redo", "_history", "current_turn")
 
     def __init__(self):
-        self.data = {"jobDetails": JobDetail().dict()}
-        self._model = JobDetail()
+        # Clés dans l'ordre du schéma (conservé à la sérialisation) ; seuls les listes et dicts sont recréés
+        self.data = {"jobDetails": {field: value.copy() if isinstance(value, (list, dict)) else value
+                                    for field, value in _DEFAULTS.items()}}
+        self._subscribers: List[Callable[[Dict[str, Any]], None]] = []
+        self._required = _BLANK_REQUIRED
+        self._missing = dict(_BLANK_MISSING)
+        # Journal des modifications. Les valeurs sont remplacées, jamais modifiées sur place :
+        # le journal et les vues as_of() partagent les mêmes objets, sans copie profonde.
+        self._log: List[ChangeRecord] = []
+        # Piles d'annulation par groupe : un patch multi-champs s'annule et se rétablit d'un bloc
+        self._undo: List[Tuple[ChangeRecord, ...]] = []
+        self._redo: List[Tuple[ChangeRecord, ...]] = []
+        self._history: Dict[str, Tuple[List[int], List[Any]]] = {}  # champ -> (versions, valeurs)
+        self.current_turn: Optional[int] = None
+
+    def _rebuild_index(self):
+        """Recalcule l'index des champs manquants (dict ordonné par priorité)."""
+        details = self.data["jobDetails"]
+        self._required = field_schema.required_fields(details)
+        self._missing = {field: None for field in self._required if not field_schema.is_filled(field, details.get(field))}
+
+    def _index_update(self, key: str, old_value: Any, new_value: Any):
+        """Met à jour l'index après une modification réussie et prévient les abonnés."""
+        previous = list(self._missing) if self._subscribers else None
+        filled = field_schema.is_filled(key, new_value)
+        if key in self.SELECTOR_FIELDS or (not filled and key in self._required and key not in self._missing):
+            # Changement de jobType/type ou champ vidé : reconstruire pour garder l'ordre de priorité
+            self._rebuild_index()
+        elif filled:
+            self._missing.pop(key, None)
+
+        if previous is None:
+            return
+        event = {
+            "field": key,
+            "old": old_value,
+            "new": new_value,
+            "added": [field for field in self._missing if field not in previous],
+            "removed": [field for field in previous if field not in self._missing],
+            "next_missing": self.next_missing_field(),
+            "progress": self.completion()
+        }
+        for callback in list(self._subscribers):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"⚠️ Erreur dans un abonné de JobDetails: {e}")
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]) -> Callable[[], None]:
+        """
+        Appelle callback(event) après chaque mise à jour réussie. L'événement contient
+        field, old, new, added/removed (champs manquants), next_missing et progress.
+        Retourne une fonction de désabonnement.
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback) if callback in self._subscribers else None
     
     def update(self, key: str, value: Any) -> Tuple[bool, Optional[str]]:
-        if key not in self.data["jobDetails"]:
-            return False, f"⚠️ Champ '{key}' non valide."
+        """Valide puis applique une valeur. Retourne (succès, message d'erreur en français)."""
+        try:
+            error = self.update_field(key, value)
+        except Exception as e:
+            return False, f"Erreur lors de la mise à jour: {e}"
+        return (True, None) if error is None else (False, error.message)
+
+    def update_field(self, key: str, value: Any) -> Optional[FieldValidationError]:
+        """Valide puis applique une valeur. Retourne None, ou l'erreur structurée (code, champ, paramètres)."""
+        details = self.data["jobDetails"]
+        if key not in details:
+            return FieldValidationError("unknown_field", key)
+        value, error = self._prepare(key, value)
+        if error is None:
+            try:
+                value = FIELD_ADAPTERS[key].validate_python(value)
+            except ValidationError as e:
+                return structured_errors(e, key)[0]
+            value, error = self._check_against(key, value, details)
+        if error is not None:
+            return error
+        self._push((self._apply(key, value, "set"),))
+        return None
+
+    def validate_patch(self, patch: Dict[str, Any]) -> Tuple[Dict[str, Any], List[FieldValidationError]]:
+        """
+        Valide plusieurs champs en une passe (un seul appel pydantic-core pour les types),
+        puis les contrôles géographiques et min/max contre l'état fusionné.
+        Retourne (valeurs nettoyées, erreurs) sans rien modifier.
+        """
+        details = self.data["jobDetails"]
+        errors = [FieldValidationError("unknown_field", key) for key in patch if key not in details]
+        prepared = {}
+        for key, value in patch.items():
+            if key in details:
+                prepared[key], error = self._prepare(key, value)
+                if error is not None:
+                    errors.append(error)
+        if errors:
+            return {}, errors
+        try:
+            cleaned = PATCH_ADAPTER.validate_python(prepared)
+        except ValidationError as e:
+            return {}, structured_errors(e)
+
+        merged = {**details, **cleaned}
+        for key in sorted(cleaned, key=field_schema.PRIORITY.get):
+            cleaned[key], error = self._check_against(key, cleaned[key], merged)
+            merged[key] = cleaned[key]
+            # Une paire min/max incohérente n'est signalée qu'une fois
+            if error is not None and not any(e.code == error.code and e.params == error.params for e in errors):
+                errors.append(error)
+        return (cleaned, []) if not errors else ({}, errors)
+
+    def update_many(self, patch: Dict[str, Any]) -> List[FieldValidationError]:
+        """Applique un patch multi-champs de façon atomique : tout ou rien. Retourne la liste des erreurs."""
+        cleaned, errors = self.validate_patch(patch)
+        if errors:
+            return errors
+        self._push(tuple(self._apply(key, cleaned[key], "set") for key in sorted(cleaned, key=field_schema.PRIORITY.get)))
+        return []
+
+    def fork(self) -> "JobDetails":
+        """
+        Copie de travail de l'état courant, sans abonnés ni journal : une extraction spéculative
+        y écrit sans toucher à l'offre, puis ses changes_since(0) sont rejoués ici (ou oubliés).
+        Les valeurs sont partagées, pas copiées : elles ne sont jamais modifiées sur place.
+        """
+        fork = JobDetails.__new__(JobDetails)
+        fork.data = {"jobDetails": dict(self.data["jobDetails"])}
+        fork._subscribers = []
+        fork._required = self._required
+        fork._missing = dict(self._missing)
+        fork._log, fork._undo, fork._redo = [], [], []
+        fork._history = {}
+        fork.current_turn = self.current_turn
+        return fork
+
+    # --- Journal des modifications, annulation et historique ---------------------------
+
+    def _apply(self, key: str, value: Any, op: str) -> ChangeRecord:
+        """Écrit une valeur déjà validée, la journalise et met à jour l'index des champs manquants."""
+        details = self.data["jobDetails"]
+        old_value = details.get(key)
+        details[key] = value
+        record = ChangeRecord(len(self._log) + 1, key, old_value, value, self.current_turn, op)
+        self._log.append(record)
+        versions, values = self._history.setdefault(key, ([], []))
+        versions.append(record.version)
+        values.append(value)
+        self._index_update(key, old_value, value)
+        return record
+
+    def _push(self, group: Tuple[ChangeRecord, ...]):
+        """Nouvelle modification (set, revert) : annulable d'un bloc, l'historique de rétablissement est perdu."""
+        if group:
+            self._undo.append(group)
+            self._redo.clear()
+
+    @property
+    def version(self) -> int:
+        """Numéro de la dernière modification (0 = formulaire vierge)."""
+        return len(self._log)
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def _check_step(self, values: Dict[str, Any]):
+        """
+        Des valeurs rétablies passent les mêmes contrôles d'état que update() : les autres champs ont pu
+        changer depuis (ex. annuler maxFullTimeSalary sous le minimum actuel). Lève FieldValidationError.
+        """
+        merged = {**self.data["jobDetails"], **values}
+        for key in sorted(values, key=field_schema.PRIORITY.get):
+            _, error = self._check_against(key, values[key], merged)
+            if error is not None:
+                raise error
+
+    def undo(self) -> Optional[ChangeRecord]:
+        """
+        Annule la dernière modification, tous les champs d'un patch ensemble. Retourne la dernière
+        entrée ajoutée au journal, ou None. Lève FieldValidationError (sans rien modifier) si les
+        anciennes valeurs ne sont plus cohérentes.
+        """
+        if not self._undo:
+            return None
+        group = self._undo[-1]
+        self._check_step({record.field: record.old for record in group})
+        self._redo.append(self._undo.pop())
+        return [self._apply(record.field, record.old, "undo") for record in reversed(group)][-1]
+
+    def redo(self) -> Optional[ChangeRecord]:
+        """
+        Rétablit la dernière modification annulée, tous les champs d'un patch ensemble. Retourne la
+        dernière entrée ajoutée au journal, ou None. Lève FieldValidationError (sans rien modifier)
+        si les valeurs ne sont plus cohérentes.
+        """
+        if not self._redo:
+            return None
+        group = self._redo[-1]
+        self._check_step({record.field: record.new for record in group})
+        self._undo.append(self._redo.pop())
+        return [self._apply(record.field, record.new, "redo") for record in group][-1]
+
+    def revert_field(self, field: str) -> Optional[ChangeRecord]:
+        """
+        Remet un champ à sa valeur précédente (ex. « remets l'ancien salaire »). None si rien à rétablir.
+        Lève FieldValidationError si la valeur précédente n'est plus cohérente avec l'offre.
+        """
+        versions, values = self._history.get(field, ((), ()))
+        if not values:
+            return None
+        previous = values[-2] if len(values) > 1 else field_default(field)
+        self._check_step({field: previous})
+        record = self._apply(field, previous, "revert")
+        self._push((record,))
+        return record
+
+    def as_of(self, version: int) -> Dict[str, Any]:
+        """État du formulaire à une version donnée, reconstruit par recherche dichotomique par champ."""
+        details = {}
+        for field, initial in _DEFAULTS.items():
+            versions, values = self._history.get(field, ((), ()))
+            position = bisect_right(versions, version)
+            details[field] = values[position - 1] if position else initial
+        return {"jobDetails": details}
+
+    def delta_since(self, version: int = 0) -> Dict[str, Any]:
+        """Valeurs actuelles des champs modifiés depuis `version`, dans l'ordre du schéma."""
+        changed = {record.field for record in self._log[max(0, version):]}
         details = self.data["jobDetails"]
+        return {field: details[field] for field in field_schema.FIELD_ORDER if field in changed}
+
+    def changes_since(self, version: int = 0) -> List[Dict[str, Any]]:
+        """Entrées du journal postérieures à `version` (deltas pour l'interface)."""
+        return [record._asdict() for record in self._log[max(0, version):]]
 
-        # Validation des champs géographiques avec pycountry
+    def _prepare(self, key: str, value: Any) -> Tuple[Any, Optional[FieldValidationError]]:
+        """Normalisations avant validation de type : None efface le champ, objet seul -> liste."""
+        if value is None:
+            return field_default(key), None
+        if key in ITEM_KEYS and isinstance(value, dict):
+            missing = [item_key for item_key in ITEM_KEYS[key] if item_key not in value]
+            if missing:
+                return value, FieldValidationError("missing_keys", key, keys=", ".join(f"'{k}'" for k in ITEM_KEYS[key]))
+            return [value], None
+        return value, None
+
+    def _check_against(self, key: str, value: Any, details: Dict[str, Any]) -> Tuple[Any, Optional[FieldValidationError]]:
+        """Contrôles dépendant de l'état : entités géographiques (pycountry) puis paires min/max."""
+        if key in ("continents", "countries", "regions") and value:
+            value, error = self._validate_geography(key, value, details)
+            if error is not None:
+                return value, error
+        if key == "city" and isinstance(value, str) and value:
+            # Ville connue du gazetteer mais absente du pays indiqué (sinon la décision reste au recruteur)
+            country = (details.get("country") or {}).get("name")
+            if gazetteer.city_in_country(value, country) is False:
+                return value, FieldValidationError("city_outside_country", key, name=value, country=country)
+        return value, field_schema.check_ranges(key, value, details)
+
+    def _validate_geography(self, key: str, value: List[Dict[str, str]], details: Dict[str, Any]) -> Tuple[Any, Optional[FieldValidationError]]:
+        # Validation des champs géographiques avec pycountry (importé à la demande)
+        import pycountry
         if key == "continents" and isinstance(value, list):
             for continent_item in value:
                 if isinstance(continent_item, dict) and "name" in continent_item:
@@ -90,9 +373,9 @@ class JobDetails:
                         try:
                             # Vérifier si c'est un pays mal interprété comme continent
                             pycountry.countries.search_fuzzy(continent_name)
-                            return False, f"⚠️ '{continent_name}' semble être un pays, pas un continent."
+                            return value, FieldValidationError("country_not_continent", key, name=continent_name)
                         except LookupError:
-                            return False, f"⚠️ Le continent '{continent_name}' n'est pas valide. Options: {', '.join(self.VALID_CONTINENTS)}"
+                            return value, FieldValidationError("invalid_continent", key, name=continent_name, allowed=", ".join(self.VALID_CONTINENTS))
 
         if key == "countries" and isinstance(value, list):
             validated_countries = []
@@ -103,7 +386,7 @@ class JobDetails:
                         country = pycountry.countries.search_fuzzy(country_name)[0]
                         validated_countries.append({"name": country.name})
                     except LookupError:
-                        return False, f"⚠️ Le pays '{country_name}' n'est pas valide."
+                        return value, FieldValidationError("invalid_country", key, name=country_name)
             # Vérifier la cohérence avec les continents existants
             if details.get("continents"):
                 continents = [c["name"].lower() for c in details["continents"] if isinstance(c, dict) and "name" in c]
@@ -120,7 +403,7 @@ class JobDetails:
                     country = pycountry.countries.search_fuzzy(country_name)[0]
                     country_continent = country.continent if hasattr(country, 'continent') else None
                     if country_continent and not any(continent_map.get(continent) == country_continent for continent in continents):
-                        return False, f"⚠️ Le pays '{country_name}' n'est pas dans les continents: {continents}"
+                        return value, FieldValidationError("country_outside_continents", key, name=country_name, continents=", ".join(continents))
             value = validated_countries  # Remplacer par les noms validés
 
         if key == "regions" and isinstance(value, list):
@@ -145,74 +428,34 @@ class JobDetails:
                             except LookupError:
                                 continue
                         if not found:
-                            return False, f"⚠️ La région '{region_name}' n'est pas valide pour les pays: {countries}"
+                            return value, FieldValidationError("invalid_region", key, name=region_name, countries=", ".join(countries))
                     else:
                         # Si aucun pays n'est spécifié, accepter la région telle quelle
                         validated_regions.append({"name": region_item["name"]})
             value = validated_regions  # Remplacer par les noms validés
 
-        # Validation existante conservée
-        if key == "countries" and isinstance(value, list) and details.get("continents"):
-            continents = [c["name"].lower() for c in details["continents"] if isinstance(c, dict) and "name" in c]
-            for country_item in value:
-                if isinstance(country_item, dict) and "name" in country_item:
-                    country_name = country_item["name"].lower()
-                    if not any(country_name in self.GEOGRAPHIC_RELATIONS["continents"].get(continent, []) for continent in continents):
-                        return False, f"⚠️ Le pays '{country_name}' n'est pas dans les continents: {continents}"
-        if key == "regions" and isinstance(value, list) and details.get("countries"):
-            countries = [c["name"].lower() for c in details["countries"] if isinstance(c, dict) and "name" in c]
-            for region_item in value:
-                if isinstance(region_item, dict) and "name" in region_item:
-                    region_name = region_item["name"].lower()
-                    if not any(region_name in self.GEOGRAPHIC_RELATIONS["countries"].get(country, []) for country in countries):
-                        return False, f"⚠️ La région '{region_name}' n'est pas dans les pays: {countries}"
-        if key in ["minHourlyRate", "maxHourlyRate"] and details.get("minHourlyRate") is not None and details.get("maxHourlyRate") is not None:
-            if details["minHourlyRate"] > details["maxHourlyRate"]:
-                return False, "⚠️ Le taux horaire minimum ne peut pas dépasser le maximum."
-        if key in ["minFullTimeSalary", "maxFullTimeSalary"] and details.get("minFullTimeSalary") is not None and details.get("maxFullTimeSalary") is not None:
-            if details["minFullTimeSalary"] > details["maxFullTimeSalary"]:
-                return False, "⚠️ Le salaire minimum ne peut pas dépasser le maximum."
-        if key == "weeklyHours" and value is not None and value > 168:
-            return False, "⚠️ Les heures par semaine ne peuvent pas dépasser 168."
-        if key == "availability" and value is not None and value < 0:
-            return False, "⚠️ La disponibilité ne peut pas être négative."
-        try:
-            if key in ["languages", "skills"] and isinstance(value, dict):
-                if key == "languages" and not all(k in value for k in ["name", "level", "required"]):
-                    return False, f"⚠️ L'objet pour '{key}' doit inclure 'name', 'level', 'required'."
-                if key == "skills" and not all(k in value for k in ["name", "mandatory"]):
-                    return False, f"⚠️ L'objet pour '{key}' doit inclure 'name', 'mandatory'."
-            details[key] = value
-            return True, None
-        except Exception as e:
-            return False, f"Erreur lors de la mise à jour: {e}"
+        return value, None
 
     def get_missing_fields(self) -> List[str]:
-        missing = []
-        details = self.data["jobDetails"]
-        
-        # Vérifier les champs de base
-        for field in self.REQUIRED_FIELDS["BASE"]:
-            if not details.get(field):
-                missing.append(field)
-        
-        # Obtenir le type de travail et d'emploi
-        job_type = details.get("jobType")
-        work_type = details.get("type")
-        
-        # Vérifier les champs spécifiques au type d'emploi (jobType)
-        if job_type in self.JOB_TYPES:
-            for field in self.REQUIRED_FIELDS.get(job_type, []):
-                if not details.get(field):
-                    missing.append(field)
-        
-        # Vérifier les champs spécifiques au type de travail (type)
-        if work_type in self.WORK_TYPES:
-            for field in self.REQUIRED_FIELDS.get(work_type, []):
-                if not details.get(field):
-                    missing.append(field)
-                    
-        return missing
+        """Champs requis encore vides, par ordre de priorité (lu depuis l'index)."""
+        return list(self._missing)
+
+    def is_missing(self, field: str) -> bool:
+        return field in self._missing
+
+    def next_missing_field(self) -> Optional[str]:
+        """Prochain champ à demander, ou None si le formulaire est complet."""
+        return next(iter(self._missing), None)
+
+    def completion(self) -> Dict[str, Any]:
+        """Avancement du formulaire pour la barre de progression."""
+        required = len(self._required)
+        filled = required - len(self._missing)
+        return {
+            "filled": filled,
+            "required": required,
+            "percent": round(filled * 100 / required) if required else 100
+        }
 
     def get_state(self) -> Dict[str, Any]:
         return self.data
@@ -231,6 +474,7 @@ class JobDetails:
             return False, f"⚠️ Type de travail '{work_type}' non valide. Valeurs acceptées: {', '.join(self.WORK_TYPES)}"
             
         # Vérifier la cohérence des champs géographiques avec pycountry
+        import pycountry
         if work_type == "REMOTE":
             # Validation des continents
             if details.get("continents"):
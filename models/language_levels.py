@@ -0,0 +1,194 @@
+# models/language_levels.py - Analyse locale des langues requises : nom ISO 639 (fr/en/es), niveau CECRL, caractère obligatoire
+#
+# Les noms de langues forment un ensemble fermé (ISO 639-1 via pycountry, traduit en français et en espagnol)
+# et les niveaux se ramènent à l'échelle du CECRL. "Français courant, anglais B2, espagnol un plus" est donc
+# résolu sans appel LLM ; seuls les fragments non reconnus lui sont confiés (voir UpdateAgent._update_languages).
+# L'index est compilé au premier appel : pycountry est long à charger.
+import gettext
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from models.skills_taxonomy import (CHUNK_BREAKS, FILLER, MARKERS, NEGATIONS, Automaton, apply_markers,
+                                    tokenize, unmatched_fragments)
+
+CEFR_LEVELS = ("A1", "A2", "B1", "B2", "C1", "C2")
+DEFAULT_LEVEL = "B1"   # niveau retenu quand la réponse n'en précise pas
+
+# Langues courantes : nom canonique (français) et variantes absentes de pycountry.
+# Le code ISO 639-1 rattache ces variantes aux noms anglais / français / espagnols de pycountry.
+LANGUAGES: Tuple[Tuple[Optional[str], str, Tuple[str, ...]], ...] = (
+    ("fr", "Français", ("french", "frances", "francophone", "langue francaise")),
+    ("en", "Anglais", ("english", "ingles", "anglophone", "langue anglaise")),
+    ("es", "Espagnol", ("spanish", "espanol", "hispanophone", "castillan", "castellano", "castilian")),
+    ("de", "Allemand", ("german", "aleman", "germanophone", "deutsch")),
+    ("it", "Italien", ("italian", "italiano", "italophone")),
+    ("pt", "Portugais", ("portuguese", "portugues", "lusophone", "portugais bresilien", "brazilian portuguese")),
+    ("ar", "Arabe", ("arabic", "arabe litteraire", "arabe classique", "arabe dialectal", "darija", "arabophone")),
+    ("zh", "Chinois", ("chinese", "chino", "mandarin", "chinois mandarin", "mandarin chinese", "mandarin chino")),
+    ("ru", "Russe", ("russian", "ruso", "russophone")),
+    ("nl", "Néerlandais", ("dutch", "neerlandes", "hollandais", "flamand", "flemish")),
+    ("el", "Grec", ("greek", "griego", "grec moderne")),
+    ("he", "Hébreu", ("hebrew", "hebreo", "ivrit")),
+    ("ms", "Malais", ("malay",)),
+    ("ne", "Népalais", ("nepali",)),
+    ("sw", "Swahili", ("kiswahili",)),
+    ("oc", "Occitan", ()),
+    ("gu", "Gujarati", ("goudjarati",)),
+    ("ht", "Créole haïtien", ("creole haitien", "haitian creole")),
+    (None, "Cantonais", ("cantonese", "cantones")),
+    (None, "Langue des signes française", ("lsf", "langue des signes")),
+)
+# Noms ISO qui sont aussi des mots courants dans les réponses
+_AMBIGUOUS = frozenset({"cri"})
+
+# Niveaux du CECRL et leurs formulations courantes (sans accents)
+LEVEL_WORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("A1", ("a1", "debutant", "debutante", "debutants", "grand debutant", "beginner", "principiante")),
+    ("A2", ("a2", "notions", "quelques notions", "basique", "basiques", "base", "bases", "de base", "elementaire", "scolaire",
+            "basic", "elementary", "basico", "basica", "nociones")),
+    ("B1", ("b1", "intermediaire", "intermediaires", "moyen", "correct", "intermediate", "intermedio", "intermedia")),
+    ("B2", ("b2", "b2+", "bon", "bon niveau", "bonne maitrise", "bonne connaissance", "operationnel", "operationnelle",
+            "professionnel", "professionnelle", "intermediaire avance", "upper intermediate", "good", "working proficiency",
+            "professional", "professional working proficiency", "buen nivel", "profesional")),
+    ("C1", ("c1", "c1+", "courant", "courante", "courants", "courantes", "couramment", "avance", "avancee", "avances", "avancees", "tres bon", "tres bon niveau",
+            "tres bonne maitrise", "parfaite maitrise", "excellent", "excellente", "fluide", "fluent", "fluently",
+            "advanced", "full professional proficiency", "fluido", "fluida", "fluidez", "avanzado", "avanzada")),
+    ("C2", ("c2", "natif", "native", "natifs", "natives", "langue maternelle", "maternelle", "native speaker",
+            "mother tongue", "nativo", "nativa", "lengua materna", "bilingue", "bilingues", "bilingual")),
+)
+
+# Mots sans contenu propres aux langues, en plus de ceux du référentiel des compétences
+_FILLER = FILLER | frozenset("""
+    langue langues language languages idioma idiomas lengua lenguas parle parlee parler lu ecrit oral
+    spoken written hablado escrito nivel level minimum moins least menos cecrl cecr cefr mcer equivalent
+    locuteur speaker
+""".split())
+_ELISIONS = ("l'", "d'", "qu'", "j'", "c'", "n'")
+
+def _tokens(text: str) -> List[str]:
+    """Mots de la réponse, élisions retirées ("l'anglais" -> "anglais") et "anglais/espagnol" séparé."""
+    tokens = []
+    for token in tokenize(text):
+        for prefix in _ELISIONS:
+            if token.startswith(prefix) and len(token) > len(prefix):
+                token = token[len(prefix):]
+                break
+        tokens.extend(part for part in token.split("/") if part)
+    return tokens
+
+def _iso_names() -> List[Tuple[str, List[str]]]:
+    """(code ISO 639-1, [nom anglais, nom français, nom espagnol]) depuis pycountry, vide s'il est absent."""
+    try:
+        import pycountry
+    except ImportError:
+        print("⚠️ pycountry indisponible : seules les langues courantes seront reconnues localement")
+        return []
+    translations = [gettext.translation("iso639-3", pycountry.LOCALES_DIR, languages=[lang], fallback=True)
+                    for lang in ("fr", "es")]
+    names = []
+    for language in pycountry.languages:
+        code = getattr(language, "alpha_2", None)
+        if code:
+            names.append((code, [language.name] + [translation.gettext(language.name) for translation in translations]))
+    return names
+
+def _strip_qualifier(name: str) -> str:
+    """"Malais (macrolangue)" -> "Malais"."""
+    return name.split("(", 1)[0].strip()
+
+_index: Dict[str, Any] = {}
+_index_lock = threading.Lock()
+
+def _get_index() -> Dict[str, Any]:
+    """Automate (langues, niveaux, marqueurs) et noms canoniques, compilés au premier appel."""
+    if "automaton" not in _index:
+        with _index_lock:
+            if "automaton" not in _index:
+                automaton = Automaton()
+                canonical = {code: name for code, name, _ in LANGUAGES if code}
+                names: Dict[str, str] = {}   # alias normalisé -> nom canonique
+                for code, iso in _iso_names():
+                    name = canonical.get(code) or _strip_qualifier(iso[1])
+                    name = name[:1].upper() + name[1:]
+                    for alias in iso:
+                        names.setdefault(" ".join(tokenize(_strip_qualifier(alias))), name)
+                for _, name, aliases in LANGUAGES:
+                    for alias in (name,) + aliases:
+                        names[" ".join(tokenize(alias))] = name
+                for alias, name in names.items():
+                    if alias and alias not in _AMBIGUOUS:
+                        automaton.add(alias.split(), ("language", name))
+                for level, phrases in LEVEL_WORDS:
+                    for phrase in phrases:
+                        automaton.add(tokenize(phrase), ("level", level))
+                for required, phrases in MARKERS:
+                    for phrase in phrases:
+                        automaton.add(tokenize(phrase), ("marker", required))
+                automaton.build()
+                _index["names"] = names
+                _index["automaton"] = automaton
+    return _index
+
+def canonical_language(name: str) -> Optional[str]:
+    """Nom canonique d'une langue ("english", "Inglés" -> "Anglais"), None si elle n'est pas connue."""
+    return _get_index()["names"].get(" ".join(_tokens(name)))
+
+def normalize_level(level: Any) -> Optional[str]:
+    """Niveau CECRL d'une formulation libre ("fluent", "courant", "b2") ; None si non reconnue."""
+    if not isinstance(level, str):
+        return None
+    if level.strip().upper() in CEFR_LEVELS:
+        return level.strip().upper()
+    for _, _, (kind, value) in _get_index()["automaton"].search(_tokens(level)):
+        if kind == "level":
+            return value
+    return None
+
+class LanguageExtraction(NamedTuple):
+    languages: List[Dict[str, Any]]   # [{"name", "level", "required"}] dans l'ordre de la réponse, sans doublon
+    residue: List[str]                # fragments non reconnus (hors mots vides) à confier au LLM
+
+def extract_languages(text: str) -> LanguageExtraction:
+    """
+    Langues reconnues, avec leur niveau CECRL et leur caractère obligatoire (par défaut obligatoire).
+    Dans un groupe délimité par la ponctuation, un niveau placé après vaut pour les langues qui le précèdent
+    et qui n'en ont pas encore ("français et anglais courants") ; placé avant, il vaut pour les suivantes
+    ("niveau C1 en anglais"). Les marqueurs obligatoire / optionnel suivent les règles des compétences.
+    Une réponse qui contient une négation est entièrement laissée au LLM.
+    """
+    tokens = _tokens(text)
+    if any(token in NEGATIONS for token in tokens):
+        return LanguageExtraction([], [" ".join(tokens)])
+    items: List[List[Any]] = []        # [kind, value, start, end, required, level]
+    for start, end, (kind, value) in _get_index()["automaton"].search(tokens):
+        items.append([kind, value, start, end, True, None])
+
+    pending: List[List[Any]] = []
+    forward: Optional[str] = None
+    previous_end = 0
+    for item in items:
+        kind, value, start, end = item[:4]
+        if any(token in CHUNK_BREAKS for token in tokens[previous_end:start]):
+            pending, forward = [], None
+        previous_end = end
+        if kind == "language":
+            if forward:
+                item[5] = forward
+            else:
+                pending.append(item)
+        elif kind == "level":
+            if pending:
+                for language in pending:
+                    language[5] = value
+                pending = []
+            else:
+                forward = value
+
+    apply_markers(tokens, items, target="language", transparent=frozenset({"level"}), filler=_FILLER)
+
+    languages, seen = [], set()
+    for kind, value, _, _, required, level in items:
+        if kind == "language" and value not in seen:
+            seen.add(value)
+            languages.append({"name": value, "level": level or DEFAULT_LEVEL, "required": required})
+    return LanguageExtraction(languages, unmatched_fragments(tokens, items, filler=_FILLER))
@@ -0,0 +1,38 @@
+# models/serialization.py - Sérialisation JSON des réponses API et de l'offre finale (orjson si disponible)
+import json
+from typing import Any, Dict
+
+from models import field_schema
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel : repli sur la bibliothèque standard
+    orjson = None
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Encode en JSON UTF-8, sans échappement ASCII ni tri des clés (l'ordre du schéma est conservé)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if pretty else 0))
+    return json.dumps(obj, ensure_ascii=False, default=str, indent=2 if pretty else None,
+                      separators=None if pretty else (",", ":")).encode("utf-8")
+
+def dumps_text(obj: Any, pretty: bool = False) -> str:
+    """Comme dumps, pour insertion dans un message texte."""
+    return dumps(obj, pretty).decode("utf-8")
+
+def loads(data) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def clean_details(details: Dict[str, Any]) -> Dict[str, Any]:
+    """Champs renseignés uniquement, dans l'ordre du schéma. Les valeurs sont partagées, pas copiées."""
+    return {field: details[field] for field in field_schema.FIELD_ORDER
+            if field in details and field_schema.is_filled(field, details[field])}
+
+def clean_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    return {"jobDetails": clean_details(state.get("jobDetails", {}))}
+
+def format_offer(state: Dict[str, Any]) -> str:
+    """Offre d'emploi indentée pour le message final du chat."""
+    return dumps_text(state, pretty=True)
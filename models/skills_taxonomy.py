@@ -0,0 +1,354 @@
+# models/skills_taxonomy.py - Référentiel des compétences (noms canoniques, alias, synonymes fr/en/es, fautes courantes)
+#
+# Compilé une fois à l'import en automate d'Aho-Corasick sur les mots : une réponse est découpée
+# puis parcourue en une seule passe pour en extraire les compétences et les marqueurs
+# obligatoire / optionnel. Seuls les fragments non reconnus sont laissés au LLM.
+# Ajouter une compétence = ajouter une ligne à SKILLS (le nom canonique est reconnu d'office).
+import re
+import unicodedata
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+SKILLS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    # Langages
+    ("Python", ("python3", "python 3", "pyhton", "phyton", "pyton")),
+    ("Java", ("java 8", "java 11", "java 17", "jave")),
+    ("JavaScript", ("js", "javascript es6", "es6", "javscript", "java script", "javasript")),
+    ("TypeScript", ("ts", "type script", "typescipt")),
+    ("C++", ("cpp", "c plus plus")),
+    ("C#", ("csharp", "c sharp")),
+    ("C", ("langage c", "c language", "lenguaje c", "c ansi")),
+    ("Go", ("golang", "go lang")),
+    ("Rust", ()),
+    ("Kotlin", ()),
+    ("Swift", ()),
+    ("Objective-C", ("objective c", "objc")),
+    ("Scala", ()),
+    ("PHP", ("php 8", "php8")),
+    ("Ruby", ()),
+    ("R", ("langage r", "r language", "lenguaje r", "rstudio", "r studio")),
+    ("MATLAB", ()),
+    ("Perl", ()),
+    ("Dart", ()),
+    ("Elixir", ()),
+    ("Haskell", ()),
+    ("COBOL", ()),
+    ("Bash", ("shell", "shell script", "scripting shell", "bash scripting")),
+    ("PowerShell", ("power shell",)),
+    ("SQL", ("langage sql", "requetes sql", "sql queries")),
+    ("PL/SQL", ("plsql", "pl sql")),
+    ("VBA", ("vba excel", "macros excel")),
+    # Frameworks et bibliothèques
+    ("React", ("react.js", "reactjs", "react js", "raect")),
+    ("React Native", ("react-native", "reactnative")),
+    ("Angular", ("angularjs", "angular.js", "angular js")),
+    ("Vue.js", ("vue", "vuejs", "vue js")),
+    ("Next.js", ("nextjs", "next js")),
+    ("Node.js", ("node", "nodejs", "node js", "noeud js")),
+    ("Express", ("express.js", "expressjs")),
+    ("NestJS", ("nest.js", "nest js")),
+    ("Django", ("djagno",)),
+    ("Flask", ()),
+    ("FastAPI", ("fast api",)),
+    ("Spring", ("spring boot", "springboot", "spring framework")),
+    ("Hibernate", ()),
+    (".NET", ("dotnet", "dot net", "asp.net", ".net core", "net core")),
+    ("Laravel", ()),
+    ("Symfony", ("symphony",)),
+    ("Ruby on Rails", ("rails", "ror")),
+    ("Flutter", ()),
+    ("jQuery", ("jquery",)),
+    ("Redux", ()),
+    ("GraphQL", ("graph ql",)),
+    ("REST", ("api rest", "rest api", "restful", "api restful", "apis rest")),
+    ("HTML", ("html5", "html 5")),
+    ("CSS", ("css3", "css 3")),
+    ("Sass", ("scss",)),
+    ("Tailwind CSS", ("tailwind", "tailwindcss")),
+    ("Bootstrap", ()),
+    # Données et IA
+    ("Pandas", ()),
+    ("NumPy", ("numpy",)),
+    ("scikit-learn", ("sklearn", "scikit learn", "scikit")),
+    ("TensorFlow", ("tensor flow", "tensorflow 2")),
+    ("PyTorch", ("torch", "py torch")),
+    ("Keras", ()),
+    ("Machine Learning", ("ml", "apprentissage automatique", "aprendizaje automatico", "machine learnig")),
+    ("Deep Learning", ("apprentissage profond", "aprendizaje profundo")),
+    ("NLP", ("traitement du langage naturel", "natural language processing", "procesamiento del lenguaje natural")),
+    ("Computer Vision", ("vision par ordinateur", "vision artificial")),
+    ("LLM", ("llms", "large language models", "grands modeles de langage")),
+    ("Data Science", ("science des donnees", "ciencia de datos")),
+    ("Data Analysis", ("analyse de donnees", "analisis de datos", "data analytics")),
+    ("Statistiques", ("statistics", "estadistica", "statistique", "stats")),
+    ("Spark", ("apache spark", "pyspark")),
+    ("Hadoop", ()),
+    ("Kafka", ("apache kafka",)),
+    ("Airflow", ("apache airflow",)),
+    ("dbt", ()),
+    ("ETL", ("elt",)),
+    ("Power BI", ("powerbi", "power-bi")),
+    ("Tableau", ("tableau software",)),
+    ("Looker", ()),
+    ("Excel", ("microsoft excel", "ms excel")),
+    # Bases de données
+    ("PostgreSQL", ("postgres", "postgre", "postgresql", "postgressql")),
+    ("MySQL", ("my sql",)),
+    ("MariaDB", ()),
+    ("Oracle", ("oracle db", "oracle database")),
+    ("SQL Server", ("mssql", "ms sql", "microsoft sql server")),
+    ("MongoDB", ("mongo", "mongo db")),
+    ("Redis", ()),
+    ("Elasticsearch", ("elastic search", "elastic")),
+    ("Cassandra", ()),
+    ("SQLite", ()),
+    ("Snowflake", ()),
+    ("BigQuery", ("big query",)),
+    # Cloud et DevOps
+    ("AWS", ("amazon web services", "amazon aws")),
+    ("Azure", ("microsoft azure",)),
+    ("GCP", ("google cloud", "google cloud platform")),
+    ("Docker", ("dokcer", "docker compose")),
+    ("Kubernetes", ("k8s", "kubernets", "kubernates", "kubernete")),
+    ("Terraform", ()),
+    ("Ansible", ()),
+    ("Jenkins", ()),
+    ("GitLab CI", ("gitlab ci/cd", "gitlab-ci")),
+    ("GitHub Actions", ("github actions",)),
+    ("CI/CD", ("ci cd", "cicd", "integration continue", "integracion continua")),
+    ("Git", ("github", "gitlab")),
+    ("Linux", ("unix", "gnu/linux")),
+    ("DevOps", ("dev ops",)),
+    ("Microservices", ("micro-services", "micro services", "microservicios")),
+    # Conception, tests, méthodes
+    ("Figma", ()),
+    ("Adobe Photoshop", ("photoshop",)),
+    ("Adobe Illustrator", ("illustrator",)),
+    ("UX Design", ("ux", "experience utilisateur", "user experience", "experiencia de usuario")),
+    ("UI Design", ("ui", "interface utilisateur", "user interface")),
+    ("Tests unitaires", ("unit tests", "unit testing", "tests unitarios", "tdd")),
+    ("Selenium", ()),
+    ("Cypress", ()),
+    ("Jest", ()),
+    ("Agile", ("methodes agiles", "methodologie agile", "agile methodology", "metodologias agiles")),
+    ("Scrum", ("scrum master",)),
+    ("Kanban", ()),
+    ("Jira", ()),
+    ("Confluence", ()),
+    # Entreprise et fonctions support
+    ("SAP", ()),
+    ("Salesforce", ()),
+    ("SEO", ("referencement naturel", "posicionamiento web")),
+    ("SEA", ("referencement payant", "google ads")),
+    ("Marketing digital", ("marketing numerique", "digital marketing", "marketing digital")),
+    ("Comptabilité", ("comptabilite", "accounting", "contabilidad")),
+    ("Finance", ("finances", "finanzas")),
+    ("Cybersécurité", ("cybersecurite", "securite informatique", "cybersecurity", "ciberseguridad", "securite")),
+    # Compétences transverses
+    ("Gestion de projet", ("project management", "gestion de projets", "gestion de proyectos", "pilotage de projet")),
+    ("Gestion d'équipe", ("management d'equipe", "management", "team management", "gestion de equipos", "leadership")),
+    ("Communication", ("comunicacion", "communication skills")),
+    ("Travail en équipe", ("travail d'equipe", "teamwork", "trabajo en equipo", "esprit d'equipe")),
+    ("Résolution de problèmes", ("problem solving", "resolution de problemes", "resolucion de problemas")),
+    ("Négociation", ("negociation", "negotiation", "negociacion")),
+)
+
+# Marqueurs du caractère obligatoire ; True = obligatoire, False = optionnel
+MARKERS: Tuple[Tuple[bool, Tuple[str, ...]], ...] = (
+    (True, ("obligatoire", "obligatoires", "requis", "requise", "requises", "indispensable", "indispensables",
+            "exige", "exigee", "exigees", "exiges", "imperatif", "imperative", "necessaire", "necessaires", "essentiel",
+            "must have", "must-have", "required", "mandatory", "essential", "a must",
+            "obligatorio", "obligatoria", "obligatorios", "imprescindible", "imprescindibles", "requerido", "requerida",
+            "necesario", "necesaria", "indispensable")),
+    (False, ("nice to have", "nice-to-have", "idealement", "ideal", "souhaite", "souhaitee", "souhaites", "souhaitees",
+             "souhaitable", "souhaitables", "un plus", "serait un plus", "est un plus", "sont un plus", "en option",
+             "optionnel", "optionnelle", "optionnels", "facultatif", "facultative", "facultatifs", "apprecie",
+             "appreciee", "apprecies", "bonus", "un atout", "serait un atout", "de preference", "si possible",
+             "ideally", "optional", "preferably", "preferred", "a plus", "is a plus", "would be a plus", "bonus points",
+             "idealmente", "deseable", "deseables", "opcional", "valorable", "se valora", "preferiblemente",
+             "es un plus", "sera un plus")),
+)
+
+# Mots sans contenu qui n'empêchent pas une résolution locale
+FILLER = frozenset("""
+    et ou avec de des du d la le les l en a au aux un une sur pour par the and or with of in on for a an
+    y o con el la los las un una para por en
+    connaissance connaissances maitrise maitriser bonne bonnes bon solide solides forte fortes excellente
+    experience experiences competence competences competences techniques outils technologies langages langage
+    framework frameworks base bases notions niveau avance avancee confirme expert expertise ans annee annees
+    knowledge skills experience strong good solid tools years advanced
+    conocimiento conocimientos experiencia dominio buen buena herramientas anos
+    aussi egalement plus ainsi que as well also tambien ademas
+    il elle nous faut faudrait doit doivent must should est sont etre is are be es son ser
+    je on cherche cherchons recherchons besoin need needs necesitamos buscamos
+    c cest voila etc ok
+""".split())
+
+_TOKEN = re.compile(r"[a-z0-9+#/]+(?:[.\-'][a-z0-9+#/]+)*|\.[a-z]+|[,;:\n()]|\.(?=\s|$)")
+CHUNK_BREAKS = frozenset({",", ";", ":", "\n", "."})    # fin d'un groupe de compétences
+_SEGMENT_BREAKS = frozenset({";", "\n", "."})          # fin de portée d'un marqueur placé avant
+_PARENTHESES = frozenset({"(", ")"})
+# "pas de Java", "sans Docker" : la portée d'une négation n'est pas résolue localement
+NEGATIONS = frozenset({"pas", "sans", "ni", "aucun", "aucune", "not", "no", "without", "sin", "ningun", "ninguna"})
+
+def tokenize(text: str) -> List[str]:
+    """Minuscules sans accents ; mots (c++, c#, node.js, .net, ci/cd...) et séparateurs de liste."""
+    text = unicodedata.normalize("NFKD", text.lower().replace("’", "'"))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _TOKEN.findall(text)
+
+class Automaton:
+    """Aho-Corasick sur des suites de mots : toutes les occurrences de tous les motifs en une passe."""
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[Tuple[int, Any]]] = [[]]   # (longueur en mots, charge utile)
+
+    def add(self, words: List[str], payload: Any):
+        node = 0
+        for word in words:
+            nxt = self.goto[node].get(word)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][word] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            node = nxt
+        if not any(length == len(words) for length, _ in self.out[node]):
+            self.out[node].append((len(words), payload))
+
+    def build(self):
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for word, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and word not in self.goto[state]:
+                    state = self.fail[state]
+                fallback = self.goto[state].get(word, 0)
+                self.fail[child] = fallback if fallback != child else 0
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def search(self, tokens: List[str]) -> List[Tuple[int, int, Any]]:
+        """Occurrences (début, fin exclue, charge utile), sans chevauchement, la plus longue d'abord."""
+        found = []
+        node = 0
+        for end, token in enumerate(tokens, 1):
+            while node and token not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(token, 0)
+            for length, payload in self.out[node]:
+                found.append((end - length, end, payload))
+        found.sort(key=lambda match: (match[0], match[0] - match[1]))
+        selected, position = [], 0
+        for start, end, payload in found:
+            if start >= position:
+                selected.append((start, end, payload))
+                position = end
+        return selected
+
+_automaton = Automaton()
+for _canonical, _aliases in SKILLS:
+    for _alias in (_canonical,) + _aliases:
+        _automaton.add(tokenize(_alias), ("skill", _canonical))
+for _mandatory, _phrases in MARKERS:
+    for _phrase in _phrases:
+        _automaton.add(tokenize(_phrase), ("marker", _mandatory))
+_automaton.build()
+CANONICAL_NAMES = frozenset(canonical for canonical, _ in SKILLS)
+
+def apply_markers(tokens: List[str], items: List[List[Any]], target: str = "skill",
+                  transparent: frozenset = frozenset(), filler: frozenset = FILLER):
+    """
+    Applique les marqueurs obligatoire / optionnel aux éléments `target` (item = [type, valeur, début, fin, drapeau, ...]).
+    Un marqueur placé avant vaut jusqu'à la fin de la phrase ; en fin de groupe, il vaut pour les éléments
+    de ce groupe, délimité par la ponctuation. Les éléments `transparent` (ex. niveaux de langue) placés
+    entre le marqueur et le premier élément visé sont enjambés.
+    """
+    def applies_forward(index: int) -> bool:
+        """Un marqueur suivi d'un contenu dans son groupe (ou d'un deux-points) porte sur la suite."""
+        for token in tokens[items[index][3]:]:
+            if token == ":":
+                return True
+            if token in CHUNK_BREAKS:
+                return False
+            if token not in filler and token not in _PARENTHESES:
+                return True
+        return False
+
+    forward: Optional[bool] = None
+    forward_end = -1
+    for index, item in enumerate(items):
+        kind, value, start, end = item[:4]
+        if kind == target:
+            if forward is not None and start < forward_end:
+                item[4] = forward
+            continue
+        if kind != "marker":
+            continue
+        if applies_forward(index):
+            forward = value
+            forward_end = next((i for i in range(end, len(tokens)) if tokens[i] in _SEGMENT_BREAKS), len(tokens))
+            continue
+        # Marqueur placé après : éléments du même groupe, en remontant jusqu'à la ponctuation
+        # ("Anglais courant et espagnol souhaité" : le niveau d'anglais clôt la portée du marqueur)
+        assigned = False
+        for previous in reversed(items[:index]):
+            if any(token in CHUNK_BREAKS for token in tokens[previous[3]:start]):
+                break
+            if previous[0] in transparent and not assigned:
+                continue
+            if previous[0] != target:
+                break
+            previous[4] = value
+            start = previous[2]
+            assigned = True
+
+def unmatched_fragments(tokens: List[str], items: List[List[Any]], filler: frozenset = FILLER) -> List[str]:
+    """Fragments non couverts par un élément reconnu, hors mots vides, à confier au LLM."""
+    residue, fragment = [], []
+    covered = set()
+    for item in items:
+        covered.update(range(item[2], item[3]))
+    for index, token in enumerate(tokens):
+        if index in covered or token in CHUNK_BREAKS or token in _PARENTHESES:
+            if fragment:
+                residue.append(" ".join(fragment))
+                fragment = []
+            continue
+        if token not in filler and len(token) > 1:
+            fragment.append(token)
+    if fragment:
+        residue.append(" ".join(fragment))
+    return residue
+
+class SkillExtraction(NamedTuple):
+    skills: List[Dict[str, Any]]   # [{"name", "mandatory"}] dans l'ordre de la réponse, sans doublon
+    residue: List[str]             # fragments non reconnus (hors mots vides) à confier au LLM
+
+def extract_skills(text: str) -> SkillExtraction:
+    """
+    Compétences reconnues et leur caractère obligatoire (par défaut obligatoire).
+    Un marqueur placé avant ("idéalement React, Vue", "Nice to have: Docker") vaut pour les compétences
+    suivantes jusqu'à la fin de la phrase ; en fin de groupe ("Python et Java obligatoires", "Docker (un plus)"),
+    il vaut pour les compétences de ce groupe, délimité par la ponctuation.
+    Une réponse qui contient une négation est entièrement laissée au LLM.
+    """
+    tokens = tokenize(text)
+    if any(token in NEGATIONS for token in tokens):
+        return SkillExtraction([], [" ".join(tokens)])
+    matches = _automaton.search(tokens)
+    items: List[List[Any]] = []        # [kind, value, start, end, mandatory]
+    for start, end, (kind, value) in matches:
+        items.append([kind, value, start, end, True])
+
+    apply_markers(tokens, items)
+
+    skills, seen = [], set()
+    for kind, value, _, _, mandatory in items:
+        if kind == "skill" and value not in seen:
+            seen.add(value)
+            skills.append({"name": value, "mandatory": mandatory})
+
+    return SkillExtraction(skills, unmatched_fragments(tokens, items))
@@ -0,0 +1,307 @@
+# models/timezones.py - Résolution locale du fuseau horaire (timeZone) : abréviations, villes, pays, décalages UTC
+#
+# Adossé à la base tz du système (zoneinfo) : "CET", "UTC+1", "heure de Paris", "Europe/Paris" ou
+# "4h overlap with EST" donnent {"name", "overlap"} sans appel LLM. Le fuseau d'un pays (zone.tab)
+# permet aussi de proposer une valeur dès que countries / country sont remplis (suggest_timezone).
+# L'index est compilé au premier appel : la base tz et pycountry sont longues à charger.
+import os
+import re
+import threading
+import unicodedata
+import zoneinfo
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from models import gazetteer
+
+DEFAULT_OVERLAP = 4   # heures de chevauchement quand la réponse n'en précise pas
+MIN_CONFIDENCE = 0.8
+# Décalages UTC existants, en minutes (Baker Island UTC-12, Kiribati UTC+14)
+UTC_OFFSET_RANGE = (-12 * 60, 14 * 60)
+
+# Abréviations usuelles : fuseau de référence et formulations en toutes lettres (sans accents)
+ABBREVIATIONS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "UTC": ("UTC", ("temps universel", "temps universel coordonne", "coordinated universal time", "tiempo universal")),
+    "GMT": ("UTC", ("greenwich mean time", "heure de greenwich", "hora de greenwich")),
+    "WET": ("Europe/Lisbon", ("western european time", "heure d europe de l ouest", "hora de europa occidental")),
+    "CET": ("Europe/Paris", ("central european time", "heure d europe centrale", "hora central europea",
+                             "heure europeenne", "european time")),
+    "CEST": ("Europe/Paris", ("central european summer time", "heure d ete d europe centrale")),
+    "EET": ("Europe/Athens", ("eastern european time", "heure d europe de l est", "hora de europa oriental")),
+    "BST": ("Europe/London", ("british summer time",)),
+    "MSK": ("Europe/Moscow", ("moscow time", "heure de moscou")),
+    "WAT": ("Africa/Lagos", ("west africa time", "heure d afrique de l ouest")),
+    "CAT": ("Africa/Maputo", ("central africa time", "heure d afrique centrale")),
+    "EAT": ("Africa/Nairobi", ("east africa time", "heure d afrique de l est")),
+    "SAST": ("Africa/Johannesburg", ("south africa standard time",)),
+    "GST": ("Asia/Dubai", ("gulf standard time", "heure du golfe")),
+    "PKT": ("Asia/Karachi", ("pakistan standard time",)),
+    "IST": ("Asia/Kolkata", ("india standard time", "indian standard time", "heure de l inde")),
+    "ICT": ("Asia/Bangkok", ("indochina time",)),
+    "SGT": ("Asia/Singapore", ("singapore time",)),
+    "HKT": ("Asia/Hong_Kong", ("hong kong time",)),
+    "JST": ("Asia/Tokyo", ("japan standard time", "heure du japon")),
+    "KST": ("Asia/Seoul", ("korea standard time",)),
+    "AEST": ("Australia/Sydney", ("australian eastern standard time",)),
+    "AEDT": ("Australia/Sydney", ("australian eastern daylight time",)),
+    "NZST": ("Pacific/Auckland", ("new zealand standard time",)),
+    "AST": ("America/Halifax", ("atlantic time", "atlantic standard time")),
+    "EST": ("America/New_York", ("eastern time", "eastern standard time", "us eastern", "heure de la cote est",
+                                 "cote est", "east coast", "hora del este")),
+    "EDT": ("America/New_York", ("eastern daylight time",)),
+    "ET": ("America/New_York", ()),
+    "CST": ("America/Chicago", ("central time", "central standard time", "us central", "hora central")),
+    "CDT": ("America/Chicago", ("central daylight time",)),
+    "MST": ("America/Denver", ("mountain time", "mountain standard time", "hora de la montana")),
+    "MDT": ("America/Denver", ("mountain daylight time",)),
+    "PST": ("America/Los_Angeles", ("pacific time", "pacific standard time", "heure du pacifique", "cote ouest",
+                                    "west coast", "hora del pacifico")),
+    "PDT": ("America/Los_Angeles", ("pacific daylight time",)),
+    "PT": ("America/Los_Angeles", ()),
+    "AKST": ("America/Anchorage", ("alaska time",)),
+    "HST": ("Pacific/Honolulu", ("hawaii time",)),
+    "BRT": ("America/Sao_Paulo", ("brasilia time", "hora de brasilia")),
+    "ART": ("America/Argentina/Buenos_Aires", ("argentina time", "hora de argentina")),
+}
+# Abréviations qui sont aussi des mots courants : reconnues seulement écrites en majuscules
+_AMBIGUOUS_ABBREVIATIONS = frozenset({"est", "cat", "eat", "art", "pt", "et", "ist", "ast", "gst", "wat"})
+
+# Noms de villes en français / espagnol (ou sans fuseau propre) -> fuseau de la base tz
+CITY_ALIASES: Dict[str, str] = {
+    "londres": "Europe/London", "bruxelles": "Europe/Brussels", "bruselas": "Europe/Brussels",
+    "geneve": "Europe/Zurich", "ginebra": "Europe/Zurich", "lausanne": "Europe/Zurich", "berne": "Europe/Zurich",
+    "lisbonne": "Europe/Lisbon", "lisboa": "Europe/Lisbon", "porto": "Europe/Lisbon",
+    "varsovie": "Europe/Warsaw", "varsovia": "Europe/Warsaw", "athenes": "Europe/Athens", "atenas": "Europe/Athens",
+    "moscou": "Europe/Moscow", "moscu": "Europe/Moscow", "roma": "Europe/Rome", "milan": "Europe/Rome",
+    "milano": "Europe/Rome", "munich": "Europe/Berlin", "francfort": "Europe/Berlin", "frankfurt": "Europe/Berlin",
+    "hambourg": "Europe/Berlin", "hamburg": "Europe/Berlin", "barcelone": "Europe/Madrid", "barcelona": "Europe/Madrid",
+    "seville": "Europe/Madrid", "sevilla": "Europe/Madrid", "lyon": "Europe/Paris", "marseille": "Europe/Paris",
+    "toulouse": "Europe/Paris", "lille": "Europe/Paris", "bordeaux": "Europe/Paris", "nantes": "Europe/Paris",
+    "copenhague": "Europe/Copenhagen", "la haye": "Europe/Amsterdam", "rotterdam": "Europe/Amsterdam",
+    "edimbourg": "Europe/London", "manchester": "Europe/London", "le caire": "Africa/Cairo", "el cairo": "Africa/Cairo",
+    "alger": "Africa/Algiers", "argel": "Africa/Algiers", "rabat": "Africa/Casablanca", "marrakech": "Africa/Casablanca",
+    "tanger": "Africa/Casablanca", "fes": "Africa/Casablanca", "pekin": "Asia/Shanghai", "beijing": "Asia/Shanghai",
+    "bombay": "Asia/Kolkata", "mumbai": "Asia/Kolkata", "delhi": "Asia/Kolkata", "new delhi": "Asia/Kolkata",
+    "bangalore": "Asia/Kolkata", "bengaluru": "Asia/Kolkata", "singapour": "Asia/Singapore", "singapur": "Asia/Singapore",
+    "tokio": "Asia/Tokyo", "seoul": "Asia/Seoul", "san francisco": "America/Los_Angeles", "seattle": "America/Los_Angeles",
+    "californie": "America/Los_Angeles", "california": "America/Los_Angeles", "silicon valley": "America/Los_Angeles",
+    "nueva york": "America/New_York", "boston": "America/New_York", "miami": "America/New_York",
+    "washington": "America/New_York", "montreal": "America/Toronto", "quebec": "America/Toronto",
+    "ottawa": "America/Toronto", "austin": "America/Chicago", "dallas": "America/Chicago", "houston": "America/Chicago",
+    "mexico": "America/Mexico_City", "ciudad de mexico": "America/Mexico_City", "rio de janeiro": "America/Sao_Paulo",
+}
+# Fuseau principal des pays qui en ont plusieurs (zone.tab liste d'abord des fuseaux excentrés)
+PRIMARY_ZONES: Dict[str, str] = {
+    "US": "America/New_York", "CA": "America/Toronto", "BR": "America/Sao_Paulo", "RU": "Europe/Moscow",
+    "AU": "Australia/Sydney", "MX": "America/Mexico_City", "AR": "America/Argentina/Buenos_Aires",
+    "ID": "Asia/Jakarta", "KZ": "Asia/Almaty", "CL": "America/Santiago", "EC": "America/Guayaquil",
+    "PT": "Europe/Lisbon", "ES": "Europe/Madrid", "CD": "Africa/Kinshasa", "MN": "Asia/Ulaanbaatar",
+}
+# Villes de la base tz et pays qui sont aussi des mots courants
+_AMBIGUOUS_PLACES = frozenset({"reunion", "christmas", "easter", "wake", "midway", "nome", "regina", "creston",
+                               "mahe", "chagos", "galapagos", "efate", "truk", "chuuk", "casey", "troll",
+                               "grenade", "maurice", "chad", "jersey"})
+_REGIONS = ("Africa/", "America/", "Asia/", "Atlantic/", "Australia/", "Europe/", "Indian/", "Pacific/")
+
+_CONFIRMATIONS = frozenset({"oui", "ok", "okay", "d accord", "daccord", "yes", "yep", "si", "parfait", "exact",
+                            "exactement", "correct", "ca marche", "c est bon", "cest bon", "tout a fait", "vale",
+                            "claro", "perfecto", "sure", "fine", "bien", "tres bien", "je confirme", "confirme",
+                            "valide", "c est ca", "that works", "sounds good"})
+_FILLER = frozenset("""
+    heure heures h d de du des la le l les en a au aux avec sur pour fuseau fuseaux horaire horaires zone zones
+    chevauchement recouvrement commun communs commune communes minimum min moins au plus environ standard ete hiver
+    local locale il faut doit etre est c cest on moi nous notre nos equipe equipes base bases aligne alignee alignes
+    time timezone with for me us the of in on at least hours hour hrs overlap overlapping our team based aligned summer winter
+    huso horario horas hora zona solapamiento con del al el los las nuestro nuestra equipo
+    et and y ou or o svp merci please thanks gracias mais but pero
+""".split())
+_NEGATIONS = frozenset({"pas", "non", "ni", "jamais", "not", "no", "never", "sin", "sans", "without", "aucun", "aucune"})
+
+_OFFSET = re.compile(r"\b(?:utc|gmt)\s*([+\-−])\s*(\d{1,2})(?:[:h.]?(\d{2}))?h?\b", re.IGNORECASE)
+_OVERLAP = re.compile(r"\b(\d{1,2}(?:[.,]\d)?)\s*(?:h|hr|hrs|heures?|hours?|horas?)\b", re.IGNORECASE)
+_OFFSET_NAME = re.compile(r"^(?:utc|gmt)\s*([+\-−])\s*(\d{1,2})(?:[:h.]?(\d{2}))?$", re.IGNORECASE)
+_WORD = re.compile(r"[a-z]+(?:/[a-z_\-]+)+|[a-z]+", re.IGNORECASE)
+
+class TimezoneParse(NamedTuple):
+    name: Optional[str]         # abréviation ("CET"), fuseau de la base tz ("Europe/Paris") ou décalage ("UTC+1")
+    zone: Optional[str]         # fuseau de la base tz correspondant, si connu
+    overlap: Optional[float]    # heures de chevauchement exprimées dans la réponse
+    confidence: float
+    confirmed: bool             # réponse d'approbation ("oui", "ok") à une valeur proposée
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.replace("’", "'"))
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+def _words(text: str) -> List[str]:
+    return " ".join(_WORD.findall(text.replace("'", " "))).split()
+
+def _zone_tab() -> Dict[str, str]:
+    """Code pays ISO -> premier fuseau listé dans zone.tab (base tz du système, sinon paquet tzdata)."""
+    for directory in zoneinfo.TZPATH:
+        path = os.path.join(directory, "zone.tab")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                lines = handle.read().splitlines()
+            break
+    else:
+        try:
+            from importlib.resources import files
+            lines = files("tzdata.zoneinfo").joinpath("zone.tab").read_text(encoding="utf-8").splitlines()
+        except Exception:
+            print("⚠️ zone.tab introuvable : pas de fuseau par défaut déduit du pays")
+            return {}
+    zones: Dict[str, str] = {}
+    for line in lines:
+        if line and not line.startswith("#"):
+            columns = line.split("\t")
+            if len(columns) >= 3:
+                zones.setdefault(columns[0], columns[2])
+    zones.update(PRIMARY_ZONES)
+    return zones
+
+_index: Dict[str, Any] = {}
+_index_lock = threading.Lock()
+
+def _get_index() -> Dict[str, Any]:
+    """Expressions (suite de mots) -> (nom retenu, fuseau), et pays -> fuseau, compilés au premier appel."""
+    if "phrases" not in _index:
+        with _index_lock:
+            if "phrases" not in _index:
+                available = zoneinfo.available_timezones()
+                phrases: Dict[Tuple[str, ...], Tuple[str, str]] = {}
+                for zone in sorted(available):
+                    if zone.startswith(_REGIONS):
+                        city = zone.rsplit("/", 1)[1].replace("_", " ").lower()
+                        if city not in _AMBIGUOUS_PLACES:
+                            phrases.setdefault(tuple(city.split()), (zone, zone))
+                    if "/" in zone:
+                        phrases[(zone.lower(),)] = (zone, zone)
+                for alias, zone in CITY_ALIASES.items():
+                    phrases[tuple(alias.split())] = (zone, zone)
+                country_zones = _zone_tab()
+                countries: Dict[str, str] = {}
+                for code, variants in gazetteer.country_names():
+                    zone = country_zones.get(code)
+                    if zone in available:
+                        for variant in variants:
+                            key = " ".join(_words(_normalize(variant.split(",")[0].split("(")[0]).lower()))
+                            if key and key not in _AMBIGUOUS_PLACES:
+                                countries[key] = zone
+                                phrases.setdefault(tuple(key.split()), (zone, zone))
+                for abbreviation, (zone, spelled) in ABBREVIATIONS.items():
+                    phrases[(abbreviation.lower(),)] = (abbreviation, zone)
+                    for phrase in spelled:
+                        phrases[tuple(phrase.split())] = (abbreviation, zone)
+                _index["longest"] = max(len(key) for key in phrases)
+                _index["countries"] = countries
+                _index["phrases"] = phrases
+    return _index
+
+def utc_offset(zone: Optional[str], when: Optional[datetime] = None) -> Optional[str]:
+    """Décalage d'un fuseau de la base tz, maintenant ou à `when` ("Europe/Paris" -> "UTC+02:00" en été)."""
+    try:
+        tz = zoneinfo.ZoneInfo(zone)
+        offset = (when.replace(tzinfo=tz) if when else datetime.now(tz)).strftime("%z")
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError, TypeError):
+        return None
+    return f"UTC{offset[0]}{offset[1:3]}:{offset[3:]}"
+
+def offset_minutes(name: Optional[str]) -> Optional[int]:
+    """Décalage en minutes d'un nom de la forme "UTC+5:30" / "GMT-3" ; None pour tout autre nom."""
+    match = _OFFSET_NAME.match((name or "").strip())
+    if not match:
+        return None
+    sign, hours, minutes = match.groups()
+    total = int(hours) * 60 + int(minutes or 0)
+    return -total if sign in "-−" else total
+
+def valid_offset(name: Optional[str]) -> bool:
+    """Faux pour un décalage qui n'existe pas ("UTC+25", "UTC+3:75") ; vrai pour tout autre nom."""
+    match = _OFFSET_NAME.match((name or "").strip())
+    if not match:
+        return True
+    low, high = UTC_OFFSET_RANGE
+    return int(match.group(3) or 0) < 60 and low <= offset_minutes(name) <= high
+
+def country_timezone(name: Optional[str]) -> Optional[str]:
+    """Fuseau principal d'un pays nommé en français, anglais ou espagnol ("Maroc" -> "Africa/Casablanca")."""
+    if not name:
+        return None
+    return _get_index()["countries"].get(" ".join(_words(_normalize(name).lower())))
+
+def suggest_timezone(details: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Valeur proposée pour timeZone d'après le pays (country) ou le premier pays ciblé (countries)."""
+    candidates = [details.get("country")] + list(details.get("countries") or [])
+    for candidate in candidates:
+        zone = country_timezone(candidate.get("name") if isinstance(candidate, dict) else candidate)
+        if zone:
+            return {"name": zone, "overlap": DEFAULT_OVERLAP}
+    return None
+
+def resolve_timezone(text: str) -> Optional[TimezoneParse]:
+    """
+    Fuseau et heures de chevauchement exprimés par la réponse, avec une confiance entre 0 et 1 ;
+    None si elle ne contient ni fuseau, ni durée de chevauchement, ni approbation.
+    Plusieurs fuseaux de décalages différents, plusieurs durées, des mots inconnus, une
+    négation ou un décalage hors de UTC-12..UTC+14 abaissent la confiance.
+    """
+    index = _get_index()
+    text = _normalize(text)
+
+    names: List[Tuple[str, Optional[str]]] = []
+    for sign, hours, minutes in _OFFSET.findall(text):
+        sign = "-" if sign in "-−" else "+"
+        names.append((f"UTC{sign}{int(hours)}" + (f":{minutes}" if minutes and minutes != "00" else ""), None))
+    text = _OFFSET.sub(" ", text)
+    overlaps = [float(value.replace(",", ".")) for value in _OVERLAP.findall(text)]
+    # Les majuscules sont conservées : "EST" est une abréviation, "est" un verbe
+    originals = _words(_OVERLAP.sub(" ", text))
+    words = [word.lower() for word in originals]
+    unknown, negated, confirmed = 0, False, False
+    position = 0
+    while position < len(words):
+        for length in range(min(index["longest"], len(words) - position), 0, -1):
+            key = tuple(words[position:position + length])
+            match = index["phrases"].get(key)
+            if match and length == 1 and key[0] in _AMBIGUOUS_ABBREVIATIONS and not originals[position].isupper():
+                match = None
+            if match:
+                names.append(match)
+                position += length
+                break
+            if " ".join(key) in _CONFIRMATIONS:
+                confirmed = True
+                position += length
+                break
+        else:
+            word = words[position]
+            if word in _NEGATIONS:
+                negated = True
+            elif word not in _FILLER:
+                unknown += 1
+            position += 1
+
+    if not names and not overlaps and not confirmed:
+        return None
+    confidence = 1.0 - 0.25 * unknown
+    offsets = [_offsets_of(name, zone) for name, zone in names]
+    shared = set.intersection(*offsets) if offsets else set()
+    if (offsets and not shared) or len(set(overlaps)) > 1:
+        confidence = min(confidence, 0.5)   # "CET ou EST", "de 9h à 17h" : à confier au LLM
+    if negated or any(not valid_offset(name) for name, zone in names if zone is None):
+        confidence = 0.0   # "UTC+99" : jamais écrit localement
+    # Un fuseau nommé prime sur son décalage ("CET, GMT+1" -> "CET")
+    name, zone = next((entry for entry in names if entry[1]), names[0] if names else (None, None))
+    overlap = overlaps[0] if overlaps and 0 < overlaps[0] <= 24 else None
+    if overlaps and overlap is None:
+        confidence = min(confidence, 0.5)
+    return TimezoneParse(name, zone, overlap, round(max(0.0, confidence), 2), confirmed)
+
+def _offsets_of(name: str, zone: Optional[str]) -> set:
+    """Décalages d'hiver et d'été, pour reconnaître deux écritures d'un même fuseau ("CET, GMT+1")."""
+    if zone is None:
+        sign, (hours, _, minutes) = name[3:4] or "+", name[4:].partition(":")
+        return {f"UTC{sign}{int(hours or 0):02d}:{minutes or '00'}"}
+    year = datetime.now().year
+    return {utc_offset(zone, datetime(year, month, 15, 12)) for month in (1, 7)} - {None}
@@ -20,6 +20,9 @@ document.addEventListener('DOMContentLoaded', function() {
     let typingTimeout = null;
     let completedFields = 0;
     let totalFields = 10; // Estimation du nombre total de champs à remplir
+    // Copie locale de l'offre, mise à jour par les deltas du format compact
+    let jobState = { jobDetails: {} };
+    let stateVersion = 0;
     
     // Check for saved theme preference or default to 'light'
     const savedTheme = localStorage.getItem('theme') || 'light';
@@ -122,14 +125,18 @@ document.addEventListener('DOMContentLoaded', function() {
         // Show typing indicator
         showTypingIndicator();
         
-        // Send message to server
-        fetch('/api/message', {
+        // Send message to server. Un nouvel essai réutilise le même message_id : le serveur
+        // renvoie alors la réponse déjà calculée au lieu de traiter le message deux fois.
+        const payload = JSON.stringify({ message, message_id: newMessageId(), wire: 'compact', version: stateVersion });
+        const post = () => fetch('/api/message', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
             },
-            body: JSON.stringify({ message }),
-        })
+            body: payload,
+        });
+        post()
+        .catch(() => post())
         .then(response => response.json())
         .then(data => {
             hideTypingIndicator();
@@ -145,9 +152,20 @@ document.addEventListener('DOMContentLoaded', function() {
                     currentField = data.field;
                 }
                 
-                if (data.current_state) {
+                if (data.state_delta) {
+                    Object.assign(jobState.jobDetails, data.state_delta);
+                    stateVersion = data.version;
+                    updateJobDetails(jobState);
+                } else if (data.current_state) {
                     updateJobDetails(data.current_state);
                 }
+                
+                // Progression calculée côté serveur (champs requis selon jobType et type)
+                if (data.progress) {
+                    completedFields = data.progress.filled;
+                    totalFields = data.progress.required;
+                    updateProgressBar(completedFields, totalFields);
+                }
             } else if (data.error) {
                 addSystemMessage(`Erreur: ${data.error}`);
             }
@@ -159,9 +177,18 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    function newMessageId() {
+        if (window.crypto && crypto.randomUUID) {
+            return crypto.randomUUID();
+        }
+        return `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+    }
+    
     function resetChat() {
         // Animation de reset
         progressBar.style.width = '0%';
+        jobState = { jobDetails: {} };
+        stateVersion = 0;
         
         // Clear UI
         jobDetails.innerHTML = `
@@ -2,26 +2,20 @@ import os
 import sys
 import re
 import json
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from langgraph.graph import StateGraph, END
 from typing import TypedDict, Annotated, Dict, Any, List
 from langchain_core.runnables.config import RunnableConfig
 
+# Permettre l'import de config/ quand le script est lancé depuis tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.llm_config import create_llm
+
 # Augmenter la limite de récursion globale de Python
 sys.setrecursionlimit(2000)
 
-# Charger la clé API depuis le fichier .env
-load_dotenv()
-TOGETHER_API_KEY = os.getenv("TOGETHER_API_KEY")
-
-llm = ChatOpenAI(
-    base_url="https://api.together.xyz",
-    api_key=TOGETHER_API_KEY,
-    model="mistralai/Mistral-7B-Instruct-v0.2",
-    temperature=0
-)
+# Même pool HTTP que les agents, seul le modèle diffère
+llm = create_llm(model="mistralai/Mistral-7B-Instruct-v0.2", temperature=0)
 
 # Schéma d'état
 class State(TypedDict):
@@ -0,0 +1,52 @@
+# tests/test_answer_cache.py - Cache des réponses déjà analysées : intention par similarité, valeur sur réponse identique
+import pytest
+
+from agents.answer_cache import AnswerCache, normalize_answer
+
+DIRECT = {"intention": "DIRECT_ANSWER", "confidence": 0.95}
+
+@pytest.fixture
+def cache():
+    cache = AnswerCache(max_size=100, threshold=0.8)
+    cache.remember("skills", "Python, Java", DIRECT, ["Python", "Java"])
+    cache.remember("skills", "C#, Python", DIRECT, ["C#", "Python"])
+    cache.remember("contractType", "CDI temps plein", DIRECT, "CDI")
+    return cache
+
+def test_normalize_answer():
+    assert normalize_answer("C'est du Télétravail !") == "teletravail"
+    assert normalize_answer("Python et Java") == normalize_answer("python , java") == "python java"
+    assert normalize_answer("C#") != normalize_answer("C++")
+
+@pytest.mark.parametrize("text", ["python , java", "Python et Java"])
+def test_same_normalized_answer_reuses_value(cache, text):
+    entry = cache.lookup("skills", text)
+    assert entry.intention["intention"] == "DIRECT_ANSWER"
+    assert cache.value_for(entry, text) == ["Python", "Java"]
+
+@pytest.mark.parametrize("field, text", [("skills", "Python, Jav"), ("contractType", "CDD temps plein")])
+def test_similar_answer_reuses_intention_only(cache, field, text):
+    entry = cache.lookup(field, text)
+    assert entry is not None and entry.intention["intention"] == "DIRECT_ANSWER"
+    assert cache.value_for(entry, text) is None
+
+@pytest.mark.parametrize("field, text", [
+    ("skills", "C++, Python"),         # autre langage, pas une faute de frappe
+    ("skills", "pas Python, Java"),    # négation
+    ("title", "Python, Java"),         # autre champ
+])
+def test_different_answer_misses(cache, field, text):
+    assert cache.lookup(field, text) is None
+
+def test_only_confident_field_independent_intentions_are_kept():
+    cache = AnswerCache(max_size=100, threshold=0.8)
+    cache.remember("skills", "Python", {"intention": "DIRECT_ANSWER", "confidence": 0.5})
+    cache.remember("skills", "change le titre", {"intention": "MODIFY_FIELD", "confidence": 0.99})
+    assert cache.stats()["size"] == 0
+
+def test_lru_eviction_keeps_recent_answers():
+    cache = AnswerCache(max_size=2, threshold=0.8)
+    for text in ("Python", "Java", "Rust"):
+        cache.remember("skills", text, DIRECT, [text])
+    assert cache.lookup("skills", "Python") is None
+    assert cache.value_for(cache.lookup("skills", "Rust"), "Rust") == ["Rust"]
@@ -0,0 +1,34 @@
+# tests/test_app.py - Réponses de l'API : format compact (deltas) et resynchronisation du client
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import app as web
+from models.job_details import JobDetails
+
+@pytest.fixture
+def sess():
+    details = JobDetails()
+    details.update("title", "Dev Python")
+    details.update("seniority", "SENIOR")
+    return SimpleNamespace(job_details=details, conversation=[])
+
+def reply(sess, delta_since):
+    with web.app.test_request_context():
+        return json.loads(web._reply(sess, delta_since, response="ok").get_data())
+
+def test_full_reply(sess):
+    body = reply(sess, None)
+    assert body["version"] == 2 and body["current_state"] == sess.job_details.get_state()
+    assert "state_delta" not in body
+
+def test_compact_reply_sends_changes_since_client_version(sess):
+    body = reply(sess, 1)
+    assert body["state_delta"] == {"seniority": "SENIOR"} and "current_state" not in body
+
+def test_client_ahead_of_server_gets_full_state(sess):
+    # Serveur redémarré ou session recréée : la version du client n'existe plus ici
+    body = reply(sess, 40)
+    assert body["current_state"] == sess.job_details.get_state()
+    assert body["version"] == 2 and "state_delta" not in body
@@ -0,0 +1,49 @@
+# tests/test_bulk_ingest.py - Ingestion en masse : clés d'idempotence et reprise d'un lot
+import json
+
+import pytest
+
+from workflow import bulk_ingest
+from workflow.bulk_ingest import BulkIngestor, parse_line, store_key
+
+@pytest.fixture
+def processed(monkeypatch):
+    """Remplace l'extraction (LLM) par une offre dont le titre est la description."""
+    briefs = []
+
+    def fake_process(brief):
+        briefs.append(brief)
+        return {"status": "complete", "jobDetails": {"title": brief}}
+
+    monkeypatch.setattr(bulk_ingest, "process_brief", fake_process)
+    return briefs
+
+def run(ingestor, *items):
+    results = [result for result in ingestor.run(json.dumps(item) for item in items) if "summary" not in result]
+    return sorted(results, key=lambda result: result["line"])
+
+def test_parse_line():
+    assert parse_line('{"brief": "Dev Python", "id": 1}') == ("1", "Dev Python")
+    assert parse_line("Dev Python")[1] == "Dev Python"
+    assert parse_line("Dev Python")[0] == parse_line("  Dev Python ")[0]
+    assert parse_line("   ") is None and parse_line('{"id": 1}') is None
+
+def test_same_key_and_brief_is_served_from_store(processed):
+    ingestor = BulkIngestor(max_workers=2, idempotency_size=100)
+    first, = run(ingestor, {"brief": "Dev Python", "id": 1})
+    second, = run(ingestor, {"brief": "Dev Python", "id": 1})
+    assert processed == ["Dev Python"]
+    assert not first["cached"] and second["cached"]
+    assert second["idempotency_key"] == "1" and second["jobDetails"] == first["jobDetails"]
+
+def test_same_key_with_another_brief_is_not_reused(processed):
+    ingestor = BulkIngestor(max_workers=2, idempotency_size=100)
+    run(ingestor, {"brief": "Dev Python", "id": 1})
+    other, = run(ingestor, {"brief": "Chef de projet", "id": 1})
+    assert processed == ["Dev Python", "Chef de projet"]
+    assert not other["cached"] and other["jobDetails"] == {"title": "Chef de projet"}
+
+def test_store_key_depends_on_brief():
+    assert store_key("1", "Dev Python") != store_key("1", "Chef de projet")
+    key, brief = parse_line("Dev Python")
+    assert store_key(key, brief) == key
@@ -0,0 +1,57 @@
+# tests/test_durations.py - Analyse locale des délais et durées en semaines
+from datetime import date
+
+import pytest
+
+from models.durations import DURATION_FIELDS, MAX_PLAUSIBLE_WEEKS, MIN_CONFIDENCE, parse_duration
+
+TODAY = date(2026, 10, 19)
+
+@pytest.mark.parametrize("text, weeks, kind", [
+    ("immédiatement", 0, "immediate"),
+    ("asap", 0, "immediate"),
+    ("dès que possible", 0, "immediate"),
+    ("3 mois", 13, "duration"),
+    ("6 months", 26, "duration"),
+    ("1 an", 52, "duration"),
+    ("un mois et demi", 7, "duration"),
+    ("dans 2 semaines", 2, "duration"),
+    ("2-3 semaines", 2.5, "range"),
+    ("entre 2 et 3 semaines", 2.5, "range"),
+    ("2 à 3 mois", 11, "range"),
+])
+def test_confident_parses(text, weeks, kind):
+    parse = parse_duration(text, today=TODAY)
+    assert (parse.weeks, parse.kind) == (weeks, kind)
+    assert parse.confidence >= MIN_CONFIDENCE
+
+@pytest.mark.parametrize("text, weeks", [("début janvier", 11), ("1er décembre", 6), ("le 15/11/2026", 4)])
+def test_dates_are_relative_to_today(text, weeks):
+    parse = parse_duration(text, today=TODAY)
+    assert (parse.weeks, parse.kind) == (weeks, "date")
+
+def test_weeks_per_month_depends_on_field():
+    assert parse_duration("1 mois", weeks_per_month=DURATION_FIELDS["availability"]).weeks == 4
+
+@pytest.mark.parametrize("text", ["2 semaines ou 3 mois", "3 weeks or 2 months", "2 o 3 semanas"])
+def test_alternatives_are_left_to_the_llm(text):
+    # "ou" / "or" / "o" propose deux réponses, ce n'est pas un intervalle
+    assert parse_duration(text).confidence < MIN_CONFIDENCE
+
+def test_implausible_duration_is_capped():
+    parse = parse_duration("100 ans")
+    assert parse.weeks > MAX_PLAUSIBLE_WEEKS
+    assert parse.confidence < MIN_CONFIDENCE
+
+def test_negation_is_left_to_the_llm():
+    assert parse_duration("pas avant 2 mois").confidence < MIN_CONFIDENCE
+
+@pytest.mark.parametrize("text", ["le 5", "40", "2-3"])
+def test_numbers_without_unit_are_left_to_the_llm(text):
+    # "le 5" est plutôt le 5 du mois que 5 semaines
+    parse = parse_duration(text)
+    assert parse is not None and parse.confidence < MIN_CONFIDENCE
+
+@pytest.mark.parametrize("text", ["", "bientôt", "200"])
+def test_unparsed(text):
+    assert parse_duration(text) is None
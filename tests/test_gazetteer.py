@@ -0,0 +1,45 @@
+# tests/test_gazetteer.py - Villes connues hors ligne : recherche exacte, tolérante aux fautes, appartenance au pays
+import pytest
+
+from models import gazetteer
+from models.gazetteer import MIN_CONFIDENCE, city_in_country, extract_city, lookup, normalize
+
+@pytest.mark.parametrize("text, name, country", [
+    ("Le poste est basé à Lyon", "Lyon", "FR"),
+    ("Nice", "Nice", "FR"),
+    ("St Etienne", "Saint-Étienne", "FR"),
+    ("Brussels", "Bruxelles", "BE"),
+])
+def test_extract_city(text, name, country):
+    assert extract_city(text, "France") == (name, country, 1.0)
+
+def test_typo_is_matched_with_lower_confidence():
+    match = extract_city("Marseile", "France")
+    assert match.name == "Marseille" and MIN_CONFIDENCE <= match.confidence < 1.0
+
+@pytest.mark.parametrize("text", ["Paris ou Lyon", "Bruxelles ville du chocolat"])
+def test_several_cities_or_unknown_words_are_left_to_the_llm(text):
+    assert extract_city(text, "France").confidence < MIN_CONFIDENCE
+
+@pytest.mark.parametrize("text", ["", "rien", "nice to have"])
+def test_no_city(text):
+    assert extract_city(text, "France") is None
+
+def test_lookup():
+    assert lookup("Londres") == ("Londres", "GB", lookup("London").population)
+    assert lookup("Xyzzyx") is None
+
+def test_city_in_country():
+    assert city_in_country("Lyon", "France") is True
+    assert city_in_country("Lyon", {"name": "Espagne"}) is False
+    # Ville ou pays inconnu : la question reste au LLM
+    assert city_in_country("Xyzzyx", "France") is None
+    assert city_in_country("Lyon", "Atlantide") is None
+
+def test_normalize():
+    assert normalize("  Saint-Étienne ") == "saint etienne"
+
+def test_build_counts_records(tmp_path):
+    target = tmp_path / "cities.bin"
+    count = gazetteer.build(target=str(target))
+    assert count > 0 and target.stat().st_size > count * gazetteer._RECORD.size
@@ -0,0 +1,101 @@
+# tests/test_job_details.py - Index des champs manquants et journal des modifications de JobDetails
+import pytest
+
+from models import field_schema
+from models.job_details import JobDetails
+
+def test_blank_form_asks_base_fields_in_schema_order():
+    details = JobDetails()
+    assert details.get_missing_fields() == list(field_schema.BASE_REQUIRED)
+    assert details.next_missing_field() == "title"
+
+def test_zero_availability_is_filled():
+    details = JobDetails()
+    assert details.update("availability", 0) == (True, None)
+    assert not details.is_missing("availability")
+
+def test_object_fields_are_missing_until_named():
+    details = JobDetails()
+    details.update("jobType", "FREELANCE")
+    details.update("type", "ONSITE")
+    # Les valeurs par défaut {"name": None} ne comptent pas comme renseignées
+    assert details.is_missing("country")
+    details.update("country", {"name": "France"})
+    assert not details.is_missing("country")
+    details.update("country", None)
+    assert details.is_missing("country")
+
+def test_remote_job_requires_timezone_until_named():
+    details = JobDetails()
+    details.update("jobType", "FREELANCE")
+    details.update("type", "REMOTE")
+    assert details.is_missing("timeZone")
+    details.update("timeZone", {"name": "Europe/Paris", "overlap": 4})
+    assert not details.is_missing("timeZone")
+
+def test_selector_change_rebuilds_index_in_priority_order():
+    details = JobDetails()
+    details.update("jobType", "FREELANCE")
+    details.update("type", "REMOTE")
+    remote = details.get_missing_fields()
+    assert "timeZone" in remote and "city" not in remote
+    details.update("type", "ONSITE")
+    onsite = details.get_missing_fields()
+    assert "timeZone" not in onsite and onsite[-2:] == ["country", "city"]
+    required = field_schema.required_fields(details.data["jobDetails"])
+    assert onsite == [field for field in required if field not in ("jobType", "type")]
+
+def test_completion_counts_filled_required_fields():
+    details = JobDetails()
+    details.update("jobType", "FREELANCE")
+    details.update("availability", 0)
+    details.update("type", "ONSITE")
+    progress = details.completion()
+    assert progress["filled"] == 3
+    assert progress["required"] == len(field_schema.required_fields(details.data["jobDetails"]))
+
+def freelance_rates(minimum, maximum):
+    details = JobDetails()
+    details.update("jobType", "FREELANCE")
+    details.update("minHourlyRate", minimum)
+    details.update("maxHourlyRate", maximum)
+    return details
+
+def test_undo_redo_restore_values_and_index():
+    details = freelance_rates(50, 60)
+    details.update("maxHourlyRate", 70)
+    record = details.undo()
+    assert record.op == "undo" and details.data["jobDetails"]["maxHourlyRate"] == 60
+    details.redo()
+    assert details.data["jobDetails"]["maxHourlyRate"] == 70
+    while details.can_undo():
+        details.undo()
+    assert details.get_missing_fields() == list(field_schema.BASE_REQUIRED)
+
+def test_revert_field_rejected_when_no_longer_coherent():
+    details = freelance_rates(50, 60)
+    details.update("maxHourlyRate", 70)
+    details.update("minHourlyRate", 65)
+    version = details.version
+    with pytest.raises(field_schema.FieldValidationError) as error:
+        details.revert_field("maxHourlyRate")
+    assert error.value.code == "min_gt_max"
+    assert details.data["jobDetails"]["maxHourlyRate"] == 70
+    assert details.version == version
+
+def test_patch_is_undone_and_redone_as_one_change():
+    details = JobDetails()
+    assert details.update_many({"title": "Dev", "seniority": "SENIOR"}) == []
+    details.undo()
+    assert (details.data["jobDetails"]["title"], details.data["jobDetails"]["seniority"]) == (None, None)
+    assert not details.can_undo()
+    details.redo()
+    assert (details.data["jobDetails"]["title"], details.data["jobDetails"]["seniority"]) == ("Dev", "SENIOR")
+
+def test_revert_to_default_uses_a_fresh_value():
+    details = JobDetails()
+    details.update("skills", [{"name": "Python", "mandatory": True}])
+    details.revert_field("skills")
+    assert details.data["jobDetails"]["skills"] == []
+    details.data["jobDetails"]["skills"].append({"name": "Go", "mandatory": True})
+    assert JobDetails().data["jobDetails"]["skills"] == []
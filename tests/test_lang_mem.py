@@ -0,0 +1,31 @@
+# tests/test_lang_mem.py - Mémoire à long terme : extractions des faits en arrière-plan
+import threading
+
+from agents.lang_mem import LangMem
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+class SlowFirstLLM:
+    """Le premier message ("50k") ne répond qu'une fois la correction ("60k") extraite."""
+
+    def __init__(self):
+        self.corrected = threading.Event()
+
+    def invoke(self, prompt, **kwargs):
+        if "50k" in prompt:
+            self.corrected.wait(2)
+            return FakeMessage('{"salary": "50k", "position": "Dev Python"}')
+        return FakeMessage('{"salary": "60k"}')
+
+def test_older_extraction_does_not_overwrite_a_correction():
+    llm = SlowFirstLLM()
+    memory = LangMem(llm)
+    first = memory.extract_facts_in_background("Dev Python à 50k")
+    second = memory.extract_facts_in_background("finalement 60k")
+    second.result(2)
+    llm.corrected.set()
+    assert first.result(2) == {"salary": "50k", "position": "Dev Python"}
+    # Les catégories que la correction n'a pas touchées sont conservées
+    assert memory.long_term_memory == {"salary": "60k", "position": "Dev Python"}
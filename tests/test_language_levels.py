@@ -0,0 +1,37 @@
+# tests/test_language_levels.py - Langues requises : nom ISO 639, niveau CECRL, caractère obligatoire
+import pytest
+
+from models.language_levels import DEFAULT_LEVEL, canonical_language, extract_languages, normalize_level
+
+def languages(text):
+    return [(item["name"], item["level"], item["required"]) for item in extract_languages(text).languages]
+
+@pytest.mark.parametrize("text, expected", [
+    ("Anglais courant, espagnol B1", [("Anglais", "C1", True), ("Espagnol", "B1", True)]),
+    ("English C1 required, French nice to have", [("Anglais", "C1", True), ("Français", DEFAULT_LEVEL, False)]),
+    ("français langue maternelle", [("Français", "C2", True)]),
+    ("Inglés avanzado", [("Anglais", "C1", True)]),
+    ("allemand niveau intermédiaire", [("Allemand", "B1", True)]),
+    ("anglais", [("Anglais", DEFAULT_LEVEL, True)]),
+])
+def test_extract_languages(text, expected):
+    assert languages(text) == expected
+    assert extract_languages(text).residue == []
+
+def test_unknown_level_is_left_to_the_llm():
+    extraction = extract_languages("anglais C3")
+    assert languages("anglais C3") == [("Anglais", DEFAULT_LEVEL, True)]
+    assert extraction.residue == ["c3"]
+
+def test_negation_leaves_whole_answer_to_the_llm():
+    assert extract_languages("anglais mais pas espagnol") == ([], ["anglais mais pas espagnol"])
+
+def test_canonical_language():
+    assert canonical_language("anglais") == canonical_language("inglés") == canonical_language("English") == "Anglais"
+    assert canonical_language("klingon") is None
+
+@pytest.mark.parametrize("level, expected", [
+    ("b2", "B2"), ("C2", "C2"), ("courant", "C1"), ("natif", "C2"), ("débutant", "A1"), ("xyz", None),
+])
+def test_normalize_level(level, expected):
+    assert normalize_level(level) == expected
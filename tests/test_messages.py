@@ -0,0 +1,65 @@
+# tests/test_messages.py - Catalogue des messages : repli par traduction LLM des langues non couvertes
+import threading
+
+import pytest
+
+from config import llm_config, messages
+from config.messages import t
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+class FakeLLM:
+    def __init__(self, reply=None, error=None, release=None):
+        self.reply, self.error, self.release = reply, error, release
+        self.calls = 0
+
+    def invoke(self, prompt, **kwargs):
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(2)
+        if self.error is not None:
+            raise self.error
+        return FakeMessage(self.reply)
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    monkeypatch.setattr(messages, "_fallback_cache", {})
+
+    def install(**kwargs):
+        llm = FakeLLM(**kwargs)
+        monkeypatch.setattr(llm_config, "llm", llm)
+        return llm
+    return install
+
+def test_catalog_languages_need_no_llm(fake_llm):
+    llm = fake_llm(error=RuntimeError("LLM indisponible"))
+    assert t("update.nothing_to_undo", "en") == messages.CATALOG["update.nothing_to_undo"]["en"]
+    assert llm.calls == 0
+
+def test_translation_is_cached(fake_llm):
+    llm = fake_llm(reply="⚠️ '{field}' muss mindestens {min:g} sein.")
+    assert t("validation.below_min", "de", field="x", min=3) == "⚠️ 'x' muss mindestens 3 sein."
+    t("validation.below_min", "de", field="y", min=1)
+    assert llm.calls == 1
+
+@pytest.mark.parametrize("llm_kwargs", [{"error": RuntimeError("timeout")}, {"reply": "⚠️ Feld muss größer sein."}])
+def test_failed_translation_falls_back_to_english_and_is_retried(fake_llm, llm_kwargs):
+    llm = fake_llm(**llm_kwargs)
+    assert t("validation.below_min", "de", field="x", min=3) == t("validation.below_min", "en", field="x", min=3)
+    t("validation.below_min", "de", field="x", min=3)
+    assert llm.calls == 2 and messages._fallback_cache == {}
+
+def test_concurrent_requests_share_one_translation(fake_llm):
+    release = threading.Event()
+    llm = fake_llm(reply="⚠️ '{field}' muss mindestens {min:g} sein.", release=release)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(messages.template("validation.below_min", "de")))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    threading.Timer(0.1, release.set).start()
+    for thread in threads:
+        thread.join(2)
+    assert llm.calls == 1 and len(set(results)) == 1
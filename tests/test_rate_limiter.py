@@ -0,0 +1,85 @@
+# tests/test_rate_limiter.py - File d'admission à priorités devant l'API LLM et seaux à jetons
+import threading
+import time
+
+import pytest
+
+from config.rate_limiter import (AdmissionController, AdmissionTimeout, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE,
+                                 SharedTokenBucket, TokenBucket, current_priority, llm_priority)
+
+def controller(**overrides):
+    params = dict(requests_per_second=1000, tokens_per_minute=10_000_000, max_concurrency=1)
+    params.update(overrides)
+    return AdmissionController(**params)
+
+def wait_for_queue(admission, depth, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while admission.stats()["queue_depth"] < depth:
+        assert time.monotonic() < deadline, "appel jamais mis en file"
+        time.sleep(0.005)
+
+def test_llm_priority_is_scoped():
+    assert current_priority() == PRIORITY_INTERACTIVE
+    with llm_priority(PRIORITY_BACKGROUND):
+        assert current_priority() == PRIORITY_BACKGROUND
+    assert current_priority() == PRIORITY_INTERACTIVE
+
+def test_token_bucket_delay_and_refill():
+    bucket = TokenBucket(rate=100, capacity=1)
+    assert bucket.delay(1) == 0
+    bucket.consume(1)
+    assert 0 < bucket.delay(1) <= 0.01
+    time.sleep(0.02)
+    assert bucket.delay(1) == 0
+
+def test_interactive_call_overtakes_queued_background_call():
+    admission = controller()
+    holder = admission.acquire()
+    order = []
+
+    def call(priority, name):
+        with admission.admit(priority=priority):
+            order.append(name)
+
+    background = threading.Thread(target=call, args=(PRIORITY_BACKGROUND, "background"))
+    background.start()
+    wait_for_queue(admission, 1)
+    interactive = threading.Thread(target=call, args=(PRIORITY_INTERACTIVE, "interactive"))
+    interactive.start()
+    wait_for_queue(admission, 2)
+    admission.release(holder)
+    background.join(2)
+    interactive.join(2)
+    assert order == ["interactive", "background"]
+
+def test_admission_timeout_leaves_queue_clean():
+    admission = controller()
+    holder = admission.acquire()
+    with pytest.raises(AdmissionTimeout):
+        admission.acquire(timeout=0.05)
+    stats = admission.stats()
+    assert stats["timeouts"] == 1 and stats["queue_depth"] == 0
+    admission.release(holder)
+    admission.release(admission.acquire(timeout=0.5))
+
+def test_penalize_pauses_admissions():
+    admission = controller()
+    admission.penalize(0.1)
+    start = time.monotonic()
+    admission.release(admission.acquire())
+    assert time.monotonic() - start >= 0.09
+    assert admission.stats()["rate_limited"] == 1
+
+def test_token_budget_delays_large_calls():
+    admission = controller(tokens_per_minute=600)   # 10 tokens/s
+    admission.release(admission.acquire(estimated_tokens=600))
+    with pytest.raises(AdmissionTimeout):
+        admission.acquire(estimated_tokens=100, timeout=0.05)
+
+def test_shared_bucket_is_seen_by_every_instance(tmp_path):
+    path = str(tmp_path / "requests.bucket")
+    first = SharedTokenBucket(rate=1, capacity=1, path=path)
+    second = SharedTokenBucket(rate=1, capacity=1, path=path)
+    assert second.delay(1) == 0
+    first.consume(1)
+    assert second.delay(1) > 0.5
@@ -0,0 +1,21 @@
+# tests/test_serialization.py - Offre finale : champs renseignés selon la même règle que la complétude
+from models import field_schema
+from models.job_details import JobDetails
+from models.serialization import clean_details, clean_state, dumps, loads
+
+def test_clean_details_matches_completion_rule():
+    details = JobDetails()
+    details.update("availability", 0)
+    raw = dict(details.data["jobDetails"], title="", city="Lyon")
+    cleaned = clean_details(raw)
+    assert cleaned == {"availability": 0, "city": "Lyon"}
+    assert all(field_schema.is_filled(field, value) for field, value in cleaned.items())
+
+def test_unnamed_objects_are_dropped():
+    state = {"jobDetails": {"timeZone": {"name": None, "overlap": 4}, "country": {"name": "France"}}}
+    assert clean_state(state) == {"jobDetails": {"country": {"name": "France"}}}
+
+def test_dumps_keeps_schema_order_and_unicode():
+    text = dumps(clean_details({"city": "Orléans", "title": "Dev"})).decode("utf-8")
+    assert text.index("title") < text.index("city") and "Orléans" in text
+    assert loads(text) == {"title": "Dev", "city": "Orléans"}
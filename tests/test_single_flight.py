@@ -0,0 +1,82 @@
+# tests/test_single_flight.py - Regroupement des appels identiques en vol
+import asyncio
+import threading
+
+import pytest
+
+from config.single_flight import SingleFlight, prompt_key
+
+def run_concurrently(flight, key, fn, count):
+    results, errors = [], []
+    barrier = threading.Barrier(count)
+
+    def worker():
+        barrier.wait()
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+def test_concurrent_calls_share_one_upstream_call():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def upstream():
+        calls.append(1)
+        release.wait(1)
+        return "réponse"
+
+    timer = threading.Timer(0.1, release.set)
+    timer.start()
+    results, errors = run_concurrently(flight, "k", upstream, 5)
+    assert not errors and len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert {value for value, _ in results} == {"réponse"}
+    assert flight.stats()["in_flight"] == 0
+
+def test_error_is_shared_and_not_cached():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(1)
+        raise ValueError("boom")
+
+    threading.Timer(0.1, release.set).start()
+    results, errors = run_concurrently(flight, "k", failing, 3)
+    assert not results and len(errors) == 3 and all(isinstance(e, ValueError) for e in errors)
+    # Rien n'est retenu une fois l'appel terminé
+    assert flight.do("k", lambda: 42) == (42, False)
+
+def test_do_async_coalesces_tasks():
+    flight = SingleFlight()
+    calls = []
+
+    async def upstream():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async("k", upstream) for _ in range(4)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert [value for value, _ in results] == ["ok"] * 4
+    assert sum(shared for _, shared in results) == 3
+
+def test_prompt_key_is_stable_and_parameter_sensitive():
+    assert prompt_key("prompt", {"b": 1, "a": 2}) == prompt_key("prompt", {"a": 2, "b": 1})
+    assert prompt_key("prompt", {"temperature": 0}) != prompt_key("prompt", {"temperature": 0.7})
+
+@pytest.mark.parametrize("key", ["", "x" * 1000])
+def test_any_key_works(key):
+    assert SingleFlight().do(key, lambda: key) == (key, False)
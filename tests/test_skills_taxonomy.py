@@ -0,0 +1,42 @@
+# tests/test_skills_taxonomy.py - Extraction des compétences par le référentiel (alias, fautes, marqueurs)
+import pytest
+
+from models.skills_taxonomy import extract_skills
+
+def names(text):
+    return [skill["name"] for skill in extract_skills(text).skills]
+
+@pytest.mark.parametrize("text, expected", [
+    ("Python, Java", ["Python", "Java"]),
+    ("C#, C++ et Go", ["C#", "C++", "Go"]),
+    ("pyhton, javscript", ["Python", "JavaScript"]),
+    ("java script et golang", ["JavaScript", "Go"]),
+    ("React.js, Node.js, k8s", ["React", "Node.js", "Kubernetes"]),
+    ("Python, python3, Python 3", ["Python"]),
+])
+def test_aliases_and_typos_map_to_canonical_names(text, expected):
+    assert names(text) == expected
+
+def test_csharp_is_not_cplusplus():
+    assert names("C#") == ["C#"] and names("C++") == ["C++"]
+
+@pytest.mark.parametrize("text, expected", [
+    ("Python obligatoire, Docker apprécié", {"Python": True, "Docker": False}),
+    ("Docker (un plus), Python", {"Docker": False, "Python": True}),
+    ("Nice to have: Docker", {"Docker": False}),
+    # Marqueur placé avant : jusqu'à la fin de la phrase seulement
+    ("idéalement React, Vue. Python obligatoire", {"React": False, "Vue.js": False, "Python": True}),
+])
+def test_mandatory_markers(text, expected):
+    assert {skill["name"]: skill["mandatory"] for skill in extract_skills(text).skills} == expected
+
+def test_unknown_fragments_are_left_to_the_llm():
+    extraction = extract_skills("du Python et un truc maison")
+    assert names("du Python et un truc maison") == ["Python"]
+    assert extraction.residue == ["truc maison"]
+
+def test_negation_leaves_whole_answer_to_the_llm():
+    assert extract_skills("Python et pas de Java") == ([], ["python et pas de java"])
+
+def test_empty_answer():
+    assert extract_skills("") == ([], [])
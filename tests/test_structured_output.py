@@ -0,0 +1,83 @@
+# tests/test_structured_output.py - Extraction tolérante du JSON des réponses LLM et mode JSON du backend
+import httpx
+import openai
+import pytest
+
+from agents import structured_output
+from agents.structured_output import IncrementalJSONParser, StructuredOutputError, extract_json, invoke_json
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+class FakeLLM:
+    """Réponse fixe ; `error` est levée par les appels en mode JSON (response_format)."""
+
+    def __init__(self, content, error=None):
+        self.content = content
+        self.error = error
+        self.calls = []
+
+    def invoke(self, prompt, **kwargs):
+        self.calls.append(kwargs)
+        if self.error is not None and "response_format" in kwargs:
+            raise self.error
+        return FakeMessage(self.content)
+
+def bad_request(message):
+    request = httpx.Request("POST", "http://llm.test/v1/chat/completions")
+    return openai.BadRequestError(message, response=httpx.Response(400, request=request), body=None)
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"value": "Python"}', {"value": "Python"}),
+    ('Voici: ```json\n{"value": "Python", "error": null}\n```', {"value": "Python", "error": None}),
+    ("{'value': 'X', 'ok': True, 'n': None}", {"value": "X", "ok": True, "n": None}),
+    ('{"a": 1, "b": [1,2,],}', {"a": 1, "b": [1, 2]}),
+    ("{value: Senior}", {"value": "Senior"}),
+    ("texte [1, 2] fin", [1, 2]),
+])
+def test_extract_json_repairs_common_llm_output(text, expected):
+    assert extract_json(text) == expected
+
+def test_extract_json_closes_truncated_output():
+    assert extract_json('{"a": {"b": [1, {"c": "d"') == {"a": {"b": [1, {"c": "d"}]}}
+    assert extract_json('{"value": "Data') == {"value": "Data"}
+
+def test_extract_json_without_structure_raises():
+    with pytest.raises(StructuredOutputError):
+        extract_json("pas de json ici")
+
+def test_incremental_parser_stops_at_end_of_first_object():
+    parser = IncrementalJSONParser()
+    done = False
+    for char in '{"a": 1, "b": "xy"} puis du texte':
+        done = parser.feed(char)
+        if done:
+            break
+    assert done and parser.result() == {"a": 1, "b": "xy"}
+    assert not parser.repaired
+
+def test_invoke_json_validates_field_value(monkeypatch):
+    monkeypatch.setitem(structured_output._json_mode, "enabled", False)
+    assert invoke_json(FakeLLM('{"value": "12"}'), "prompt", "test", field="weeklyHours") == {"value": 12.0}
+    # Valeur hors schéma : retournée telle quelle, le gestionnaire du champ décide
+    assert invoke_json(FakeLLM('{"value": "beaucoup"}'), "prompt", "test", field="weeklyHours") == {"value": "beaucoup"}
+
+def test_invoke_json_wraps_list_for_field(monkeypatch):
+    monkeypatch.setitem(structured_output._json_mode, "enabled", False)
+    result = invoke_json(FakeLLM('[{"name": "Python", "mandatory": true}]'), "prompt", "test", field="skills")
+    assert result == {"value": [{"name": "Python", "mandatory": True}]}
+
+def test_json_mode_disabled_when_response_format_refused(monkeypatch):
+    monkeypatch.setitem(structured_output._json_mode, "enabled", True)
+    llm = FakeLLM('{"ok": true}', error=bad_request("response_format json_object is not supported for this model"))
+    assert invoke_json(llm, "prompt", "test") == {"ok": True}
+    assert structured_output._json_mode["enabled"] is False
+    assert llm.calls == [{"response_format": {"type": "json_object"}}, {}]
+
+def test_json_mode_kept_on_unrelated_bad_request(monkeypatch):
+    monkeypatch.setitem(structured_output._json_mode, "enabled", True)
+    llm = FakeLLM('{"ok": true}', error=bad_request("This model's maximum context length is 8192 tokens"))
+    with pytest.raises(openai.BadRequestError):
+        invoke_json(llm, "prompt", "test")
+    assert structured_output._json_mode["enabled"] is True
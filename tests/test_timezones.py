@@ -0,0 +1,92 @@
+# tests/test_timezones.py - Fuseau horaire : analyse locale de la réponse et suggestion d'après le pays
+from datetime import datetime
+
+import pytest
+
+from agents.question_agent import question_agent
+from config.messages import t
+from models.job_details import JobDetails
+from models.timezones import (DEFAULT_OVERLAP, MIN_CONFIDENCE, country_timezone, resolve_timezone, suggest_timezone,
+                              utc_offset)
+from workflow.form_workflow import FormState, FormWorkflow
+
+# Offre REMOTE remplie jusqu'au fuseau horaire, dernier champ requis
+REMOTE_JOB = {
+    "title": "Développeur Python", "description": "Backend", "discipline": "Informatique", "availability": 0,
+    "seniority": "SENIOR", "languages": [{"name": "Anglais", "level": "C1", "required": True}],
+    "skills": [{"name": "Python", "mandatory": True}], "jobType": "FREELANCE", "type": "REMOTE",
+    "minHourlyRate": 50, "maxHourlyRate": 70, "weeklyHours": 35, "estimatedWeeks": 12,
+    "continents": [{"name": "Europe"}], "countries": [{"name": "France"}], "regions": [{"name": "Île-de-France"}],
+}
+
+def suggestion(zone, lang="fr"):
+    return t("form.timezone_suggestion", lang, zone=zone, offset=utc_offset(zone), overlap=DEFAULT_OVERLAP)
+
+@pytest.mark.parametrize("text, name, zone, overlap", [
+    ("CET", "CET", "Europe/Paris", None),
+    ("heure de Paris", "Europe/Paris", "Europe/Paris", None),
+    ("Europe/Paris, 3h de chevauchement", "Europe/Paris", "Europe/Paris", 3.0),
+    ("UTC+2", "UTC+2", None, None),
+    ("CET, GMT+1", "CET", "Europe/Paris", None),   # deux écritures du même fuseau
+])
+def test_resolve_timezone(text, name, zone, overlap):
+    parse = resolve_timezone(text)
+    assert (parse.name, parse.zone, parse.overlap) == (name, zone, overlap)
+    assert parse.confidence >= MIN_CONFIDENCE
+
+def test_confirmation_of_the_suggestion():
+    assert resolve_timezone("oui").confirmed
+
+@pytest.mark.parametrize("text", ["CET ou EST", "pas CET"])
+def test_conflicts_and_negations_are_left_to_the_llm(text):
+    assert resolve_timezone(text).confidence < MIN_CONFIDENCE
+
+@pytest.mark.parametrize("text", ["est-ce important", "bonjour"])
+def test_no_timezone(text):
+    assert resolve_timezone(text) is None
+
+def test_country_timezone_and_offset():
+    assert country_timezone("Maroc") == "Africa/Casablanca"
+    assert country_timezone("Spain") == "Europe/Madrid"
+    assert country_timezone("Atlantide") is None
+    assert utc_offset("Europe/Paris", datetime(2026, 1, 15, 12)) == "UTC+01:00"
+    assert utc_offset("Europe/Paris", datetime(2026, 7, 15, 12)) == "UTC+02:00"
+
+def test_suggest_timezone_from_country_or_countries():
+    assert suggest_timezone({"country": {"name": None}, "countries": [{"name": "Maroc"}]}) == \
+        {"name": "Africa/Casablanca", "overlap": DEFAULT_OVERLAP}
+    assert suggest_timezone({"country": {"name": None}, "countries": []}) is None
+
+def test_remote_job_with_country_is_asked_the_suggested_timezone():
+    details = JobDetails()
+    assert details.update_many(REMOTE_JOB) == []
+    assert details.get_missing_fields() == ["timeZone"]
+    assert question_agent.get_next_question(details) == ("timeZone", suggestion("Europe/Paris"))
+    assert question_agent.suggested_question("timeZone", details, "en") == suggestion("Europe/Paris", "en")
+
+def test_workflow_asks_the_suggested_timezone():
+    workflow = FormWorkflow()
+    assert workflow.job_details.update_many(REMOTE_JOB) == []
+    state = workflow.determine_next_action(FormState())
+    assert state.current_field == "timeZone"
+    assert state.current_question == suggestion("Europe/Paris")
+
+def test_no_suggestion_without_country():
+    details = JobDetails()
+    assert question_agent.suggested_question("timeZone", details) is None
+
+@pytest.mark.parametrize("text", ["UTC+99", "UTC+14:30", "UTC+3:75", "CET, UTC+25"])
+def test_impossible_offset_is_never_resolved_locally(text):
+    assert resolve_timezone(text).confidence < MIN_CONFIDENCE
+
+@pytest.mark.parametrize("text", ["UTC-12", "UTC+14", "GMT+5:30"])
+def test_offset_range_bounds(text):
+    assert resolve_timezone(text).confidence >= MIN_CONFIDENCE
+
+def test_job_details_rejects_impossible_offset():
+    details = JobDetails()
+    ok, error = details.update("timeZone", {"name": "UTC+25", "overlap": 4})
+    assert not ok and "UTC+25" in error
+    assert details.data["jobDetails"]["timeZone"]["name"] is None
+    assert [e.code for e in details.update_many({"timeZone": {"name": "GMT-13", "overlap": 4}})] == ["invalid_utc_offset"]
+    assert details.update("timeZone", {"name": "UTC+5:30", "overlap": 4}) == (True, None)
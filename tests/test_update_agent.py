@@ -0,0 +1,86 @@
+# tests/test_update_agent.py - Extraction spéculative : validation, abandon et reprise sans spéculation
+import pytest
+
+from agents import update_agent
+from agents.answer_cache import answer_cache
+from agents.update_agent import UpdateAgent
+from models.job_details import JobDetails
+
+@pytest.fixture
+def agent(monkeypatch):
+    """Agent sans LLM : intention et extraction simulées, extractions comptées par offre."""
+    monkeypatch.setattr(update_agent, "SPECULATIVE_EXTRACTION", True)
+    state = {"intention": "DIRECT_ANSWER", "extractions": [], "fail": False}
+
+    def detect_intention(self, user_input, key, job_state):
+        return {"intention": state["intention"], "confidence": 0.5}
+
+    def extract(self, key, user_input, original_question, intention_analysis):
+        state["extractions"].append(self.job_details)
+        if state["fail"] and len(state["extractions"]) == 1:
+            raise RuntimeError("LLM indisponible")
+        errors = self.job_details.update_many({"title": user_input, "seniority": "SENIOR"})
+        return not errors, None, intention_analysis
+
+    monkeypatch.setattr(UpdateAgent, "detect_intention", detect_intention)
+    monkeypatch.setattr(UpdateAgent, "_extract", extract)
+    agent = UpdateAgent(JobDetails(), None)
+    agent.user_language = "fr"
+    yield agent, state
+    answer_cache.clear()
+
+def test_confirmed_speculation_is_committed_as_one_change(agent):
+    agent, state = agent
+    assert agent.update("title", "Data engineer", "Titre ?")[0] is True
+    # Une seule extraction, sur la copie de l'offre
+    assert len(state["extractions"]) == 1 and state["extractions"][0] is not agent.job_details
+    assert agent.job_details.data["jobDetails"]["title"] == "Data engineer"
+    agent.job_details.undo()
+    assert agent.job_details.data["jobDetails"]["seniority"] is None and not agent.job_details.can_undo()
+
+def test_speculation_is_discarded_for_other_intentions(agent):
+    agent, state = agent
+    state["intention"] = "SHOW_STATUS"
+    assert agent.update("title", "où en est-on ?", "Titre ?")[1] == "SHOW_STATUS:title"
+    assert agent.job_details.version == 0
+
+def test_failed_speculation_falls_back_to_direct_extraction(agent):
+    agent, state = agent
+    state["fail"] = True
+    assert agent.update("title", "Chef de projet", "Titre ?")[0] is True
+    assert state["extractions"][-1] is agent.job_details
+    assert agent.job_details.data["jobDetails"]["title"] == "Chef de projet"
+
+def test_speculation_on_a_changed_offer_is_redone(agent):
+    agent, state = agent
+    speculation = agent._speculate("title", "Product owner", "Titre ?")
+    speculation.result(2)
+    agent.job_details.update("discipline", "Informatique")
+    assert agent._commit_speculation(speculation, {}) is None
+    assert agent.job_details.data["jobDetails"]["title"] is None
+
+@pytest.mark.parametrize("key, answer, expected", [
+    ("availability", "dans 3 semaines", 3.0),
+    ("city", "Le poste est basé à Lyon", "Lyon"),
+])
+def test_local_answer_is_parsed_once_and_written_without_llm(monkeypatch, key, answer, expected):
+    calls = []
+    original = UpdateAgent._local_answer
+
+    def counted(self, field, user_input):
+        calls.append(field)
+        return original(self, field, user_input)
+
+    def no_llm(self, *args, **kwargs):
+        raise AssertionError("appel LLM inattendu")
+
+    monkeypatch.setattr(UpdateAgent, "_local_answer", counted)
+    monkeypatch.setattr(UpdateAgent, "detect_intention", no_llm)
+    details = JobDetails()
+    details.update("type", "ONSITE")
+    details.update("country", {"name": "France"})
+    agent = UpdateAgent(details, None)
+    agent.user_language = "fr"
+    assert agent.update(key, answer, "Question ?")[0] is True
+    assert details.data["jobDetails"][key] == expected
+    assert calls == [key]
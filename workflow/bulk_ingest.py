@@ -0,0 +1,212 @@
+# workflow/bulk_ingest.py - Ingestion en masse d'offres d'emploi (JSONL) par un pool de workers borné
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from config.llm_config import llm_priority, PRIORITY_BACKGROUND
+from config.single_flight import SingleFlight
+from agents.update_agent import UpdateAgent
+from models.job_details import JobDetails
+from models import serialization
+
+# Par défaut autant de workers que d'appels LLM simultanés admis
+BULK_MAX_WORKERS = int(os.getenv("BULK_MAX_WORKERS", os.getenv("LLM_MAX_CONCURRENCY", "8")))
+BULK_IDEMPOTENCY_SIZE = int(os.getenv("BULK_IDEMPOTENCY_SIZE", "10000"))
+
+class IdempotencyStore:
+    """Résultats déjà produits par clé d'idempotence (LRU borné), pour reprendre un lot interrompu."""
+
+    def __init__(self, max_size: int):
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.max_size = max_size
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._items.get(key)
+            if result is not None:
+                self._items.move_to_end(key)
+            return result
+
+    def put(self, key: str, result: Dict[str, Any]):
+        with self._lock:
+            self._items[key] = result
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+def parse_line(line) -> Optional[Tuple[str, str]]:
+    """
+    Une ligne JSONL : {"brief": "...", "idempotency_key": "..."} ou du texte brut.
+    Retourne (clé, description), la clé par défaut étant l'empreinte de la description. None si vide.
+    """
+    if isinstance(line, bytes):
+        line = line.decode("utf-8", errors="replace")
+    line = line.strip()
+    if not line:
+        return None
+    item = None
+    if line.startswith("{"):
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError:
+            item = None
+    if isinstance(item, dict):
+        brief = str(item.get("brief") or item.get("text") or "").strip()
+        key = item.get("idempotency_key") or item.get("id")
+    else:
+        brief, key = line, None
+    if not brief:
+        return None
+    return str(key or _digest(brief)), brief
+
+def _digest(brief: str) -> str:
+    return hashlib.sha256(brief.encode("utf-8")).hexdigest()[:32]
+
+def store_key(key: str, brief: str) -> str:
+    """
+    Clé du résultat mémorisé : la clé du client seule est partagée par tous les lots et tous les
+    clients ("id": 1), l'empreinte de la description évite de rendre l'offre d'une autre description.
+    """
+    digest = _digest(brief)
+    return digest if key == digest else f"{key}:{digest}"
+
+def process_brief(brief: str) -> Dict[str, Any]:
+    """Extraction, validation et contrôle de complétude d'une offre, sans question au recruteur."""
+    job_details = JobDetails()
+    rejected = UpdateAgent(job_details, None).extract_from_brief(brief)
+    missing = job_details.get_missing_fields()
+    coherent, coherence_error = job_details.validate_coherence()
+    result = {
+        "status": "complete" if not missing and coherent else "incomplete",
+        "jobDetails": serialization.clean_details(job_details.data["jobDetails"]),
+    }
+    if missing:
+        result["missing_fields"] = missing
+    if not coherent:
+        result["coherence_error"] = coherence_error
+    if rejected:
+        result["rejected"] = [{**error.to_dict(), "message": error.message} for error in rejected]
+    return result
+
+class BulkIngestor:
+    """
+    Traite des lots de descriptions en parallèle (pool partagé par toutes les requêtes) et produit
+    les résultats au fil de l'eau. Les appels LLM passent en priorité basse : le chat reste fluide.
+    """
+
+    def __init__(self, max_workers: int, idempotency_size: int):
+        self.max_workers = max_workers
+        self.store = IdempotencyStore(idempotency_size)
+        self._flights = SingleFlight()  # même clé envoyée deux fois en parallèle : un seul traitement
+        self._pool = {"pid": None, "executor": None}
+        self._lock = threading.Lock()
+        self._counts = {"items": 0, "complete": 0, "incomplete": 0, "error": 0, "cached": 0}
+        self._latencies = deque(maxlen=1000)
+        self._last_batch: Dict[str, Any] = {}
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool["pid"] != os.getpid():
+            with self._lock:
+                if self._pool["pid"] != os.getpid():
+                    self._pool["executor"] = ThreadPoolExecutor(self.max_workers, thread_name_prefix="bulk-ingest")
+                    self._pool["pid"] = os.getpid()
+        return self._pool["executor"]
+
+    def _compute(self, key: str, brief: str) -> Dict[str, Any]:
+        cached = self.store.get(key)
+        if cached is not None:
+            return dict(cached, cached=True)
+        start = time.perf_counter()
+        try:
+            with llm_priority(PRIORITY_BACKGROUND):
+                result = process_brief(brief)
+        except Exception as e:
+            # Non mémorisé : l'élément sera retenté à la reprise du lot
+            print(f"⚠️ Échec de l'ingestion ({key}): {e}")
+            return {"status": "error", "error": str(e), "latency_ms": round((time.perf_counter() - start) * 1000, 1)}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        self.store.put(key, result)
+        return dict(result, cached=False)
+
+    def _process(self, index: int, key: str, brief: str) -> Dict[str, Any]:
+        stored = store_key(key, brief)
+        result, _ = self._flights.do(stored, lambda: self._compute(stored, brief))
+        return {"line": index, "idempotency_key": key, **result}
+
+    def _record(self, result: Dict[str, Any]):
+        with self._lock:
+            self._counts["items"] += 1
+            self._counts[result["status"]] += 1
+            if result.get("cached"):
+                self._counts["cached"] += 1
+            else:
+                self._latencies.append(result["latency_ms"])
+
+    def run(self, lines: Iterable) -> Iterator[Dict[str, Any]]:
+        """
+        Produit un résultat par description, dans l'ordre de fin de traitement (champ "line" pour
+        l'ordre d'entrée), puis une ligne {"summary": ...} avec le débit en offres par minute.
+        Au plus 2 × max_workers descriptions sont lues d'avance : le flux d'entrée n'est pas chargé en mémoire.
+        """
+        executor = self._executor()
+        window = 2 * self.max_workers
+        start = time.perf_counter()
+        batch = {"items": 0, "complete": 0, "incomplete": 0, "error": 0, "cached": 0}
+        latencies = []
+        pending = set()
+
+        def drain(block_until: int):
+            nonlocal pending
+            while len(pending) > block_until:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    self._record(result)
+                    batch["items"] += 1
+                    batch[result["status"]] += 1
+                    if result.get("cached"):
+                        batch["cached"] += 1
+                    else:
+                        latencies.append(result["latency_ms"])
+                    yield result
+
+        index = 0
+        for line in lines:
+            parsed = parse_line(line)
+            index += 1
+            if parsed is None:
+                continue
+            yield from drain(window - 1)
+            pending.add(executor.submit(self._process, index, *parsed))
+        yield from drain(0)
+
+        elapsed = time.perf_counter() - start
+        summary = dict(batch, elapsed_s=round(elapsed, 2),
+                       postings_per_minute=round(batch["items"] / elapsed * 60, 1) if elapsed > 0 else 0.0,
+                       **_percentiles(latencies))
+        with self._lock:
+            self._last_batch = summary
+        yield {"summary": summary}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._counts, max_workers=self.max_workers, idempotency_keys=len(self.store),
+                        last_batch=dict(self._last_batch), **_percentiles(list(self._latencies)))
+
+def _percentiles(latencies) -> Dict[str, float]:
+    if not latencies:
+        return {"latency_ms_p50": 0.0, "latency_ms_p95": 0.0}
+    ordered = sorted(latencies)
+    return {"latency_ms_p50": ordered[len(ordered) // 2],
+            "latency_ms_p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]}
+
+bulk_ingestor = BulkIngestor(BULK_MAX_WORKERS, BULK_IDEMPOTENCY_SIZE)
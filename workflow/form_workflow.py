@@ -1,18 +1,34 @@
 # workflow/form_workflow.py - Version avec traduction dynamique via LLM sans suppression de code
 
 from dataclasses import field
-from langgraph.graph import StateGraph, END
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, List, Any, Tuple, Union, Literal
+from typing import Optional, Dict, List, Any, Tuple, Union, Literal, Annotated
+import os
 import json
 import copy
+import time
 import traceback
 import re
 from config.llm_config import llm
+from config.messages import t
 from models.job_details import JobDetails
+from models import field_schema, serialization
 from agents.question_agent import QuestionAgent
 from agents.update_agent import UpdateAgent  # Version améliorée
 from agents.lang_mem import LangMem
+from agents import welcome
+from workflow.node_timings import NodeTimings
+
+# Après une réponse acceptée, ces étapes ne dépendent pas les unes des autres : branches parallèles
+# du graphe (une super-étape LangGraph), rejointes par merge_turn. WORKFLOW_PARALLEL=0 les enchaîne.
+WORKFLOW_PARALLEL = os.getenv("WORKFLOW_PARALLEL", "1") == "1"
+WORKFLOW_TIMINGS = os.getenv("WORKFLOW_TIMINGS", "0") == "1"
+TURN_BRANCHES = ("remember_facts", "check_contradictions", "determine_next_action")
+
+def merge_dicts(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Réducteur des branches parallèles : fusion par clé, une valeur None retire la clé."""
+    merged = {**(left or {}), **(right or {})}
+    return {key: value for key, value in merged.items() if value is not None}
 
 class ConversationTurn(BaseModel):
     role: str  # "user" ou "system"
@@ -31,9 +47,21 @@ class FormState(BaseModel):
     processed_fields: List[str] = Field(default_factory=list, description="Champs déjà traités")
     skip_modification_detection: bool = Field(default=False, description="Flag pour ignorer la détection de modification")
     failed_attempts: Dict[str, int] = Field(default_factory=dict, description="Compteur d'échecs par champ")
-    memory_snapshots: List[Dict[str, Any]] = Field(default_factory=list, description="Instantanés de mémoire pour le suivi des modifications")
+    memory_snapshots: List[Dict[str, Any]] = Field(default_factory=list, description="Versions de JobDetails (champ, version) pour le suivi des modifications")
     iteration_count: int = Field(default=0, description="Compteur d'itérations pour éviter les boucles infinies")
     is_first_interaction: bool = Field(default=True, description="Indique si c'est la première interaction")
+    memory_facts: Annotated[Dict[str, Any], merge_dicts] = Field(default_factory=dict, description="Faits extraits des réponses (branche remember_facts)")
+    contradictions: Annotated[Dict[str, str], merge_dicts] = Field(default_factory=dict, description="Contradiction détectée par champ (branche check_contradictions)")
+
+def _changes(state: FormState, new_state: Union[FormState, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Mise à jour partielle d'un nœud : seuls les champs modifiés sont écrits, pour que des branches
+    parallèles puissent écrire dans la même super-étape sans se contredire.
+    """
+    if isinstance(new_state, dict):
+        return new_state
+    return {name: getattr(new_state, name) for name in FormState.model_fields
+            if getattr(new_state, name) != getattr(state, name)}
 
 class FormWorkflow:
     """
@@ -52,20 +80,18 @@ class FormWorkflow:
         self.question_agent.llm = self.llm
         self.question_agent.job_details = self.job_details
         
+        from langgraph.graph import StateGraph, END  # import lourd, différé à la construction
+        self.timings = NodeTimings()
         self.graph = StateGraph(FormState)
         
-        self.graph.add_node("wait_for_first_input", self.wait_for_first_input)
-        self.graph.add_node("determine_next_action", self.determine_next_action)
-        self.graph.add_node("ask_question", self.ask_question)
-        self.graph.add_node("process_user_input", self.process_user_input)
-        self.graph.add_node("handle_error", self.handle_error)
-        self.graph.add_node("show_status", self.show_status)
-        self.graph.add_node("finalize_form", self.finalize_form)
+        for name in ("wait_for_first_input", "ask_question", "process_user_input", "handle_error",
+                     "show_status", "finalize_form", "merge_turn") + TURN_BRANCHES:
+            self.graph.add_node(name, self._timed(name, getattr(self, name)))
         
         self.graph.add_edge("wait_for_first_input", "process_user_input")
         
         self.graph.add_conditional_edges(
-            "determine_next_action",
+            "merge_turn",
             self.route_next_action,
             {
                 "ask_question": "ask_question",
@@ -77,16 +103,21 @@ class FormWorkflow:
         
         self.graph.add_conditional_edges(
             "process_user_input",
-            self.route_after_input,
+            self.route_turn,
             {
-                "success": "determine_next_action",
                 "error": "handle_error",
-                "change_field": "determine_next_action",
                 "show_status": "show_status",
-                "wait": "wait_for_first_input"
+                "wait": "wait_for_first_input",
+                **{name: name for name in TURN_BRANCHES}
             }
         )
         
+        if WORKFLOW_PARALLEL:
+            self.graph.add_edge(list(TURN_BRANCHES), "merge_turn")
+        else:
+            for current, following in zip(TURN_BRANCHES, TURN_BRANCHES[1:] + ("merge_turn",)):
+                self.graph.add_edge(current, following)
+        
         self.graph.add_edge("handle_error", "ask_question")
         self.graph.add_edge("show_status", "ask_question")
         self.graph.add_edge("finalize_form", END)
@@ -101,95 +132,55 @@ class FormWorkflow:
         """Compile le graphe en fixant explicitement une limite de récursion."""
         return self.graph.compile(recursion_limit=1500)
 
+    def _timed(self, name: str, node):
+        """Enveloppe un nœud : durée enregistrée par super-étape, retour réduit aux champs modifiés."""
+        def run(state: FormState, config) -> Dict[str, Any]:
+            start = time.perf_counter()
+            new_state = node(state)
+            step = config.get("metadata", {}).get("langgraph_step", -1)
+            self.timings.record(name, step, time.perf_counter() - start)
+            return _changes(state, new_state)
+        return run
+
     def wait_for_first_input(self, state: FormState) -> FormState:
         """Attend le premier message de l'utilisateur et affiche une invite."""
         new_state = copy.deepcopy(state)
         if new_state.is_first_interaction:
-            print("\n🤖 Assistant: Envoyez un premier message (ex. Bonjour) pour commencer.")
+            print(f"\n🤖 Assistant: {t('app.initial_prompt')}")
         return new_state
 
-    def generate_welcome_response(self, user_input: str) -> str:
-        """Génère une réponse de bienvenue en fonction de la langue détectée."""
-        lang = self.lang_mem._detect_language(user_input)
-        self.lang_mem.user_language = lang
-        self.update_agent.user_language = lang
-        
-        prompt = f"""
-        L'utilisateur a envoyé ce premier message: "{user_input}"
-        Langue détectée: {lang}
-        
-        TÂCHE: Générez une réponse de bienvenue adaptée à la langue:
-        1. Répondez dans la langue détectée ({lang}).
-        2. Répétez le salut initial (ex. "Bonjour" → "Bonjour").
-        3. Présentez-vous comme un assistant intelligent aidant les recruteurs à créer des offres d'emploi.
-        4. Ton amical et professionnel, maximum 2-3 phrases.
-        
-        EXEMPLES:
-        - Input: "Bonjour", Langue: fr → "Bonjour ! Je suis un assistant intelligent qui aide les recruteurs à créer des offres d'emploi."
-        - Input: "Hello", Langue: en → "Hello! I’m an intelligent assistant helping recruiters craft job postings."
-        - Input: "Hola", Langue: es → "¡Hola! Soy un asistente inteligente que ayuda a los reclutadores a crear ofertas de empleo."
-        
-        Retournez UNIQUEMENT la réponse, sans JSON ni commentaire.
-        """
-        try:
-            response = self.llm.invoke(prompt)
-            return response.content.strip()
-        except Exception as e:
-            print(f"⚠️ Erreur lors de la génération de la réponse: {e}")
-            return "Bonjour ! Je suis un assistant intelligent qui aide les recruteurs à créer des offres d'emploi."
-
-    # Nouvelle méthode pour traduire dynamiquement les messages
-    def translate_message(self, message: str, target_lang: str) -> str:
-        """Traduit un message en anglais vers la langue cible via LLM si différente de 'en'."""
-        if target_lang == "en":
-            return message
-        prompt = f"""
-        Traduisez ce message en {target_lang} :
-        "{message}"
-        Retournez UNIQUEMENT la traduction, sans commentaire ni JSON.
-        """
-        try:
-            response = self.llm.invoke(prompt)
-            return response.content.strip()
-        except Exception as e:
-            print(f"⚠️ Erreur lors de la traduction en {target_lang}: {e}")
-            return message  # Retourner le message original en cas d'erreur
+    def _t(self, msgid: str, **params) -> str:
+        """Message système dans la langue de l'utilisateur (catalogue, sans appel LLM)."""
+        return t(msgid, self.update_agent.user_language, **params)
 
     def process_user_input(self, state: FormState) -> FormState:
         new_state = copy.deepcopy(state)
         
         print(f"DEBUG: Processing input for field: {new_state.current_field}, Input: {new_state.last_user_input}")
         
-        if len(new_state.memory_snapshots) < 10:
-            new_state.memory_snapshots.append({
-                "field": new_state.current_field,
-                "job_details": copy.deepcopy(self.job_details.get_state())
-            })
-        else:
-            new_state.memory_snapshots.pop(0)
-            new_state.memory_snapshots.append({
-                "field": new_state.current_field,
-                "job_details": copy.deepcopy(self.job_details.get_state())
-            })
-        
-        current_language = self.update_agent.user_language or "fr"
-        prompt_text = {"fr": "👨‍💼 Recruteur: ", "en": "👨‍💼 Recruiter: ", "es": "👨‍💼 Reclutador: "}
+        # Un instantané n'est qu'un numéro de version : l'état se reconstruit avec job_details.as_of(version)
+        new_state.memory_snapshots = new_state.memory_snapshots[-9:] + [{
+            "field": new_state.current_field,
+            "version": self.job_details.version
+        }]
         
-        user_input = input(prompt_text.get(current_language, prompt_text["fr"]))
+        user_input = input(self._t("workflow.recruiter_prompt"))
         new_state.last_user_input = user_input
         
         new_state.conversation_history.append(ConversationTurn(role="user", content=user_input))
-        self.lang_mem.add_interaction("user", user_input)
+        # Hors premier message, les faits sont extraits par la branche remember_facts (ou handle_error)
+        self.lang_mem.add_interaction("user", user_input, extract_facts=new_state.is_first_interaction)
         
         if new_state.is_first_interaction:
-            welcome_response = self.generate_welcome_response(user_input)
+            welcome_response, personalization = welcome.start_welcome(user_input, self.lang_mem, self.llm)
+            self.update_agent.user_language = self.lang_mem.user_language
+            field, question = self.question_agent.get_next_question(self.job_details, self.lang_mem)
+            welcome_response = welcome.settle(welcome_response, personalization)
             print(f"\n🤖 Assistant: {welcome_response}")
             new_state.conversation_history.append(ConversationTurn(role="system", content=welcome_response))
             self.lang_mem.add_interaction("system", welcome_response)
             new_state.is_first_interaction = False
             
-            memory_summary = self.lang_mem.get_summary()
-            field, question = self.question_agent.get_next_question(self.job_details, memory_summary)
             if field and question:
                 new_state.current_field = field
                 new_state.current_question = question
@@ -198,7 +189,9 @@ class FormWorkflow:
                 self.lang_mem.add_interaction("system", question)
             return new_state
         
-        if new_state.current_question and "Remplacer" in new_state.current_question and new_state.current_field:
+        # Réponse à l'invite "Remplacer '...' par quoi" : début du gabarit dans la langue courante
+        replace_prefix = self._t("form.replace_value").split("'", 1)[0]
+        if new_state.current_question and new_state.current_question.startswith(replace_prefix) and new_state.current_field:
             success, update_error = self.job_details.update(new_state.current_field, user_input)
             if success:
                 print(f"✅ Champ '{new_state.current_field}' modifié avec succès: {user_input}")
@@ -213,7 +206,7 @@ class FormWorkflow:
                 new_state.skip_modification_detection = False
                 return new_state
             else:
-                new_state.error_message = update_error or f"Erreur lors de la mise à jour de '{new_state.current_field}'"
+                new_state.error_message = update_error or self._t("update.failed", field=new_state.current_field)
                 return new_state
         
         success, message, intention_analysis = self.update_agent.update(
@@ -225,22 +218,15 @@ class FormWorkflow:
             field_to_modify = message.split("CHANGE_FIELD:")[1]
             if field_to_modify in self.job_details.data["jobDetails"]:
                 new_state.current_field = field_to_modify
-                current_value = self.job_details.data["jobDetails"].get(field_to_modify, "Non spécifié")
+                current_value = self.job_details.data["jobDetails"].get(field_to_modify)
                 formatted_value = self.format_value_for_display(field_to_modify, current_value)
-                modification_prompts = {
-                    "fr": f"Remplacer '{formatted_value}' par quoi pour '{field_to_modify}' ?",
-                    "en": f"Replace '{formatted_value}' with what for '{field_to_modify}'?",
-                    "es": f"¿Reemplazar '{formatted_value}' por qué para '{field_to_modify}'?"
-                }
-                new_state.current_question = modification_prompts.get(current_language, modification_prompts["fr"])
+                new_state.current_question = self._t("form.replace_value", value=formatted_value, field=field_to_modify)
                 new_state.error_message = message
                 new_state.skip_modification_detection = True
                 print(f"DEBUG Changement de champ vers: {field_to_modify}")
                 return new_state
             else:
-                default_message = f"Field '{field_to_modify}' not recognized."
-                translated_message = self.translate_message(default_message, current_language)
-                new_state.error_message = translated_message
+                new_state.error_message = self._t("form.field_not_recognized", field=field_to_modify)
                 return new_state
         
         if success:
@@ -263,26 +249,17 @@ class FormWorkflow:
             elif intention_analysis is not None and intention_analysis.get("intention") == "MODIFY_FIELD":
                 field_to_modify = intention_analysis.get("field_to_modify")
                 if field_to_modify and field_to_modify in self.job_details.data["jobDetails"]:
-                    current_value = self.job_details.data["jobDetails"].get(field_to_modify, "Non spécifié")
+                    current_value = self.job_details.data["jobDetails"].get(field_to_modify)
                     formatted_value = self.format_value_for_display(field_to_modify, current_value)
-                    modification_prompts = {
-                        "fr": f"Quelle nouvelle valeur souhaitez-vous pour '{field_to_modify}' (actuellement: {formatted_value}) ?",
-                        "en": f"What new value would you like for '{field_to_modify}' (currently: {formatted_value})?",
-                        "es": f"¿Qué nuevo valor desea para '{field_to_modify}' (actualmente: {formatted_value})?"
-                    }
-                    new_state.current_question = modification_prompts.get(current_language, modification_prompts["fr"])
+                    new_state.current_question = self._t("form.new_value_for", field=field_to_modify, value=formatted_value)
                     new_state.error_message = None
                     return new_state
                 else:
-                    default_message = "I didn't understand which field you want to modify."
-                    translated_message = self.translate_message(default_message, current_language)
-                    new_state.error_message = translated_message
+                    new_state.error_message = self._t("form.field_unclear")
                     return new_state
             elif intention_analysis is None:
                 print("⚠️ intention_analysis est None, impossible de déterminer l'intention.")
-                default_message = "Unable to determine the user's intention."
-                translated_message = self.translate_message(default_message, current_language)
-                new_state.error_message = translated_message
+                new_state.error_message = self._t("workflow.intention_unknown")
                 return new_state
         
         if new_state.current_field:
@@ -293,9 +270,7 @@ class FormWorkflow:
             else:
                 new_state.error_message = message
         else:
-            default_message = "No active field to update."
-            translated_message = self.translate_message(default_message, current_language)
-            new_state.error_message = translated_message
+            new_state.error_message = self._t("workflow.no_active_field")
         
         return new_state
 
@@ -305,23 +280,14 @@ class FormWorkflow:
         final_json = self._clean_json_output(self.job_details.get_state())
         new_state.json_output = final_json
         
-        current_language = self.update_agent.user_language or "fr"
-        default_message = "\n✅ Job posting finalized. Details:"
-        translated_message = self.translate_message(default_message, current_language)
-        print(translated_message)
-        print(json.dumps(new_state.json_output, indent=4, ensure_ascii=False))
+        print(self._t("workflow.finalized"))
+        print(serialization.format_offer(new_state.json_output))
         
         return new_state
 
     def format_value_for_display(self, field: str, value: Any) -> str:
         if value is None:
-            current_language = self.update_agent.user_language or "fr"
-            if current_language == "fr":
-                return "Non spécifié"
-            elif current_language == "es":
-                return "No especificado"
-            else:
-                return "Not specified"
+            return self._t("form.not_specified")
         
         if isinstance(value, list) and not value:
             return "[]"
@@ -332,32 +298,14 @@ class FormWorkflow:
         if isinstance(value, (int, float)):
             if field == "availability":
                 if value == 0:
-                    return "Immédiat" if self.update_agent.user_language == "fr" else "Immediate"
+                    return self._t("display.immediate")
                 elif value == 1:
-                    return "1 semaine" if self.update_agent.user_language == "fr" else "1 week"
-                else:
-                    if self.update_agent.user_language == "fr":
-                        return f"{value} semaines"
-                    elif self.update_agent.user_language == "es":
-                        return f"{value} semanas"
-                    else:
-                        return f"{value} weeks"
+                    return self._t("display.one_week")
+                return self._t("display.weeks", value=value)
             elif "Salary" in field:
-                current_language = self.update_agent.user_language or "fr"
-                if current_language == "fr":
-                    return f"{value}€"
-                elif current_language == "es":
-                    return f"{value}€"
-                else:
-                    return f"${value}"
+                return self._t("display.salary", value=value)
             elif "HourlyRate" in field:
-                current_language = self.update_agent.user_language or "fr"
-                if current_language == "fr":
-                    return f"{value}€/h"
-                elif current_language == "es":
-                    return f"{value}€/h"
-                else:
-                    return f"${value}/h"
+                return self._t("display.hourly_rate", value=value)
             return str(value)
         
         if isinstance(value, str) and len(value) < 50:
@@ -370,23 +318,21 @@ class FormWorkflow:
                 if field == "languages" and all("level" in item for item in value):
                     return ", ".join([f"{item['name']} ({item['level']})" for item in value])
                 elif field == "skills" and all("mandatory" in item for item in value):
-                    return ", ".join([f"{item['name']}{' (requis)' if item['mandatory'] else ' (optionnel)'}" for item in value])
+                    required, optional = self._t("display.required"), self._t("display.optional")
+                    return ", ".join([f"{item['name']} ({required if item['mandatory'] else optional})" for item in value])
                 return ", ".join([item["name"] for item in value])
         
         if isinstance(value, dict) and "name" in value:
             if field == "timeZone" and "overlap" in value:
-                return f"{value['name']} (chevauchement: {value['overlap']}h)"
+                return self._t("display.overlap", name=value["name"], overlap=value["overlap"])
             return value["name"]
         
         return str(value)[:50] + ("..." if len(str(value)) > 50 else "")
 
     def _clean_json_output(self, json_data):
         try:
-            cleaned_json = {}
-            for key, value in json_data.get("jobDetails", {}).items():
-                if value not in [None, [], {}] and not (isinstance(value, dict) and not value.get("name")):
-                    cleaned_json[key] = value
-            return {"jobDetails": cleaned_json}
+            # Filtrage en une passe, sans aller-retour JSON ni copie des valeurs
+            return serialization.clean_state(json_data)
         except Exception as e:
             print(f"⚠️ Erreur lors du nettoyage du JSON: {e}")
         return self._manual_clean_json(json_data)
@@ -415,10 +361,7 @@ class FormWorkflow:
             return json_data
             
     def start(self):
-        current_language = self.update_agent.user_language or "fr"
-        default_message = "\n🚀 Starting the job posting creation process...\n"
-        translated_message = self.translate_message(default_message, current_language)
-        print(translated_message)
+        print(self._t("workflow.starting"))
         
         initial_state = FormState(
             current_field=None,
@@ -434,20 +377,16 @@ class FormWorkflow:
         )
         
         try:
-            config = {"recursion_limit": 100}
+            # Un tour accepté compte 4 super-étapes (réponse, branches, jonction, question), 7 si WORKFLOW_PARALLEL=0
+            config = {"recursion_limit": 400}
             self.executor.invoke(initial_state, config=config)
         except Exception as e:
-            current_language = self.update_agent.user_language or "fr"
-            default_message = f"\n❌ An error occurred: {str(e)}"
-            translated_message = self.translate_message(default_message, current_language)
-            print(translated_message)
+            print(self._t("workflow.error", error=e))
             
             try:
                 if (self.job_details.data["jobDetails"].get("title") and 
                     self.job_details.data["jobDetails"].get("description")):
-                    default_message = "\n🔄 Attempting to finalize despite the error..."
-                    translated_message = self.translate_message(default_message, current_language)
-                    print(translated_message)
+                    print(self._t("workflow.finalize_anyway"))
                     
                     final_state = FormState(
                         is_complete=True,
@@ -458,15 +397,14 @@ class FormWorkflow:
                     )
                     self.finalize_form(final_state)
                 else:
-                    default_message = "⚠️ Not enough information to finalize the job posting."
-                    translated_message = self.translate_message(default_message, current_language)
-                    print(translated_message)
+                    print(self._t("workflow.not_enough_info"))
             except Exception as finalize_error:
-                default_message = f"⚠️ Finalization failed: {str(finalize_error)}"
-                translated_message = self.translate_message(default_message, current_language)
-                print(translated_message)
+                print(self._t("workflow.finalize_failed", error=finalize_error))
                 
             traceback.print_exc()
+        finally:
+            if WORKFLOW_TIMINGS:
+                print(self.timings.report())
 
     def determine_next_action(self, state: FormState) -> FormState:
         new_state = copy.deepcopy(state)
@@ -475,9 +413,7 @@ class FormWorkflow:
         print(f"DEBUG: Iteration {new_state.iteration_count}, Current Field: {new_state.current_field}, Is Complete: {new_state.is_complete}")
         
         if new_state.iteration_count >= 100:
-            default_message = f"⚠️ Iteration limit ({new_state.iteration_count}) reached. Forcing finalization."
-            translated_message = self.translate_message(default_message, self.update_agent.user_language or "fr")
-            print(translated_message)
+            print(self._t("workflow.iteration_limit", count=new_state.iteration_count))
             new_state.is_complete = True
             new_state.json_output = self.job_details.get_state()
             return new_state
@@ -520,13 +456,7 @@ class FormWorkflow:
                     new_state.current_question = response.content.strip()
                 except Exception as e:
                     print(f"⚠️ Erreur lors de la génération de la question de modification: {e}")
-                    current_language = self.update_agent.user_language or "fr"
-                    if current_language == "fr":
-                        new_state.current_question = f"Valeur actuelle pour '{field_to_change}': {formatted_value}. Nouvelle valeur?"
-                    elif current_language == "es":
-                        new_state.current_question = f"Valor actual para '{field_to_change}': {formatted_value}. ¿Nuevo valor?"
-                    else:
-                        new_state.current_question = f"Current value for '{field_to_change}': {formatted_value}. New value?"
+                    new_state.current_question = self._t("app.current_value", field=field_to_change, value=formatted_value)
                 
                 new_state.error_message = None
                 new_state.skip_modification_detection = True
@@ -538,78 +468,62 @@ class FormWorkflow:
             new_state.json_output = self.job_details.get_state()
             return new_state
         
-        priority_order = [
-            "title",
-            "description", 
-            "discipline", 
-            "availability", 
-            "seniority", 
-            "languages", 
-            "skills", 
-            "jobType", 
-            "type"
-        ]
-        
         try:
-            for key in priority_order:
-                if key in missing_fields and key not in new_state.processed_fields:
-                    question = self.question_agent.generate_question_with_llm(key)
-                    new_state.current_field = key
-                    new_state.current_question = question
-                    return new_state
-            
-            job_type = self.job_details.data["jobDetails"].get("jobType")
-            job_mode = self.job_details.data["jobDetails"].get("type")
-
-            if job_type and job_mode:
-                specific_fields = []
-                if job_type == "FREELANCE":
-                    specific_fields = ["minHourlyRate", "maxHourlyRate", "weeklyHours", "estimatedWeeks"]
-                elif job_type == "FULLTIME":
-                    specific_fields = ["minFullTimeSalary", "maxFullTimeSalary"]
-                elif job_type == "PARTTIME":
-                    specific_fields = ["minPartTimeSalary", "maxPartTimeSalary"]
-
-                if job_mode == "REMOTE":
-                    geo_hierarchy = ["continents", "countries", "regions", "timeZone"]
-                    for key in geo_hierarchy:
-                        if key in missing_fields and key not in new_state.processed_fields:
-                            question = self.question_agent.generate_question_with_llm(key)
-                            new_state.current_field = key
-                            new_state.current_question = question
-                            return new_state
-                            
-                elif job_mode in ["ONSITE", "HYBRID"]:
-                    directing = ["country", "city"]
-                    specific_fields.extend(directing)
-
-                for key in specific_fields:
-                    if key in missing_fields and key not in new_state.processed_fields:
-                        question = self.question_agent.generate_question_with_llm(key)
-                        new_state.current_field = key
-                        new_state.current_question = question
-                        return new_state
-                            
+            # Ordre de priorité du schéma, tenu à jour par l'index de JobDetails (jobType et type compris)
+            key = next((field for field in missing_fields if field not in new_state.processed_fields), None)
+            if key is not None:
+                new_state.current_field = key
+                new_state.current_question = (self.question_agent.suggested_question(key, self.job_details)
+                                              or self.question_agent.generate_question_with_llm(key, self.lang_mem, self.job_details))
+                return new_state
         except Exception as e:
-            default_message = f"⚠️ Error determining next question: {e}"
-            translated_message = self.translate_message(default_message, self.update_agent.user_language or "fr")
-            print(translated_message)
+            print(self._t("workflow.next_question_error", error=e))
             if missing_fields:
                 field = missing_fields[0]
                 new_state.current_field = field
-                current_language = self.update_agent.user_language or "fr"
-                if current_language == "fr":
-                    new_state.current_question = f"Précisez {field} pour cette offre d'emploi."
-                elif current_language == "es":
-                    new_state.current_question = f"Especifique {field} para esta oferta de trabajo."
-                else:
-                    new_state.current_question = f"Specify {field} for this job posting."
+                new_state.current_question = self._t("form.specify_field", field=field)
             else:
                 new_state.is_complete = True
                 new_state.json_output = self.job_details.get_state()
                     
         return new_state
 
+    def _turn_fields(self, state: FormState) -> List[str]:
+        """Champs modifiés depuis l'instantané pris à la lecture de la dernière réponse."""
+        if not state.memory_snapshots:
+            return []
+        changes = self.job_details.changes_since(state.memory_snapshots[-1]["version"])
+        return list(dict.fromkeys(change["field"] for change in changes))
+
+    def remember_facts(self, state: FormState) -> Dict[str, Any]:
+        """Branche parallèle : faits de la dernière réponse pour la mémoire à long terme."""
+        if not state.last_user_input:
+            return {}
+        return {"memory_facts": self.lang_mem._extract_facts(state.last_user_input)}
+
+    def check_contradictions(self, state: FormState) -> Dict[str, Any]:
+        """Branche parallèle : cohérence des champs modifiés par la dernière réponse avec le reste de l'offre."""
+        found = {}
+        for field in self._turn_fields(state):
+            value = self.job_details.data["jobDetails"].get(field)
+            contradiction, message = self.lang_mem.check_contradiction(field, value, self.job_details.data)
+            found[field] = message if contradiction else None
+        return {"contradictions": found} if found else {}
+
+    def merge_turn(self, state: FormState) -> FormState:
+        """Point de jonction des branches : les réducteurs ont fusionné leurs résultats dans l'état."""
+        for field in self._turn_fields(state):
+            if state.contradictions.get(field):
+                print(f"⚠️ {state.contradictions[field]}")
+        return state
+
+    def route_turn(self, state: FormState) -> Union[str, List[str]]:
+        """Après une réponse acceptée : toutes les branches du tour, sinon la route de route_after_input."""
+        route = self.route_after_input(state)
+        if route in ("success", "change_field"):
+            return list(TURN_BRANCHES) if WORKFLOW_PARALLEL else [TURN_BRANCHES[0]]
+        return route
+
     def route_next_action(self, state: FormState) -> str:
         print(f"DEBUG: Routing - Iteration {state.iteration_count}, Is Complete: {state.is_complete}")
         if state.is_complete or state.iteration_count >= 100:
@@ -621,19 +535,12 @@ class FormWorkflow:
         new_state = copy.deepcopy(state)
         
         if not new_state.current_question:
-            memory_summary = self.lang_mem.get_summary()
-            field, question = self.question_agent.get_next_question(self.job_details, memory_summary)
+            field, question = self.question_agent.get_next_question(self.job_details, self.lang_mem)
             if field and question:
                 new_state.current_field = field
                 new_state.current_question = question
             else:
-                current_language = self.update_agent.user_language or "fr"
-                if current_language == "fr":
-                    new_state.current_question = "Quelle information souhaitez-vous ajouter?"
-                elif current_language == "es":
-                    new_state.current_question = "¿Qué información desea añadir?"
-                else:
-                    new_state.current_question = "What information would you like to add?"
+                new_state.current_question = self._t("form.what_to_add")
                 
         print(f"\n🤖 Assistant: {new_state.current_question}")
         
@@ -650,17 +557,13 @@ class FormWorkflow:
             return "wait"
             
         if state.error_message in ["ERROR_RESET_STATE", "NO_FIELD_SELECTED"]:
-            default_message = "🔄 Resetting state to avoid loop"
-            translated_message = self.translate_message(default_message, self.update_agent.user_language or "fr")
-            print(translated_message)
+            print(self._t("workflow.reset_loop"))
             return "success"
             
         if state.error_message == "SHOW_STATUS":
             return "show_status"
         elif state.error_message and state.error_message.startswith("SHOW_STATUS:"):
-            default_message = "ℹ️ Displaying requested status"
-            translated_message = self.translate_message(default_message, self.update_agent.user_language or "fr")
-            print(translated_message)
+            print(self._t("workflow.show_status"))
             return "show_status"
         elif state.error_message and state.error_message.startswith("NEED_CLARIFICATION:"):
             return "error"
@@ -669,9 +572,7 @@ class FormWorkflow:
         elif state.error_message:
             current_field = state.current_field
             if current_field and state.failed_attempts.get(current_field, 0) >= 3:
-                default_message = f"🔄 Too many errors for '{current_field}', moving to next field"
-                translated_message = self.translate_message(default_message, self.update_agent.user_language or "fr")
-                print(translated_message)
+                print(self._t("workflow.too_many_errors", field=current_field))
                 return "success"
             return "error"
         else:
@@ -685,13 +586,14 @@ class FormWorkflow:
         error_msg = new_state.error_message
         analysis = new_state.user_analysis
         
+        if new_state.last_user_input:
+            new_state.memory_facts = {**new_state.memory_facts, **self.lang_mem._extract_facts(new_state.last_user_input)}
+        
         if error_msg and error_msg.startswith("NEED_CLARIFICATION:"):
             explanation = error_msg.replace("NEED_CLARIFICATION:", "")
             new_state.current_question = explanation
             
-            default_message = "ℹ️ Here's an explanation"
-            translated_message = self.translate_message(default_message, self.update_agent.user_language or "fr")
-            print(translated_message)
+            print(self._t("workflow.explanation"))
         else:
             reformulated = self.update_agent.reformulate_question(
                 field, 
@@ -701,9 +603,7 @@ class FormWorkflow:
             )
             new_state.current_question = reformulated
             
-            default_message = f"🔄 Reformulating due to: {error_msg}"
-            translated_message = self.translate_message(default_message, self.update_agent.user_language or "fr")
-            print(translated_message)
+            print(self._t("workflow.reformulating", error=error_msg))
         
         return new_state
         
@@ -712,7 +612,7 @@ class FormWorkflow:
         
         filled_fields = {}
         for field, value in self.job_details.data["jobDetails"].items():
-            if value not in [None, [], {}] and not (isinstance(value, dict) and not value.get("name")):
+            if field_schema.is_filled(field, value):
                 filled_fields[field] = value
         
         previous_field = new_state.current_field
@@ -744,17 +644,9 @@ class FormWorkflow:
             response = self.llm.invoke(prompt)
             status_message = response.content.strip()
         except Exception as e:
-            default_message = f"⚠️ Error generating status: {e}"
-            translated_message = self.translate_message(default_message, self.update_agent.user_language or "fr")
-            print(translated_message)
-            
-            current_language = self.update_agent.user_language or "fr"
-            if current_language == "fr":
-                status_message = f"Voici les informations fournies :\n• {', '.join([f'{k}: {self.format_value_for_display(k, v)}' for k, v in filled_fields.items()])}"
-            elif current_language == "es":
-                status_message = f"Aquí está la información proporcionada:\n• {', '.join([f'{k}: {self.format_value_for_display(k, v)}' for k, v in filled_fields.items()])}"
-            else:
-                status_message = f"Here is the information provided:\n• {', '.join([f'{k}: {self.format_value_for_display(k, v)}' for k, v in filled_fields.items()])}"
+            print(self._t("workflow.status_error", error=e))
+            items = ", ".join(f"{k}: {self.format_value_for_display(k, v)}" for k, v in filled_fields.items())
+            status_message = self._t("form.status_fallback", items=items)
     
         print(f"\n🤖 Assistant: {status_message}")
         
@@ -767,13 +659,7 @@ class FormWorkflow:
             new_state.current_field = previous_field
             new_state.current_question = previous_question
         else:
-            current_language = self.update_agent.user_language or "fr"
-            if current_language == "fr":
-                new_state.current_question = "Souhaitez-vous continuer à remplir le formulaire ?"
-            elif current_language == "es":
-                new_state.current_question = "¿Desea continuar completando el formulario?"
-            else:
-                new_state.current_question = "Would you like to continue filling out the form?"
+            new_state.current_question = self._t("form.continue")
         
         new_state.error_message = None
         
@@ -0,0 +1,54 @@
+# workflow/node_timings.py - Durées par nœud du graphe FormWorkflow et chemin critique par super-étape
+#
+# LangGraph exécute le graphe par super-étapes : les branches d'une même étape tournent en
+# parallèle et l'étape dure autant que sa branche la plus lente. Le chemin critique est donc la
+# somme, étape par étape, du nœud le plus long ; le comparer à la somme de tous les nœuds montre
+# ce que la parallélisation fait gagner.
+import threading
+from typing import Dict, List, Tuple
+
+class NodeTimings:
+    """Collecte thread-safe des durées (nœud, super-étape) d'une exécution du graphe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples: List[Tuple[int, str, float]] = []
+
+    def record(self, node: str, step: int, elapsed: float):
+        with self._lock:
+            self._samples.append((step, node, elapsed))
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Par nœud : nombre d'exécutions, durée totale et moyenne (secondes)."""
+        with self._lock:
+            samples = list(self._samples)
+        per_node: Dict[str, Dict[str, float]] = {}
+        for _, node, elapsed in samples:
+            entry = per_node.setdefault(node, {"calls": 0, "total": 0.0})
+            entry["calls"] += 1
+            entry["total"] += elapsed
+        for entry in per_node.values():
+            entry["mean"] = entry["total"] / entry["calls"]
+        return per_node
+
+    def critical_path(self) -> Tuple[float, float]:
+        """(chemin critique, somme des nœuds) : le premier est le temps d'horloge minimal du graphe."""
+        with self._lock:
+            samples = list(self._samples)
+        slowest: Dict[int, float] = {}
+        for step, _, elapsed in samples:
+            slowest[step] = max(slowest.get(step, 0.0), elapsed)
+        return sum(slowest.values()), sum(elapsed for _, _, elapsed in samples)
+
+    def report(self) -> str:
+        per_node = self.stats()
+        critical, total = self.critical_path()
+        lines = [f"{'nœud':<24}{'appels':>8}{'total (s)':>12}{'moyenne (ms)':>14}"]
+        for node, entry in sorted(per_node.items(), key=lambda item: -item[1]["total"]):
+            lines.append(f"{node:<24}{entry['calls']:>8}{entry['total']:>12.3f}{entry['mean'] * 1000:>14.1f}")
+        lines.append(f"chemin critique: {critical:.3f} s, somme des nœuds: {total:.3f} s")
+        return "\n".join(lines)